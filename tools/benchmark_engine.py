@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""Benchmark per-query overhead of the SQLite engine profiles.
+
+Builds a scratch sessions.db (schema from the ORM models, --rows learning
+items), then times the same request-shaped work for each profile in
+tracker_app/db/engine_profiles.py:
+
+  checkout    borrow a connection, SELECT 1, return it (pool + pre-ping cost)
+  pk lookup   open session, SELECT one LearningItem by id, close
+  due scan    open session, the dashboard's due-items query, close
+  insert      open session, add one IntentPrediction, commit, close
+
+The 'legacy' row is the previous get_engine() configuration, so the
+difference to 'dashboard' / 'tracker' is the effect of this change.
+
+Each operation is timed for --rounds rounds and the fastest round is
+reported, which keeps scheduler noise out of the comparison.
+
+Usage:
+    python tools/benchmark_engine.py [--rows 5000] [--iterations 2000] [--rounds 5]
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from datetime import timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from tracker_app.db.engine_profiles import ENGINE_PROFILES, build_engine  # noqa: E402
+from tracker_app.db.models import Base, IntentPrediction, LearningItem  # noqa: E402
+from tracker_app.utils import utcnow  # noqa: E402
+
+
+OPERATIONS = ("checkout", "pk lookup", "due scan", "insert")
+
+
+def seed(url: str, rows: int) -> None:
+    engine = build_engine(url, "legacy")
+    Base.metadata.create_all(bind=engine)
+    rng = random.Random(1)
+    now = utcnow()
+    with sessionmaker(bind=engine)() as db:
+        db.add_all(
+            LearningItem(
+                id=f"item-{i}", question=f"question {i}", answer=f"answer {i}",
+                next_review_date=now + timedelta(days=rng.randint(-30, 30)),
+            )
+            for i in range(rows)
+        )
+        db.commit()
+    engine.dispose()
+
+
+def bench(url: str, profile: str, rows: int, iterations: int, rounds: int) -> dict:
+    engine = build_engine(url, profile)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    rng = random.Random(2)
+    now = utcnow()
+
+    def checkout():
+        with engine.connect() as conn:
+            conn.exec_driver_sql("SELECT 1").scalar()
+
+    def pk_lookup():
+        with Session() as db:
+            db.get(LearningItem, f"item-{rng.randrange(rows)}")
+
+    def due_scan():
+        with Session() as db:
+            db.query(LearningItem).filter(
+                LearningItem.next_review_date <= now
+            ).order_by(LearningItem.next_review_date).limit(20).all()
+
+    def insert():
+        with Session() as db:
+            db.add(IntentPrediction(timestamp=utcnow(), predicted_intent="studying",
+                                    confidence=0.9, context_keywords="[]"))
+            db.commit()
+
+    out = {}
+    for name, fn, n in (("checkout", checkout, iterations),
+                        ("pk lookup", pk_lookup, iterations),
+                        ("due scan", due_scan, iterations),
+                        ("insert", insert, max(1, iterations // 10))):
+        for _ in range(min(50, n)):  # warm caches / pool
+            fn()
+        best = float("inf")
+        for _ in range(rounds):
+            start = time.perf_counter()
+            for _ in range(n):
+                fn()
+            best = min(best, time.perf_counter() - start)
+        out[name] = best / n * 1_000_000
+    engine.dispose()
+    return out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{Path(tmp) / 'bench.db'}"
+        seed(url, args.rows)
+        print(f"{args.rows} learning items, {args.iterations} iterations (us per operation)\n")
+        print(f"{'profile':<10} " + " ".join(f"{op:>10}" for op in OPERATIONS))
+        results = {}
+        for profile in ("legacy", *(p for p in ENGINE_PROFILES if p != "legacy")):
+            results[profile] = r = bench(url, profile, args.rows, args.iterations, args.rounds)
+            print(f"{profile:<10} " + " ".join(f"{r[op]:10.1f}" for op in OPERATIONS))
+        base = results["legacy"]
+        print()
+        for profile, r in results.items():
+            if profile != "legacy":
+                print(f"{profile} vs legacy: " + ", ".join(
+                    f"{k} {base[k] / r[k]:.2f}x" for k in base))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""Benchmark the keyword extraction pipeline on synthetic OCR-sized pages.
+
+Default mode times the statistical keyword scorers (yake package vs the
+built-in NumPy scorer) on a ~50k-character input and reports how closely
+their top-15 lists agree.
+
+--profiles times each spaCy extraction profile (full / balanced / fast) and
+scores it against the expectations of the keyword tests
+(test_entity_extraction.py), plus top-15 agreement with the full profile.
+
+Usage:
+    python tools/benchmark_extraction.py [--chars 50000] [--repeat 3] [--profiles]
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from tracker_app.tracking import keyword_extractor as kw  # noqa: E402
+
+SAMPLE_PARAGRAPHS = [
+    "Photosynthesis is the process by which plants convert sunlight into glucose "
+    "using chlorophyll in the chloroplasts. The light-dependent reactions occur in "
+    "the thylakoid membrane, while the Calvin cycle runs in the stroma.",
+    "Backpropagation computes the gradient of the loss function with respect to the "
+    "weights of a neural network. Stochastic gradient descent uses mini-batches.",
+    "The French Revolution began in 1789. The Estates General convened at Versailles "
+    "and the National Assembly drew on Enlightenment ideas about popular sovereignty.",
+    "A covering index contains every column a query needs, so SQLite can skip the "
+    "table lookup. Query planners choose a B-tree index using table statistics.",
+]
+
+
+# (text, any-of keywords that must appear, keywords that must not appear)
+# -- mirrors tracker_app/tests/test_entity_extraction.py.
+ACCURACY_CASES = [
+    ("John Smith works at Stanford University in California",
+     {"stanford", "stanford university"}, {"john", "smith"}),
+    ("Google published a paper on transformer architecture", {"google"}, set()),
+    ("The French Revolution began in Paris, France", {"france", "paris"}, set()),
+    ("John Smith works at Microsoft developing machine learning algorithms",
+     set(), {"smith works", "microsoft developing", "developing machine"}),
+    ("The neural network architecture uses transformer attention mechanism",
+     {"neural network"}, set()),
+    ("The neural network architecture uses transformer attention mechanism",
+     {"attention mechanism"}, set()),
+    ("Photosynthesis is the process by which plants convert light energy",
+     {"photosynthesis", "process"}, set()),
+]
+
+
+def build_text(chars: int, seed: int = 1) -> str:
+    """Mix real study paragraphs with dictionary-word filler up to `chars`."""
+    rng = random.Random(seed)
+    words = (ROOT / "tracker_app" / "data" / "english_words.txt").read_text(
+        encoding="utf-8").split()
+    parts: list[str] = []
+    size = 0
+    while size < chars:
+        if rng.random() < 0.5:
+            part = rng.choice(SAMPLE_PARAGRAPHS)
+        else:
+            part = " ".join(rng.choice(words) for _ in range(15)) + "."
+        parts.append(part)
+        size += len(part) + 1
+    return " ".join(parts)[:chars]
+
+
+def time_call(fn, text: str, repeat: int) -> tuple[float, list]:
+    result = fn(text)  # warm-up
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn(text)
+    return (time.perf_counter() - start) / repeat, result
+
+
+def case_accuracy(pipeline) -> float:
+    """Fraction of ACCURACY_CASES a pipeline satisfies."""
+    passed = 0
+    for text, want_any, forbid in ACCURACY_CASES:
+        got = {k for k, _ in pipeline.keywords(text)}
+        if (not want_any or got & want_any) and not (got & forbid):
+            passed += 1
+    return passed / len(ACCURACY_CASES)
+
+
+def bench_profiles(text: str, repeat: int) -> None:
+    print(f"{'profile':<9} {'components':<48} {'page ms':>9} {'accuracy':>9} {'vs full':>8}")
+    reference = None
+    for profile in ("full", "balanced", "fast"):
+        try:
+            nlp = kw._load_nlp(profile)
+        except Exception as e:
+            print(f"{profile:<9} unavailable: {e}")
+            continue
+        pipeline = kw.ExtractionPipeline(cache_size=0, nlp=nlp, profile=profile)
+        secs, out = time_call(lambda t: pipeline.keywords(t, 15), text, repeat)
+        top = {k for k, _ in out}
+        if reference is None and profile == "full":
+            reference = top
+        agreement = (f"{len(top & reference) / max(len(top | reference), 1):8.2f}"
+                     if reference is not None else f"{'-':>8}")
+        print(f"{profile:<9} {','.join(nlp.pipe_names):<48} {secs * 1000:9.1f} "
+              f"{case_accuracy(pipeline):9.2f} {agreement}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--chars", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--profiles", action="store_true",
+                        help="compare spaCy extraction profiles instead of scorers")
+    args = parser.parse_args()
+
+    text = build_text(args.chars)
+    if args.profiles:
+        print(f"Input: {len(text)} chars\n")
+        bench_profiles(text, args.repeat)
+        return
+    print(f"Input: {len(text)} chars\n")
+
+    scorers = {"numpy": kw.NumpyKeywordScorer().extract_keywords}
+    yake = kw._get_yake()
+    if yake is not None:
+        scorers["yake"] = yake.extract_keywords
+
+    results = {}
+    for name, fn in scorers.items():
+        secs, out = time_call(fn, text, args.repeat)
+        results[name] = [k.lower() for k, _ in out][:15]
+        print(f"  {name:<6} {secs * 1000:9.1f} ms")
+
+    if "yake" in results:
+        overlap = len(set(results["yake"]) & set(results["numpy"]))
+        print(f"\nTop-15 overlap numpy vs yake: {overlap}/15")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""Benchmark item search: LIKE '%q%' scan vs the FTS5 index (migration 019).
+
+Builds a scratch sessions.db with --rows learning items (schema and FTS
+triggers from the ORM models, so the index is filled as rows go in). It
+then times dashboard-style queries through both paths:
+
+  like   the previous search_items filter:
+         question LIKE '%q%' OR answer LIKE '%q%'
+  fts    SearchRepository.search_items: BM25-ranked prefix match, top 20
+
+Each query runs --iterations times per round. The report gives the
+fastest of --rounds rounds, in milliseconds per query.
+
+Usage:
+    python tools/benchmark_search.py [--rows 100000] [--iterations 20] [--rounds 3]
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from sqlalchemy import or_  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from tracker_app.db.engine_profiles import build_engine  # noqa: E402
+from tracker_app.db.models import Base, LearningItem  # noqa: E402
+from tracker_app.db.repository import SearchRepository  # noqa: E402
+
+
+SYLLABLES = ("ba ke lo mi nu ra se ti vo xa ze pho cy dra gen lu mor pan qui sta "
+             "tor ul ven wex yo").split()
+VOCAB_SIZE = 20_000
+
+
+def vocabulary() -> list:
+    """Deterministic pseudo-words, most frequent first (drawn Zipf-weighted)."""
+    rng = random.Random(0)
+    words = set()
+    while len(words) < VOCAB_SIZE:
+        words.add("".join(rng.choices(SYLLABLES, k=rng.randint(2, 4))))
+    words = sorted(words)
+    rng.shuffle(words)
+    return words
+
+
+VOCAB = vocabulary()
+WEIGHTS = [1 / (rank + 1) for rank in range(VOCAB_SIZE)]
+
+# (label, query): from the worst case for ranking (the most common word,
+# a two-letter prefix) down to a rare word and no match at all.
+QUERIES = (
+    ("top word", VOCAB[0]),
+    ("2-char prefix", VOCAB[0][:2]),
+    ("common word", VOCAB[20]),
+    ("two words", f"{VOCAB[5]} {VOCAB[40]}"),
+    ("rare word", VOCAB[5000]),
+    ("no match", "zzzqqq"),
+)
+
+
+def seed(url: str, rows: int) -> None:
+    engine = build_engine(url, "tracker")
+    Base.metadata.create_all(bind=engine)
+    rng = random.Random(1)
+    with sessionmaker(bind=engine)() as db:
+        for start in range(0, rows, 5000):
+            db.add_all(
+                LearningItem(
+                    id=f"item-{i}",
+                    question=" ".join(rng.choices(VOCAB, WEIGHTS, k=8)),
+                    answer=" ".join(rng.choices(VOCAB, WEIGHTS, k=25)),
+                    tags='["bench"]',
+                )
+                for i in range(start, min(rows, start + 5000))
+            )
+            db.commit()
+    engine.dispose()
+
+
+def bench(url: str, iterations: int, rounds: int) -> dict:
+    engine = build_engine(url, "dashboard")
+    Session = sessionmaker(bind=engine)
+
+    def like(q):
+        with Session() as db:
+            term = f"%{q}%"
+            db.query(LearningItem).filter(
+                LearningItem.status == "active",
+                or_(LearningItem.question.like(term), LearningItem.answer.like(term)),
+            ).order_by(LearningItem.created_at.desc()).limit(20).all()
+
+    def fts(q):
+        with Session() as db:
+            SearchRepository.search_items(db, q, limit=20)
+
+    out = {}
+    for _, q in QUERIES:
+        for name, fn in (("like", like), ("fts", fts)):
+            fn(q)  # warm the page cache
+            best = float("inf")
+            for _ in range(rounds):
+                start = time.perf_counter()
+                for _ in range(iterations):
+                    fn(q)
+                best = min(best, time.perf_counter() - start)
+            out[(q, name)] = best / iterations * 1000
+    engine.dispose()
+    return out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{Path(tmp) / 'bench.db'}"
+        start = time.perf_counter()
+        seed(url, args.rows)
+        print(f"{args.rows} learning items seeded in {time.perf_counter() - start:.1f}s "
+              f"(ms per query)\n")
+        results = bench(url, args.iterations, args.rounds)
+        print(f"{'query':<16} {'like':>10} {'fts':>10} {'speedup':>9}")
+        for label, q in QUERIES:
+            like, fts = results[(q, "like")], results[(q, "fts")]
+            print(f"{label:<16} {like:10.2f} {fts:10.2f} {like / fts:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -54,6 +54,44 @@ def get_db_path() -> str:
 
 DB_PATH = get_db_path()
 
+# SQLite engine profile (tracker_app/db/engine_profiles.py): 'dashboard'
+# (QueuePool, default), 'tracker' (a larger QueuePool; main.py selects it for
+# the tracking process) or 'legacy' (the old pre-ping pool and
+# PRAGMAs). SQLITE_* size the per-connection PRAGMAs of the tuned profiles.
+DB_ENGINE_PROFILE      = os.environ.get('DB_ENGINE_PROFILE', 'dashboard').strip().lower()
+SQLITE_CACHE_SIZE_KB   = int(os.environ.get('SQLITE_CACHE_SIZE_KB', 16384))
+SQLITE_MMAP_SIZE       = int(os.environ.get('SQLITE_MMAP_SIZE', 64 * 1024 * 1024))
+SQLITE_BUSY_TIMEOUT_MS = int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', 5000))
+SQLITE_STATEMENT_CACHE = int(os.environ.get('SQLITE_STATEMENT_CACHE', 256))
+
+# Retention / compaction of the append-only log tables (tracker_app/db/
+# retention.py), run by the tracker every RETENTION_INTERVAL_HOURS. Whole days
+# of raw rows older than a horizon (days) are folded into per-day rollup
+# tables and deleted; 0 keeps the table forever. Review history is the deck's
+# audit trail and is kept by default. Only feedback samples already consumed
+# by retraining are deleted. applied_reviews only has to outlive a client's
+# batch-retry window, so its ids go after a week. Freed pages are returned to
+# the OS with incremental VACUUM (RETENTION_VACUUM_PAGES per run, 0 = all).
+RETENTION_ENABLED         = os.environ.get('RETENTION_ENABLED', 'true').lower() == 'true'
+RETENTION_INTERVAL_HOURS  = float(os.environ.get('RETENTION_INTERVAL_HOURS', 6))
+RETENTION_ENCOUNTER_DAYS  = int(os.environ.get('RETENTION_ENCOUNTER_DAYS', 90))
+RETENTION_INTENT_DAYS     = int(os.environ.get('RETENTION_INTENT_DAYS', 30))
+RETENTION_MULTIMODAL_DAYS = int(os.environ.get('RETENTION_MULTIMODAL_DAYS', 30))
+RETENTION_REVIEW_DAYS     = int(os.environ.get('RETENTION_REVIEW_DAYS', 0))
+RETENTION_FEEDBACK_DAYS   = int(os.environ.get('RETENTION_FEEDBACK_DAYS', 90))
+RETENTION_APPLIED_REVIEW_DAYS = int(os.environ.get('RETENTION_APPLIED_REVIEW_DAYS', 7))
+RETENTION_VACUUM_PAGES    = int(os.environ.get('RETENTION_VACUUM_PAGES', 0))
+
+# Change audit of ORM writes (tracker_app/db/change_audit.py): compact column
+# diffs handed to a background writer on the "DB_Models" logger. Set
+# CHANGE_AUDIT_ENABLED=false to remove the flush listener entirely.
+# CHANGE_AUDIT_TABLES overrides the level / sample rate per table, e.g.
+# "intent_predictions=DEBUG@0.1,learning_items=INFO,tracked_concepts=OFF".
+CHANGE_AUDIT_ENABLED    = os.environ.get('CHANGE_AUDIT_ENABLED', 'true').lower() == 'true'
+CHANGE_AUDIT_LEVEL      = os.environ.get('CHANGE_AUDIT_LEVEL', 'INFO').strip().upper()
+CHANGE_AUDIT_TABLES     = os.environ.get('CHANGE_AUDIT_TABLES', '')
+CHANGE_AUDIT_QUEUE_SIZE = int(os.environ.get('CHANGE_AUDIT_QUEUE_SIZE', 10000))
+
 # ----------------------------
 # Tesseract OCR
 # ----------------------------
@@ -90,6 +128,16 @@ AUDIO_INTERVAL      = int(os.environ.get('AUDIO_INTERVAL',      15))
 WEBCAM_INTERVAL     = int(os.environ.get('WEBCAM_INTERVAL',     45))
 USER_ALLOW_WEBCAM   = os.environ.get('ALLOW_WEBCAM', 'true').lower() == 'true'
 
+# Intent predictions are buffered in memory and written in one transaction
+# every INTENT_FLUSH_CYCLES predictions or INTENT_FLUSH_SECONDS, whichever
+# comes first, and on session end / exit. A crash loses at most one batch.
+# The dashboard only sees a prediction once its batch is written, so the
+# intent-feedback toast (/api/v1/intent/recent) can lag the tracker by up to
+# INTENT_FLUSH_SECONDS; keep it short next to TOAST_COOLDOWN_MINUTES.
+# INTENT_FLUSH_CYCLES=1 restores the old one-commit-per-cycle behaviour.
+INTENT_FLUSH_CYCLES  = max(1, int(os.environ.get('INTENT_FLUSH_CYCLES', 3)))
+INTENT_FLUSH_SECONDS = float(os.environ.get('INTENT_FLUSH_SECONDS', 15))
+
 # ----------------------------
 # Study-session capture
 # ----------------------------
@@ -114,6 +162,29 @@ MEMORY_THRESHOLD         = 0.6
 DEFAULT_LAMBDA           = 0.1
 MIN_REVIEW_INTERVAL_HOURS = 1
 MAX_REVIEW_INTERVAL_HOURS = 720
+# Due concepts/items are served from an in-memory min-heap keyed on the next
+# review time (learning/due_queue.py). Local writes update it through hooks;
+# a full reload from the DB every DUE_QUEUE_RECONCILE_SECONDS picks up rows
+# written by the other process. Set to false to query SQLite on every call.
+DUE_QUEUE_ENABLED           = os.environ.get('DUE_QUEUE_ENABLED', 'true').lower() == 'true'
+DUE_QUEUE_RECONCILE_SECONDS = int(os.environ.get('DUE_QUEUE_RECONCILE_SECONDS', 300))
+# Bulk refit of every concept's lambda_personalised from its review counts
+# (learning/lambda_calibration.py), run by the tracker every
+# LAMBDA_CALIBRATION_INTERVAL_HOURS so concepts that are not being quizzed
+# do not keep a stale decay rate.
+LAMBDA_CALIBRATION_ENABLED        = os.environ.get('LAMBDA_CALIBRATION_ENABLED', 'true').lower() == 'true'
+LAMBDA_CALIBRATION_INTERVAL_HOURS = float(os.environ.get('LAMBDA_CALIBRATION_INTERVAL_HOURS', 24))
+
+# ----------------------------
+# Tracker <-> dashboard events
+# ----------------------------
+# Unix-domain-socket pub/sub (tracking/event_bus.py): the dashboard listens
+# on EVENT_BUS_SOCKET, the tracker connects and publishes concept-captured,
+# graph-updated, quiz and session events so the dashboard can push them to
+# the browser and refresh its caches at once. Unavailable where the
+# platform has no AF_UNIX; both processes then fall back to polling.
+EVENT_BUS_ENABLED = os.environ.get('EVENT_BUS_ENABLED', 'true').lower() == 'true'
+EVENT_BUS_SOCKET  = os.environ.get('EVENT_BUS_SOCKET', str(DATA_DIR / "fkt-events.sock"))
 
 # ----------------------------
 # Notifications
@@ -133,6 +204,27 @@ OCR_TOP_KEYWORDS          = 15
 # typically score ~0 while readable study content scores 50-95, so this keeps
 # junk out of tracked_concepts at the source. Tunable via OCR_MIN_WORD_CONFIDENCE.
 OCR_MIN_WORD_CONFIDENCE   = int(os.environ.get('OCR_MIN_WORD_CONFIDENCE', 30))
+# Number of distinct texts whose spaCy/YAKE analysis the keyword extraction
+# pipeline keeps in memory. Repeat OCR frames of an unchanged page hit the
+# cache instead of re-parsing. 0 disables caching.
+KEYWORD_CACHE_SIZE        = int(os.environ.get('KEYWORD_CACHE_SIZE', 64))
+# Statistical keyword scorer: 'yake' (the yake package) or 'numpy' (built-in
+# YAKE-compatible scorer over token-ID arrays, several times faster on long
+# OCR pages and needs no yake install).
+KEYWORD_SCORER            = os.environ.get('KEYWORD_SCORER', 'numpy').strip().lower()
+# spaCy components used for keyword extraction: 'full' (tagger + parser +
+# NER), 'balanced' (no parser; rule-based noun chunks) or 'fast' (no parser,
+# no NER). See tools/benchmark_extraction.py --profiles for the trade-off.
+EXTRACTION_PROFILE        = os.environ.get('EXTRACTION_PROFILE', 'full').strip().lower()
+# Per-stage latency histograms for the OCR -> concept pipeline (capture,
+# Tesseract, extraction, add_concept, ...), served at /api/v1/metrics and
+# included in export_tracking_data. Set to false to make the timers no-ops.
+STAGE_METRICS_ENABLED     = os.environ.get('STAGE_METRICS_ENABLED', 'true').lower() == 'true'
+# The histograms live in the tracker process; it writes their raw buckets to
+# STAGE_METRICS_SNAPSHOT at most every STAGE_METRICS_PUBLISH_SECONDS (and on
+# every export) so the dashboard's /api/v1/metrics can serve them.
+STAGE_METRICS_SNAPSHOT    = os.environ.get('STAGE_METRICS_SNAPSHOT', str(DATA_DIR / "stage_metrics.json"))
+STAGE_METRICS_PUBLISH_SECONDS = float(os.environ.get('STAGE_METRICS_PUBLISH_SECONDS', 30))
 
 # ----------------------------
 # EAR Calibration
@@ -0,0 +1,241 @@
+"""Structured, sampled change audit for ORM writes.
+
+Replaces the old after_flush listener that logged ``obj.__dict__`` at INFO
+for every inserted/updated/deleted object on the writing thread (one per
+concept encounter, intent prediction and review). The listener now only
+decides whether a change is wanted (per-table level + sample rate, checked
+before any work), captures a compact column diff, and hands it to a
+bounded queue. A daemon writer thread does the formatting and logging on
+the "DB_Models" logger. When the queue is full the record is dropped and
+counted rather than blocking the tracker.
+
+Configured in config.py: CHANGE_AUDIT_ENABLED (false = listener never
+installed), CHANGE_AUDIT_LEVEL (default level), CHANGE_AUDIT_TABLES
+("table=LEVEL[@rate],...", LEVEL may be OFF) and CHANGE_AUDIT_QUEUE_SIZE.
+"""
+
+import atexit
+import logging
+import queue
+import random
+import threading
+from datetime import date, datetime
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import event, inspect
+
+from tracker_app.config import (
+    CHANGE_AUDIT_ENABLED, CHANGE_AUDIT_LEVEL, CHANGE_AUDIT_TABLES, CHANGE_AUDIT_QUEUE_SIZE,
+)
+
+logger = logging.getLogger("ChangeAudit")
+db_logger = logging.getLogger("DB_Models")
+
+# Above CRITICAL: a table at this level is never audited.
+OFF = logging.CRITICAL + 10
+
+# Values longer than this are truncated in the audit line (feature vectors,
+# context snippets, ...).
+MAX_VALUE_CHARS = 80
+
+# Tables written on every tracking cycle are audited at DEBUG by default so
+# the INFO log keeps the user-driven changes (items, reviews, feedback).
+DEFAULT_TABLE_RULES: Dict[str, Tuple[int, float]] = {
+    'intent_predictions': (logging.DEBUG, 1.0),
+    'concept_encounters': (logging.DEBUG, 1.0),
+    'tracked_concepts':   (logging.DEBUG, 1.0),
+    'streak_state':       (logging.DEBUG, 1.0),
+}
+
+_STOP = object()
+
+
+def _parse_level(name: str) -> Optional[int]:
+    name = name.strip().upper()
+    if name == 'OFF':
+        return OFF
+    level = logging.getLevelName(name)
+    return level if isinstance(level, int) else None
+
+
+def parse_table_rules(spec: str) -> Dict[str, Tuple[int, float]]:
+    """Parse "table=LEVEL[@rate],..." into {table: (level, rate)}.
+
+    Malformed entries are logged and skipped so a typo in .env never stops
+    the app from starting.
+    """
+    rules = {}
+    for entry in (spec or '').split(','):
+        entry = entry.strip()
+        if not entry:
+            continue
+        try:
+            table, rule = entry.split('=', 1)
+            level_name, _, rate = rule.partition('@')
+            level = _parse_level(level_name)
+            rate = float(rate) if rate else 1.0
+            if level is None or not 0.0 <= rate <= 1.0:
+                raise ValueError(entry)
+        except ValueError:
+            logger.warning("Ignoring malformed CHANGE_AUDIT_TABLES entry: %r", entry)
+            continue
+        rules[table.strip()] = (level, rate)
+    return rules
+
+
+def _compact(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (int, float, bool)) or value is None:
+        return value
+    text = value if isinstance(value, str) else repr(value)
+    if len(text) > MAX_VALUE_CHARS:
+        text = text[:MAX_VALUE_CHARS] + f"...(+{len(text) - MAX_VALUE_CHARS})"
+    return text
+
+
+def _format_changes(changes) -> str:
+    return '{' + ', '.join(
+        f"{key}: {_compact(val[0])} -> {_compact(val[1])}" if isinstance(val, tuple)
+        else f"{key}: {_compact(val)}"
+        for key, val in changes
+    ) + '}'
+
+
+class ChangeAudit:
+    """after_flush listener + queue-backed writer."""
+
+    def __init__(self, default_level: int = logging.INFO, table_rules=None,
+                 queue_size: int = 10000, target: logging.Logger = db_logger, rng=random.random):
+        self.default_level = default_level
+        self.table_rules = dict(table_rules or {})
+        self.target = target
+        self._rng = rng
+        self._queue = queue.Queue(maxsize=max(1, queue_size))
+        self._thread = None
+        self._thread_lock = threading.Lock()
+        self.dropped = 0
+
+    def _level_for(self, table: str) -> Optional[int]:
+        level, rate = self.table_rules.get(table, (self.default_level, 1.0))
+        if level >= OFF or not self.target.isEnabledFor(level):
+            return None
+        if rate < 1.0 and self._rng() >= rate:
+            return None
+        return level
+
+    def after_flush(self, session, flush_context):
+        for op, objs in (('INSERT', session.new), ('UPDATE', session.dirty),
+                         ('DELETE', session.deleted)):
+            for obj in objs:
+                table = getattr(obj, '__tablename__', type(obj).__name__)
+                level = self._level_for(table)
+                if level is None:
+                    continue
+                state = inspect(obj)
+                changes = self._capture(state, op)
+                if op == 'UPDATE' and not changes:
+                    continue  # touched but no column actually changed
+                pk = state.mapper.primary_key_from_instance(obj)
+                pk = pk[0] if len(pk) == 1 else tuple(pk)
+                self._enqueue((level, op, table, pk, changes))
+
+    @staticmethod
+    def _capture(state, op):
+        """Column values for inserts, (old, new) pairs for updates ('?' when
+        the old value was never loaded), nothing for deletes (the primary key
+        identifies the row)."""
+        if op == 'DELETE':
+            return ()
+        values = state.dict
+        if op == 'INSERT':
+            return tuple(
+                (attr.key, values[attr.key]) for attr in state.mapper.column_attrs
+                if values.get(attr.key) is not None
+            )
+        changes = []
+        for attr in state.mapper.column_attrs:
+            hist = state.attrs[attr.key].history
+            if hist.has_changes():
+                # Expired attributes are not reloaded just to audit them.
+                old = hist.deleted[0] if hist.deleted else '?'
+                new = hist.added[0] if hist.added else None
+                changes.append((attr.key, (old, new)))
+        return tuple(changes)
+
+    def _enqueue(self, record):
+        if self._thread is None:
+            self._start()
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def _start(self):
+        with self._thread_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="change-audit-writer", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            record = self._queue.get()
+            try:
+                if record is _STOP:
+                    return
+                level, op, table, pk, changes = record
+                self.target.log(level, "%s %s pk=%s %s", op, table, pk, _format_changes(changes))
+            except Exception as e:
+                logger.debug("Change audit write failed: %s", e)
+            finally:
+                self._queue.task_done()
+
+    def drain(self) -> None:
+        """Block until every queued record has been written."""
+        if self._thread is not None:
+            self._queue.join()
+
+    def stop(self, timeout: float = 2.0) -> None:
+        thread = self._thread
+        if thread is None:
+            return
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            return
+        thread.join(timeout)
+        self._thread = None
+
+
+_audit: Optional[ChangeAudit] = None
+
+
+def get_change_audit() -> Optional[ChangeAudit]:
+    return _audit
+
+
+def install_change_audit(target) -> Optional[ChangeAudit]:
+    """Register the audit listener on `target` (the Session class) unless
+    CHANGE_AUDIT_ENABLED is false. Idempotent."""
+    global _audit
+    if not CHANGE_AUDIT_ENABLED:
+        return None
+    if _audit is None:
+        default_level = _parse_level(CHANGE_AUDIT_LEVEL)
+        if default_level is None:
+            logger.warning("Unknown CHANGE_AUDIT_LEVEL %r, using INFO", CHANGE_AUDIT_LEVEL)
+            default_level = logging.INFO
+        rules = dict(DEFAULT_TABLE_RULES)
+        rules.update(parse_table_rules(CHANGE_AUDIT_TABLES))
+        _audit = ChangeAudit(default_level, rules, CHANGE_AUDIT_QUEUE_SIZE)
+        atexit.register(_audit.stop)
+    if not event.contains(target, "after_flush", _audit.after_flush):
+        event.listen(target, "after_flush", _audit.after_flush)
+    return _audit
+
+
+def uninstall_change_audit(target) -> None:
+    """Remove the listener at runtime (e.g. to silence a bulk import)."""
+    if _audit is not None and event.contains(target, "after_flush", _audit.after_flush):
+        event.remove(target, "after_flush", _audit.after_flush)
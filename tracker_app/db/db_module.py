@@ -32,6 +32,19 @@ def init_all_databases():
                 result["applied"], result["skipped"], result["failed"])
     if result["errors"]:
         logger.error("Migration errors: %s", result["errors"])
+    # One-time backfill of the daily_summary rollup (migration 014) and the
+    # streak state row (015) so stats read from them are complete on
+    # upgraded databases.
+    try:
+        from tracker_app.db.models import SessionLocal
+        from tracker_app.db.repository import DailySummaryRepository, StreakRepository
+        with SessionLocal() as db:
+            written = DailySummaryRepository.backfill_if_empty(db)
+            StreakRepository.backfill_if_missing(db)
+        if written:
+            logger.info("Backfilled daily_summary rollup: %d days", written)
+    except Exception as e:
+        logger.error("Stats backfill failed: %s", e)
     logger.info("All database tables initialized via SQLAlchemy.")
 
 if __name__ == "__main__":
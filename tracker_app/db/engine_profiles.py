@@ -0,0 +1,108 @@
+"""SQLite engine profiles for the tracker and dashboard processes.
+
+Both processes open the same sessions.db file. Every profile enables WAL,
+foreign keys and synchronous=NORMAL. The tuned profiles also set the page
+cache, mmap, temp_store and busy_timeout PRAGMAs once per connection.
+They drop pool_pre_ping, which is a round trip that can never fail on a
+local file, and pool_recycle, which only helps with server-side idle
+timeouts. They keep sqlite3's prepared-statement cache large enough for
+the app's working set of statements.
+
+  tracker    QueuePool sized for the tracker's DB-using threads (loop,
+             pipeline workers, warm-up, audit writer, retention, lambda
+             calibration, event-bus reader), so connections and their page
+             caches stay warm without being pinned to threads. A
+             SingletonThreadPool is not safe here: once more threads than its
+             pool_size have connected it closes other threads' connections,
+             including ones still in use.
+  dashboard  QueuePool. Flask/Socket.IO request threads come and go, so
+             connections are borrowed from a small shared pool rather than
+             pinned to threads that may exit.
+  legacy     The previous settings (default pool + pre-ping + hourly
+             recycle, three PRAGMAs). Kept for comparison; see
+             tools/benchmark_engine.py.
+
+DB_ENGINE_PROFILE picks the profile (main.py selects 'tracker' for the
+tracking process). The SQLITE_* settings in config.py size the PRAGMAs.
+"""
+
+import logging
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.pool import QueuePool
+
+from tracker_app.config import (
+    SQLITE_CACHE_SIZE_KB, SQLITE_MMAP_SIZE, SQLITE_BUSY_TIMEOUT_MS, SQLITE_STATEMENT_CACHE,
+)
+
+logger = logging.getLogger("DB_Engine")
+
+_BASE_PRAGMAS = (
+    "PRAGMA foreign_keys=ON",
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+)
+
+
+def _tuned_pragmas():
+    return _BASE_PRAGMAS + (
+        # Negative cache_size is in KiB rather than pages.
+        f"PRAGMA cache_size=-{int(SQLITE_CACHE_SIZE_KB)}",
+        f"PRAGMA mmap_size={int(SQLITE_MMAP_SIZE)}",
+        "PRAGMA temp_store=MEMORY",
+        f"PRAGMA busy_timeout={int(SQLITE_BUSY_TIMEOUT_MS)}",
+    )
+
+
+ENGINE_PROFILES = {
+    'tracker': {
+        'engine_kwargs': {'poolclass': QueuePool, 'pool_size': 10, 'max_overflow': 10},
+        'tuned': True,
+    },
+    'dashboard': {
+        'engine_kwargs': {'poolclass': QueuePool, 'pool_size': 5, 'max_overflow': 10},
+        'tuned': True,
+    },
+    'legacy': {
+        'engine_kwargs': {'pool_pre_ping': True, 'pool_recycle': 3600},
+        'tuned': False,
+    },
+}
+
+DEFAULT_PROFILE = 'dashboard'
+
+
+def resolve_profile(name: str) -> str:
+    """Known profile name, falling back to DEFAULT_PROFILE for typos."""
+    name = (name or '').strip().lower()
+    if name not in ENGINE_PROFILES:
+        logger.warning("Unknown DB_ENGINE_PROFILE %r, using %r", name, DEFAULT_PROFILE)
+        return DEFAULT_PROFILE
+    return name
+
+
+def pragmas_for(profile: str) -> tuple:
+    return _tuned_pragmas() if ENGINE_PROFILES[profile]['tuned'] else _BASE_PRAGMAS
+
+
+def build_engine(url: str, profile: str = DEFAULT_PROFILE):
+    """Create a SQLite engine configured for `profile`."""
+    profile = resolve_profile(profile)
+    spec = ENGINE_PROFILES[profile]
+    connect_args = {"check_same_thread": False}
+    if spec['tuned']:
+        # sqlite3's per-connection prepared statement LRU (default 128).
+        connect_args["cached_statements"] = int(SQLITE_STATEMENT_CACHE)
+        # sqlite3's own busy handler; the PRAGMA below sets the same value.
+        connect_args["timeout"] = SQLITE_BUSY_TIMEOUT_MS / 1000.0
+    engine = create_engine(url, connect_args=connect_args, echo=False, **spec['engine_kwargs'])
+    pragmas = pragmas_for(profile)
+
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragma(dbapi_conn, _connection_record):
+        cursor = dbapi_conn.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
+
+    return engine
@@ -0,0 +1,125 @@
+"""SQLite FTS5 full-text index over learning items and tracked concepts.
+
+learning_items_fts covers the question, answer and tags of each learning
+item that is not archived. tracked_concepts_fts covers each tracked
+concept and its context_tags. Triggers on the source tables keep both
+indexes in sync, so no code path has to remember to update them. Keeping
+archived items out of the index means a ranked query never has to join
+back to learning_items to filter them.
+
+Both source tables have TEXT primary keys. Their implicit rowids are not
+stable across VACUUM, which retention's reclaim_space can run, so the
+indexes are not external-content tables keyed on rowid. Instead they
+store their own copy of the text and carry the source key as an
+UNINDEXED column. The delete and update triggers therefore scan the
+index, which takes tens of milliseconds at 100k items. That is acceptable
+because item text is written once, and archives and deletes are
+single-row user actions. The WHEN clauses keep scheduling updates from
+firing the triggers at all. Reads, the hot path, are an index lookup.
+
+BM25 has to score every match before it can sort, so a term that matches
+most of a large deck would cost a full pass. When a query has more than
+RANK_WINDOW matches, SearchRepository ranks only the newest RANK_WINDOW
+of them. Because the index rowid follows insertion order, that is a
+rowid range that FTS5 can seek.
+
+Migration 019 creates and back-fills the indexes. models.py replays
+FTS_DDL after Base.metadata.create_all, so ORM-provisioned databases
+match.
+"""
+
+import re
+from typing import List
+
+_TOKENIZE = "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3'"
+
+FTS_DDL: List[str] = [
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS learning_items_fts USING fts5("
+    f"item_id UNINDEXED, question, answer, tags, {_TOKENIZE})",
+    """
+    CREATE TRIGGER IF NOT EXISTS learning_items_fts_ai AFTER INSERT ON learning_items
+    WHEN new.status IS NOT 'archived' BEGIN
+        INSERT INTO learning_items_fts (item_id, question, answer, tags)
+        VALUES (new.id, new.question, new.answer, new.tags);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS learning_items_fts_ad AFTER DELETE ON learning_items
+    WHEN old.status IS NOT 'archived' BEGIN
+        DELETE FROM learning_items_fts WHERE item_id = old.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS learning_items_fts_au
+    AFTER UPDATE OF id, question, answer, tags, status ON learning_items
+    WHEN old.id IS NOT new.id OR old.question IS NOT new.question
+      OR old.answer IS NOT new.answer OR old.tags IS NOT new.tags
+      OR (old.status = 'archived') IS NOT (new.status = 'archived') BEGIN
+        DELETE FROM learning_items_fts WHERE item_id = old.id;
+        INSERT INTO learning_items_fts (item_id, question, answer, tags)
+        SELECT new.id, new.question, new.answer, new.tags WHERE new.status IS NOT 'archived';
+    END
+    """,
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS tracked_concepts_fts USING fts5("
+    f"concept, context_tags, {_TOKENIZE})",
+    """
+    CREATE TRIGGER IF NOT EXISTS tracked_concepts_fts_ai AFTER INSERT ON tracked_concepts BEGIN
+        INSERT INTO tracked_concepts_fts (concept, context_tags)
+        VALUES (new.concept, new.context_tags);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tracked_concepts_fts_ad AFTER DELETE ON tracked_concepts BEGIN
+        DELETE FROM tracked_concepts_fts WHERE concept = old.concept;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tracked_concepts_fts_au
+    AFTER UPDATE OF concept, context_tags ON tracked_concepts
+    WHEN old.concept IS NOT new.concept OR old.context_tags IS NOT new.context_tags BEGIN
+        DELETE FROM tracked_concepts_fts WHERE concept = old.concept;
+        INSERT INTO tracked_concepts_fts (concept, context_tags)
+        VALUES (new.concept, new.context_tags);
+    END
+    """,
+]
+
+# Re-index every existing row (migration 019 back-fill; safe to re-run).
+FTS_REBUILD: List[str] = [
+    "DELETE FROM learning_items_fts",
+    "INSERT INTO learning_items_fts (item_id, question, answer, tags) "
+    "SELECT id, question, answer, tags FROM learning_items WHERE status IS NOT 'archived'",
+    "DELETE FROM tracked_concepts_fts",
+    "INSERT INTO tracked_concepts_fts (concept, context_tags) "
+    "SELECT concept, context_tags FROM tracked_concepts",
+]
+
+FTS_DROP: List[str] = [
+    *(f"DROP TRIGGER IF EXISTS {table}_fts_{event}"
+      for table in ("learning_items", "tracked_concepts") for event in ("ai", "ad", "au")),
+    "DROP TABLE IF EXISTS learning_items_fts",
+    "DROP TABLE IF EXISTS tracked_concepts_fts",
+]
+
+# bm25() column weights, in index column order (item_id is unindexed).
+ITEM_WEIGHTS = (0.0, 10.0, 4.0, 2.0)
+CONCEPT_WEIGHTS = (10.0, 2.0)
+
+# Most matches BM25 scores per query; beyond it only the newest are ranked.
+RANK_WINDOW = 2000
+
+_MAX_TERMS = 8
+_TERM_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def match_query(text: str) -> str:
+    """Turn free text from a search box into an FTS5 MATCH expression.
+
+    Every word becomes a quoted prefix term ("bay" finds "bayes"), and the
+    terms are ANDed together. Single characters are matched as whole
+    words, because the prefix index starts at two characters. Quoting
+    keeps FTS5 operators and punctuation typed by the user from reaching
+    the query parser. Returns '' when the text holds no searchable word.
+    """
+    terms = _TERM_RE.findall(text or "")[:_MAX_TERMS]
+    return " ".join(f'"{t}"*' if len(t) > 1 else f'"{t}"' for t in terms)
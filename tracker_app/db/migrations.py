@@ -6,6 +6,7 @@ import os
 from datetime import datetime
 from pathlib import Path
 from tracker_app.config import DB_PATH
+from tracker_app.db.fts import FTS_DDL, FTS_REBUILD
 
 
 
@@ -169,6 +170,145 @@ MIGRATIONS = [
     ("013_feedback_used_in_training", "Add used_in_training flag to feedback_training_samples", [
         "ALTER TABLE feedback_training_samples ADD COLUMN used_in_training INTEGER DEFAULT 0",
     ]),
+
+    # ---- 014: Daily rollup counters -------------------------------------------------
+    # daily_summary existed but nothing populated it, so every dashboard stats call
+    # re-aggregated review_history / tracking_sessions / concept_encounters. These
+    # counters are bumped incrementally by the write paths (DailySummaryRepository.bump)
+    # and backfilled once by init_all_databases / scripts.rebuild_daily_summary.
+    ("014_daily_summary_rollup", "Add incremental rollup counters to daily_summary", [
+        "ALTER TABLE daily_summary ADD COLUMN sessions        INTEGER DEFAULT 0",
+        "ALTER TABLE daily_summary ADD COLUMN attention_sum   REAL    DEFAULT 0.0",
+        "ALTER TABLE daily_summary ADD COLUMN reviews         INTEGER DEFAULT 0",
+        "ALTER TABLE daily_summary ADD COLUMN correct_reviews INTEGER DEFAULT 0",
+        "ALTER TABLE daily_summary ADD COLUMN items_added     INTEGER DEFAULT 0",
+        "ALTER TABLE daily_summary ADD COLUMN items_mastered  INTEGER DEFAULT 0",
+        "ALTER TABLE daily_summary ADD COLUMN concepts_seen   INTEGER DEFAULT 0",
+    ]),
+
+    # ---- 015: Review streak state row -----------------------------------------------
+    # get_learning_stats ran SELECT DISTINCT date(timestamp) over all of review_history
+    # on every call (including every Socket.IO request_stats) to walk the streak back
+    # day by day. A single state row advanced by record_review makes it O(1); it is
+    # seeded by init_all_databases and repairable via StreakRepository.rebuild.
+    ("015_streak_state", "Create streak_state table", [
+        """
+        CREATE TABLE IF NOT EXISTS streak_state (
+            id               INTEGER PRIMARY KEY,
+            current_streak   INTEGER DEFAULT 0,
+            last_review_date TEXT,
+            updated_at       DATETIME
+        )
+        """,
+    ]),
+
+    # ---- 016: Composite / covering indexes for the hot read paths ------------------
+    # Designed from EXPLAIN QUERY PLAN (pinned by test_query_plan_indexes.py):
+    #   get_due_concepts      SCAN USING INDEX ix_tracked_concepts_due (no temp
+    #                         B-tree sort; LIMIT stops the walk early)
+    #   get_session_concepts  SEARCH USING COVERING INDEX (timestamp, concept)
+    #   get_concept_history   SEARCH USING INDEX (concept=? AND timestamp>?),
+    #                         no temp B-tree sort
+    #   /intent/recent        cooldown lookup via a partial prompted_at index
+    #                         instead of a full scan + sort
+    # The composites make the single-column concept_encounters indexes redundant
+    # prefixes, so those are dropped to keep inserts (one per encounter) cheap.
+    ("016_hot_query_indexes", "Add composite/covering indexes for due, session and history queries", [
+        "CREATE INDEX IF NOT EXISTS ix_tracked_concepts_due ON tracked_concepts "
+        "(relevance_score DESC, next_review) WHERE status != 'archived'",
+        "CREATE INDEX IF NOT EXISTS ix_concept_encounters_concept_timestamp ON concept_encounters (concept, timestamp)",
+        "CREATE INDEX IF NOT EXISTS ix_concept_encounters_timestamp_concept ON concept_encounters (timestamp, concept)",
+        "CREATE INDEX IF NOT EXISTS ix_intent_predictions_prompted_at ON intent_predictions "
+        "(prompted_at) WHERE prompted_at IS NOT NULL",
+        "DROP INDEX IF EXISTS ix_concept_encounters_concept",
+        "DROP INDEX IF EXISTS ix_concept_encounters_timestamp",
+    ]),
+
+    # ---- 017: Retention rollups ------------------------------------------------------
+    # concept_encounters, intent_predictions, multi_modal_logs and review_history grew
+    # forever. db/retention.py folds raw rows past their horizon into these per-day
+    # aggregates before deleting them, so long-range stats survive compaction.
+    ("017_retention_rollups", "Create per-day rollup tables for compacted log rows", [
+        """
+        CREATE TABLE IF NOT EXISTS concept_daily_rollup (
+            day            TEXT NOT NULL,
+            concept        TEXT NOT NULL,
+            encounters     INTEGER DEFAULT 0,
+            confidence_sum REAL    DEFAULT 0.0,
+            first_seen     DATETIME,
+            last_seen      DATETIME,
+            PRIMARY KEY (day, concept)
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS intent_daily_rollup (
+            day              TEXT NOT NULL,
+            intent           TEXT NOT NULL,
+            predictions      INTEGER DEFAULT 0,
+            confidence_sum   REAL    DEFAULT 0.0,
+            feedback_correct INTEGER DEFAULT 0,
+            feedback_wrong   INTEGER DEFAULT 0,
+            PRIMARY KEY (day, intent)
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS activity_daily_rollup (
+            day             TEXT NOT NULL,
+            intent_label    TEXT NOT NULL,
+            samples         INTEGER DEFAULT 0,
+            attention_sum   REAL    DEFAULT 0.0,
+            interaction_sum REAL    DEFAULT 0.0,
+            PRIMARY KEY (day, intent_label)
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS review_daily_rollup (
+            day             TEXT PRIMARY KEY,
+            reviews         INTEGER DEFAULT 0,
+            correct_reviews INTEGER DEFAULT 0
+        )
+        """,
+    ]),
+
+    # ---- 018: Keyset index for item listing -----------------------------------------
+    # /items and /items/search page by (created_at, id) after a cursor instead of
+    # returning one unbounded list; this index serves the status filter, the
+    # cursor range and the ORDER BY without a temp B-tree.
+    ("018_learning_items_keyset_index", "Add (status, created_at, id) index for keyset item pages", [
+        "CREATE INDEX IF NOT EXISTS ix_learning_items_status_created "
+        "ON learning_items (status, created_at, id)",
+    ]),
+
+    # ---- 019: Full-text search ------------------------------------------------------
+    # Item search was `LIKE '%q%'` on question/answer, a full scan per keystroke.
+    # FTS5 indexes over learning_items and tracked_concepts, kept in sync by
+    # triggers (see tracker_app/db/fts.py), then back-filled from existing rows.
+    ("019_fts_search", "Create FTS5 search indexes + sync triggers for items and concepts",
+     FTS_DDL + FTS_REBUILD),
+
+    # ---- 020: Idempotent batch reviews ----------------------------------------------
+    # POST /reviews/batch records each client-supplied review id with its result,
+    # so a retried batch replays the stored outcome instead of re-applying it.
+    ("020_applied_reviews", "Create applied_reviews for idempotent batch review ids", [
+        """
+        CREATE TABLE IF NOT EXISTS applied_reviews (
+            review_id   VARCHAR PRIMARY KEY,
+            kind        VARCHAR NOT NULL,
+            target      VARCHAR NOT NULL,
+            applied_at  DATETIME NOT NULL,
+            result      TEXT
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS ix_applied_reviews_applied_at ON applied_reviews (applied_at)",
+    ]),
+
+    # ---- 021: Lambda calibration bookkeeping ----------------------------------------
+    # recalibrate_all_lambdas records the review_count each concept was last fitted
+    # at and skips it until new reviews arrive, so unchanged evidence is not
+    # re-applied every run. NULL means never calibrated.
+    ("021_lambda_calibrated_reviews", "Add calibrated_review_count to tracked_concepts", [
+        "ALTER TABLE tracked_concepts ADD COLUMN calibrated_review_count INTEGER",
+    ]),
 ]
 
 
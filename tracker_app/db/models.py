@@ -7,12 +7,13 @@ from tracker_app.utils import utcnow as _utcnow
 
 from sqlalchemy import (
     Column, Integer, String, Float, DateTime, Text,
-    ForeignKey, Index, event, create_engine
+    DDL, ForeignKey, Index, event
 )
 from sqlalchemy.orm import declarative_base, sessionmaker, relationship, Session
 import logging
 
-from tracker_app.config import get_db_path
+from tracker_app.config import get_db_path, DB_ENGINE_PROFILE
+from tracker_app.db.engine_profiles import build_engine, resolve_profile
 
 
 Base = declarative_base()
@@ -27,6 +28,21 @@ Base = declarative_base()
 
 _engine = None
 _SessionLocal = None
+_engine_profile = DB_ENGINE_PROFILE
+
+
+def configure_engine(profile: str) -> None:
+    """Select the engine profile (see db/engine_profiles.py) for this process.
+
+    Call before the first database access; an engine that already exists is
+    disposed so the next get_engine() builds one with the new profile.
+    """
+    global _engine, _SessionLocal, _engine_profile
+    _engine_profile = resolve_profile(profile)
+    if _engine is not None:
+        _engine.dispose()
+        _engine = None
+        _SessionLocal = None
 
 
 def get_engine():
@@ -37,21 +53,7 @@ def get_engine():
         # environment fresh, so FKT_TEST_DB set after this module was
         # imported still selects the right database. (config.DB_PATH is
         # frozen at import time and would be a no-op here.)
-        _engine = create_engine(
-            f"sqlite:///{get_db_path()}",
-            connect_args={"check_same_thread": False},
-            echo=False,
-            pool_pre_ping=True,
-            pool_recycle=3600,
-        )
-
-        @event.listens_for(_engine, "connect")
-        def _set_sqlite_pragma(dbapi_conn, _connection_record):
-            cursor = dbapi_conn.cursor()
-            cursor.execute("PRAGMA foreign_keys=ON")
-            cursor.execute("PRAGMA journal_mode=WAL")
-            cursor.execute("PRAGMA synchronous=NORMAL")
-            cursor.close()
+        _engine = build_engine(f"sqlite:///{get_db_path()}", _engine_profile)
 
     return _engine
 
@@ -120,21 +122,27 @@ def get_db():
         db.close()
 
 
-# â”€â”€â”€ Active Model Logging â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€
-# Listens for all SQLAlchemy flush events and logs exactly what records
-# were inserted, updated, or deleted. This satisfies the requirement to
-# "log each of the changes and all and it is saved as logs".
+# â”€â”€â”€ Change audit â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€
+# Every flush is summarised as compact column diffs on the "DB_Models" logger
+# by a sampled, queue-backed writer thread (tracker_app/db/change_audit.py);
+# per-table levels and CHANGE_AUDIT_ENABLED=false live in config.py.
+
+from tracker_app.db.change_audit import install_change_audit
 
-db_logger = logging.getLogger("DB_Models")
+install_change_audit(Session)
 
-@event.listens_for(Session, "after_flush")
-def receive_after_flush(session, flush_context):
-    for obj in session.new:
-        db_logger.info(f"INSERTED [{obj.__class__.__name__}]: {obj.__dict__}")
-    for obj in session.dirty:
-        db_logger.info(f"UPDATED  [{obj.__class__.__name__}]: {obj.__dict__}")
-    for obj in session.deleted:
-        db_logger.info(f"DELETED  [{obj.__class__.__name__}]: {obj.__dict__}")
+
+# â”€â”€â”€ Full-text search â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€
+# The FTS5 index and its sync triggers are raw DDL (tracker_app/db/fts.py,
+# migration 019); create_all/drop_all replay it so ORM-provisioned databases
+# search the same way as migrated ones.
+
+from tracker_app.db.fts import FTS_DDL, FTS_DROP
+
+for _ddl in FTS_DDL:
+    event.listen(Base.metadata, "after_create", DDL(_ddl).execute_if(dialect="sqlite"))
+for _ddl in FTS_DROP:
+    event.listen(Base.metadata, "before_drop", DDL(_ddl).execute_if(dialect="sqlite"))
 
 
 # â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•
@@ -171,6 +179,12 @@ class LearningItem(Base):
     reviews = relationship("ReviewHistory", back_populates="item",
                            cascade="all, delete-orphan", passive_deletes=True)
 
+    __table_args__ = (
+        # Keyset pages for /items and /items/search: status equality, then the
+        # (created_at, id) cursor range walked backwards (migration 018).
+        Index("ix_learning_items_status_created", "status", "created_at", "id"),
+    )
+
 
 class ReviewHistory(Base):
     __tablename__ = "review_history"
@@ -189,6 +203,20 @@ class ReviewHistory(Base):
     item = relationship("LearningItem", back_populates="reviews")
 
 
+class AppliedReview(Base):
+    """Client review ids already applied by POST /reviews/batch.
+
+    A retried batch (offline queue, flaky connection) replays the stored
+    per-review result instead of applying the rating a second time."""
+    __tablename__ = "applied_reviews"
+
+    review_id  = Column(String, primary_key=True)
+    kind       = Column(String, nullable=False)     # 'item' | 'concept'
+    target     = Column(String, nullable=False)     # item id or concept
+    applied_at = Column(DateTime, default=_utcnow, nullable=False, index=True)
+    result     = Column(Text)                       # JSON per-review result
+
+
 # â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•
 # Intent & Activity Models
 # â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•
@@ -207,6 +235,13 @@ class IntentPrediction(Base):
     prompted_at      = Column(DateTime, nullable=True)  # when the feedback toast last surfaced this row
     window_title     = Column(String,  nullable=True)   # what was on screen when predicted
 
+    __table_args__ = (
+        # /intent/recent cooldown: latest prompted_at. Partial, so only the few
+        # prompted rows are indexed (migration 016).
+        Index("ix_intent_predictions_prompted_at", "prompted_at",
+              sqlite_where=prompted_at.isnot(None)),
+    )
+
 
 class IntentAccuracy(Base):
     __tablename__ = "intent_accuracy"
@@ -240,6 +275,27 @@ class DailySummary(Base):
     avg_attention          = Column(Float)
     primary_intents        = Column(String)
 
+    # Incremental rollup counters (migration 014), bumped in the same
+    # transaction as the write they summarise; see DailySummaryRepository.
+    sessions        = Column(Integer, default=0)
+    attention_sum   = Column(Float,   default=0.0)
+    reviews         = Column(Integer, default=0)
+    correct_reviews = Column(Integer, default=0)
+    items_added     = Column(Integer, default=0)
+    items_mastered  = Column(Integer, default=0)
+    concepts_seen   = Column(Integer, default=0)
+
+
+class StreakState(Base):
+    """Single-row review-streak state (id = 1), advanced by record_review so
+    stats never scan review_history for distinct dates (StreakRepository)."""
+    __tablename__ = "streak_state"
+
+    id               = Column(Integer, primary_key=True)
+    current_streak   = Column(Integer, default=0)
+    last_review_date = Column(String)   # YYYY-MM-DD of the latest review day
+    updated_at       = Column(DateTime, default=_utcnow, onupdate=_utcnow)
+
 
 # â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•
 # Concept Tracking Models
@@ -267,11 +323,20 @@ class TrackedConcept(Base):
     # AWFC fields â€” attention at time of first learning
     attention_at_encoding = Column(Float, default=50.0)   # 0â€“100 scale
     lambda_personalised   = Column(Float, default=0.1)    # personalised decay rate
+    calibrated_review_count = Column(Integer)             # review_count at the last bulk refit
 
     # Relationship
     encounters = relationship("ConceptEncounter", back_populates="tracked_concept",
                               cascade="all, delete-orphan", passive_deletes=True)
 
+    __table_args__ = (
+        # get_due_concepts: walked in ORDER BY order with next_review checked
+        # in the index, so LIMIT stops early and only the returned rows are
+        # read; archived concepts are left out of the index (migration 016).
+        Index("ix_tracked_concepts_due", relevance_score.desc(), next_review,
+              sqlite_where=status != 'archived'),
+    )
+
 
 class ConceptEncounter(Base):
     __tablename__ = "concept_encounters"
@@ -279,12 +344,20 @@ class ConceptEncounter(Base):
     id              = Column(Integer, primary_key=True, autoincrement=True)
     concept         = Column(String,
                              ForeignKey("tracked_concepts.concept", ondelete="CASCADE"),
-                             nullable=False, index=True)
-    timestamp       = Column(DateTime, default=_utcnow, nullable=False, index=True)
+                             nullable=False)
+    timestamp       = Column(DateTime, default=_utcnow, nullable=False)
     source          = Column(String)   # 'ocr' | 'browser_extension' | 'manual'
     confidence      = Column(Float, default=1.0)
     context_snippet = Column(String)
 
+    # Composite indexes replace the single-column concept / timestamp ones
+    # (migration 016): (concept, timestamp) serves concept history and the
+    # FK cascade; (timestamp, concept) covers the session-concepts scan.
+    __table_args__ = (
+        Index("ix_concept_encounters_concept_timestamp", "concept", "timestamp"),
+        Index("ix_concept_encounters_timestamp_concept", "timestamp", "concept"),
+    )
+
     tracked_concept = relationship("TrackedConcept", back_populates="encounters")
 
 
@@ -362,3 +435,51 @@ class FeedbackTrainingSample(Base):
     window_title    = Column(String, default="")
     used_in_training = Column(Integer, default=0, nullable=False)
 
+
+# --- Retention rollups (db/retention.py) -------------------------------------
+# Raw log rows past their retention horizon are folded into these per-day
+# aggregates and deleted. Days are 'YYYY-MM-DD' keys like daily_summary.date.
+
+class ConceptDailyRollup(Base):
+    """Per-day, per-concept totals of compacted concept_encounters rows."""
+    __tablename__ = "concept_daily_rollup"
+
+    day            = Column(String, primary_key=True)
+    concept        = Column(String, primary_key=True)
+    encounters     = Column(Integer, default=0)
+    confidence_sum = Column(Float,   default=0.0)
+    first_seen     = Column(DateTime)
+    last_seen      = Column(DateTime)
+
+
+class IntentDailyRollup(Base):
+    """Per-day, per-intent totals of compacted intent_predictions rows."""
+    __tablename__ = "intent_daily_rollup"
+
+    day              = Column(String, primary_key=True)
+    intent           = Column(String, primary_key=True)
+    predictions      = Column(Integer, default=0)
+    confidence_sum   = Column(Float,   default=0.0)
+    feedback_correct = Column(Integer, default=0)
+    feedback_wrong   = Column(Integer, default=0)
+
+
+class ActivityDailyRollup(Base):
+    """Per-day, per-intent-label totals of compacted multi_modal_logs rows."""
+    __tablename__ = "activity_daily_rollup"
+
+    day             = Column(String, primary_key=True)
+    intent_label    = Column(String, primary_key=True)
+    samples         = Column(Integer, default=0)
+    attention_sum   = Column(Float,   default=0.0)
+    interaction_sum = Column(Float,   default=0.0)
+
+
+class ReviewDailyRollup(Base):
+    """Per-day totals of compacted review_history rows; DailySummaryRepository
+    and StreakRepository rebuilds read it alongside the raw table."""
+    __tablename__ = "review_daily_rollup"
+
+    day             = Column(String, primary_key=True)
+    reviews         = Column(Integer, default=0)
+    correct_reviews = Column(Integer, default=0)
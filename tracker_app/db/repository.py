@@ -2,12 +2,15 @@
 Data Access Object (DAO) / Repository Layer
 Abstracts SQLAlchemy models and query logic away from the business layer.
 """
-from typing import List, Optional, Tuple, Dict, Any
-from datetime import datetime
+import base64
+import json
+from typing import Iterator, List, Optional, Tuple, Dict, Any
+from datetime import date, datetime, timedelta
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import String, and_, case, exists, func, or_, select, text, tuple_, union
 
 from tracker_app.utils import utcnow as _utcnow
+from tracker_app.db.fts import CONCEPT_WEIGHTS, ITEM_WEIGHTS, RANK_WINDOW, match_query
 
 from tracker_app.db.models import (
     LearningItem, 
@@ -16,9 +19,30 @@ from tracker_app.db.models import (
     IntentPrediction,
     IntentAccuracy,
     FeedbackTrainingSample,
-    TrackedConcept
+    TrackedConcept,
+    ConceptEncounter,
+    DailySummary,
+    StreakState,
+    ConceptDailyRollup,
+    ReviewDailyRollup,
 )
 
+def encode_item_cursor(item: LearningItem) -> str:
+    """Opaque keyset cursor pointing just past `item` in (created_at, id) order."""
+    raw = json.dumps([item.created_at.isoformat(), item.id])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_item_cursor(cursor: str) -> Tuple[datetime, str]:
+    """Inverse of encode_item_cursor; raises ValueError on a malformed cursor."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, item_id = json.loads(raw)
+        return datetime.fromisoformat(created_at), str(item_id)
+    except (TypeError, ValueError, UnicodeDecodeError) as e:
+        raise ValueError("invalid cursor") from e
+
+
 class LearningRepository:
     """Repository for CRUD operations on learning items and their reviews."""
     
@@ -38,6 +62,15 @@ class LearningRepository:
     @staticmethod
     def get_all_items(db: Session) -> List[LearningItem]:
         return db.query(LearningItem).all()
+
+    @staticmethod
+    def iter_all_items(db: Session, batch_size: int = 200) -> Iterator[LearningItem]:
+        """Stream every item in primary-key order, `batch_size` rows per fetch.
+
+        Walks the primary-key index, so no sort is materialised and memory
+        stays at one batch however large the deck is."""
+        return db.query(LearningItem).order_by(LearningItem.id)\
+                 .yield_per(batch_size)
         
     @staticmethod
     def get_total_count(db: Session) -> int:
@@ -101,62 +134,63 @@ class LearningRepository:
         from `review_history`, items added from `learning_items.created_at`,
         mastery from the first review where the stored mastery rule holds, and
         due items from `next_review_date`. Nothing is simulated.
+
+        Two statements regardless of history length: one UNION ALL of
+        GROUP BY date(...) aggregates restricted to the window (reviews,
+        additions, due), and one window-function pass computing the mastery
+        day for the mastered items that could land in the window.
         """
-        from datetime import timedelta
+        from sqlalchemy import literal, union_all
 
         today = _utcnow().date()
-        dates = [today - timedelta(days=i) for i in range(days - 1, -1, -1)]
-        by_day = {d: {"date": d.isoformat(), "reviews": 0, "correct": 0,
-                      "added": 0, "mastered": 0, "due": 0} for d in dates}
+        first_day = today - timedelta(days=days - 1)
+        start = datetime.combine(first_day, datetime.min.time())
+        end = datetime.combine(today + timedelta(days=1), datetime.min.time())
+        by_day = {}
+        for i in range(days):
+            d = (first_day + timedelta(days=i)).isoformat()
+            by_day[d] = {"date": d, "reviews": 0, "correct": 0,
+                         "added": 0, "mastered": 0, "due": 0}
 
-        reviews = db.query(ReviewHistory.timestamp, ReviewHistory.quality_rating).all()
-        for ts, quality in reviews:
-            if ts is None:
-                continue
-            day = ts.date()
+        is_correct = case((ReviewHistory.quality_rating >= 3, 1), else_=0)
+        review_day = func.date(ReviewHistory.timestamp)
+        created_day = func.date(LearningItem.created_at)
+        due_day = func.date(LearningItem.next_review_date)
+        per_day = union_all(
+            select(literal("reviews"), review_day, func.count(), func.sum(is_correct))
+            .where(ReviewHistory.timestamp >= start, ReviewHistory.timestamp < end)
+            .group_by(review_day),
+            select(literal("added"), created_day, func.count(), literal(0))
+            .where(LearningItem.created_at >= start, LearningItem.created_at < end)
+            .group_by(created_day),
+            select(literal("due"), due_day, func.count(), literal(0))
+            .where(LearningItem.status == "active",
+                   LearningItem.next_review_date >= start,
+                   LearningItem.next_review_date < end)
+            .group_by(due_day),
+        )
+        for kind, day, n, correct in db.execute(per_day):
             if day in by_day:
-                by_day[day]["reviews"] += 1
-                if quality is not None and quality >= 3:
-                    by_day[day]["correct"] += 1
-
-        items = db.query(
-            LearningItem.id,
-            LearningItem.created_at,
-            LearningItem.status,
-            LearningItem.next_review_date,
-        ).all()
-        for item_id, created, status, next_review in items:
-            if created is not None and created.date() in by_day:
-                by_day[created.date()]["added"] += 1
-            if status == "active" and next_review is not None and next_review.date() in by_day:
-                by_day[next_review.date()]["due"] += 1
-
-        for item_id, created, status, _next in items:
-            if status != "mastered":
+                by_day[day][kind] += n
+                if kind == "reviews":
+                    by_day[day]["correct"] += correct or 0
+
+        # A mastery day can only fall in the window for items reviewed or
+        # created inside it, so only those items' histories are scanned.
+        reviewed_in_window = exists().where(
+            ReviewHistory.item_id == LearningItem.id,
+            ReviewHistory.timestamp >= start,
+            ReviewHistory.timestamp < end,
+        )
+        mastery = LearningRepository.mastery_days_select(
+            or_(reviewed_in_window,
+                and_(LearningItem.created_at >= start, LearningItem.created_at < end)))
+        for created, reached, last_review in db.execute(mastery):
+            when = reached or last_review or created
+            if when is None:
                 continue
-            item_reviews = (
-                db.query(ReviewHistory.timestamp, ReviewHistory.quality_rating)
-                .filter(ReviewHistory.item_id == item_id)
-                .order_by(ReviewHistory.timestamp.asc())
-                .all()
-            )
-            if not item_reviews:
-                day = created.date() if created is not None else None
-            else:
-                total = correct = 0
-                day = None
-                for ts, quality in item_reviews:
-                    if ts is None:
-                        continue
-                    total += 1
-                    if quality is not None and quality >= 3:
-                        correct += 1
-                    if total > 5 and (correct / total) > 0.95:
-                        day = ts.date()
-                        break
-                if day is None:
-                    day = item_reviews[-1][0].date()
-            if day is not None and day in by_day:
+            day = when.date().isoformat()
+            if day in by_day:
                 by_day[day]["mastered"] += 1
 
         out = list(by_day.values())
@@ -166,23 +200,152 @@ class LearningRepository:
         return out
 
     @staticmethod
-    def search_items(db: Session, query: str) -> List[LearningItem]:
-        from sqlalchemy import or_
-        search_term = f"%{query}%"
-        return db.query(LearningItem).filter(
-            LearningItem.status == "active",
-            or_(
+    def count_due_by_day(db: Session, end: datetime) -> Dict[str, int]:
+        """Active items due before `end`, counted per UTC day ('YYYY-MM-DD').
+
+        One GROUP BY date(next_review_date) over a range scan of the
+        next_review_date index; past days are the overdue backlog."""
+        due_day = func.date(LearningItem.next_review_date)
+        rows = db.execute(
+            select(due_day, func.count())
+            .where(LearningItem.status == "active",
+                   LearningItem.next_review_date < end)
+            .group_by(due_day)
+        )
+        return {day: n for day, n in rows}
+
+    @staticmethod
+    def mastery_days_select(*item_filters):
+        """Select (created_at, reached_at, last_review_at) per mastered item.
+
+        reached_at is the timestamp of the first review at which the running
+        record satisfies the stored mastery rule (more than 5 reviews,
+        accuracy > 95%), computed with one window-function pass. An item's
+        mastery day is reached_at, else its last review, else its creation.
+        `item_filters` further restrict which learning_items are scanned.
+        """
+        is_correct = case((ReviewHistory.quality_rating >= 3, 1), else_=0)
+        candidates = (
+            select(LearningItem.id, LearningItem.created_at)
+            .where(LearningItem.status == "mastered", *item_filters)
+            .subquery()
+        )
+        running_window = dict(
+            partition_by=ReviewHistory.item_id,
+            order_by=(ReviewHistory.timestamp, ReviewHistory.id),
+            rows=(None, 0),
+        )
+        running = (
+            select(
+                ReviewHistory.item_id.label("item_id"),
+                ReviewHistory.timestamp.label("ts"),
+                func.count().over(**running_window).label("total"),
+                func.sum(is_correct).over(**running_window).label("correct"),
+            )
+            .where(ReviewHistory.item_id.in_(select(candidates.c.id)))
+            .subquery()
+        )
+        # correct/total > 0.95 in integers: 20*correct > 19*total.
+        reached_at = case(
+            (and_(running.c.total > 5, running.c.correct * 20 > running.c.total * 19),
+             running.c.ts))
+        return (
+            select(candidates.c.created_at, func.min(reached_at), func.max(running.c.ts))
+            .select_from(candidates)
+            .outerjoin(running, running.c.item_id == candidates.c.id)
+            .group_by(candidates.c.id, candidates.c.created_at)
+        )
+
+    @staticmethod
+    def _page(q, limit: int, cursor: Optional[str]) -> Tuple[List[LearningItem], Optional[str]]:
+        """Newest-first keyset page of `q` after `cursor`.
+
+        Fetches one extra row to learn whether another page exists; the
+        (created_at, id) row-value comparison keeps ties on created_at stable."""
+        if cursor:
+            created_at, item_id = decode_item_cursor(cursor)
+            q = q.filter(tuple_(LearningItem.created_at, LearningItem.id)
+                         < tuple_(created_at, item_id))
+        rows = q.order_by(LearningItem.created_at.desc(), LearningItem.id.desc())\
+                .limit(limit + 1).all()
+        if len(rows) > limit:
+            return rows[:limit], encode_item_cursor(rows[limit - 1])
+        return rows, None
+
+    @staticmethod
+    def search_items(db: Session, query: str, limit: int = 50,
+                     cursor: Optional[str] = None) -> Tuple[List[LearningItem], Optional[str]]:
+        q = db.query(LearningItem).filter(LearningItem.status == "active")
+        match = match_query(query)
+        if match:
+            # FTS5 prefix match (migration 019) instead of a LIKE table scan.
+            q = q.filter(LearningItem.id.in_(
+                text("SELECT item_id FROM learning_items_fts WHERE learning_items_fts MATCH :match")
+                .bindparams(match=match).columns(item_id=String)))
+        else:
+            # Nothing indexable (punctuation only): plain substring match.
+            search_term = f"%{query}%"
+            q = q.filter(or_(
                 LearningItem.question.like(search_term),
                 LearningItem.answer.like(search_term)
-            )
-        ).order_by(LearningItem.created_at.desc()).all()
+            ))
+        return LearningRepository._page(q, limit, cursor)
 
     @staticmethod
-    def get_items(db: Session, status: str = 'active', limit: int = 50) -> List[LearningItem]:
+    def get_items(db: Session, status: str = 'active', limit: int = 50,
+                  cursor: Optional[str] = None) -> Tuple[List[LearningItem], Optional[str]]:
         q = db.query(LearningItem)
         if status != 'all':
             q = q.filter(LearningItem.status == status)
-        return q.order_by(LearningItem.created_at.desc()).limit(limit).all()
+        return LearningRepository._page(q, limit, cursor)
+
+
+class SearchRepository:
+    """BM25-ranked full-text search over the FTS5 indexes (db/fts.py).
+
+    Results come best match first, each with a positive `score`: the
+    negated bm25() rank, so higher is better."""
+
+    @staticmethod
+    def _rank(db: Session, table: str, key: str, weights, match: str,
+              limit: int) -> List[Tuple[str, float]]:
+        # Past RANK_WINDOW matches, rank only the newest ones (rowid range).
+        floor = db.execute(text(
+            f"SELECT rowid FROM {table} WHERE {table} MATCH :match "
+            "ORDER BY rowid DESC LIMIT 1 OFFSET :window"
+        ), {'match': match, 'window': RANK_WINDOW - 1}).scalar() or 0
+        w = ", ".join(str(x) for x in weights)
+        return [(k, -rank) for k, rank in db.execute(text(
+            f"SELECT {key}, bm25({table}, {w}) AS rank FROM {table} "
+            f"WHERE {table} MATCH :match AND rowid >= :floor ORDER BY rank LIMIT :limit"
+        ), {'match': match, 'floor': floor, 'limit': limit})]
+
+    @staticmethod
+    def search_items(db: Session, query: str, limit: int = 20) -> List[Tuple[LearningItem, float]]:
+        """Non-archived items matching `query` (archived ones are not indexed)."""
+        match = match_query(query)
+        if not match:
+            return []
+        ranked = SearchRepository._rank(db, "learning_items_fts", "item_id",
+                                        ITEM_WEIGHTS, match, limit)
+        if not ranked:
+            return []
+        items = {item.id: item for item in
+                 db.query(LearningItem).filter(LearningItem.id.in_([k for k, _ in ranked]))}
+        return [(items[k], score) for k, score in ranked if k in items]
+
+    @staticmethod
+    def search_concepts(db: Session, query: str, limit: int = 20) -> List[Tuple[TrackedConcept, float]]:
+        match = match_query(query)
+        if not match:
+            return []
+        ranked = SearchRepository._rank(db, "tracked_concepts_fts", "concept",
+                                        CONCEPT_WEIGHTS, match, limit)
+        if not ranked:
+            return []
+        concepts = {c.concept: c for c in
+                    db.query(TrackedConcept).filter(TrackedConcept.concept.in_([k for k, _ in ranked]))}
+        return [(concepts[k], score) for k, score in ranked if k in concepts]
 
 
 class TrackingRepository:
@@ -198,6 +361,19 @@ class TrackingRepository:
         db.add(prediction)
         db.commit()
         db.refresh(prediction)
+
+    @staticmethod
+    def log_intent_predictions(db: Session, predictions: List[IntentPrediction]) -> List[int]:
+        """Insert a batch of predictions in one transaction and return their ids.
+
+        The ids are read after the flush, before commit expires the rows, so
+        no per-row refresh SELECT is needed.
+        """
+        db.add_all(predictions)
+        db.flush()
+        ids = [p.id for p in predictions]
+        db.commit()
+        return ids
         
     @staticmethod
     def get_intent_prediction(db: Session, prediction_id: int) -> Optional[IntentPrediction]:
@@ -293,6 +469,309 @@ class TrackingRepository:
             'avg_attention_score': row[3] or 0
         }
 
+class DailySummaryRepository:
+    """Incrementally maintained per-day rollup (``daily_summary``).
+
+    Write paths (review, item creation, concept encounter, session log) call
+    bump() inside their own transaction, so the counters commit or roll back
+    with the row they count. Dashboard stats then read one row per day
+    instead of re-aggregating raw history. rebuild() recomputes the counters
+    from the raw tables for backfill and repair.
+    """
+
+    COUNTERS = (
+        "sessions", "total_tracking_minutes", "concepts_encountered", "attention_sum",
+        "reviews", "correct_reviews", "items_added", "items_mastered", "concepts_seen",
+    )
+
+    @staticmethod
+    def day_key(when) -> str:
+        return when.strftime("%Y-%m-%d")
+
+    @staticmethod
+    def bump(db: Session, when, **deltas) -> None:
+        """Add `deltas` to the counters of `when`'s day. The caller commits."""
+        from sqlalchemy.dialects.sqlite import insert
+
+        unknown = set(deltas) - set(DailySummaryRepository.COUNTERS)
+        if unknown:
+            raise ValueError(f"Unknown daily_summary counters: {sorted(unknown)}")
+        values = dict.fromkeys(DailySummaryRepository.COUNTERS, 0)
+        values.update(deltas)
+        if values["sessions"]:
+            values["avg_attention"] = values["attention_sum"] / values["sessions"]
+        stmt = insert(DailySummary).values(date=DailySummaryRepository.day_key(when), **values)
+
+        col = DailySummary.__table__.c
+        new = {name: func.coalesce(col[name], 0) + stmt.excluded[name] for name in deltas}
+        if "sessions" in deltas:
+            sessions = func.coalesce(col.sessions, 0) + stmt.excluded.sessions
+            attention = func.coalesce(col.attention_sum, 0) + stmt.excluded.attention_sum
+            new["avg_attention"] = case((sessions > 0, attention * 1.0 / sessions),
+                                        else_=col.avg_attention)
+        db.execute(stmt.on_conflict_do_update(index_elements=[col.date], set_=new))
+
+    @staticmethod
+    def get_days(db: Session, first_day: date, last_day: Optional[date] = None) -> Dict[str, Dict[str, Any]]:
+        """Counters keyed by 'YYYY-MM-DD' for first_day..last_day (open-ended if None)."""
+        q = db.query(DailySummary).filter(
+            DailySummary.date >= DailySummaryRepository.day_key(first_day))
+        if last_day is not None:
+            q = q.filter(DailySummary.date <= DailySummaryRepository.day_key(last_day))
+        return {
+            row.date: {name: getattr(row, name) or 0 for name in DailySummaryRepository.COUNTERS}
+            for row in q.all()
+        }
+
+    @staticmethod
+    def _day(db: Session, day: date) -> Dict[str, Any]:
+        return DailySummaryRepository.get_days(db, day, day).get(
+            DailySummaryRepository.day_key(day),
+            dict.fromkeys(DailySummaryRepository.COUNTERS, 0))
+
+    @staticmethod
+    def get_learning_today(db: Session) -> Dict[str, Any]:
+        """Rollup-backed equivalent of LearningRepository.get_learning_today."""
+        today = DailySummaryRepository._day(db, _utcnow().date())
+        total, correct = today["reviews"], today["correct_reviews"]
+        return {
+            'reviews_today': total,
+            'correct_today': correct,
+            'accuracy_today': (correct / total * 100) if total else 0,
+            'concepts_studied': today["concepts_seen"],
+        }
+
+    @staticmethod
+    def get_daily_summary(db: Session, date: Optional[datetime] = None) -> Dict[str, Any]:
+        """Rollup-backed equivalent of TrackingRepository.get_daily_summary."""
+        if date is None:
+            date = _utcnow()
+        day = DailySummaryRepository._day(db, date.date() if isinstance(date, datetime) else date)
+        return {
+            'date': date.strftime("%Y-%m-%d"),
+            'total_minutes': day["total_tracking_minutes"],
+            'concepts': day["concepts_encountered"],
+            'avg_attention': (day["attention_sum"] / day["sessions"]) if day["sessions"] else 0,
+        }
+
+    @staticmethod
+    def get_trend_analysis(db: Session, days: int = 7) -> Dict[str, Any]:
+        """Rollup-backed equivalent of TrackingRepository.get_trend_analysis.
+
+        The window starts at an arbitrary time of day (now - days), so the
+        whole days after it come from the rollup and only the partial first
+        day is aggregated from tracking_sessions.
+        """
+        cutoff = _utcnow() - timedelta(days=days)
+        next_midnight = datetime.combine(cutoff.date() + timedelta(days=1), datetime.min.time())
+
+        head = db.query(
+            func.count(TrackingSession.id),
+            func.sum(TrackingSession.duration_minutes),
+            func.sum(TrackingSession.concepts_encountered),
+            func.sum(TrackingSession.avg_attention),
+        ).filter(
+            TrackingSession.start_time >= cutoff,
+            TrackingSession.start_time < next_midnight,
+        ).first()
+        sessions = head[0] or 0
+        minutes = head[1] or 0
+        concepts = head[2] or 0
+        attention = head[3] or 0
+        for day in DailySummaryRepository.get_days(db, next_midnight.date()).values():
+            sessions += day["sessions"]
+            minutes += day["total_tracking_minutes"]
+            concepts += day["concepts_encountered"]
+            attention += day["attention_sum"]
+
+        return {
+            'tracking_days': sessions,
+            'avg_session_minutes': (minutes / sessions) if sessions else 0,
+            'total_concepts_encountered': concepts,
+            'avg_attention_score': (attention / sessions) if sessions else 0,
+        }
+
+    @staticmethod
+    def rebuild(db: Session, since: Optional[date] = None) -> int:
+        """Recompute the rollup from the raw tables for days >= `since`
+        (every day when None). The caller commits. Returns rows written.
+
+        items_mastered is re-derived from each mastered item's mastery day
+        (LearningRepository.mastery_days_select), while bump() counts status
+        transitions as they happen; the two agree unless an item was demoted
+        and re-mastered.
+
+        Days whose raw review / encounter rows were compacted by
+        db/retention.py are taken from review_daily_rollup and
+        concept_daily_rollup instead (compaction moves whole days, so the
+        two sources never overlap).
+        """
+        start = datetime.combine(since, datetime.min.time()) if since else None
+
+        def _in_range(column):
+            return [column >= start] if start is not None else []
+
+        def _in_range_day(column):
+            return [column >= DailySummaryRepository.day_key(since)] if since is not None else []
+
+        rows: Dict[str, Dict[str, Any]] = {}
+
+        def _add(day, **values):
+            if day is None:
+                return
+            row = rows.setdefault(day, dict.fromkeys(DailySummaryRepository.COUNTERS, 0))
+            for name, value in values.items():
+                row[name] += value or 0
+
+        review_day = func.date(ReviewHistory.timestamp)
+        for day, n, correct in (
+            db.query(review_day, func.count(),
+                     func.sum(case((ReviewHistory.quality_rating >= 3, 1), else_=0)))
+            .filter(*_in_range(ReviewHistory.timestamp))
+            .group_by(review_day)
+        ):
+            _add(day, reviews=n, correct_reviews=correct)
+        for day, n, correct in (
+            db.query(ReviewDailyRollup.day, ReviewDailyRollup.reviews,
+                     ReviewDailyRollup.correct_reviews)
+            .filter(*_in_range_day(ReviewDailyRollup.day))
+        ):
+            _add(day, reviews=n, correct_reviews=correct)
+
+        created_day = func.date(LearningItem.created_at)
+        for day, n in (db.query(created_day, func.count())
+                         .filter(*_in_range(LearningItem.created_at))
+                         .group_by(created_day)):
+            _add(day, items_added=n)
+
+        seen_day = func.date(ConceptEncounter.timestamp)
+        for day, n in (db.query(seen_day, func.count(func.distinct(ConceptEncounter.concept)))
+                         .filter(*_in_range(ConceptEncounter.timestamp))
+                         .group_by(seen_day)):
+            _add(day, concepts_seen=n)
+        for day, n in (db.query(ConceptDailyRollup.day, func.count())
+                         .filter(*_in_range_day(ConceptDailyRollup.day))
+                         .group_by(ConceptDailyRollup.day)):
+            _add(day, concepts_seen=n)
+
+        session_day = func.date(TrackingSession.start_time)
+        for day, n, minutes, concepts, attention in (
+            db.query(session_day, func.count(TrackingSession.id),
+                     func.sum(TrackingSession.duration_minutes),
+                     func.sum(TrackingSession.concepts_encountered),
+                     func.sum(TrackingSession.avg_attention))
+            .filter(*_in_range(TrackingSession.start_time))
+            .group_by(session_day)
+        ):
+            _add(day, sessions=n, total_tracking_minutes=minutes,
+                 concepts_encountered=concepts, attention_sum=attention)
+
+        for created, reached, last_review in db.execute(LearningRepository.mastery_days_select()):
+            when = reached or last_review or created
+            if when is not None and (start is None or when >= start):
+                _add(DailySummaryRepository.day_key(when), items_mastered=1)
+
+        q = db.query(DailySummary)
+        if since is not None:
+            q = q.filter(DailySummary.date >= DailySummaryRepository.day_key(since))
+        q.delete(synchronize_session=False)
+        for day, values in rows.items():
+            db.add(DailySummary(
+                date=day,
+                avg_attention=(values["attention_sum"] / values["sessions"]) if values["sessions"] else None,
+                **values,
+            ))
+        return len(rows)
+
+    @staticmethod
+    def backfill_if_empty(db: Session) -> int:
+        """Rebuild (and commit) the rollup once when it has never been populated."""
+        if db.query(DailySummary.date).first() is not None:
+            return 0
+        written = DailySummaryRepository.rebuild(db)
+        db.commit()
+        return written
+
+class StreakRepository:
+    """O(1) review streak: one ``streak_state`` row advanced per review day.
+
+    The streak counts consecutive days with at least one review, ending
+    today, or yesterday when today has no review yet. rebuild() re-derives
+    the row from review_history for repair and first-time seeding.
+    """
+
+    ROW_ID = 1
+
+    @staticmethod
+    def record_review_day(db: Session, when) -> None:
+        """Advance the streak for a review at `when`. The caller commits."""
+        day = when.date() if isinstance(when, datetime) else when
+        state = db.get(StreakState, StreakRepository.ROW_ID)
+        if state is None:
+            state = StreakState(id=StreakRepository.ROW_ID, current_streak=0)
+            db.add(state)
+        last = date.fromisoformat(state.last_review_date) if state.last_review_date else None
+        if last is not None and day <= last:
+            return  # same day (or a clock step backwards): nothing to advance
+        if last is not None and day - last == timedelta(days=1):
+            state.current_streak = (state.current_streak or 0) + 1
+        else:
+            state.current_streak = 1
+        state.last_review_date = day.isoformat()
+
+    @staticmethod
+    def get_current_streak(db: Session, today: Optional[date] = None) -> int:
+        state = db.get(StreakState, StreakRepository.ROW_ID)
+        if state is None or not state.last_review_date:
+            return 0
+        today = today or _utcnow().date()
+        last = date.fromisoformat(state.last_review_date)
+        return (state.current_streak or 0) if (today - last).days in (0, 1) else 0
+
+    @staticmethod
+    def rebuild(db: Session) -> int:
+        """Recompute the state row from review_history (plus the days
+        compacted into review_daily_rollup). The caller commits.
+
+        Walks distinct review days newest-first and stops at the first gap,
+        so the scan is proportional to the streak, not the history.
+        """
+        review_days = union(
+            select(func.date(ReviewHistory.timestamp).label("day"))
+            .where(ReviewHistory.timestamp.isnot(None)),
+            select(ReviewDailyRollup.day.label("day")),
+        ).subquery()
+        days = db.execute(select(review_days.c.day).order_by(review_days.c.day.desc())
+                            .execution_options(yield_per=64))
+        last = None
+        streak = 0
+        for (day_str,) in days:
+            day = date.fromisoformat(day_str)
+            if last is None:
+                last, expected = day, day
+            if day != expected:
+                break
+            streak += 1
+            expected = day - timedelta(days=1)
+
+        state = db.get(StreakState, StreakRepository.ROW_ID)
+        if state is None:
+            state = StreakState(id=StreakRepository.ROW_ID)
+            db.add(state)
+        state.current_streak = streak
+        state.last_review_date = last.isoformat() if last else None
+        return streak
+
+    @staticmethod
+    def backfill_if_missing(db: Session) -> bool:
+        """Seed (and commit) the state row once on databases that predate it."""
+        if db.get(StreakState, StreakRepository.ROW_ID) is not None:
+            return False
+        StreakRepository.rebuild(db)
+        db.commit()
+        return True
+
+
 class FeedbackRepository:
     """Repository for machine learning feedback and retraining data."""
     
@@ -0,0 +1,302 @@
+"""Retention and compaction for the append-only log tables.
+
+concept_encounters (up to 15 rows per OCR cycle), intent_predictions (one per
+5 s tracking cycle), multi_modal_logs, review_history,
+feedback_training_samples and applied_reviews only ever grow. Each run of this module handles
+every table whose horizon is set (see RETENTION_* in config.py):
+
+  1. For each whole day older than the horizon, oldest first, it folds that
+     day's raw rows into the table's per-day rollup (models
+     *DailyRollup). It then deletes the rows and commits. One day per
+     transaction keeps the write lock short while the tracker is writing.
+     An interrupted run never counts a row twice.
+  2. It returns the freed pages to the filesystem with incremental VACUUM.
+     The first run converts the database to auto_vacuum=INCREMENTAL, which
+     needs one full VACUUM.
+  3. It runs PRAGMA optimize so the planner statistics follow the data.
+
+run_retention() returns a report with per-table counts and reclaimed bytes.
+The tracker runs it in a background thread (start_retention_worker).
+scripts/compact_history.py runs it on demand.
+"""
+
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import case, func, select
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.exc import OperationalError
+
+from tracker_app.config import (
+    RETENTION_ENABLED, RETENTION_INTERVAL_HOURS, RETENTION_ENCOUNTER_DAYS,
+    RETENTION_INTENT_DAYS, RETENTION_MULTIMODAL_DAYS, RETENTION_REVIEW_DAYS,
+    RETENTION_FEEDBACK_DAYS, RETENTION_APPLIED_REVIEW_DAYS, RETENTION_VACUUM_PAGES,
+)
+from tracker_app.db import models
+from tracker_app.db.models import (
+    ConceptEncounter, IntentPrediction, MultiModalLog, ReviewHistory, FeedbackTrainingSample,
+    AppliedReview,
+    ConceptDailyRollup, IntentDailyRollup, ActivityDailyRollup, ReviewDailyRollup,
+)
+from tracker_app.utils import utcnow as _utcnow
+
+logger = logging.getLogger("Retention")
+
+# sqlite auto_vacuum modes (PRAGMA auto_vacuum)
+_AUTO_VACUUM_INCREMENTAL = 2
+
+
+def _fold(db, model, columns, query, keys, sums=(), mins=(), maxs=()) -> None:
+    """INSERT ... SELECT `query` into `model`, adding onto an existing row for
+    the same key (a day rolled in two parts, e.g. rows that arrived late)."""
+    stmt = insert(model).from_select(columns, query)
+    col = model.__table__.c
+    new = {name: func.coalesce(col[name], 0) + stmt.excluded[name] for name in sums}
+    # Two-argument min()/max() are SQLite's scalar functions.
+    new.update({name: func.min(col[name], stmt.excluded[name]) for name in mins})
+    new.update({name: func.max(col[name], stmt.excluded[name]) for name in maxs})
+    db.execute(stmt.on_conflict_do_update(index_elements=[col[k] for k in keys], set_=new))
+
+
+def _fold_encounters(db, window) -> None:
+    ts = ConceptEncounter.timestamp
+    day = func.date(ts)
+    _fold(db, ConceptDailyRollup,
+          ["day", "concept", "encounters", "confidence_sum", "first_seen", "last_seen"],
+          select(day, ConceptEncounter.concept, func.count(),
+                 func.coalesce(func.sum(ConceptEncounter.confidence), 0.0),
+                 func.min(ts), func.max(ts))
+          .where(*window).group_by(day, ConceptEncounter.concept),
+          keys=("day", "concept"), sums=("encounters", "confidence_sum"),
+          mins=("first_seen",), maxs=("last_seen",))
+
+
+def _fold_intents(db, window) -> None:
+    day = func.date(IntentPrediction.timestamp)
+    intent = func.coalesce(IntentPrediction.predicted_intent, "unknown")
+    _fold(db, IntentDailyRollup,
+          ["day", "intent", "predictions", "confidence_sum", "feedback_correct", "feedback_wrong"],
+          select(day, intent, func.count(),
+                 func.coalesce(func.sum(IntentPrediction.confidence), 0.0),
+                 func.sum(case((IntentPrediction.user_feedback == 1, 1), else_=0)),
+                 func.sum(case((IntentPrediction.user_feedback == 0, 1), else_=0)))
+          .where(*window).group_by(day, intent),
+          keys=("day", "intent"),
+          sums=("predictions", "confidence_sum", "feedback_correct", "feedback_wrong"))
+
+
+def _fold_activity(db, window) -> None:
+    day = func.date(MultiModalLog.timestamp)
+    label = func.coalesce(MultiModalLog.intent_label, "unknown")
+    _fold(db, ActivityDailyRollup,
+          ["day", "intent_label", "samples", "attention_sum", "interaction_sum"],
+          select(day, label, func.count(),
+                 func.coalesce(func.sum(MultiModalLog.attention_score), 0.0),
+                 func.coalesce(func.sum(MultiModalLog.interaction_rate), 0.0))
+          .where(*window).group_by(day, label),
+          keys=("day", "intent_label"),
+          sums=("samples", "attention_sum", "interaction_sum"))
+
+
+def _fold_reviews(db, window) -> None:
+    day = func.date(ReviewHistory.timestamp)
+    _fold(db, ReviewDailyRollup,
+          ["day", "reviews", "correct_reviews"],
+          select(day, func.count(),
+                 func.sum(case((ReviewHistory.quality_rating >= 3, 1), else_=0)))
+          .where(*window).group_by(day),
+          keys=("day",), sums=("reviews", "correct_reviews"))
+
+
+class RetentionPolicy:
+    """How one log table is compacted: rows of `model` whose `timestamp`
+    is older than `horizon_days` (and match `filters`) are folded with
+    `fold` (None = deleted without a rollup) and removed."""
+
+    def __init__(self, table: str, model, timestamp, horizon_days: int,
+                 fold=None, filters=()):
+        self.table = table
+        self.model = model
+        self.timestamp = timestamp
+        self.horizon_days = int(horizon_days)
+        self.fold = fold
+        self.filters = tuple(filters)
+
+    def cutoff(self, now: datetime) -> Optional[datetime]:
+        """Midnight `horizon_days` ago, so only whole days are compacted.
+        None when the table is kept forever."""
+        if self.horizon_days <= 0:
+            return None
+        return datetime.combine((now - timedelta(days=self.horizon_days)).date(),
+                                datetime.min.time())
+
+
+def default_policies() -> List[RetentionPolicy]:
+    return [
+        RetentionPolicy("concept_encounters", ConceptEncounter, ConceptEncounter.timestamp,
+                        RETENTION_ENCOUNTER_DAYS, _fold_encounters),
+        RetentionPolicy("intent_predictions", IntentPrediction, IntentPrediction.timestamp,
+                        RETENTION_INTENT_DAYS, _fold_intents),
+        RetentionPolicy("multi_modal_logs", MultiModalLog, MultiModalLog.timestamp,
+                        RETENTION_MULTIMODAL_DAYS, _fold_activity),
+        RetentionPolicy("review_history", ReviewHistory, ReviewHistory.timestamp,
+                        RETENTION_REVIEW_DAYS, _fold_reviews),
+        # Unused samples are pending training data; only consumed ones go.
+        RetentionPolicy("feedback_training_samples", FeedbackTrainingSample,
+                        FeedbackTrainingSample.timestamp, RETENTION_FEEDBACK_DAYS,
+                        filters=(FeedbackTrainingSample.used_in_training == 1,)),
+        # Batch review ids only guard retries; past the retry window a
+        # replayed id is just a new review.
+        RetentionPolicy("applied_reviews", AppliedReview, AppliedReview.applied_at,
+                        RETENTION_APPLIED_REVIEW_DAYS),
+    ]
+
+
+def compact_table(db, policy: RetentionPolicy, now: datetime, dry_run: bool = False) -> Dict[str, Any]:
+    """Fold and delete `policy`'s rows past the horizon, one day per commit."""
+    cutoff = policy.cutoff(now)
+    result = {'horizon_days': policy.horizon_days,
+              'cutoff': cutoff.isoformat() if cutoff else None,
+              'days_compacted': 0, 'rows_deleted': 0}
+    if cutoff is None:
+        return result
+    ts = policy.timestamp
+    if dry_run:
+        result['rows_eligible'] = (db.query(func.count()).select_from(policy.model)
+                                     .filter(ts < cutoff, *policy.filters).scalar())
+        return result
+
+    day_col = func.date(ts)
+    days = [d for (d,) in db.query(day_col).filter(ts < cutoff, *policy.filters)
+                                           .distinct().order_by(day_col) if d]
+    for day in days:
+        start = datetime.strptime(day, "%Y-%m-%d")
+        window = (ts >= start, ts < min(start + timedelta(days=1), cutoff), *policy.filters)
+        if policy.fold is not None:
+            policy.fold(db, window)
+        deleted = db.query(policy.model).filter(*window).delete(synchronize_session=False)
+        db.commit()
+        result['days_compacted'] += 1
+        result['rows_deleted'] += deleted
+    return result
+
+
+def reclaim_space(engine=None, max_pages: int = RETENTION_VACUUM_PAGES) -> Dict[str, Any]:
+    """Incremental VACUUM + PRAGMA optimize; returns sizes before/after."""
+    engine = engine if engine is not None else models.get_engine()
+    with engine.connect() as conn:
+        conn = conn.execution_options(isolation_level="AUTOCOMMIT")
+        raw = conn.connection.driver_connection
+
+        def pragma(name):
+            return raw.execute(f"PRAGMA {name}").fetchone()[0]
+
+        page_size = pragma("page_size")
+        pages_before = pragma("page_count")
+        method = None
+        try:
+            if pragma("auto_vacuum") != _AUTO_VACUUM_INCREMENTAL:
+                # auto_vacuum only changes through a full VACUUM; done once,
+                # after that each run just frees what compaction released.
+                raw.execute("PRAGMA auto_vacuum=INCREMENTAL")
+                raw.execute("VACUUM")
+                method = 'full'
+            elif pragma("freelist_count"):
+                # executescript steps the PRAGMA to completion; execute()
+                # would free a single page.
+                arg = f"({int(max_pages)})" if max_pages > 0 else ""
+                raw.executescript(f"PRAGMA incremental_vacuum{arg};")
+                method = 'incremental'
+            raw.execute("PRAGMA optimize")
+        except Exception as e:
+            # Typically SQLITE_BUSY while the other process writes; the
+            # pages stay on the freelist for the next run.
+            logger.warning("Space reclaim skipped: %s", e)
+            method = 'skipped'
+        pages_after = pragma("page_count")
+        free_after = pragma("freelist_count")
+    return {
+        'method': method,
+        'size_before_bytes': pages_before * page_size,
+        'size_after_bytes': pages_after * page_size,
+        'reclaimed_bytes': max(0, pages_before - pages_after) * page_size,
+        'free_bytes': free_after * page_size,
+    }
+
+
+_last_report: Optional[Dict[str, Any]] = None
+_run_lock = threading.Lock()
+
+
+def get_last_report() -> Optional[Dict[str, Any]]:
+    return _last_report
+
+
+def run_retention(now: Optional[datetime] = None, dry_run: bool = False,
+                  vacuum: bool = True, policies: Optional[List[RetentionPolicy]] = None
+                  ) -> Dict[str, Any]:
+    """Compact every table past its horizon, then reclaim space."""
+    global _last_report
+    now = now or _utcnow()
+    started = time.perf_counter()
+    report = {'started_at': now.isoformat(), 'dry_run': dry_run, 'tables': {}, 'space': None}
+    with _run_lock:
+        for policy in (policies if policies is not None else default_policies()):
+            try:
+                with models.SessionLocal() as db:
+                    report['tables'][policy.table] = compact_table(db, policy, now, dry_run)
+            except OperationalError as e:
+                logger.warning("Compaction of %s stopped: %s", policy.table, e)
+                report['tables'][policy.table] = {'error': str(e)}
+        if vacuum and not dry_run:
+            report['space'] = reclaim_space()
+    report['duration_ms'] = round((time.perf_counter() - started) * 1000, 1)
+    if not dry_run:
+        _last_report = report
+        deleted = sum(t.get('rows_deleted', 0) for t in report['tables'].values())
+        reclaimed = (report['space'] or {}).get('reclaimed_bytes', 0)
+        logger.info("Retention run: %d rows compacted, %.1f MB reclaimed in %.0f ms",
+                    deleted, reclaimed / 1e6, report['duration_ms'])
+    return report
+
+
+class RetentionWorker:
+    """Daemon thread calling run_retention() every `interval_hours`."""
+
+    def __init__(self, interval_hours: float = RETENTION_INTERVAL_HOURS,
+                 first_run_delay: float = 300.0):
+        self.interval = max(60.0, interval_hours * 3600.0)
+        self.first_run_delay = first_run_delay
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self) -> "RetentionWorker":
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="fkt-retention", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self):
+        delay = self.first_run_delay
+        while not self._stop.wait(delay):
+            try:
+                run_retention()
+            except Exception as e:
+                logger.error("Retention run failed: %s", e)
+            delay = self.interval
+
+
+def start_retention_worker() -> Optional[RetentionWorker]:
+    """Start the background worker unless RETENTION_ENABLED is false."""
+    if not RETENTION_ENABLED:
+        return None
+    return RetentionWorker().start()
@@ -6,9 +6,10 @@ from typing import Dict, Any, List, Optional
 
 from tracker_app.utils import utcnow as _utcnow
 
-from tracker_app.config import DATA_DIR, DEFAULT_LAMBDA
+from tracker_app.config import DATA_DIR, DEFAULT_LAMBDA, DUE_QUEUE_ENABLED
 from tracker_app.db import models
 from tracker_app.db.models import TrackedConcept, ConceptEncounter, SessionLocal
+from tracker_app.learning.due_queue import concept_entry, concept_queue
 
 logger = logging.getLogger("ConceptScheduler")
 
@@ -54,7 +55,10 @@ class ConceptScheduler:
             logger.debug("Skipping implausible concept: %r", concept)
             return None
 
+        from tracker_app.db.repository import DailySummaryRepository
+
         now = _utcnow()
+        day_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
 
         with SessionLocal() as db:
             existing = (db.query(TrackedConcept)
@@ -89,6 +93,8 @@ class ConceptScheduler:
                         0.9 * (existing.lambda_personalised or DEFAULT_LAMBDA)
                         + 0.1 * attention_lambda
                     )
+                if existing.last_seen is None or existing.last_seen < day_start:
+                    DailySummaryRepository.bump(db, now, concepts_seen=1)
                 existing.last_seen       = now
                 existing.frequency_count = (existing.frequency_count or 0) + 1
                 existing.relevance_score = (
@@ -125,6 +131,7 @@ class ConceptScheduler:
                     lambda_personalised=lambda_p,
                 )
                 db.add(new_concept)
+                DailySummaryRepository.bump(db, now, concepts_seen=1)
 
             encounter = ConceptEncounter(
                 concept=concept,
@@ -134,7 +141,10 @@ class ConceptScheduler:
                 context_snippet=context[:200] if context else "",
             )
             db.add(encounter)
+            db.flush()
+            queue_entry = concept_entry(existing or new_concept)
             db.commit()
+        concept_queue.upsert(*queue_entry)
 
         # Keep the in-memory knowledge graph in step with the live SM-2/AWFC
         # row (Phase 11.2) â€” a re-encounter resets the retention clock.
@@ -159,10 +169,6 @@ class ConceptScheduler:
             logger.warning(f"schedule_next_review: quality must be 0-5, got {quality}")
             return
 
-        from tracker_app.learning.sm2_memory_model import (
-            MIN_EASE_FACTOR, MAX_EASE_FACTOR, QUALITY_THRESHOLD,
-            SECOND_REVIEW_INTERVAL_DAYS,
-        )
         with models.SessionLocal() as db:
             tracked = (db.query(TrackedConcept)
                          .filter(TrackedConcept.concept == concept_id)
@@ -172,65 +178,13 @@ class ConceptScheduler:
                 logger.warning(f"schedule_next_review: '{concept_id}' not found.")
                 return
 
-            interval    = getattr(tracked, "interval", 1) or 1
-            ease        = getattr(tracked, "memory_strength", 2.5) or 2.5
-            repetitions = getattr(tracked, "repetitions", 0) or 0
-
-            # Ease factor adjusts on every review (success AND failure) using
-            # the canonical SM-2 formula â€” the tested implementation applies it
-            # unconditionally, so we do too instead of the old flat -0.2.
-            from tracker_app.learning.sm2_memory_model import (
-                calculate_sm2_interval,
-            )
-            sm2_result = calculate_sm2_interval(
-                interval=interval,
-                ease_factor=ease,
-                repetitions=repetitions,
-                quality=quality,
-            )
-            new_interval = sm2_result['interval']
-            new_ease = sm2_result['ease_factor']
-            repetitions = sm2_result['repetitions']
-
-            tracked.interval        = new_interval
-            tracked.memory_strength = new_ease
-            tracked.repetitions     = repetitions
-            tracked.next_review     = _utcnow() + timedelta(days=new_interval)
-            # Recalibration needs the decay window since the PREVIOUS
-            # reinforcement, so snapshot last_seen before this review resets it.
-            prev_last_seen = tracked.last_seen
-            # A review is a reinforcement event: reset the retention clock so
-            # the AWFC memory score (and the graph's live copy) reflect the
-            # fresh recall rather than the last OCR encounter.
-            tracked.last_seen       = _utcnow()
-
-            # Cumulative review history (M-6): every schedule_next_review call
-            # is one quiz review, so review_count/correct_count give a true
-            # cumulative success rate for recalibration instead of the old
-            # "single rating / 5" approximation.
-            tracked.review_count  = (tracked.review_count or 0) + 1
-            if quality >= QUALITY_THRESHOLD:
-                tracked.correct_count = (tracked.correct_count or 0) + 1
-
-            # Recalibrate â•¬â•— from actual vs predicted recall after enough reviews.
-            review_count = tracked.review_count or 0
-            if review_count >= 5:
-                try:
-                    from tracker_app.learning.memory_model import recalibrate_lambda
-                    correct_rate = (tracked.correct_count or 0) / review_count
-                    tracked.lambda_personalised = recalibrate_lambda(
-                        concept_id,
-                        tracked.lambda_personalised or DEFAULT_LAMBDA,
-                        actual_success_rate=correct_rate,
-                        n_reviews=review_count,
-                        last_seen=prev_last_seen,
-                    )
-                except Exception as e:
-                    logger.debug(f"â•¬â•— recalibration skipped: {e}")
-
+            new_interval = self.apply_review(tracked, quality)
+            queue_entry = concept_entry(tracked)
+            lambda_p = tracked.lambda_personalised
             db.commit()
+            concept_queue.upsert(*queue_entry)
             logger.debug(f"Scheduled '{concept_id}' in {new_interval}d "
-                         f"(quality={quality}, â•¬â•—={tracked.lambda_personalised:.4f})")
+                         f"(quality={quality}, â•¬â•—={lambda_p:.4f})")
 
             # Reflect the fresh review in the knowledge graph (Phase 11.2).
             try:
@@ -239,12 +193,83 @@ class ConceptScheduler:
             except Exception as e:
                 logger.debug(f"Graph sync skipped for {concept_id}: {e}")
 
+    def apply_review(self, tracked: TrackedConcept, quality: int) -> int:
+        """Apply one SM-2 + AWFC review to a loaded row; the caller commits.
+
+        Shared by schedule_next_review and the batch review path, which
+        applies many ratings in one transaction. Returns the new interval
+        in days."""
+        interval    = getattr(tracked, "interval", 1) or 1
+        ease        = getattr(tracked, "memory_strength", 2.5) or 2.5
+        repetitions = getattr(tracked, "repetitions", 0) or 0
+
+        # Ease factor adjusts on every review (success AND failure) using
+        # the canonical SM-2 formula â€” the tested implementation applies it
+        # unconditionally, so we do too instead of the old flat -0.2.
+        from tracker_app.learning.sm2_memory_model import (
+            QUALITY_THRESHOLD, calculate_sm2_interval,
+        )
+        sm2_result = calculate_sm2_interval(
+            interval=interval,
+            ease_factor=ease,
+            repetitions=repetitions,
+            quality=quality,
+        )
+        new_interval = sm2_result['interval']
+        new_ease = sm2_result['ease_factor']
+        repetitions = sm2_result['repetitions']
+
+        tracked.interval        = new_interval
+        tracked.memory_strength = new_ease
+        tracked.repetitions     = repetitions
+        tracked.next_review     = _utcnow() + timedelta(days=new_interval)
+        # Recalibration needs the decay window since the PREVIOUS
+        # reinforcement, so snapshot last_seen before this review resets it.
+        prev_last_seen = tracked.last_seen
+        # A review is a reinforcement event: reset the retention clock so
+        # the AWFC memory score (and the graph's live copy) reflect the
+        # fresh recall rather than the last OCR encounter.
+        tracked.last_seen       = _utcnow()
+
+        # Cumulative review history (M-6): every schedule_next_review call
+        # is one quiz review, so review_count/correct_count give a true
+        # cumulative success rate for recalibration instead of the old
+        # "single rating / 5" approximation.
+        tracked.review_count  = (tracked.review_count or 0) + 1
+        if quality >= QUALITY_THRESHOLD:
+            tracked.correct_count = (tracked.correct_count or 0) + 1
+
+        # Recalibrate â•¬â•— from actual vs predicted recall after enough reviews.
+        review_count = tracked.review_count or 0
+        if review_count >= 5:
+            try:
+                from tracker_app.learning.memory_model import recalibrate_lambda
+                correct_rate = (tracked.correct_count or 0) / review_count
+                tracked.lambda_personalised = recalibrate_lambda(
+                    tracked.concept,
+                    tracked.lambda_personalised or DEFAULT_LAMBDA,
+                    actual_success_rate=correct_rate,
+                    n_reviews=review_count,
+                    last_seen=prev_last_seen,
+                )
+            except Exception as e:
+                logger.debug(f"â•¬â•— recalibration skipped: {e}")
+
+        return new_interval
+
     # Î“Ã¶Ã‡Î“Ã¶Ã‡ Get due concepts Î“Ã¶Ã‡Î“Ã¶Ã‡Î“Ã¶Ã‡Î“Ã¶Ã‡Î“Ã¶Ã‡Î“Ã¶Ã‡Î“Ã¶Ã‡Î“Ã¶Ã‡Î“Ã¶Ã‡Î“Ã¶Ã‡Î“Ã¶Ã‡Î“Ã¶Ã‡Î“Ã¶Ã‡Î“Ã¶Ã‡Î“Ã¶Ã‡Î“Ã¶Ã‡Î“Ã¶Ã‡Î“Ã¶Ã‡Î“Ã¶Ã‡Î“Ã¶Ã‡Î“Ã¶Ã‡Î“Ã¶Ã‡Î“Ã¶Ã‡Î“Ã¶Ã‡Î“Ã¶Ã‡Î“Ã¶Ã‡Î“Ã¶Ã‡Î“Ã¶Ã‡Î“Ã¶Ã‡Î“Ã¶Ã‡Î“Ã¶Ã‡Î“Ã¶Ã‡Î“Ã¶Ã‡Î“Ã¶Ã‡Î“Ã¶Ã‡Î“Ã¶Ã‡Î“Ã¶Ã‡Î“Ã¶Ã‡Î“Ã¶Ã‡Î“Ã¶Ã‡Î“Ã¶Ã‡Î“Ã¶Ã‡Î“Ã¶Ã‡Î“Ã¶Ã‡Î“Ã¶Ã‡Î“Ã¶Ã‡Î“Ã¶Ã‡Î“Ã¶Ã‡Î“Ã¶Ã‡Î“Ã¶Ã‡Î“Ã¶Ã‡Î“Ã¶Ã‡Î“Ã¶Ã‡
 
     def get_due_concepts(self, limit: int = 10) -> List[Dict[str, Any]]:
-        """Return concepts whose next_review is now or overdue."""
+        """Return concepts whose next_review is now or overdue.
+
+        Most relevant first, then earliest due. Served from the in-memory
+        due queue (learning/due_queue.py) unless DUE_QUEUE_ENABLED is off."""
         now = _utcnow()
 
+        if DUE_QUEUE_ENABLED:
+            return [{"id": name, "concept": name, **payload}
+                    for name, _, payload in concept_queue.due(now, limit)]
+
         with models.SessionLocal() as db:
             concepts = (
                 db.query(TrackedConcept)
@@ -0,0 +1,279 @@
+"""In-memory due queues for tracked concepts and learning items.
+
+get_due_concepts and get_items_due used to run an ORDER BY query against
+SQLite on every call, and export_tracking_data asks for 1000 due concepts
+every five minutes. Instead, each DueQueue loads its rows once and keeps
+them in two structures:
+
+- a min-heap of (next review time, id) for entries not yet due; a read
+  moves the entries that have come due off the heap, O(log n) each and
+  once per entry rather than once per read;
+- a sorted "ready" list of the entries already due, in the order callers
+  want them (relevance for concepts, due time for items), so a read of
+  the top N is a slice.
+
+The write paths (add_concept, schedule_next_review, record_review, and
+item add/archive/unarchive/delete) update the queue right after they
+commit. Rows written by another process, or by a path without a hook,
+are picked up by a full reload every DUE_QUEUE_RECONCILE_SECONDS, or at
+once for concepts the other process announces on the event bus. A
+queue also reloads when the session factory it was loaded from changes
+(tests and tools rebind the database).
+
+An update does not search the heap for the old entry. It pushes a new one
+under a fresh sequence number, and entries whose sequence no longer
+matches are dropped when they surface (lazy deletion). The heap is
+compacted when dead entries outnumber the live ones.
+"""
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+from bisect import bisect_left, insort
+from datetime import datetime
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+from tracker_app.config import DUE_QUEUE_RECONCILE_SECONDS
+from tracker_app.db import models
+from tracker_app.db.models import LearningItem, TrackedConcept
+from tracker_app.tracking import event_bus
+from tracker_app.utils import utcnow as _utcnow
+
+logger = logging.getLogger("DueQueue")
+
+# (id, due, payload) rows a loader yields for a full reload.
+Loader = Callable[[Any], Iterable[Tuple[Hashable, datetime, Any]]]
+# Sort key of a due entry in the ready list, from (due, payload).
+Rank = Callable[[datetime, Any], tuple]
+
+
+def _session_source():
+    """Identity of the session factory currently in use."""
+    return (models.SessionLocal, models._SessionLocal)
+
+
+def _by_due(due: datetime, payload: Any) -> tuple:
+    return (due,)
+
+
+class DueQueue:
+    """Ids by due time; due ones are read in `rank` order."""
+
+    def __init__(self, name: str, loader: Loader, rank: Rank = _by_due,
+                 reconcile_seconds: float = DUE_QUEUE_RECONCILE_SECONDS):
+        self.name = name
+        self._loader = loader
+        self._rank = rank
+        self.reconcile_seconds = reconcile_seconds
+        self._heap: List[Tuple[datetime, int, Hashable]] = []
+        self._ready: List[Tuple[tuple, int, Hashable]] = []
+        # id -> [due, seq, payload, its ready-list tuple or None]
+        self._live: Dict[Hashable, list] = {}
+        self._seq = itertools.count()
+        self._lock = threading.RLock()
+        self._loaded_at: Optional[float] = None
+        self._source = None
+        self._promoted_until: Optional[datetime] = None
+
+    def __len__(self) -> int:
+        return len(self._live)
+
+    # ── Loading ────────────────────────────────────────────────────────────
+
+    def reconcile(self) -> int:
+        """Reload every entry from the database; returns the entry count."""
+        source = _session_source()
+        with models.SessionLocal() as db:
+            rows = list(self._loader(db))
+        with self._lock:
+            self._live, self._heap, self._ready = {}, [], []
+            for key, due, payload in rows:
+                seq = next(self._seq)
+                self._live[key] = [due, seq, payload, None]
+                self._heap.append((due, seq, key))
+            heapq.heapify(self._heap)
+            self._promoted_until = None
+            self._loaded_at = time.monotonic()
+            self._source = source
+        logger.debug("%s queue reconciled: %d entries", self.name, len(rows))
+        return len(rows)
+
+    def invalidate(self) -> None:
+        """Drop the loaded state; the next read reloads."""
+        with self._lock:
+            self._loaded_at = None
+
+    def _ensure_current(self) -> None:
+        if (self._loaded_at is None
+                or self._source != _session_source()
+                or time.monotonic() - self._loaded_at >= self.reconcile_seconds):
+            self.reconcile()
+
+    # ── Write hooks ────────────────────────────────────────────────────────
+
+    def upsert(self, key: Hashable, due: Optional[datetime], payload: Any = None) -> None:
+        """Set `key` to fall due at `due`; a None due removes it.
+
+        A no-op until the queue is first loaded: the load reads the row."""
+        if due is None:
+            self.discard(key)
+            return
+        with self._lock:
+            if self._loaded_at is None:
+                return
+            self._unready(self._live.get(key))
+            seq = next(self._seq)
+            self._live[key] = [due, seq, payload, None]
+            heapq.heappush(self._heap, (due, seq, key))
+            self._maybe_compact()
+
+    def discard(self, key: Hashable) -> None:
+        with self._lock:
+            entry = self._live.pop(key, None)
+            if entry is not None:
+                self._unready(entry)
+                self._maybe_compact()
+
+    def _unready(self, entry: Optional[list]) -> None:
+        if entry is None or entry[3] is None:
+            return
+        i = bisect_left(self._ready, entry[3])
+        if i < len(self._ready) and self._ready[i] == entry[3]:
+            del self._ready[i]
+        entry[3] = None
+
+    def _maybe_compact(self) -> None:
+        if len(self._heap) > 2 * len(self._live) + 64:
+            self._heap = [(due, seq, key) for key, (due, seq, _, ready)
+                          in self._live.items() if ready is None]
+            heapq.heapify(self._heap)
+
+    # ── Reads ──────────────────────────────────────────────────────────────
+
+    def _promote(self, now: datetime) -> None:
+        """Move every entry due at `now` from the heap to the ready list."""
+        if self._promoted_until is not None and now < self._promoted_until:
+            # Asked about an earlier instant: hand the ready entries back.
+            for _, seq, key in self._ready:
+                entry = self._live[key]
+                entry[3] = None
+                heapq.heappush(self._heap, (entry[0], seq, key))
+            self._ready = []
+        heap, live, batch = self._heap, self._live, []
+        while heap and heap[0][0] <= now:
+            due, seq, key = heapq.heappop(heap)
+            entry = live.get(key)
+            if entry is not None and entry[1] == seq:
+                entry[3] = (self._rank(due, entry[2]), seq, key)
+                batch.append(entry[3])
+        if len(batch) > 32:
+            self._ready.extend(batch)
+            self._ready.sort()
+        else:
+            for item in batch:
+                insort(self._ready, item)
+        self._promoted_until = now
+
+    def _select(self, now: Optional[datetime], limit: Optional[int]):
+        self._ensure_current()
+        self._promote(now or _utcnow())
+        return self._ready if limit is None else self._ready[:limit]
+
+    def due(self, now: Optional[datetime] = None,
+            limit: Optional[int] = None) -> List[Tuple[Hashable, datetime, Any]]:
+        """(id, due, payload) of the entries due at `now`, in rank order."""
+        with self._lock:
+            out = []
+            for _, _, key in self._select(now, limit):
+                due, _, payload, _ = self._live[key]
+                out.append((key, due, payload))
+            return out
+
+    def pop_due(self, now: Optional[datetime] = None,
+                limit: Optional[int] = None) -> List[Tuple[Hashable, datetime, Any]]:
+        """Like due(), but removes the returned entries from the queue."""
+        with self._lock:
+            out = self.due(now, limit)
+            del self._ready[:len(out)]
+            for key, _, _ in out:
+                del self._live[key]
+            return out
+
+
+# ── Concepts ───────────────────────────────────────────────────────────────
+
+def concept_payload(c: TrackedConcept) -> Dict[str, Any]:
+    """The fields get_due_concepts returns, kept with each heap entry."""
+    return {
+        "encounter_count":       c.frequency_count,
+        "interval":              c.interval,
+        "relevance":             c.relevance_score,
+        "attention_at_encoding": c.attention_at_encoding,
+        "lambda_personalised":   c.lambda_personalised,
+    }
+
+
+def concept_entry(c: TrackedConcept) -> Tuple[str, Optional[datetime], Dict[str, Any]]:
+    """(id, due, payload) for a concept row; due is None when it never is."""
+    due = c.next_review if c.status != "archived" else None
+    return c.concept, due, concept_payload(c)
+
+
+def _load_concepts(db):
+    cols = (TrackedConcept.concept, TrackedConcept.next_review,
+            TrackedConcept.frequency_count, TrackedConcept.interval,
+            TrackedConcept.relevance_score, TrackedConcept.attention_at_encoding,
+            TrackedConcept.lambda_personalised)
+    rows = db.query(*cols).filter(TrackedConcept.status != "archived",
+                                  TrackedConcept.next_review.isnot(None))
+    for name, due, freq, interval, relevance, attention, lam in rows:
+        yield name, due, {
+            "encounter_count": freq, "interval": interval, "relevance": relevance,
+            "attention_at_encoding": attention, "lambda_personalised": lam,
+        }
+
+
+# ── Learning items ─────────────────────────────────────────────────────────
+
+def item_due(item: LearningItem) -> Optional[datetime]:
+    """When `item` falls due for the item queue; None if it never does."""
+    return item.next_review_date if item.status == "active" else None
+
+
+def _load_items(db):
+    rows = db.query(LearningItem.id, LearningItem.next_review_date)\
+             .filter(LearningItem.status == "active",
+                     LearningItem.next_review_date.isnot(None))
+    for item_id, due in rows:
+        yield item_id, due, None
+
+
+def _by_relevance(due: datetime, payload: Dict[str, Any]) -> tuple:
+    """get_due_concepts order: relevance desc (NULL last), then due."""
+    relevance = payload["relevance"]
+    return (relevance is None, -(relevance or 0.0), due)
+
+
+concept_queue = DueQueue("concepts", _load_concepts, rank=_by_relevance)
+item_queue = DueQueue("items", _load_items)
+
+
+def _refresh_external_concepts(data) -> None:
+    """CONCEPT_CAPTURED from the other process: reread just those rows."""
+    names = [c for c in (data or {}).get("concepts") or () if isinstance(c, str)]
+    if not names or concept_queue._loaded_at is None:
+        return
+    try:
+        with models.SessionLocal() as db:
+            rows = db.query(TrackedConcept).filter(TrackedConcept.concept.in_(names)).all()
+            entries = [concept_entry(row) for row in rows]
+    except Exception as e:
+        logger.debug("Concept queue refresh failed: %s", e)
+        return
+    for key, due, payload in entries:
+        concept_queue.upsert(key, due, payload)
+
+
+event_bus.subscribe(event_bus.CONCEPT_CAPTURED, _refresh_external_concepts, remote_only=True)
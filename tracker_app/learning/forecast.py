@@ -0,0 +1,101 @@
+"""Review-load forecast: how many reviews fall due on each of the next N days.
+
+get_items_due and get_due_concepts answer only "what is due now". The
+forecast projects the workload ahead of time, in two reads:
+
+- learning items: SM-2 next_review_date, counted per UTC day by one
+  GROUP BY over the next_review_date index;
+- tracked concepts: due at whichever comes first, the SM-2 next_review
+  or the instant their AWFC retention drops below MEMORY_THRESHOLD. The
+  crossing depends on per-concept decay, so no SQL index can bucket it.
+  Instead one column query loads every active concept into a
+  RetentionSnapshot, and np.bincount buckets the due instants by day.
+
+Anything due before today is reported once as the overdue backlog and is
+not spread over the days.
+"""
+
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+import numpy as np
+from sqlalchemy import func, select
+
+from tracker_app.config import MEMORY_THRESHOLD
+from tracker_app.learning.retention_engine import (
+    RetentionSnapshot,
+    _epoch_seconds,
+    sql_epoch_seconds,
+)
+from tracker_app.utils import utcnow as _utcnow
+
+MAX_FORECAST_DAYS = 90
+
+_DAY_SECONDS = 86400.0
+
+
+def concept_due_by_day(db, start: datetime, days: int,
+                       threshold: float = MEMORY_THRESHOLD) -> Dict[str, Any]:
+    """Active concepts due per day from `start`, plus the overdue count.
+
+    A concept is due at min(next_review, AWFC threshold crossing); a NULL
+    next_review leaves only the crossing."""
+    from tracker_app.db.models import TrackedConcept
+    seen = func.coalesce(TrackedConcept.last_seen, TrackedConcept.first_seen)
+    rows = db.execute(
+        select(
+            TrackedConcept.concept,
+            sql_epoch_seconds(seen),
+            TrackedConcept.attention_at_encoding,
+            TrackedConcept.lambda_personalised,
+            sql_epoch_seconds(TrackedConcept.next_review),
+        ).where(TrackedConcept.status != "archived")
+    ).all()
+    counts = np.zeros(days, dtype=np.int64)
+    if not rows:
+        return {"per_day": counts, "overdue": 0, "by_decay": 0}
+
+    names, seen_s, att, lam, next_review = zip(*rows)
+    snapshot = RetentionSnapshot(names, np.array(seen_s, dtype=float),
+                                 np.array(att, dtype=float), np.array(lam, dtype=float),
+                                 now=start)
+    sm2_due = np.array(next_review, dtype=float)
+    decay_due = snapshot.due_at(threshold)
+    due = np.fmin(sm2_due, decay_due)   # fmin: a NaN next_review defers to decay
+
+    offset = (due - _epoch_seconds(start)) / _DAY_SECONDS
+    overdue = offset < 0
+    in_window = ~overdue & (offset < days)
+    counts += np.bincount(offset[in_window].astype(np.int64), minlength=days)[:days]
+    # Concepts due by memory decay rather than their SM-2 date (NaN counts).
+    by_decay = int(np.count_nonzero(in_window & ~(sm2_due <= decay_due)))
+    return {"per_day": counts, "overdue": int(np.count_nonzero(overdue)),
+            "by_decay": by_decay}
+
+
+def review_forecast(db, days: int = 14, now: Optional[datetime] = None,
+                    threshold: float = MEMORY_THRESHOLD) -> Dict[str, Any]:
+    """Due items and concepts per UTC day for `days` days, starting today."""
+    from tracker_app.db.repository import LearningRepository
+    now = now or _utcnow()
+    start = datetime.combine(now.date(), datetime.min.time())
+    end = start + timedelta(days=days)
+    dates = [(start + timedelta(days=i)).date().isoformat() for i in range(days)]
+
+    item_counts = LearningRepository.count_due_by_day(db, end)
+    items_overdue = sum(n for day, n in item_counts.items() if day < dates[0])
+    concepts = concept_due_by_day(db, start, days, threshold)
+
+    per_day = []
+    for i, day in enumerate(dates):
+        n_items = item_counts.get(day, 0)
+        n_concepts = int(concepts["per_day"][i])
+        per_day.append({"date": day, "items": n_items, "concepts": n_concepts,
+                        "total": n_items + n_concepts})
+    return {
+        "days": per_day,
+        "overdue": {"items": items_overdue, "concepts": concepts["overdue"],
+                    "total": items_overdue + concepts["overdue"]},
+        "concepts_due_by_decay": concepts["by_decay"],
+        "threshold": threshold,
+    }
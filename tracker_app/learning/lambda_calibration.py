@@ -0,0 +1,240 @@
+"""Bulk recalibration of lambda_personalised for every reviewed concept.
+
+recalibrate_lambda in memory_model.py nudges one concept's lambda inside
+schedule_next_review, so a concept with plenty of review history that is
+not being quizzed keeps whatever decay rate it had at its last review.
+recalibrate_all_lambdas refits every concept with at least MIN_REVIEWS
+reviews, and new reviews since its last refit, in one pass:
+
+- one column query loads review_count, correct_count, attention and the
+  review timing (first_seen, last_seen, SM-2 interval);
+- the observed recall rate (correct + 0.5) / (reviews + 1) is compared
+  with the AWFC prediction exp(-lambda_p * t), where t is the concept's
+  mean gap between reinforcements;
+- lambda_p is fitted by damped Gauss-Newton steps over all concepts at
+  once, on a least-squares objective in log(lambda_p): the recall error
+  weighted by review count, plus PRIOR_WEIGHT (on the scale of MIN_REVIEWS
+  reviews) times the squared distance from the current value, and never
+  more than MAX_RUN_CHANGE away from it, so a handful of reviews cannot
+  throw lambda to a bound;
+- the fitted attention-damped rate is converted back to the stored base
+  lambda and written with one executemany UPDATE, together with the
+  review_count it was fitted at (calibrated_review_count). The UPDATE only
+  matches rows whose review_count is still the one read, so a review that
+  lands mid-run is not overwritten. A concept is refitted only once its
+  review_count moves past calibrated_review_count, so the same counts
+  never push lambda further run after run.
+
+The fit targets lambda_p, the rate the AWFC score actually decays at, and
+keeps within [LAMBDA_FLOOR, LAMBDA_CEIL] like the per-review path. The
+tracker runs it in a background thread (start_lambda_calibration_worker).
+"""
+
+import logging
+import math
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+import numpy as np
+from sqlalchemy import bindparam, func, select, update
+
+from tracker_app.config import (
+    DEFAULT_LAMBDA,
+    LAMBDA_CALIBRATION_ENABLED,
+    LAMBDA_CALIBRATION_INTERVAL_HOURS,
+    MIN_REVIEW_INTERVAL_HOURS,
+)
+from tracker_app.db import models
+from tracker_app.learning.memory_model import AWFC_ALPHA, LAMBDA_CEIL, LAMBDA_FLOOR
+from tracker_app.learning.retention_engine import DEFAULT_ATTENTION, awfc_lambda, sql_epoch_seconds
+from tracker_app.utils import utcnow as _utcnow
+
+logger = logging.getLogger("LambdaCalibration")
+
+MIN_REVIEWS = 5          # same bar as recalibrate_lambda
+PRIOR_WEIGHT = float(MIN_REVIEWS)   # cost of a unit log-lambda move, in reviews' squared error
+MAX_RUN_CHANGE = math.log(1.5)      # at most x1.5 or /1.5 per concept per run
+MAX_ITERATIONS = 50
+TOLERANCE = 1e-6         # |step| in log(lambda_p) that counts as converged
+MAX_STEP = 1.0           # damping: at most a factor e per iteration
+MIN_CHANGE = 1e-4        # relative change below which a row is not rewritten
+
+_run_lock = threading.Lock()
+
+
+def fit_lambda_p(lambda_p: np.ndarray, gap_hours: np.ndarray, recall: np.ndarray,
+                 weight: np.ndarray, prior_weight: float = PRIOR_WEIGHT,
+                 max_change: float = MAX_RUN_CHANGE,
+                 max_iterations: int = MAX_ITERATIONS,
+                 tol: float = TOLERANCE) -> Dict[str, Any]:
+    """Least-squares fit of exp(-lambda_p * gap_hours) to `recall`, per row.
+
+    No row moves more than `max_change` in log(lambda_p) from its start.
+    Returns the fitted rates with the iteration count, a per-row converged
+    mask and the last step size of each row."""
+    theta0 = np.log(np.clip(lambda_p, LAMBDA_FLOOR, LAMBDA_CEIL))
+    lo = np.maximum(theta0 - max_change, math.log(LAMBDA_FLOOR))
+    hi = np.minimum(theta0 + max_change, math.log(LAMBDA_CEIL))
+    theta = theta0.copy()
+    step = np.full(len(theta), np.inf)
+    active = np.ones(len(theta), dtype=bool)
+    sqrt_w, sqrt_k = np.sqrt(weight), math.sqrt(prior_weight)
+    iterations = 0
+    while active.any() and iterations < max_iterations:
+        iterations += 1
+        lam = np.exp(theta[active])
+        t = gap_hours[active]
+        predicted = np.exp(-lam * t)
+        r_data = sqrt_w[active] * (predicted - recall[active])
+        j_data = -sqrt_w[active] * t * lam * predicted
+        r_prior = sqrt_k * (theta[active] - theta0[active])
+        delta = -(j_data * r_data + sqrt_k * r_prior) / (j_data ** 2 + prior_weight)
+        delta = np.clip(delta, -MAX_STEP, MAX_STEP)
+        new_theta = np.clip(theta[active] + delta, lo[active], hi[active])
+        step[active] = np.abs(new_theta - theta[active])
+        theta[active] = new_theta
+        active &= step >= tol
+    return {"lambda_p": np.exp(theta), "iterations": iterations,
+            "converged": step < tol, "step": step}
+
+
+def recalibrate_all_lambdas(now: Optional[datetime] = None, dry_run: bool = False,
+                            min_reviews: int = MIN_REVIEWS) -> Dict[str, Any]:
+    """Refit lambda_personalised for every concept with enough reviews that
+    has been reviewed again since its last refit."""
+    from tracker_app.db.models import TrackedConcept
+    now = now or _utcnow()
+    started = time.perf_counter()
+    report: Dict[str, Any] = {"started_at": now.isoformat(), "dry_run": dry_run,
+                              "concepts": 0, "updated": 0, "iterations": 0,
+                              "converged": 0, "max_step": 0.0, "at_bound": 0,
+                              "rmse_before": None, "rmse_after": None}
+    with _run_lock, models.SessionLocal() as db:
+        rows = db.execute(
+            select(
+                TrackedConcept.concept,
+                TrackedConcept.review_count,
+                TrackedConcept.correct_count,
+                TrackedConcept.attention_at_encoding,
+                TrackedConcept.lambda_personalised,
+                TrackedConcept.interval,
+                sql_epoch_seconds(TrackedConcept.first_seen),
+                sql_epoch_seconds(func.coalesce(TrackedConcept.last_seen,
+                                                TrackedConcept.first_seen)),
+            ).where(TrackedConcept.status != "archived",
+                    TrackedConcept.review_count >= min_reviews,
+                    TrackedConcept.review_count
+                    != func.coalesce(TrackedConcept.calibrated_review_count, -1))
+        ).all()
+        if rows:
+            names, n, correct, att, base, interval, first_s, last_s = zip(*rows)
+            reviews = n
+            n = np.array(n, dtype=float)
+            correct = np.minimum(np.array([c or 0 for c in correct], dtype=float), n)
+            att = np.array(att, dtype=float)
+            att = np.where(np.isnan(att) | (att == 0), DEFAULT_ATTENTION, att)
+            base = np.array(base, dtype=float)
+            base = np.where(np.isnan(base) | (base == 0), DEFAULT_LAMBDA, base)
+
+            # Mean hours between reinforcements; a concept reviewed without a
+            # measurable span falls back to its SM-2 interval.
+            span = (np.array(last_s, dtype=float) - np.array(first_s, dtype=float)) / 3600.0
+            interval_h = np.array([i or 1 for i in interval], dtype=float) * 24.0
+            gap = np.where(np.nan_to_num(span) > 0, span / n, interval_h)
+            gap = np.maximum(gap, MIN_REVIEW_INTERVAL_HOURS)
+            recall = (correct + 0.5) / (n + 1.0)
+
+            lambda_p = awfc_lambda(base, att)
+            fit = fit_lambda_p(lambda_p, gap, recall, n)
+            damping = 1.0 - np.clip(att / 100.0, 0.0, 1.0) * AWFC_ALPHA
+            new_base = np.clip(fit["lambda_p"] / damping, LAMBDA_FLOOR, LAMBDA_CEIL)
+
+            changed = np.abs(new_base - base) > MIN_CHANGE * base
+            report.update(
+                concepts=len(names),
+                updated=int(np.count_nonzero(changed)),
+                iterations=fit["iterations"],
+                converged=int(np.count_nonzero(fit["converged"])),
+                max_step=float(fit["step"].max()),
+                at_bound=int(np.count_nonzero((new_base <= LAMBDA_FLOOR)
+                                              | (new_base >= LAMBDA_CEIL))),
+                rmse_before=_rmse(lambda_p, gap, recall),
+                rmse_after=_rmse(awfc_lambda(new_base, att), gap, recall),
+            )
+            if not dry_run:
+                # Rows reviewed since the select keep their lambda; their
+                # review_count no longer matches, so the next run refits them.
+                table = TrackedConcept.__table__
+                stmt = (update(table)
+                        .where(table.c.concept == bindparam("b_concept"),
+                               table.c.review_count == bindparam("b_reviews"))
+                        .values(lambda_personalised=bindparam("b_lambda"),
+                                calibrated_review_count=bindparam("b_reviews")))
+                db.execute(stmt, [
+                    {"b_concept": names[i],
+                     "b_lambda": float(new_base[i] if changed[i] else base[i]),
+                     "b_reviews": reviews[i]}
+                    for i in range(len(names))
+                ])
+                db.commit()
+    if report["updated"] and not dry_run:
+        # Due-concept payloads carry lambda_personalised.
+        from tracker_app.learning.due_queue import concept_queue
+        concept_queue.invalidate()
+    report["duration_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    logger.info("Lambda calibration: %d/%d concepts updated, %d/%d converged in %d "
+                "iterations, recall RMSE %s -> %s",
+                report["updated"], report["concepts"], report["converged"],
+                report["concepts"], report["iterations"],
+                _fmt(report["rmse_before"]), _fmt(report["rmse_after"]))
+    return report
+
+
+def _rmse(lambda_p: np.ndarray, gap: np.ndarray, recall: np.ndarray) -> float:
+    return float(np.sqrt(np.mean((np.exp(-lambda_p * gap) - recall) ** 2)))
+
+
+def _fmt(value: Optional[float]) -> str:
+    return "n/a" if value is None else f"{value:.4f}"
+
+
+class LambdaCalibrationWorker:
+    """Daemon thread calling recalibrate_all_lambdas() every `interval_hours`."""
+
+    def __init__(self, interval_hours: float = LAMBDA_CALIBRATION_INTERVAL_HOURS,
+                 first_run_delay: float = 600.0):
+        self.interval = max(60.0, interval_hours * 3600.0)
+        self.first_run_delay = first_run_delay
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self) -> "LambdaCalibrationWorker":
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="fkt-lambda-calibration",
+                                            daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self):
+        delay = self.first_run_delay
+        while not self._stop.wait(delay):
+            try:
+                recalibrate_all_lambdas()
+            except Exception as e:
+                logger.error("Lambda calibration failed: %s", e)
+            delay = self.interval
+
+
+def start_lambda_calibration_worker() -> Optional[LambdaCalibrationWorker]:
+    """Start the background worker unless LAMBDA_CALIBRATION_ENABLED is false."""
+    if not LAMBDA_CALIBRATION_ENABLED:
+        return None
+    return LambdaCalibrationWorker().start()
@@ -1,15 +1,19 @@
 ﻿import json
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Any
 from enum import Enum
 import uuid
 
 from tracker_app.utils import utcnow as _utcnow
 
+from tracker_app.config import DUE_QUEUE_ENABLED
+from tracker_app.learning.due_queue import item_due, item_queue
 from tracker_app.learning.sm2_memory_model import SM2Item, SM2Scheduler
 from tracker_app.db import models
 from tracker_app.db.models import LearningItem, ReviewHistory
-from tracker_app.db.repository import LearningRepository
+from tracker_app.db.repository import (
+    LearningRepository, DailySummaryRepository, StreakRepository,
+)
 from sqlalchemy import func, or_
 from sqlalchemy.orm import Session
 
@@ -78,15 +82,39 @@ class LearningTracker:
                 next_review_date=now,
                 updated_at=now
             )
+            DailySummaryRepository.bump(db, now, items_added=1)
             LearningRepository.add_item(db, new_item)
+        item_queue.upsert(item_id, now)
 
         return item_id
     
-    def get_items_due(self) -> List[Dict[str, Any]]:
-        """Get items that are due for review now"""
+    def get_items_due(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """Get items that are due for review now, earliest first.
+
+        The due ids come from the in-memory due queue; only those rows are
+        read, by primary key. An id whose row changed behind the queue's
+        back (another process reviewed or archived it) is corrected in the
+        queue and the read is retried without it."""
+        if not DUE_QUEUE_ENABLED:
+            with models.SessionLocal() as db:
+                items = LearningRepository.get_items_due(db, limit)
+                return [self._row_to_dict(item) for item in items]
+
+        now = _utcnow()
         with models.SessionLocal() as db:
-            items = LearningRepository.get_items_due(db)
-            return [self._row_to_dict(item) for item in items]
+            while True:
+                due_ids = [item_id for item_id, _, _ in item_queue.due(now, limit)]
+                rows = {row.id: row for row in
+                        db.query(LearningItem).filter(LearningItem.id.in_(due_ids))}
+                stale = False
+                for item_id in due_ids:
+                    row = rows.get(item_id)
+                    due = item_due(row) if row is not None else None
+                    if due is None or due > now:
+                        item_queue.upsert(item_id, due)
+                        stale = True
+                if not stale:
+                    return [self._row_to_dict(rows[item_id]) for item_id in due_ids]
     
     def get_item(self, item_id: str) -> Optional[Dict[str, Any]]:
         """Get a single learning item by ID"""
@@ -101,54 +129,78 @@ class LearningTracker:
         time_spent_seconds: int = None,
         algorithm: str = "sm2"
     ) -> Dict[str, Any]:
-        item_dict = self.get_item(item_id)
-        if not item_dict:
-            raise ValueError(f"Item {item_id} not found")
-        
         with models.SessionLocal() as db:
             item_record = LearningRepository.get_item(db, item_id)
-            
-            # Reconstruct SM2Item
-            item = self._dict_to_sm2item(item_dict)
-            
-            result = SM2Scheduler.calculate_next_interval(item, quality_rating)
-                
+            if not item_record:
+                raise ValueError(f"Item {item_id} not found")
+
             review_date = _utcnow()
-            was_correct = quality_rating >= 3
-
-            # Create review history record
-            history = ReviewHistory(
-                item_id=item_id,
-                timestamp=review_date,
-                quality_rating=quality_rating,
-                old_interval=item_dict['interval'],
-                new_interval=item.interval,
-                old_ease=item_dict['ease_factor'],
-                new_ease=item.ease_factor
+            applied = self.apply_review(db, item_record, quality_rating, review_date)
+            DailySummaryRepository.bump(
+                db, review_date,
+                reviews=1,
+                correct_reviews=int(applied['correct']),
+                items_mastered=int(applied['became_mastered']),
             )
-
-            success_rate = item.correct_count / item.total_reviews if item.total_reviews > 0 else 0
-            status = 'mastered' if (success_rate > 0.95 and item.repetitions > 5) else 'active'
-
-            # Update item record with new SM-2 state
-            item_record.interval = item.interval
-            item_record.ease_factor = item.ease_factor
-            item_record.repetitions = item.repetitions
-            item_record.next_review_date = item.next_review_date
-            item_record.total_reviews = item.total_reviews
-            item_record.correct_count = item.correct_count
-            item_record.success_rate = success_rate
-            item_record.status = status
-            item_record.last_review_date = review_date
-            item_record.updated_at = _utcnow()
-
-            LearningRepository.record_review(db, history, item_record)
+            StreakRepository.record_review_day(db, review_date)
+            LearningRepository.record_review(db, applied['history'], item_record)
+            item_queue.upsert(item_id, item_due(item_record))
             
         updated_item = self.get_item(item_id)
         return {
             'item': updated_item,
+            'result': applied['result'],
+            'retention_estimate': applied['retention_estimate']
+        }
+
+    def apply_review(self, db: Session, item_record: LearningItem, quality_rating: int,
+                     review_date: datetime) -> Dict[str, Any]:
+        """Apply one SM-2 review to a loaded item row; the caller commits.
+
+        Adds the review_history row and returns it with the SM-2 result, the
+        retention estimate, and whether the review was correct and made the
+        item mastered. Shared by record_review and the batch review path."""
+        item_dict = self._row_to_dict(item_record)
+        # Reconstruct SM2Item
+        item = self._dict_to_sm2item(item_dict)
+
+        result = SM2Scheduler.calculate_next_interval(item, quality_rating)
+        was_correct = quality_rating >= 3
+
+        # Create review history record
+        history = ReviewHistory(
+            item_id=item_record.id,
+            timestamp=review_date,
+            quality_rating=quality_rating,
+            old_interval=item_dict['interval'],
+            new_interval=item.interval,
+            old_ease=item_dict['ease_factor'],
+            new_ease=item.ease_factor
+        )
+        db.add(history)
+
+        success_rate = item.correct_count / item.total_reviews if item.total_reviews > 0 else 0
+        status = 'mastered' if (success_rate > 0.95 and item.repetitions > 5) else 'active'
+        became_mastered = status == 'mastered' and item_record.status != 'mastered'
+
+        # Update item record with new SM-2 state
+        item_record.interval = item.interval
+        item_record.ease_factor = item.ease_factor
+        item_record.repetitions = item.repetitions
+        item_record.next_review_date = item.next_review_date
+        item_record.total_reviews = item.total_reviews
+        item_record.correct_count = item.correct_count
+        item_record.success_rate = success_rate
+        item_record.status = status
+        item_record.last_review_date = review_date
+        item_record.updated_at = _utcnow()
+
+        return {
+            'history': history,
             'result': result,
-            'retention_estimate': SM2Scheduler.estimate_retention(item)
+            'retention_estimate': SM2Scheduler.estimate_retention(item),
+            'correct': was_correct,
+            'became_mastered': became_mastered,
         }
     
     def get_learning_stats(self) -> Dict[str, Any]:
@@ -166,42 +218,40 @@ class LearningTracker:
                 'items_due_today': base_stats['total_due'],
                 'average_success_rate': avg_success,
                 'total_reviews': total_reviews,
-                'current_streak': self._compute_streak(db),
+                'current_streak': StreakRepository.get_current_streak(db),
                 # legacy aliases (kept for backward compatibility)
                 'due_now': base_stats['total_due'],
                 'total_reviews_ever': total_reviews
             }
 
-    @staticmethod
-    def _compute_streak(db: Session) -> int:
-        """Consecutive days with at least one review, counting back from today."""
-        review_days = {
-            row[0]
-            for row in db.query(func.date(ReviewHistory.timestamp)).distinct().all()
-            if row[0]
-        }
-        day = _utcnow().date()
-        if str(day) not in review_days:
-            day -= timedelta(days=1)  # today not reviewed yet â€” streak may still be alive
-        streak = 0
-        while str(day) in review_days:
-            streak += 1
-            day -= timedelta(days=1)
-        return streak
-    
     def get_learning_today(self) -> Dict[str, Any]:
         with models.SessionLocal() as db:
-            return LearningRepository.get_learning_today(db)
+            return DailySummaryRepository.get_learning_today(db)
             
-    def search_items(self, query: str) -> List[Dict[str, Any]]:
+    def search_items(self, query: str, limit: int = 50) -> List[Dict[str, Any]]:
+        return self.search_items_page(query, limit)['items']
+
+    def search_items_page(self, query: str, limit: int = 50,
+                          cursor: Optional[str] = None) -> Dict[str, Any]:
+        """One newest-first page of active items matching `query`.
+
+        Pass the returned `next_cursor` back to get the following page; it is
+        None on the last one. Raises ValueError for a malformed cursor."""
         with models.SessionLocal() as db:
-            items = LearningRepository.search_items(db, query)
-            return [self._row_to_dict(item) for item in items]
+            items, next_cursor = LearningRepository.search_items(db, query, limit, cursor)
+            return {'items': [self._row_to_dict(item) for item in items],
+                    'next_cursor': next_cursor}
 
     def get_items(self, status: str = 'active', limit: int = 50) -> List[Dict[str, Any]]:
+        return self.get_items_page(status, limit)['items']
+
+    def get_items_page(self, status: str = 'active', limit: int = 50,
+                       cursor: Optional[str] = None) -> Dict[str, Any]:
+        """Keyset-paginated variant of get_items (see search_items_page)."""
         with models.SessionLocal() as db:
-            items = LearningRepository.get_items(db, status, limit)
-            return [self._row_to_dict(item) for item in items]
+            items, next_cursor = LearningRepository.get_items(db, status, limit, cursor)
+            return {'items': [self._row_to_dict(item) for item in items],
+                    'next_cursor': next_cursor}
             
     def archive_item(self, item_id: str):
         with models.SessionLocal() as db:
@@ -210,6 +260,7 @@ class LearningTracker:
                 item.status = "archived"
                 item.updated_at = _utcnow()
                 db.commit()
+        item_queue.discard(item_id)
 
     def delete_item(self, item_id: str) -> bool:
         """Permanently delete a learning item and its review history.
@@ -222,7 +273,8 @@ class LearningTracker:
                 return False
             db.delete(item)  # cascade='all, delete-orphan' removes reviews
             db.commit()
-            return True
+        item_queue.discard(item_id)
+        return True
 
     def unarchive_item(self, item_id: str):
         with models.SessionLocal() as db:
@@ -231,22 +283,42 @@ class LearningTracker:
                 item.status = "active"
                 item.updated_at = _utcnow()
                 db.commit()
+                item_queue.upsert(item_id, item_due(item))
                 
     def export_items(self, format: str = "json") -> str:
+        return "".join(self.iter_export(format))
+
+    def iter_export(self, format: str = "json", batch_size: int = 200) -> Iterator[str]:
+        """Export the whole deck as a stream of text chunks.
+
+        "json" yields a JSON array one item per line, "anki" yields
+        tab-separated question/answer/tags lines. Rows are fetched
+        `batch_size` at a time, so memory stays flat for large decks. The
+        format is checked up front so a bad one raises before streaming."""
+        if format == "json":
+            render, head, sep, tail = self._json_line, "[\n", ",\n", "\n]\n"
+        elif format == "anki":
+            render, head, sep, tail = self._anki_line, "", "\n", ""
+        else:
+            raise ValueError(f"Unknown format: {format}")
+        return self._stream_export(render, head, sep, tail, batch_size)
+
+    def _stream_export(self, render, head: str, sep: str, tail: str,
+                       batch_size: int) -> Iterator[str]:
         with models.SessionLocal() as db:
-            items = LearningRepository.get_all_items(db)
-            items_dict = [self._row_to_dict(item) for item in items]
-            
-            if format == "json":
-                return json.dumps(items_dict, indent=2, default=str)
-            elif format == "anki":
-                lines = []
-                for item in items_dict:
-                    tags = ' '.join(item['tags'])
-                    lines.append(f"{item['question']}\t{item['answer']}\t{tags}")
-                return "\n".join(lines)
-            else:
-                raise ValueError(f"Unknown format: {format}")
+            yield head
+            for n, item in enumerate(LearningRepository.iter_all_items(db, batch_size)):
+                yield (sep if n else "") + render(self._row_to_dict(item))
+            yield tail
+
+    @staticmethod
+    def _json_line(item: Dict[str, Any]) -> str:
+        return json.dumps(item, default=str)
+
+    @staticmethod
+    def _anki_line(item: Dict[str, Any]) -> str:
+        tags = ' '.join(item['tags'])
+        return f"{item['question']}\t{item['answer']}\t{tags}"
 
     @staticmethod
     def _row_to_dict(row: LearningItem) -> Dict[str, Any]:
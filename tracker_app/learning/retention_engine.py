@@ -0,0 +1,171 @@
+"""Vectorised AWFC retention over the whole tracked_concepts table.
+
+compute_memory_score_awfc in memory_model.py scores one concept per call,
+with one math.exp per call inside Python loops. RetentionSnapshot instead
+loads last_seen, attention_at_encoding and lambda_personalised for every
+concept into NumPy arrays with one column query. It then answers these
+questions for all concepts in a single array pass:
+
+- the retention score now, or at any other instant;
+- hours until the score drops below MEMORY_THRESHOLD, and when;
+- which N concepts will cross the threshold within the next H hours.
+
+Scores equal compute_memory_score_awfc applied to the row the way the
+knowledge graph does: the personalised lambda, further damped by
+attention at encoding, a NULL or 0 field falling back to its default, and
+the score clamped to [0.05, 1.0].
+"""
+
+import math
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+from sqlalchemy import func, select
+
+from tracker_app.config import DEFAULT_LAMBDA, MEMORY_THRESHOLD
+from tracker_app.learning.memory_model import AWFC_ALPHA, LAMBDA_CEIL, LAMBDA_FLOOR
+from tracker_app.utils import utcnow as _utcnow
+
+SCORE_FLOOR = 0.05
+SCORE_CEIL = 1.0
+DEFAULT_ATTENTION = 50.0
+
+_EPOCH = datetime(1970, 1, 1)
+_UNIX_EPOCH_JULIAN_DAY = 2440587.5
+
+
+def _epoch_seconds(dt: datetime) -> float:
+    """Naive-UTC datetime -> seconds since 1970 (no local-time conversion)."""
+    return (dt - _EPOCH).total_seconds()
+
+
+def sql_epoch_seconds(column):
+    """SQL expression: a stored naive-UTC DateTime column as epoch seconds."""
+    return (func.julianday(column) - _UNIX_EPOCH_JULIAN_DAY) * 86400.0
+
+
+def awfc_lambda(base_lambda: np.ndarray, attention_at_encoding: np.ndarray,
+                alpha: float = AWFC_ALPHA) -> np.ndarray:
+    """Array form of memory_model.compute_awfc_lambda."""
+    att_norm = np.clip(attention_at_encoding / 100.0, 0.0, 1.0)
+    return np.clip(base_lambda * (1.0 - att_norm * alpha), LAMBDA_FLOOR, LAMBDA_CEIL)
+
+
+class RetentionSnapshot:
+    """Columnar AWFC state of a set of concepts, frozen at load time.
+
+    `now` is the default evaluation instant. Each query method also takes
+    `at`, so a single snapshot can be projected forward in time.
+    """
+
+    def __init__(self, names: Iterable[str], last_seen: Iterable[float],
+                 attention: Iterable[Optional[float]], base_lambda: Iterable[Optional[float]],
+                 now: Optional[datetime] = None):
+        self.now = now or _utcnow()
+        self.names: List[str] = list(names)
+        # Seconds since epoch of the last encounter/review; NaN -> "just now".
+        self.last_seen = np.asarray(last_seen, dtype=float).reshape(-1)
+        self.last_seen[np.isnan(self.last_seen)] = _epoch_seconds(self.now)
+        base = np.asarray(base_lambda, dtype=float).reshape(-1)
+        att = np.asarray(attention, dtype=float).reshape(-1)
+        # `row.x or default` in _memory_score_from_row: NULL and 0 both fall back.
+        base = np.where(np.isnan(base) | (base == 0), DEFAULT_LAMBDA, base)
+        att = np.where(np.isnan(att) | (att == 0), DEFAULT_ATTENTION, att)
+        self.lambda_p = awfc_lambda(base, att)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    @classmethod
+    def load(cls, db, concepts: Optional[Iterable[str]] = None,
+             now: Optional[datetime] = None) -> "RetentionSnapshot":
+        """One column query over tracked_concepts (optionally only `concepts`).
+
+        last_seen arrives as epoch seconds computed by SQLite, so the load
+        builds no ORM objects and does no per-row datetime parsing."""
+        from tracker_app.db.models import TrackedConcept
+        seen = func.coalesce(TrackedConcept.last_seen, TrackedConcept.first_seen)
+        q = select(
+            TrackedConcept.concept,
+            sql_epoch_seconds(seen),
+            TrackedConcept.attention_at_encoding,
+            TrackedConcept.lambda_personalised,
+        )
+        if concepts is not None:
+            q = q.where(TrackedConcept.concept.in_(list(concepts)))
+        rows = db.execute(q).all()
+        if not rows:
+            return cls([], [], [], [], now)
+        names, seen_s, att, lam = zip(*rows)
+        return cls(names, np.array(seen_s, dtype=float), np.array(att, dtype=float),
+                   np.array(lam, dtype=float), now)
+
+    @classmethod
+    def from_rows(cls, rows, now: Optional[datetime] = None) -> "RetentionSnapshot":
+        """Snapshot of TrackedConcept rows a caller has already loaded."""
+        now = now or _utcnow()
+        return cls(
+            [r.concept for r in rows],
+            [_epoch_seconds(r.last_seen or r.first_seen or now) for r in rows],
+            [r.attention_at_encoding for r in rows],
+            [r.lambda_personalised for r in rows],
+            now,
+        )
+
+    def _at(self, at: Optional[datetime]) -> float:
+        return _epoch_seconds(at or self.now)
+
+    def age_hours(self, at: Optional[datetime] = None) -> np.ndarray:
+        return np.maximum(0.0, (self._at(at) - self.last_seen) / 3600.0)
+
+    def scores(self, at: Optional[datetime] = None) -> np.ndarray:
+        """AWFC retention of every concept at `at` (default: snapshot time)."""
+        raw = np.exp(-self.lambda_p * self.age_hours(at))
+        return np.clip(raw, SCORE_FLOOR, SCORE_CEIL)
+
+    def hours_until_below(self, threshold: float = MEMORY_THRESHOLD,
+                          at: Optional[datetime] = None) -> np.ndarray:
+        """Hours from `at` until each score first drops below `threshold`.
+
+        0 when it already has; inf when it never can (threshold at or under
+        the 0.05 score floor)."""
+        if threshold <= SCORE_FLOOR:
+            return np.full(len(self), np.inf)
+        if threshold >= SCORE_CEIL:
+            return np.zeros(len(self))
+        crossing = math.log(1.0 / threshold) / self.lambda_p
+        return np.maximum(0.0, crossing - self.age_hours(at))
+
+    def due_at(self, threshold: float = MEMORY_THRESHOLD) -> np.ndarray:
+        """Epoch seconds at which each score crosses `threshold`."""
+        if threshold <= SCORE_FLOOR:
+            return np.full(len(self), np.inf)
+        return self.last_seen + math.log(1.0 / threshold) / self.lambda_p * 3600.0
+
+    def as_dict(self, at: Optional[datetime] = None) -> Dict[str, float]:
+        return dict(zip(self.names, self.scores(at).tolist()))
+
+    def falling_below(self, within_hours: float, limit: Optional[int] = None,
+                      threshold: float = MEMORY_THRESHOLD,
+                      include_below: bool = False) -> List[Dict[str, Any]]:
+        """Concepts whose score crosses `threshold` within `within_hours`.
+
+        Soonest first. Concepts already below the threshold are left out
+        unless `include_below`, and then they lead with 0 hours. `limit`
+        uses argpartition, so picking the top N stays O(n)."""
+        scores = self.scores()
+        hours = self.hours_until_below(threshold)
+        mask = hours <= within_hours
+        if not include_below:
+            mask &= scores >= threshold
+        idx = np.flatnonzero(mask)
+        if limit is not None and limit < idx.size:
+            idx = idx[np.argpartition(hours[idx], limit - 1)[:limit]] if limit > 0 else idx[:0]
+        idx = idx[np.argsort(hours[idx], kind="stable")]
+        return [{
+            'concept': self.names[i],
+            'memory_score': round(float(scores[i]), 4),
+            'hours_until_threshold': round(float(hours[i]), 2),
+            'drops_below_at': self.now + timedelta(hours=float(hours[i])),
+        } for i in idx]
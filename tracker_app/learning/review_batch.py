@@ -0,0 +1,192 @@
+"""Batch review submission: many ratings, one transaction.
+
+POST /reviews and /quiz/answer each open a session, apply one rating,
+commit, and sync the knowledge graph. A client that reviews offline, or
+a quiz run answered in one go, ends up paying that round trip per rating.
+apply_review_batch instead:
+
+- loads every target row, and the ids already applied, with one IN query
+  per table;
+- applies the ratings in the order given, so two ratings of the same item
+  in one batch build on each other exactly as two single calls would;
+- bumps the daily summary and streak once and commits once;
+- updates the due queues and syncs the touched graph nodes in one pass
+  after the commit.
+
+Each entry carries a client-chosen review_id. Applied ids are stored in
+applied_reviews in the same transaction as the review itself, so a
+retried batch replays the stored results (status "duplicate") instead of
+rating anything twice; when two submissions of one id race, the loser's
+commit fails on the applied_reviews key and the batch reruns, so it also
+reports a duplicate. Entries whose item or concept does not exist get
+status "error" and are not recorded, so a later retry can still apply them.
+"""
+
+import json
+import logging
+from typing import Any, Dict, List
+
+from sqlalchemy.exc import IntegrityError
+
+from tracker_app.db import models
+from tracker_app.db.models import AppliedReview, LearningItem, TrackedConcept
+from tracker_app.db.repository import DailySummaryRepository, StreakRepository
+from tracker_app.learning.due_queue import concept_entry, concept_queue, item_due, item_queue
+from tracker_app.utils import utcnow as _utcnow
+
+logger = logging.getLogger("ReviewBatch")
+
+MAX_REVIEW_BATCH = 200
+MAX_REVIEW_ID_LENGTH = 128
+
+
+def normalize_reviews(reviews: Any) -> List[Dict[str, Any]]:
+    """Validate a batch body's review list; raises ValueError naming the entry.
+
+    Every entry needs a review_id and exactly one of item_id / concept.
+    quality is 0-5; a concept entry may give was_correct instead (true is
+    quality 4, false is 0, as in /quiz/answer)."""
+    if not isinstance(reviews, list) or not reviews:
+        raise ValueError("reviews must be a non-empty list")
+    if len(reviews) > MAX_REVIEW_BATCH:
+        raise ValueError(f"at most {MAX_REVIEW_BATCH} reviews per batch")
+
+    out = []
+    for i, entry in enumerate(reviews):
+        if not isinstance(entry, dict):
+            raise ValueError(f"reviews[{i}] must be an object")
+        review_id = entry.get("review_id")
+        if not isinstance(review_id, str) or not review_id.strip():
+            raise ValueError(f"reviews[{i}].review_id is required")
+        review_id = review_id.strip()
+        if len(review_id) > MAX_REVIEW_ID_LENGTH:
+            raise ValueError(f"reviews[{i}].review_id is longer than "
+                             f"{MAX_REVIEW_ID_LENGTH} characters")
+
+        has_item, has_concept = entry.get("item_id") is not None, entry.get("concept") is not None
+        if has_item == has_concept:
+            raise ValueError(f"reviews[{i}] needs exactly one of item_id or concept")
+        kind = "item" if has_item else "concept"
+        target = str(entry["item_id"] if has_item else entry["concept"]).strip()
+        if not target:
+            raise ValueError(f"reviews[{i}].{'item_id' if has_item else 'concept'} is empty")
+
+        if "quality" in entry:
+            quality = entry["quality"]
+            if isinstance(quality, bool) or not isinstance(quality, int):
+                raise ValueError(f"reviews[{i}].quality must be an integer")
+            if not 0 <= quality <= 5:
+                raise ValueError(f"reviews[{i}].quality must be 0-5")
+        elif kind == "concept" and isinstance(entry.get("was_correct"), bool):
+            quality = 4 if entry["was_correct"] else 0
+        else:
+            raise ValueError(f"reviews[{i}].quality is required"
+                             + (" (or was_correct)" if kind == "concept" else ""))
+
+        out.append({"review_id": review_id, "kind": kind, "target": target,
+                    "quality": quality})
+    return out
+
+
+def _apply(db, reviews, tracker, scheduler):
+    """Stage the batch in `db` without committing.
+
+    Returns the results plus the rows and queue entries to refresh after
+    the commit."""
+    results: List[Dict[str, Any]] = []
+    touched_items: Dict[str, LearningItem] = {}
+    touched_concepts: Dict[str, TrackedConcept] = {}
+    review_ids = {r["review_id"] for r in reviews}
+    item_ids = {r["target"] for r in reviews if r["kind"] == "item"}
+    concept_ids = {r["target"] for r in reviews if r["kind"] == "concept"}
+    done = {row.review_id: json.loads(row.result) for row in
+            db.query(AppliedReview).filter(AppliedReview.review_id.in_(review_ids))}
+    items = {row.id: row for row in
+             db.query(LearningItem).filter(LearningItem.id.in_(item_ids))} if item_ids else {}
+    concepts = {row.concept: row for row in
+                db.query(TrackedConcept).filter(TrackedConcept.concept.in_(concept_ids))
+                } if concept_ids else {}
+
+    now = _utcnow()
+    reviews_n = correct_n = mastered_n = 0
+    for r in reviews:
+        if r["review_id"] in done:
+            results.append(dict(done[r["review_id"]], status="duplicate"))
+            continue
+        result = {"review_id": r["review_id"], "kind": r["kind"], "id": r["target"]}
+        if r["kind"] == "item":
+            row = items.get(r["target"])
+            if row is None:
+                results.append(dict(result, status="error", error="item not found"))
+                continue
+            applied = tracker.apply_review(db, row, r["quality"], now)
+            reviews_n += 1
+            correct_n += int(applied["correct"])
+            mastered_n += int(applied["became_mastered"])
+            touched_items[row.id] = row
+            result.update(interval=row.interval, next_review=row.next_review_date)
+        else:
+            row = concepts.get(r["target"])
+            if row is None:
+                results.append(dict(result, status="error", error="concept not found"))
+                continue
+            scheduler.apply_review(row, r["quality"])
+            touched_concepts[row.concept] = row
+            result.update(interval=row.interval, next_review=row.next_review)
+        result["status"] = "applied"
+        if result["next_review"] is not None:
+            result["next_review"] = result["next_review"].isoformat()
+        db.add(AppliedReview(review_id=r["review_id"], kind=r["kind"], target=r["target"],
+                             applied_at=now, result=json.dumps(result)))
+        done[r["review_id"]] = result
+        results.append(result)
+
+    if reviews_n:
+        DailySummaryRepository.bump(db, now, reviews=reviews_n,
+                                    correct_reviews=correct_n, items_mastered=mastered_n)
+        StreakRepository.record_review_day(db, now)
+    item_entries = [(item_id, item_due(row)) for item_id, row in touched_items.items()]
+    concept_entries = [concept_entry(row) for row in touched_concepts.values()]
+    return results, touched_concepts, item_entries, concept_entries
+
+
+def apply_review_batch(reviews: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Apply normalised reviews in order inside one transaction.
+
+    Returns the per-entry results (in input order) and status counts."""
+    from tracker_app.learning.concept_scheduler import get_scheduler
+    from tracker_app.learning.learning_tracker import LearningTracker
+    tracker, scheduler = LearningTracker(), get_scheduler()
+
+    for attempt in range(2):
+        with models.SessionLocal() as db:
+            try:
+                results, touched_concepts, item_entries, concept_entries = _apply(
+                    db, reviews, tracker, scheduler)
+                db.commit()
+            except IntegrityError:
+                # A concurrent submission stored one of these review ids
+                # first. Start over: the lookup now sees it as a duplicate.
+                db.rollback()
+                if attempt:
+                    raise
+                logger.debug("Review batch raced a concurrent submission; retrying")
+                continue
+        break
+
+    for item_id, due in item_entries:
+        item_queue.upsert(item_id, due)
+    for entry in concept_entries:
+        concept_queue.upsert(*entry)
+    if touched_concepts:
+        # Reflect the reviews in the knowledge graph in one pass.
+        try:
+            from tracker_app.tracking.knowledge_graph import sync_concepts_to_graph
+            sync_concepts_to_graph(list(touched_concepts))
+        except Exception as e:
+            logger.debug(f"Graph sync skipped for review batch: {e}")
+
+    counts = {status: sum(1 for r in results if r["status"] == status)
+              for status in ("applied", "duplicate", "error")}
+    logger.debug(f"Review batch: {counts}")
+    return {"results": results, **counts}
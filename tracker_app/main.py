@@ -62,6 +62,12 @@ if __name__ == "__main__":
     )
 
     setup_directories()
+
+    # Pool sized for the tracker's threads (see db/engine_profiles.py);
+    # an explicit DB_ENGINE_PROFILE in the environment still wins.
+    if 'DB_ENGINE_PROFILE' not in os.environ:
+        from tracker_app.db.models import configure_engine
+        configure_engine('tracker')
     print("Forgotten Knowledge Tracker 2.0 initialising...")
 
     allow_webcam = ask_user_permissions()
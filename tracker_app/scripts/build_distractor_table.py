@@ -0,0 +1,35 @@
+"""Rebuild the knowledge graph's nearest-neighbour distractor table now.
+
+add_concepts keeps the table current as concepts arrive, and a graph saved
+without one is built on first load; use this after changing
+DISTRACTOR_TABLE_K or EDGE_SIMILARITY, or to refill lists shortened by
+removed concepts.
+
+Run: python -m tracker_app.scripts.build_distractor_table
+"""
+
+import argparse
+import logging
+
+from tracker_app.tracking.knowledge_graph import build_distractor_table
+
+logger = logging.getLogger("BuildDistractorTable")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.parse_args(argv)
+
+    report = build_distractor_table()
+    if not report['concepts']:
+        print("No concepts with embeddings in the graph.")
+        return report
+    print(f"{report['concepts']} concepts given up to {report['k']} nearest-neighbour "
+          f"distractors ({report['duration_ms']} ms)")
+    return report
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO,
+                        format="%(asctime)s [%(name)s] %(levelname)s: %(message)s")
+    main()
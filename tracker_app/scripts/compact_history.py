@@ -0,0 +1,48 @@
+"""Compact the raw log tables now and report the reclaimed space.
+
+The tracker runs the same retention pass in the background every
+RETENTION_INTERVAL_HOURS; use this to run it on demand (e.g. before a
+backup) or, with --dry-run, to see how many rows are past their horizon.
+
+Run: python -m tracker_app.scripts.compact_history [--dry-run] [--no-vacuum]
+"""
+
+import argparse
+import logging
+
+from tracker_app.db.retention import run_retention
+
+logger = logging.getLogger("CompactHistory")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dry-run", action="store_true",
+                        help="only count the rows past each table's horizon")
+    parser.add_argument("--no-vacuum", action="store_true",
+                        help="skip the incremental VACUUM / PRAGMA optimize step")
+    args = parser.parse_args(argv)
+
+    report = run_retention(dry_run=args.dry_run, vacuum=not args.no_vacuum)
+    for table, result in report['tables'].items():
+        if 'error' in result:
+            print(f"{table:<26} error: {result['error']}")
+        elif not result['horizon_days']:
+            print(f"{table:<26} kept forever")
+        elif args.dry_run:
+            print(f"{table:<26} {result['rows_eligible']:>9} rows older than {result['cutoff'][:10]}")
+        else:
+            print(f"{table:<26} {result['rows_deleted']:>9} rows compacted over "
+                  f"{result['days_compacted']} days")
+    space = report['space']
+    if space:
+        print(f"\nDatabase: {space['size_before_bytes'] / 1e6:.1f} MB -> "
+              f"{space['size_after_bytes'] / 1e6:.1f} MB "
+              f"({space['reclaimed_bytes'] / 1e6:.1f} MB reclaimed, vacuum: {space['method']})")
+    return report
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO,
+                        format="%(asctime)s [%(name)s] %(levelname)s: %(message)s")
+    main()
@@ -0,0 +1,43 @@
+"""Rebuild the daily_summary rollup from the raw review/session/encounter tables.
+
+The counters (and the streak_state row) are normally maintained
+incrementally by the write paths; run this to backfill an upgraded database
+or to repair drift after manual edits.
+
+Run: python -m tracker_app.scripts.rebuild_daily_summary [--since YYYY-MM-DD]
+"""
+
+import argparse
+import logging
+from datetime import datetime
+
+from tracker_app.db.models import SessionLocal
+from tracker_app.db.repository import DailySummaryRepository, StreakRepository
+
+logger = logging.getLogger("RebuildDailySummary")
+
+
+def rebuild(since=None) -> int:
+    """Recompute every rollup day >= `since` (all days when None) and the
+    review streak."""
+    with SessionLocal() as db:
+        written = DailySummaryRepository.rebuild(db, since=since)
+        StreakRepository.rebuild(db)
+        db.commit()
+    return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--since", type=lambda s: datetime.strptime(s, "%Y-%m-%d").date(),
+                        help="only rebuild days on or after this date (YYYY-MM-DD)")
+    args = parser.parse_args(argv)
+    written = rebuild(args.since)
+    logger.info("daily_summary rebuilt: %d days", written)
+    print(f"daily_summary rebuilt: {written} days")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO,
+                        format="%(asctime)s [%(name)s] %(levelname)s: %(message)s")
+    main()
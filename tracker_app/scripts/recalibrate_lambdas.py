@@ -0,0 +1,43 @@
+"""Refit lambda_personalised for every reviewed concept now.
+
+The tracker runs the same fit in the background every
+LAMBDA_CALIBRATION_INTERVAL_HOURS; use this to run it on demand or, with
+--dry-run, to see how far the stored decay rates are from the fit.
+
+Run: python -m tracker_app.scripts.recalibrate_lambdas [--dry-run] [--min-reviews N]
+"""
+
+import argparse
+import logging
+
+from tracker_app.learning.lambda_calibration import MIN_REVIEWS, recalibrate_all_lambdas
+
+logger = logging.getLogger("RecalibrateLambdas")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dry-run", action="store_true",
+                        help="fit and report without writing the new rates")
+    parser.add_argument("--min-reviews", type=int, default=MIN_REVIEWS,
+                        help=f"only refit concepts with at least this many reviews "
+                             f"(default {MIN_REVIEWS})")
+    args = parser.parse_args(argv)
+
+    report = recalibrate_all_lambdas(dry_run=args.dry_run, min_reviews=args.min_reviews)
+    if not report['concepts']:
+        print("No concepts with enough reviews to refit.")
+        return report
+    verb = "would change" if args.dry_run else "updated"
+    print(f"{report['concepts']} concepts fitted, {report['updated']} {verb}")
+    print(f"converged: {report['converged']}/{report['concepts']} in "
+          f"{report['iterations']} iterations (max last step {report['max_step']:.2e})")
+    print(f"recall RMSE: {report['rmse_before']:.4f} -> {report['rmse_after']:.4f}")
+    print(f"at a lambda bound: {report['at_bound']}   ({report['duration_ms']} ms)")
+    return report
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO,
+                        format="%(asctime)s [%(name)s] %(levelname)s: %(message)s")
+    main()
@@ -47,6 +47,11 @@ def monitor(monkeypatch):
         "log_intent_prediction",
         lambda db, pred: None,
     )
+    monkeypatch.setattr(
+        activity_monitor.TrackingRepository,
+        "log_intent_predictions",
+        lambda db, preds: [None] * len(preds),
+    )
     return ActivityMonitor()
 
 
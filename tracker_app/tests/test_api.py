@@ -455,5 +455,79 @@ class TestAPIInputValidationNoCrash(TestAPIBase):
         self.assertEqual(resp.status_code, 400)
 
 
+class TestAPIMetrics(TestAPIBase):
+    """GET /metrics serves the per-stage latency histograms."""
+
+    def setUp(self):
+        super().setUp()
+        from tracker_app.tracking import stage_metrics as sm
+        self.sm = sm
+        self._was_enabled = sm.is_enabled()
+        self._was_path = sm._snapshot_path
+        self._snapshot_dir = tempfile.mkdtemp()
+        sm._snapshot_path = os.path.join(self._snapshot_dir, 'stage_metrics.json')
+        sm.set_enabled(True)
+        sm.reset_stage_metrics()
+
+    def tearDown(self):
+        self.sm.reset_stage_metrics()
+        self.sm.set_enabled(self._was_enabled)
+        self.sm._snapshot_path = self._was_path
+        super().tearDown()
+
+    def _publish_as_tracker(self):
+        # The snapshot is written by another process: a different pid.
+        from unittest import mock
+        with mock.patch.object(self.sm.os, 'getpid', return_value=-1):
+            self.assertTrue(self.sm.publish_snapshot())
+
+    def test_metrics_reports_stage_percentiles(self):
+        self.sm.record_stage('ocr.extract_text', 0.5)
+        resp = self.client.get('/api/v1/metrics')
+        self.assertEqual(resp.status_code, 200)
+        data = json.loads(resp.data)['data']
+        self.assertTrue(data['enabled'])
+        stage = data['stages']['ocr.extract_text']
+        self.assertEqual(stage['count'], 1)
+        for key in ('p50_ms', 'p95_ms', 'p99_ms'):
+            self.assertAlmostEqual(stage[key], 500.0, delta=5.0)
+
+    def test_metrics_reset_clears_after_read(self):
+        self.sm.record_stage('ocr.extract_text', 0.5)
+        data = json.loads(self.client.get('/api/v1/metrics?reset=true').data)['data']
+        self.assertIn('ocr.extract_text', data['stages'])
+        self.assertEqual(self.sm.get_stage_metrics()['stages'], {})
+
+    def test_metrics_serve_the_tracker_snapshot(self):
+        # Tracker: records two OCR samples and publishes them.
+        self.sm.record_stage('ocr.extract_text', 0.5)
+        self.sm.record_stage('ocr.extract_text', 0.1)
+        self._publish_as_tracker()
+        # Dashboard: its own histograms hold only a browser-side sample.
+        self.sm.reset_stage_metrics()
+        self.sm.record_stage('ocr.extract_text', 0.3)
+
+        data = json.loads(self.client.get('/api/v1/metrics').data)['data']
+        stage = data['stages']['ocr.extract_text']
+        self.assertEqual(stage['count'], 3)
+        self.assertAlmostEqual(stage['min_ms'], 100.0, delta=2.0)
+        self.assertAlmostEqual(stage['max_ms'], 500.0, delta=5.0)
+        self.assertIsNotNone(data['published_at'])
+
+    def test_metrics_reset_reaches_the_tracker(self):
+        self.sm.record_stage('ocr.extract_text', 0.5)
+        self._publish_as_tracker()
+        self.sm.reset_stage_metrics()
+        self.client.get('/api/v1/metrics?reset=true')
+        data = json.loads(self.client.get('/api/v1/metrics').data)['data']
+        self.assertEqual(data['stages'], {})
+
+        # The tracker drops its samples before its next publish.
+        self.sm.record_stage('ocr.extract_text', 0.5)
+        self._publish_as_tracker()
+        data = json.loads(self.client.get('/api/v1/metrics').data)['data']
+        self.assertEqual(data['stages'], {})
+
+
 if __name__ == '__main__':
     unittest.main()
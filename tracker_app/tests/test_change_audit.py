@@ -0,0 +1,134 @@
+"""Sampled, queue-backed change audit (tracker_app/db/change_audit.py).
+
+The old after_flush listener formatted obj.__dict__ at INFO for every write
+on the writing thread. The audit now captures compact diffs, filters per
+table before doing any work, and logs from a background thread.
+"""
+
+import logging
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from tracker_app.db import change_audit as ca
+from tracker_app.db.models import Base, IntentPrediction, LearningItem
+
+
+class _Capture(logging.Handler):
+    def __init__(self):
+        super().__init__(logging.DEBUG)
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+@pytest.fixture
+def audit_env():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+    target = logging.getLogger("test.change_audit")
+    target.setLevel(logging.INFO)
+    target.propagate = False
+    handler = _Capture()
+    target.addHandler(handler)
+    audits = []
+
+    def make(**kwargs):
+        audit = ca.ChangeAudit(target=target, **kwargs)
+        event.listen(Session, "after_flush", audit.after_flush)
+        audits.append(audit)
+        return audit
+
+    yield Session, make, handler
+    for audit in audits:
+        event.remove(Session, "after_flush", audit.after_flush)
+        audit.stop()
+    target.removeHandler(handler)
+
+
+def _messages(handler):
+    return [r.getMessage() for r in handler.records]
+
+
+def test_insert_update_delete_are_compact_diffs(audit_env):
+    Session, make, handler = audit_env
+    audit = make()
+    with Session() as s:
+        item = LearningItem(id="i1", question="q" * 500, answer="a")
+        s.add(item)
+        s.commit()
+        item.answer = "b"                     # expired after commit: old value unknown
+        s.commit()
+        assert item.question                  # loaded: old value known
+        item.difficulty = "hard"
+        s.commit()
+        s.delete(item)
+        s.commit()
+    audit.drain()
+
+    insert, update, loaded_update, delete = _messages(handler)
+    assert insert.startswith("INSERT learning_items pk=i1 {")
+    assert "(+420)" in insert                 # long values are truncated
+    assert update == "UPDATE learning_items pk=i1 {answer: ? -> b}"
+    assert loaded_update.startswith("UPDATE learning_items pk=i1 {difficulty: medium -> hard")
+    assert delete == "DELETE learning_items pk=i1 {}"
+
+
+def test_table_rules_filter_before_capture(audit_env, monkeypatch):
+    Session, make, handler = audit_env
+    audit = make(table_rules={"intent_predictions": (logging.DEBUG, 1.0),
+                              "learning_items": (ca.OFF, 1.0)})
+    captured = []
+    monkeypatch.setattr(audit, "_capture", lambda state, op: captured.append(op) or ())
+    with Session() as s:
+        s.add(IntentPrediction(predicted_intent="studying", confidence=0.9))
+        s.add(LearningItem(id="i1", question="q", answer="a"))
+        s.commit()
+    audit.drain()
+
+    # DEBUG is below the target logger's INFO level and OFF is never audited,
+    # so neither row is even captured.
+    assert captured == []
+    assert handler.records == []
+
+
+def test_sample_rate_drops_records(audit_env):
+    Session, make, handler = audit_env
+    rolls = iter([0.05, 0.95, 0.05])
+    audit = make(table_rules={"learning_items": (logging.INFO, 0.1)}, rng=lambda: next(rolls))
+    with Session() as s:
+        for i in range(3):
+            s.add(LearningItem(id=f"i{i}", question="q", answer="a"))
+            s.commit()
+    audit.drain()
+    assert len(handler.records) == 2
+
+
+def test_full_queue_drops_instead_of_blocking(audit_env, monkeypatch):
+    Session, make, handler = audit_env
+    audit = make(queue_size=1)
+    monkeypatch.setattr(audit, "_start", lambda: None)   # no writer: queue stays full
+    audit._thread = object()
+    with Session() as s:
+        for i in range(3):
+            s.add(LearningItem(id=f"i{i}", question="q", answer="a"))
+        s.commit()
+    assert audit.dropped == 2
+    audit._thread = None
+
+
+def test_parse_table_rules():
+    rules = ca.parse_table_rules("intent_predictions=DEBUG@0.1, learning_items=off,bad,x=INFO@7")
+    assert rules == {"intent_predictions": (logging.DEBUG, 0.1),
+                     "learning_items": (ca.OFF, 1.0)}
+
+
+def test_disabled_audit_is_not_installed(monkeypatch):
+    class _Target:
+        pass
+
+    monkeypatch.setattr(ca, "CHANGE_AUDIT_ENABLED", False)
+    assert ca.install_change_audit(_Target) is None
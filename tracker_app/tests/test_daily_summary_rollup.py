@@ -0,0 +1,160 @@
+"""Incremental daily_summary rollup (DailySummaryRepository).
+
+The write paths bump per-day counters in their own transaction; stats
+readers use those rows instead of re-aggregating raw history. rebuild()
+must reproduce exactly what the incremental path wrote.
+"""
+
+from datetime import datetime, timedelta
+from unittest import mock
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from tracker_app.db import models
+from tracker_app.db.models import Base, DailySummary, LearningItem, ReviewHistory
+from tracker_app.db.repository import DailySummaryRepository, TrackingRepository
+from tracker_app.learning.concept_scheduler import ConceptScheduler
+from tracker_app.learning.learning_tracker import LearningTracker
+from tracker_app.tracking.activity_monitor import TrackingAnalytics
+
+
+@pytest.fixture
+def db(monkeypatch):
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    monkeypatch.setattr(models, "_engine", engine)
+    monkeypatch.setattr(models, "_SessionLocal", TestingSessionLocal)
+    monkeypatch.setattr("tracker_app.tracking.knowledge_graph.sync_concept_to_graph",
+                        lambda concept: None)
+    return TestingSessionLocal
+
+
+def _rollup(Session):
+    with Session() as s:
+        return {
+            row.date: {name: getattr(row, name) or 0 for name in DailySummaryRepository.COUNTERS}
+            for row in s.query(DailySummary).all()
+        }
+
+
+def _write_activity():
+    tracker = LearningTracker()
+    mastered = tracker.add_learning_item("What is ATP?", "Energy currency.")
+    other = tracker.add_learning_item("What is DNA?", "Genetic material.")
+    for _ in range(7):
+        tracker.record_review(mastered, 5)
+    tracker.record_review(other, 2)
+
+    scheduler = ConceptScheduler()
+    scheduler.add_concept("photosynthesis", 0.8)
+    scheduler.add_concept("photosynthesis", 0.8)   # same day: still one concept seen
+    scheduler.add_concept("mitochondria", 0.7)
+
+    analytics = TrackingAnalytics()
+    now = datetime.utcnow()
+    analytics.log_session(now - timedelta(minutes=30), now, 4, 60.0, "studying")
+    analytics.log_session(now - timedelta(days=2, minutes=10), now - timedelta(days=2), 2, 40.0, "passive")
+    return now
+
+
+def test_write_paths_bump_counters(db):
+    now = _write_activity()
+    today = _rollup(db)[now.strftime("%Y-%m-%d")]
+
+    assert today["items_added"] == 2
+    assert today["reviews"] == 8
+    assert today["correct_reviews"] == 7
+    assert today["items_mastered"] == 1
+    assert today["concepts_seen"] == 2
+    assert today["sessions"] == 1
+    assert today["total_tracking_minutes"] == pytest.approx(30.0)
+    assert today["attention_sum"] == pytest.approx(60.0)
+
+    two_days_ago = _rollup(db)[(now - timedelta(days=2)).strftime("%Y-%m-%d")]
+    assert two_days_ago["sessions"] == 1
+    assert two_days_ago["concepts_encountered"] == 2
+
+
+def test_rebuild_reproduces_incremental_counters(db):
+    _write_activity()
+    incremental = _rollup(db)
+
+    with db() as s:
+        written = DailySummaryRepository.rebuild(s)
+        s.commit()
+
+    assert written == len(incremental)
+    rebuilt = _rollup(db)
+    assert rebuilt.keys() == incremental.keys()
+    for day, counters in incremental.items():
+        assert rebuilt[day] == pytest.approx(counters), day
+
+
+def test_rebuild_since_leaves_older_days(db):
+    now = _write_activity()
+    old_key = (now - timedelta(days=2)).strftime("%Y-%m-%d")
+    with db() as s:
+        s.query(DailySummary).update({DailySummary.reviews: 99})
+        s.commit()
+        DailySummaryRepository.rebuild(s, since=now.date())
+        s.commit()
+
+    rollup = _rollup(db)
+    assert rollup[old_key]["reviews"] == 99
+    assert rollup[now.strftime("%Y-%m-%d")]["reviews"] == 8
+
+
+def test_learning_today_reads_rollup(db):
+    _write_activity()
+    today = LearningTracker().get_learning_today()
+    assert today == {
+        "reviews_today": 8,
+        "correct_today": 7,
+        "accuracy_today": pytest.approx(87.5),
+        "concepts_studied": 2,
+    }
+
+
+def test_trend_analysis_matches_raw_sessions(db):
+    fixed_now = datetime(2026, 8, 11, 12, 0, 0)
+    cutoff = fixed_now - timedelta(days=7)
+    analytics = TrackingAnalytics()
+    for start, minutes, concepts, attention in (
+        (cutoff + timedelta(hours=3), 10.0, 1, 30.0),    # boundary day, after cutoff
+        (cutoff - timedelta(hours=7), 20.0, 2, 40.0),    # boundary day, before cutoff
+        (cutoff + timedelta(days=1), 30.0, 3, 50.0),
+        (cutoff + timedelta(days=6, hours=1), 40.0, 4, 60.0),
+        (cutoff - timedelta(days=10), 50.0, 5, 70.0),
+    ):
+        analytics.log_session(start, start + timedelta(minutes=minutes), concepts, attention, "studying")
+
+    with db() as s, mock.patch("tracker_app.db.repository._utcnow", return_value=fixed_now):
+        raw = TrackingRepository.get_trend_analysis(s, days=7)
+        rolled = DailySummaryRepository.get_trend_analysis(s, days=7)
+
+    assert rolled["tracking_days"] == raw["tracking_days"] == 3
+    for key in ("avg_session_minutes", "total_concepts_encountered", "avg_attention_score"):
+        assert rolled[key] == pytest.approx(raw[key]), key
+
+
+def test_daily_summary_matches_raw_sessions(db):
+    now = _write_activity()
+    with db() as s:
+        raw = TrackingRepository.get_daily_summary(s, date=now)
+        rolled = DailySummaryRepository.get_daily_summary(s, date=now)
+    assert rolled == pytest.approx(raw)
+
+
+def test_backfill_if_empty_populates_from_raw_tables(db):
+    now = datetime.utcnow()
+    with db() as s:
+        s.add(LearningItem(id="a", question="q", answer="a", created_at=now))
+        s.add(ReviewHistory(item_id="a", timestamp=now, quality_rating=4))
+        s.commit()
+        assert DailySummaryRepository.backfill_if_empty(s) == 1
+        assert DailySummaryRepository.backfill_if_empty(s) == 0
+
+    assert LearningTracker().get_learning_today()["reviews_today"] == 1
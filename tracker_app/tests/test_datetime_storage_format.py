@@ -52,9 +52,12 @@ BOUND = datetime(2026, 8, 13, 10, 0, 0)
 
 # Total migration count tracks the MIGRATIONS registry in
 # tracker_app/db/migrations.py — bump when a migration is appended
-# (currently 13: 001..013 including 011_datetime_storage_format, 012
-# drop_duplicate_feedback_index, and 013_feedback_used_in_training).
-TOTAL_MIGRATIONS = 13
+# (currently 21: 001..021 including 011_datetime_storage_format, 012
+# drop_duplicate_feedback_index, 013_feedback_used_in_training,
+# 014_daily_summary_rollup, 015_streak_state, 016_hot_query_indexes,
+# 017_retention_rollups, 018_learning_items_keyset_index,
+# 019_fts_search, 020_applied_reviews and 021_lambda_calibrated_reviews).
+TOTAL_MIGRATIONS = 21
 
 
 class _FixedUtcnow:
@@ -119,6 +122,8 @@ def test_migration_011_normalizes_t_rows_and_due_query_includes_them(monkeypatch
     _use_db(monkeypatch, db_file)
     monkeypatch.setattr("tracker_app.learning.concept_scheduler.datetime", _FixedUtcnow)
     monkeypatch.setattr("tracker_app.learning.concept_scheduler._utcnow", lambda: BOUND)
+    # The defect lives in the SQL comparison, not the in-memory due queue.
+    monkeypatch.setattr("tracker_app.learning.concept_scheduler.DUE_QUEUE_ENABLED", False)
     try:
         scheduler = ConceptScheduler()
 
@@ -0,0 +1,146 @@
+"""Nearest-neighbour distractor table (knowledge_graph._NearTable).
+
+Every plausible concept keeps its most embedding-similar concepts that are
+neither graph neighbours nor above the edge threshold; add_concepts keeps
+the lists equal to a full build, they survive a save/load, and quizzes on
+sparsely connected concepts draw from them instead of at random.
+"""
+
+import zlib
+
+import numpy as np
+import pytest
+
+from tracker_app.learning.text_quality_validator import is_plausible_concept
+from tracker_app.tracking import knowledge_graph as kg
+from tracker_app.tracking import quiz_engine
+
+
+def _vec(name):
+    return np.random.default_rng(zlib.crc32(name.encode())).normal(size=8)
+
+
+class _HashEncoder:
+    def encode(self, concepts):
+        return np.array([_vec(c) for c in concepts])
+
+
+WORDS = ["osmosis", "diffusion", "glycolysis", "mitosis", "meiosis", "enzyme",
+         "ribosome", "chloroplast", "membrane", "nucleus", "vacuole", "cytoplasm",
+         "lysosome", "centriole", "flagellum", "protein", "nucleotide", "chromatin"]
+# "flagellum" fails is_plausible_concept: it gets no list and is in none.
+
+
+@pytest.fixture
+def graph(monkeypatch, tmp_path):
+    monkeypatch.setattr(kg, "KNOWLEDGE_GRAPH_PATH", str(tmp_path / "graph.json"))
+    monkeypatch.setattr(kg, "_get_embed_model", lambda: _HashEncoder())
+    monkeypatch.setattr(kg, "_fetch_live_memory_scores", lambda concepts: {})
+    original = kg.knowledge_graph.copy()
+    with kg._graph_lock:
+        kg.knowledge_graph.clear()
+        kg._mark_graph_changed()
+        kg._loaded = True
+        kg._last_db_sync = float("inf")
+    yield
+    with kg._graph_lock:
+        kg.knowledge_graph.clear()
+        kg.knowledge_graph.add_nodes_from(original.nodes(data=True))
+        kg.knowledge_graph.add_edges_from(original.edges(data=True))
+        kg._loaded = False
+        kg._last_db_sync = 0.0
+        kg._mark_graph_changed()
+
+
+def _tables():
+    return {n: [m for m, _ in d.get("near", ())]
+            for n, d in kg.knowledge_graph.nodes(data=True)}
+
+
+def _brute_force(name):
+    g = kg.knowledge_graph
+    unit = lambda v: v / np.linalg.norm(v)
+    sims = []
+    if not is_plausible_concept(name):
+        return []
+    for m in g:
+        if m == name or g.has_edge(name, m) or not is_plausible_concept(m):
+            continue
+        sim = float(unit(_vec(name)) @ unit(_vec(m)))
+        if sim <= kg.EDGE_SIMILARITY:
+            sims.append((sim, m))
+    return [m for _, m in sorted(sims, reverse=True)[:kg.DISTRACTOR_TABLE_K]]
+
+
+def test_incremental_lists_match_a_full_build(graph):
+    for start in range(0, len(WORDS), 4):
+        kg.add_concepts(WORDS[start:start + 4])
+    incremental = _tables()
+    assert incremental == {n: _brute_force(n) for n in kg.knowledge_graph}
+
+    report = kg.build_distractor_table()
+    assert report["concepts"] == len(WORDS) - 1
+    assert _tables() == incremental
+
+
+def test_table_is_saved_and_built_for_old_graphs(graph):
+    kg.add_concepts(WORDS[:10])
+    kg._save_graph()
+    expected = _tables()
+
+    with kg._graph_lock:
+        kg.knowledge_graph.clear()
+        assert kg._load_graph_locked()
+    assert _tables() == expected
+
+    with kg._graph_lock:
+        for _, d in kg.knowledge_graph.nodes(data=True):
+            d.pop("near")
+        assert kg._distractor_table_missing()
+        kg._build_distractor_table_locked()
+    assert _tables() == expected
+
+
+def test_removed_and_linked_concepts_leave_the_lists(graph):
+    kg.add_concepts(WORDS)
+    victim = kg.knowledge_graph.nodes["osmosis"]["near"][0][0]
+    kg.remove_concept_from_graph(victim)
+    assert all(victim not in names for names in _tables().values())
+
+    other = kg.knowledge_graph.nodes["osmosis"]["near"][0][0]
+    with kg._graph_lock:
+        kg._on_edge_changed("osmosis", other, True)
+        kg.knowledge_graph.add_edge("osmosis", other, weight=0.8)
+        kg._mark_graph_changed(stats_kept=True)
+    assert other not in _tables()["osmosis"]
+    assert "osmosis" not in _tables()[other]
+
+
+def test_sparse_concept_quiz_uses_nearest_neighbours(graph):
+    kg.add_concepts(WORDS)
+    with kg._graph_lock:
+        kg.knowledge_graph.remove_edges_from(list(kg.knowledge_graph.edges()))
+        node = kg.knowledge_graph.nodes["glycolysis"]
+        node["memory_score"] = 0.01
+        kg._mark_graph_changed()
+    nearest = [m for m, _ in kg.knowledge_graph.nodes["glycolysis"]["near"][:3]]
+    for _ in range(10):
+        quiz = quiz_engine.generate_micro_quiz()
+        assert quiz["concept"] == "glycolysis"
+        assert quiz["distractors"] == nearest
+
+
+def test_lists_refill_after_neighbours_leave(graph):
+    kg.add_concepts(WORDS)
+    for _ in range(3):
+        victim = kg.knowledge_graph.nodes["osmosis"]["near"][0][0]
+        kg.remove_concept_from_graph(victim)
+    other = kg.knowledge_graph.nodes["osmosis"]["near"][0][0]
+    with kg._graph_lock:
+        kg._on_edge_changed("osmosis", other, True)
+        kg.knowledge_graph.add_edge("osmosis", other, weight=0.8)
+        kg._mark_graph_changed(stats_kept=True)
+
+    expected = {n: _brute_force(n) for n in kg.knowledge_graph}
+    assert _tables() == expected
+    assert len(expected["osmosis"]) == kg.DISTRACTOR_TABLE_K
@@ -0,0 +1,133 @@
+"""In-memory due queues (learning/due_queue.py).
+
+Reads must match the SQL due queries they replace, the write hooks must
+keep the queue current without touching SQLite on the read path, and
+rows written behind the queue's back must be corrected by the item read
+or by reconciliation.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from tracker_app.db import models
+from tracker_app.db.models import Base, LearningItem, TrackedConcept
+from tracker_app.learning import concept_scheduler, learning_tracker
+from tracker_app.learning.concept_scheduler import ConceptScheduler
+from tracker_app.learning.due_queue import DueQueue, concept_queue, item_queue
+from tracker_app.learning.learning_tracker import LearningTracker
+
+
+@pytest.fixture
+def db(monkeypatch, tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'due.db'}")
+    Base.metadata.create_all(bind=engine)
+    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    monkeypatch.setattr(models, "_engine", engine)
+    monkeypatch.setattr(models, "_SessionLocal", TestingSessionLocal)
+    statements = []
+    event.listen(engine, "before_cursor_execute",
+                 lambda conn, cur, stmt, *a: statements.append(stmt))
+    TestingSessionLocal.statements = statements
+    yield TestingSessionLocal
+    engine.dispose()
+
+
+def _seed_concepts(db, n=60):
+    now = datetime.utcnow()
+    with db() as s:
+        for i in range(n):
+            s.add(TrackedConcept(
+                concept=f"c{i}", relevance_score=(i * 7 % n) / n,
+                next_review=now + timedelta(hours=i - n // 2),
+                status="archived" if i % 9 == 0 else "discovered",
+            ))
+        s.add(TrackedConcept(concept="unscheduled", next_review=None))
+        s.commit()
+
+
+def test_heap_updates_discards_and_reads_without_consuming():
+    t0 = datetime(2026, 1, 1)
+    q = DueQueue("test", lambda db: [("a", t0, 1), ("b", t0 + timedelta(hours=2), 2)])
+    q.reconcile()
+    assert [k for k, _, _ in q.due(t0 + timedelta(hours=1))] == ["a"]
+    assert [k for k, _, _ in q.due(t0 + timedelta(hours=1))] == ["a"]   # unchanged
+
+    q.upsert("b", t0 - timedelta(hours=1), 3)        # rescheduled earlier
+    q.upsert("c", t0 + timedelta(minutes=30))
+    q.discard("a")
+    assert q.due(t0 + timedelta(hours=3)) == [("b", t0 - timedelta(hours=1), 3),
+                                              ("c", t0 + timedelta(minutes=30), None)]
+    assert [k for k, _, _ in q.pop_due(t0 + timedelta(hours=3), limit=1)] == ["b"]
+    assert len(q) == 1 and q.due(t0 + timedelta(hours=3))[0][0] == "c"
+    assert q.due(t0) == []                           # an earlier instant still works
+    assert q.due(t0 + timedelta(hours=1))[0][0] == "c"
+
+    for i in range(500):                             # dead entries get compacted
+        q.upsert("c", t0 + timedelta(seconds=i))
+    assert len(q._heap) <= 2 * len(q) + 64
+
+
+def test_due_concepts_match_sql_fallback(db, monkeypatch):
+    _seed_concepts(db)
+    scheduler = ConceptScheduler()
+    from_queue = scheduler.get_due_concepts(limit=1000)
+    monkeypatch.setattr(concept_scheduler, "DUE_QUEUE_ENABLED", False)
+    from_sql = scheduler.get_due_concepts(limit=1000)
+    assert from_queue == from_sql and len(from_queue) > 10
+    monkeypatch.setattr(concept_scheduler, "DUE_QUEUE_ENABLED", True)
+    assert scheduler.get_due_concepts(limit=5) == from_sql[:5]
+
+
+def test_concept_hooks_keep_queue_current_without_reads(db):
+    scheduler = ConceptScheduler()
+    assert scheduler.get_due_concepts() == []        # loads the (empty) queue
+    db.statements.clear()
+
+    scheduler.add_concept("photosynthesis", 0.9)
+    assert [c["id"] for c in scheduler.get_due_concepts()] == ["photosynthesis"]
+    scheduler.schedule_next_review("photosynthesis", quality=5)
+    assert scheduler.get_due_concepts() == []
+
+    # The writes (and their graph sync) look rows up by key; nothing scans
+    # the table for due concepts.
+    assert not [s for s in db.statements if "tracked_concepts.next_review <=" in s
+                or "FROM tracked_concepts ORDER BY" in s.replace("\n", " ")]
+
+
+def test_reconcile_picks_up_rows_written_elsewhere(db, monkeypatch):
+    scheduler = ConceptScheduler()
+    assert scheduler.get_due_concepts() == []
+    with db() as s:                                  # e.g. the other process
+        s.add(TrackedConcept(concept="external", next_review=datetime.utcnow()))
+        s.commit()
+    assert scheduler.get_due_concepts() == []        # not reconciled yet
+    monkeypatch.setattr(concept_queue, "reconcile_seconds", 0)
+    assert [c["id"] for c in scheduler.get_due_concepts()] == ["external"]
+
+
+def test_items_due_follow_hooks_and_self_correct(db, monkeypatch):
+    tracker = LearningTracker()
+    first = tracker.add_learning_item("Q1?", "A1")
+    second = tracker.add_learning_item("Q2?", "A2")
+    assert {i["id"] for i in tracker.get_items_due()} == {first, second}
+
+    tracker.record_review(first, quality_rating=5)
+    assert [i["id"] for i in tracker.get_items_due()] == [second]
+
+    # Archived behind the queue's back: the read notices and drops it.
+    with db() as s:
+        s.get(LearningItem, second).status = "archived"
+        s.commit()
+    assert tracker.get_items_due() == []
+    assert len(item_queue) == 1
+
+    tracker.unarchive_item(second)
+    assert [i["id"] for i in tracker.get_items_due()] == [second]
+    tracker.delete_item(second)
+    assert tracker.get_items_due() == []
+
+    monkeypatch.setattr(learning_tracker, "DUE_QUEUE_ENABLED", False)
+    assert tracker.get_items_due() == []
@@ -32,9 +32,12 @@ from tracker_app.db.migrations import ensure_base_schema, run_migrations
 
 # Total migration count tracks the MIGRATIONS registry in
 # tracker_app/db/migrations.py — bump when a migration is appended
-# (currently 13: 001..013 including 012_drop_duplicate_feedback_index and
-# 013_feedback_used_in_training).
-TOTAL_MIGRATIONS = 13
+# (currently 21: 001..021 including 012_drop_duplicate_feedback_index,
+# 013_feedback_used_in_training, 014_daily_summary_rollup,
+# 015_streak_state, 016_hot_query_indexes,
+# 017_retention_rollups, 018_learning_items_keyset_index,
+# 019_fts_search, 020_applied_reviews and 021_lambda_calibrated_reviews).
+TOTAL_MIGRATIONS = 21
 
 # The single index the ORM auto-creates for FeedbackTrainingSample.timestamp
 # (declarative_base() default naming: "ix_<table>_<column>").
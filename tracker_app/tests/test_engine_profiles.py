@@ -0,0 +1,103 @@
+"""SQLite engine profiles (db/engine_profiles.py, models.configure_engine).
+
+The tuned profiles must apply the cache/mmap/temp_store/busy_timeout PRAGMAs
+on every new connection, use an SQLite-appropriate pool and skip pre-ping;
+'legacy' keeps the old configuration for the benchmark.
+"""
+
+import threading
+
+from sqlalchemy import text
+from sqlalchemy.pool import QueuePool
+
+from tracker_app.config import SQLITE_BUSY_TIMEOUT_MS, SQLITE_CACHE_SIZE_KB, SQLITE_MMAP_SIZE
+from tracker_app.db import models
+from tracker_app.db.engine_profiles import DEFAULT_PROFILE, build_engine, resolve_profile
+
+
+def _pragma(engine, name):
+    with engine.connect() as conn:
+        return conn.exec_driver_sql(f"PRAGMA {name}").scalar()
+
+
+def test_tuned_profiles_apply_pragmas(tmp_path):
+    for profile, pool_cls in (("tracker", QueuePool), ("dashboard", QueuePool)):
+        engine = build_engine(f"sqlite:///{tmp_path / (profile + '.db')}", profile)
+        try:
+            assert isinstance(engine.pool, pool_cls)
+            assert not engine.pool._pre_ping
+            assert _pragma(engine, "journal_mode") == "wal"
+            assert _pragma(engine, "foreign_keys") == 1
+            assert _pragma(engine, "synchronous") == 1          # NORMAL
+            assert _pragma(engine, "cache_size") == -SQLITE_CACHE_SIZE_KB
+            assert _pragma(engine, "temp_store") == 2           # MEMORY
+            assert _pragma(engine, "busy_timeout") == SQLITE_BUSY_TIMEOUT_MS
+            # mmap_size is capped by the SQLite build, never above the request.
+            assert 0 <= _pragma(engine, "mmap_size") <= SQLITE_MMAP_SIZE
+        finally:
+            engine.dispose()
+
+
+def test_legacy_profile_keeps_old_settings(tmp_path):
+    engine = build_engine(f"sqlite:///{tmp_path / 'legacy.db'}", "legacy")
+    try:
+        assert engine.pool._pre_ping
+        assert _pragma(engine, "journal_mode") == "wal"
+        assert _pragma(engine, "temp_store") == 0           # untouched default
+    finally:
+        engine.dispose()
+
+
+def test_unknown_profile_falls_back_to_default():
+    assert resolve_profile("Tracker ") == "tracker"
+    assert resolve_profile("turbo") == DEFAULT_PROFILE
+
+
+def test_configure_engine_rebuilds_with_new_profile(monkeypatch, tmp_path):
+    monkeypatch.setenv("FKT_TEST_DB", str(tmp_path / "configured.db"))
+    monkeypatch.setattr(models, "_engine", None)
+    monkeypatch.setattr(models, "_SessionLocal", None)
+    monkeypatch.setattr(models, "_engine_profile", models._engine_profile)
+
+    models.configure_engine("dashboard")
+    first = models.get_engine()
+    assert isinstance(first.pool, QueuePool)
+
+    models.configure_engine("tracker")
+    second = models.get_engine()
+    try:
+        assert second is not first
+        assert isinstance(second.pool, QueuePool)
+        assert second.pool.size() > first.pool.size()
+    finally:
+        second.dispose()
+
+
+def test_tracker_pool_survives_more_threads_than_its_size(tmp_path):
+    engine = build_engine(f"sqlite:///{tmp_path / 'threads.db'}", "tracker")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE t (thread INTEGER, i INTEGER)"))
+    n_threads = engine.pool.size() + 6
+    start, errors = threading.Barrier(n_threads), []
+
+    def worker(k):
+        try:
+            start.wait()
+            for i in range(20):
+                with engine.begin() as conn:
+                    conn.execute(text("INSERT INTO t VALUES (:k, :i)"), {"k": k, "i": i})
+                    conn.execute(text("SELECT count(*) FROM t")).scalar()
+        except Exception as e:           # pragma: no cover - the failure mode
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(k,)) for k in range(n_threads)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    try:
+        assert errors == []
+        with engine.connect() as conn:
+            assert conn.execute(text("SELECT count(*) FROM t")).scalar() == n_threads * 20
+    finally:
+        engine.dispose()
@@ -0,0 +1,158 @@
+"""Tracker <-> dashboard event bus (tracking/event_bus.py).
+
+Events published on one side of the Unix socket reach the other side's
+subscribers (and only the other side's, for remote_only ones), the tracker
+reconnects to a restarted dashboard (even when dropped while connecting), and a captured concept reaches the
+dashboard's graph and due-queue invalidation hooks.
+"""
+
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from tracker_app.tracking import event_bus
+from tracker_app.tracking import knowledge_graph as kg
+
+pytestmark = pytest.mark.skipif(not event_bus.available(), reason="no AF_UNIX")
+
+
+def _wait(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return predicate()
+
+
+class _Inbox:
+    def __init__(self):
+        self.items = []
+        self.arrived = threading.Event()
+
+    def __call__(self, data):
+        self.items.append(data)
+        self.arrived.set()
+
+
+@pytest.fixture
+def bus(monkeypatch):
+    # AF_UNIX paths are limited to ~100 bytes: keep it short.
+    path = str(Path(tempfile.mkdtemp(prefix="fkt")) / "bus.sock")
+    started, subscribed = [], []
+
+    def server():
+        s = event_bus.EventBusServer(path).start()
+        started.append(s)
+        return s
+
+    def client():
+        c = event_bus.EventBusClient(path).start()
+        started.append(c)
+        assert _wait(lambda: c.peer_count() == 1)
+        return c
+
+    def subscribe(topic, remote_only=False):
+        inbox = _Inbox()
+        event_bus.subscribe(topic, inbox, remote_only=remote_only)
+        subscribed.append((topic, inbox))
+        return inbox
+
+    monkeypatch.setattr(event_bus, "_endpoint", None)
+    yield server, client, subscribe, path
+    for endpoint in reversed(started):
+        endpoint.stop()
+    for topic, inbox in subscribed:
+        event_bus.unsubscribe(topic, inbox)
+
+
+def test_tracker_events_reach_dashboard_subscribers(bus):
+    start_server, start_client, subscribe, _ = bus
+    server = start_server()
+    start_client()                      # publish() now goes through the client
+    remote = subscribe(event_bus.QUIZ, remote_only=True)
+    assert _wait(lambda: server.peer_count() == 1)
+
+    quiz = {"concept": "osmosis", "all_options": ["osmosis", "a", "b", "c"]}
+    assert event_bus.publish(event_bus.QUIZ, quiz) is True
+    assert remote.arrived.wait(5)
+    assert remote.items == [quiz]       # once: the local delivery skipped it
+
+
+def test_dashboard_events_reach_the_tracker(bus, monkeypatch):
+    start_server, start_client, subscribe, _ = bus
+    server = start_server()
+    start_client()
+    inbox = subscribe(event_bus.SESSION, remote_only=True)
+    assert _wait(lambda: server.peer_count() == 1)
+
+    monkeypatch.setattr(event_bus, "_endpoint", server)     # publish as the dashboard
+    assert event_bus.publish(event_bus.SESSION, {"active": True, "version": 4})
+    assert inbox.arrived.wait(5)
+    assert inbox.items == [{"active": True, "version": 4}]
+
+
+def test_client_reconnects_to_a_restarted_dashboard(bus):
+    start_server, start_client, subscribe, path = bus
+    first = start_server()
+    client = start_client()
+    first.stop()
+    assert _wait(lambda: client.peer_count() == 0)
+    assert event_bus.publish(event_bus.GRAPH_UPDATED, {"nodes": 1}) is False
+
+    second = start_server()
+    assert second is not None
+    assert _wait(lambda: client.peer_count() == 1, timeout=10)
+    event_bus._endpoint = client
+    inbox = subscribe(event_bus.GRAPH_UPDATED, remote_only=True)
+    assert event_bus.publish(event_bus.GRAPH_UPDATED, {"nodes": 2})
+    assert inbox.arrived.wait(5) and inbox.items == [{"nodes": 2}]
+
+
+def test_client_reconnects_after_a_drop_during_connect(bus, monkeypatch):
+    start_server, start_client, _, _ = bus
+    server = start_server()
+    real_start, dropped = event_bus._Peer.start, []
+
+    def start_then_drop(peer):
+        real_start(peer)
+        if peer.name == "fkt-event-bus" and not dropped:    # the client's side
+            dropped.append(peer)
+            peer.close()
+        return peer
+
+    monkeypatch.setattr(event_bus._Peer, "start", start_then_drop)
+    client = start_client()
+    assert _wait(lambda: dropped and client._peer not in (None, dropped[0])
+                 and client.peer_count() == 1)
+    assert _wait(lambda: server.peer_count() == 1)
+
+
+def test_server_replaces_stale_socket_but_not_a_live_one(bus):
+    start_server, _, _, path = bus
+    Path(path).write_text("left behind by a crash")
+    assert start_server() is not None
+    assert event_bus.EventBusServer(path).start() is None
+
+
+def test_without_a_peer_only_local_subscribers_see_events(bus):
+    _, _, subscribe, _ = bus
+    local = subscribe(event_bus.CONCEPT_CAPTURED)
+    remote = subscribe(event_bus.CONCEPT_CAPTURED, remote_only=True)
+    assert event_bus.publish(event_bus.CONCEPT_CAPTURED, {"concepts": ["x"]}) is False
+    assert local.items == [{"concepts": ["x"]}] and remote.items == []
+    with pytest.raises(ValueError):
+        event_bus.publish("nonsense", {})
+
+
+def test_captured_concepts_queue_a_graph_sync(bus, monkeypatch):
+    start_server, start_client, _, _ = bus
+    server = start_server()
+    start_client()
+    assert _wait(lambda: server.peer_count() == 1)
+    monkeypatch.setattr(kg, "_external_concepts", set())
+
+    event_bus.publish(event_bus.CONCEPT_CAPTURED,
+                      {"concepts": ["photosynthesis", ""], "source": "ocr"})
+    assert _wait(lambda: kg._external_concepts == {"photosynthesis"})
@@ -29,6 +29,7 @@ class _NullSession:
 @pytest.fixture
 def monitor(monkeypatch):
     monkeypatch.setattr(activity_monitor, "SessionLocal", _NullSession)
+    monkeypatch.setattr(activity_monitor, "publish_snapshot", lambda: True)
     monitor = ActivityMonitor()
     monitor.scheduler = types.SimpleNamespace(get_due_concepts=lambda limit: [])
     monitor.validator = types.SimpleNamespace(get_accuracy_stats=lambda: {})
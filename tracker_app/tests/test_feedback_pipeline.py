@@ -165,6 +165,7 @@ class TestFeatureVectorJsonContract(FeedbackPipelineBase):
         validator = IntentValidator()
         validator.log_prediction('idle', 0.5, context='Some Window Title',
                                  features=None)
+        validator.flush()
 
         with self.TestingSessionLocal() as db:
             pred = db.query(IntentPrediction).first()
@@ -222,6 +223,7 @@ class TestFeatureVectorJsonContract(FeedbackPipelineBase):
         validator = IntentValidator()
         validator.log_prediction('studying', 0.9, context='FKT - Antigravity IDE',
                                  features=feats)
+        validator.flush()
 
         with self.TestingSessionLocal() as db:
             pred = db.query(IntentPrediction).first()
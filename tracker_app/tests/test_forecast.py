@@ -0,0 +1,123 @@
+"""Review-load forecast (learning/forecast.py, GET /stats/forecast).
+
+Items bucket on their SM-2 date; concepts on the sooner of their SM-2 date
+and AWFC threshold crossing; anything already due before today is counted
+once as overdue; archived and inactive rows are left out.
+"""
+
+import math
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from tracker_app.config import MEMORY_THRESHOLD
+from tracker_app.db import models
+from tracker_app.db.models import Base, LearningItem, TrackedConcept
+from tracker_app.learning.forecast import review_forecast
+
+NOW = datetime(2026, 10, 18, 15, 0, 0)
+TODAY = datetime(2026, 10, 18)
+
+
+@pytest.fixture
+def db(monkeypatch, tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'forecast.db'}")
+    Base.metadata.create_all(bind=engine)
+    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    monkeypatch.setattr(models, "_engine", engine)
+    monkeypatch.setattr(models, "_SessionLocal", TestingSessionLocal)
+    yield TestingSessionLocal
+    engine.dispose()
+
+
+def _item(i, due, status="active"):
+    return LearningItem(id=f"item-{i}", question=f"q{i}", answer="a",
+                        next_review_date=due, status=status)
+
+
+def _concept(name, last_seen, next_review, lam=0.001, status="discovered"):
+    # attention 50 damps lambda by 15%: lambda_p = 0.85 * lam.
+    return TrackedConcept(concept=name, last_seen=last_seen, next_review=next_review,
+                          attention_at_encoding=50, lambda_personalised=lam, status=status)
+
+
+def _hours_to_threshold(lam):
+    return math.log(1 / MEMORY_THRESHOLD) / (lam * 0.85)
+
+
+def test_items_bucket_by_day_with_overdue_separate(db):
+    with db() as s:
+        s.add_all([
+            _item(1, TODAY - timedelta(days=3)),
+            _item(2, TODAY + timedelta(hours=1)),
+            _item(3, TODAY + timedelta(hours=23, minutes=59)),
+            _item(4, TODAY + timedelta(days=2, hours=8)),
+            _item(5, TODAY + timedelta(days=7)),                 # past the window
+            _item(6, TODAY + timedelta(days=1), status="mastered"),
+        ])
+        s.commit()
+        forecast = review_forecast(s, days=7, now=NOW)
+    assert [d["date"] for d in forecast["days"]][:3] == ["2026-10-18", "2026-10-19",
+                                                         "2026-10-20"]
+    assert [d["items"] for d in forecast["days"]] == [2, 0, 1, 0, 0, 0, 0]
+    assert forecast["overdue"]["items"] == 1
+    assert all(d["total"] == d["items"] for d in forecast["days"])
+
+
+def test_concepts_due_at_sooner_of_sm2_and_decay(db):
+    fast = 0.05           # crosses 0.6 about 12 h after last_seen
+    with db() as s:
+        s.add_all([
+            # SM-2 date comes first.
+            _concept("sm2", NOW, TODAY + timedelta(days=1, hours=3)),
+            # Decay crosses (~12 h -> tomorrow 03:00) before the SM-2 date.
+            _concept("decay", NOW, TODAY + timedelta(days=5), lam=fast),
+            # No SM-2 date at all: decay alone.
+            _concept("unscheduled", NOW - timedelta(hours=2), None, lam=fast),
+            # Already below the threshold: overdue.
+            _concept("faded", NOW - timedelta(days=3), TODAY + timedelta(days=4), lam=fast),
+            _concept("archived", NOW, TODAY + timedelta(hours=20), status="archived"),
+        ])
+        s.commit()
+        forecast = review_forecast(s, days=3, now=NOW)
+    hours = _hours_to_threshold(fast)
+    assert 11 < hours < 13
+    assert [d["concepts"] for d in forecast["days"]] == [0, 3, 0]
+    assert forecast["overdue"]["concepts"] == 1
+    assert forecast["concepts_due_by_decay"] == 2
+
+
+def test_empty_database(db):
+    with db() as s:
+        forecast = review_forecast(s, days=5, now=NOW)
+    assert len(forecast["days"]) == 5
+    assert all(d["total"] == 0 for d in forecast["days"])
+    assert forecast["overdue"] == {"items": 0, "concepts": 0, "total": 0}
+
+
+def test_forecast_endpoint(db):
+    now = datetime.utcnow()
+    with db() as s:
+        s.add_all([
+            _item(1, now - timedelta(days=2)),
+            _item(2, now + timedelta(days=3)),
+            _concept("c", now, now + timedelta(days=3)),
+        ])
+        s.commit()
+    from tracker_app.web.app import app
+    app.config['TESTING'] = True
+    client = app.test_client()
+
+    body = client.get("/api/v1/stats/forecast?days=10").get_json()
+    assert body['success']
+    data = body['data']
+    assert len(data['days']) == 10
+    assert sum(d['total'] for d in data['days']) == 2
+    assert data['overdue']['total'] == 1
+
+    assert len(client.get("/api/v1/stats/forecast").get_json()['data']['days']) == 14
+    assert client.get("/api/v1/stats/forecast?days=0").status_code == 400
+    assert client.get("/api/v1/stats/forecast?days=91").status_code == 400
+    assert client.get("/api/v1/stats/forecast?days=x").status_code == 400
@@ -0,0 +1,180 @@
+"""FTS5 search over learning items and tracked concepts (db/fts.py, migration 019).
+
+The index must follow inserts, edits and deletes through its triggers on
+both migrated and create_all databases, back-fill rows that predate the
+migration, rank question hits above answer hits, match word prefixes and
+never pass user-typed FTS5 syntax through to the query parser.
+"""
+
+import sqlite3
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from tracker_app.db import models
+from tracker_app.db.fts import FTS_DROP, match_query
+from tracker_app.db.migrations import run_migrations
+from tracker_app.db.models import Base, LearningItem, TrackedConcept
+from tracker_app.db.repository import LearningRepository, SearchRepository
+from tracker_app.web.app import app
+
+
+def _item(i, question, answer, status="active"):
+    return LearningItem(id=f"item-{i}", question=question, answer=answer,
+                        tags='["ml"]' if i % 2 else '[]', status=status)
+
+
+@pytest.fixture(params=["migrated", "create_all"])
+def db(request, monkeypatch, tmp_path):
+    path = tmp_path / "fts.db"
+    if request.param == "migrated":
+        result = run_migrations(db_path=str(path))
+        assert result["failed"] == 0, result["errors"]
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    monkeypatch.setattr(models, "_engine", engine)
+    monkeypatch.setattr(models, "_SessionLocal", TestingSessionLocal)
+
+    with TestingSessionLocal() as s:
+        s.add_all([
+            _item(1, "What is Bayes theorem?", "P(A|B) = P(B|A)P(A)/P(B)"),
+            _item(2, "Define posterior", "Probability after observing evidence, via Bayes"),
+            _item(3, "Python list comprehension", "[x for x in xs]"),
+            _item(4, "Bayesian networks", "Directed graphical models", status="archived"),
+            TrackedConcept(concept="bayesian inference", context_tags="statistics"),
+            TrackedConcept(concept="gradient descent", context_tags="optimisation bayes"),
+        ])
+        s.commit()
+    yield TestingSessionLocal
+    engine.dispose()
+
+
+def _ids(results):
+    return [obj.id for obj, _ in results]
+
+
+def test_prefix_match_ranks_question_over_answer_and_skips_archived(db):
+    with db() as s:
+        results = SearchRepository.search_items(s, "bay")
+    assert _ids(results) == ["item-1", "item-2"]
+    assert results[0][1] > results[1][1] > 0
+
+
+def test_all_terms_must_match(db):
+    with db() as s:
+        assert _ids(SearchRepository.search_items(s, "bayes theorem")) == ["item-1"]
+        assert SearchRepository.search_items(s, "bayes python") == []
+
+
+def test_concepts_search_weights_name_over_tags(db):
+    with db() as s:
+        results = SearchRepository.search_concepts(s, "bayes")
+    assert [c.concept for c, _ in results] == ["bayesian inference", "gradient descent"]
+
+
+def test_triggers_follow_insert_update_delete(db):
+    with db() as s:
+        s.add(_item(5, "Quicksort pivot", "Partition around a pivot"))
+        s.commit()
+        assert _ids(SearchRepository.search_items(s, "quicks")) == ["item-5"]
+
+        item = s.get(LearningItem, "item-5")
+        item.question = "Mergesort split"
+        s.commit()
+        assert SearchRepository.search_items(s, "quicks") == []
+        assert _ids(SearchRepository.search_items(s, "merges")) == ["item-5"]
+
+        # Scheduling updates must not touch the index.
+        item.interval = 6
+        s.commit()
+        assert _ids(SearchRepository.search_items(s, "merges")) == ["item-5"]
+
+        s.delete(item)
+        s.delete(s.get(TrackedConcept, "gradient descent"))
+        s.commit()
+        assert SearchRepository.search_items(s, "merges") == []
+        assert SearchRepository.search_concepts(s, "gradient") == []
+
+
+def test_archiving_takes_items_out_of_the_index(db):
+    with db() as s:
+        item = s.get(LearningItem, "item-1")
+        item.status = "archived"
+        s.commit()
+        assert _ids(SearchRepository.search_items(s, "bayes")) == ["item-2"]
+        item.status = "active"
+        s.commit()
+        assert _ids(SearchRepository.search_items(s, "bayes")) == ["item-1", "item-2"]
+        s.get(LearningItem, "item-4").status = "mastered"
+        s.commit()
+        assert "item-4" in _ids(SearchRepository.search_items(s, "bayes"))
+
+
+def test_unselective_terms_rank_only_the_newest_window(db, monkeypatch):
+    from tracker_app.db import repository
+    monkeypatch.setattr(repository, "RANK_WINDOW", 2)
+    with db() as s:
+        s.add(_item(6, "Bayes again", "newest"))
+        s.commit()
+        # Matches: item-1, item-2, item-6; only the newest two are ranked.
+        assert _ids(SearchRepository.search_items(s, "bayes")) == ["item-6", "item-2"]
+
+
+def test_user_syntax_is_quoted(db):
+    assert match_query('foo AND "bar NEAR(') == '"foo"* "AND"* "bar"* "NEAR"*'
+    assert match_query("  ++ ") == ""
+    assert match_query("x y2") == '"x" "y2"*'
+    with db() as s:
+        for q in ('bayes OR python', '"bayes', 'NEAR(bayes', 'col:bayes', '*'):
+            SearchRepository.search_items(s, q)   # must not raise
+
+
+def test_item_listing_search_uses_index_with_like_fallback(db):
+    with db() as s:
+        items, _ = LearningRepository.search_items(s, "poster")
+        assert [i.id for i in items] == ["item-2"]
+        items, _ = LearningRepository.search_items(s, "|")   # no word: substring LIKE
+        assert [i.id for i in items] == ["item-1"]
+
+
+def test_search_endpoint(db):
+    app.config['TESTING'] = True
+    client = app.test_client()
+    body = client.get("/api/v1/search?q=bayes").get_json()
+    assert body['success']
+    assert [i['id'] for i in body['data']['items']] == ["item-1", "item-2"]
+    assert [c['concept'] for c in body['data']['concepts']] == ["bayesian inference",
+                                                                  "gradient descent"]
+    body = client.get("/api/v1/search?q=bayes&scope=concepts&limit=1").get_json()
+    assert list(body['data']) == ['concepts'] and len(body['data']['concepts']) == 1
+
+    assert client.get("/api/v1/search").status_code == 400
+    assert client.get("/api/v1/search?q=x&scope=graph").status_code == 400
+    assert client.get("/api/v1/search?q=x&limit=500").status_code == 400
+
+
+def test_migration_backfills_existing_rows(tmp_path):
+    path = tmp_path / "old.db"
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    engine.dispose()
+    conn = sqlite3.connect(path)
+    for ddl in FTS_DROP:   # a pre-019 database: no index, no triggers
+        conn.execute(ddl)
+    conn.execute("INSERT INTO learning_items (id, question, answer, status, created_at) "
+                 "VALUES ('old', 'Legacy eigenvalue card', 'lambda', 'active', '2025-01-01')")
+    conn.commit()
+    conn.close()
+
+    result = run_migrations(db_path=str(path))
+    assert result["failed"] == 0, result["errors"]
+
+    conn = sqlite3.connect(path)
+    try:
+        rows = conn.execute("SELECT item_id FROM learning_items_fts "
+                            "WHERE learning_items_fts MATCH ?", (match_query("eigen"),)).fetchall()
+    finally:
+        conn.close()
+    assert rows == [("old",)]
@@ -0,0 +1,138 @@
+"""Running graph statistics (knowledge_graph._GraphStats).
+
+get_graph_stats must serve the same answer from the hook-maintained
+aggregates as a full recount would, without recounting on the hooked
+paths, and must notice mutations that bypass the hooks.
+"""
+
+import random
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from tracker_app.db import models
+from tracker_app.db.models import Base, TrackedConcept
+from tracker_app.tracking import knowledge_graph as kg
+
+
+class _GroupEncoder:
+    """Concepts named 'g<k>-...' share a direction: same group, one edge."""
+
+    def encode(self, concepts):
+        out = []
+        for c in concepts:
+            v = np.zeros(16)
+            v[int(c.split("-")[0][1:]) % 8] = 1.0
+            v[8 + sum(map(ord, c)) % 8] = 0.2
+            out.append(v)
+        return np.array(out)
+
+
+@pytest.fixture
+def graph(monkeypatch, tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'stats.db'}")
+    Base.metadata.create_all(bind=engine)
+    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    monkeypatch.setattr(models, "_engine", engine)
+    monkeypatch.setattr(models, "_SessionLocal", TestingSessionLocal)
+    monkeypatch.setattr(kg, "KNOWLEDGE_GRAPH_PATH", str(tmp_path / "graph.json"))
+    monkeypatch.setattr(kg, "_get_embed_model", lambda: _GroupEncoder())
+    original = kg.knowledge_graph.copy()
+    with kg._graph_lock:
+        kg.knowledge_graph.clear()
+        kg._mark_graph_changed()
+        kg._loaded = True
+        kg._last_db_sync = float("inf")      # no periodic DB reconcile mid-test
+    yield TestingSessionLocal
+    with kg._graph_lock:
+        kg.knowledge_graph.clear()
+        kg.knowledge_graph.add_nodes_from(original.nodes(data=True))
+        kg.knowledge_graph.add_edges_from(original.edges(data=True))
+        kg._loaded = False
+        kg._last_db_sync = 0.0
+        kg._mark_graph_changed()
+    engine.dispose()
+
+
+def _recounted():
+    with kg._graph_lock:
+        kg._stats.version = -1
+    return kg.get_graph_stats()
+
+
+def _seed(db, names, rng):
+    now = datetime.utcnow()
+    with db() as s:
+        for name in names:
+            s.merge(TrackedConcept(concept=name, attention_at_encoding=50,
+                                   lambda_personalised=rng.uniform(0.01, 0.5),
+                                   last_seen=now - timedelta(hours=rng.uniform(0, 24))))
+        s.commit()
+
+
+def test_hooked_mutations_match_a_full_recount(graph, monkeypatch):
+    rng = random.Random(7)
+    rebuilds = []
+    real_rebuild = kg._stats.rebuild
+    monkeypatch.setattr(kg._stats, "rebuild", lambda: (rebuilds.append(1), real_rebuild()))
+
+    names = [f"g{i % 6}-{i}" for i in range(40)]
+    _seed(graph, names, rng)
+    kg.get_graph_stats()
+    rebuilds.clear()
+
+    for step in range(30):
+        op = rng.random()
+        if op < 0.4:
+            kg.add_concepts(rng.sample(names, 5))
+        elif op < 0.7:
+            _seed(graph, rng.sample(names, 8), rng)
+            kg._refresh_all_memory_scores(names)
+        elif op < 0.85:
+            kg.sync_concept_to_graph(rng.choice(names))
+        else:
+            kg.remove_concept_from_graph(rng.choice(list(kg.knowledge_graph) or names))
+
+        stats = kg.get_graph_stats()
+        assert rebuilds == []           # served from the hook-maintained stats
+        assert stats["total_nodes"] == kg.knowledge_graph.number_of_nodes()
+        assert stats["total_edges"] == kg.knowledge_graph.number_of_edges()
+        expected = _recounted()
+        assert stats["top_concepts"] == expected["top_concepts"]
+        assert stats["nodes"] == expected["nodes"]
+        assert stats["edges"] == expected["edges"]
+        assert stats["avg_memory_score"] == pytest.approx(expected["avg_memory_score"], abs=1e-4)
+        assert stats["density"] == expected["density"]
+        rebuilds.clear()
+
+    assert kg.knowledge_graph.number_of_edges() > 0
+
+
+def test_top_concept_score_drop_refills_the_heap(graph):
+    with kg._graph_lock:
+        for i in range(15):
+            kg.knowledge_graph.add_node(f"g0-{i}", memory_score=i / 20)
+        kg._mark_graph_changed()
+    assert kg.get_graph_stats()["top_concepts"][0] == "g0-14"
+
+    with kg._graph_lock:
+        kg._stats.score_changed("g0-14", 0.7, 0.0)
+        kg.knowledge_graph.nodes["g0-14"]["memory_score"] = 0.0
+        kg._mark_graph_changed(stats_kept=True)
+    top = kg.get_graph_stats()["top_concepts"]
+    assert top == [f"g0-{i}" for i in range(13, 3, -1)]
+
+
+def test_unhooked_mutations_trigger_a_rebuild(graph):
+    with kg._graph_lock:
+        kg.knowledge_graph.add_node("g0-a", memory_score=0.4)
+    assert kg.get_graph_stats()["top_concepts"] == ["g0-a"]
+    with kg._graph_lock:
+        kg.knowledge_graph.add_node("g0-b", memory_score=0.9)   # no hook, no mark
+        kg.knowledge_graph.add_edge("g0-a", "g0-b", weight=0.8)
+    stats = kg.get_graph_stats()
+    assert stats["top_concepts"] == ["g0-b", "g0-a"]
+    assert stats["edges"] == [["g0-a", "g0-b", 0.8]]
@@ -0,0 +1,112 @@
+"""Buffered intent predictions (IntentValidator).
+
+log_prediction used to open a session, insert one row, commit and refresh on
+every tracking cycle. Predictions are now buffered and written in one
+transaction per batch (count or age threshold, session end, exit).
+"""
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from tracker_app.db import models
+from tracker_app.db.models import Base, IntentPrediction
+from tracker_app.tracking import activity_monitor
+from tracker_app.tracking.activity_monitor import ActivityMonitor, IntentValidator
+
+
+@pytest.fixture
+def db(monkeypatch):
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    monkeypatch.setattr(models, "_engine", engine)
+    monkeypatch.setattr(models, "_SessionLocal", TestingSessionLocal)
+    TestingSessionLocal.commits = 0
+
+    def _count(conn):
+        TestingSessionLocal.commits += 1
+    event.listen(engine, "commit", _count)
+    return TestingSessionLocal
+
+
+def _rows(db):
+    with db() as s:
+        return s.query(IntentPrediction).order_by(IntentPrediction.id).all()
+
+
+def test_predictions_are_written_in_one_commit_per_batch(db):
+    validator = IntentValidator(flush_every=5, flush_seconds=3600)
+    for i in range(4):
+        validator.log_prediction('studying', 0.8, context=f"w{i}")
+    assert _rows(db) == []
+    assert validator.pending_count == 4
+    assert db.commits == 0
+
+    validator.log_prediction('studying', 0.8, context="w4")
+    rows = _rows(db)
+    assert [r.window_title for r in rows] == [f"w{i}" for i in range(5)]
+    assert db.commits == 1
+    assert validator.pending_count == 0
+
+
+def test_age_threshold_triggers_flush(db, monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(activity_monitor.time, "monotonic", lambda: clock[0])
+    validator = IntentValidator(flush_every=100, flush_seconds=60)
+    validator.log_prediction('idle', 0.5)
+    assert _rows(db) == []
+
+    clock[0] += 61
+    validator.log_prediction('idle', 0.5)
+    assert len(_rows(db)) == 2
+
+
+def test_default_flush_keeps_the_feedback_toast_fresh():
+    from tracker_app.config import TOAST_COOLDOWN_MINUTES, TRACK_INTERVAL
+    validator = IntentValidator()
+    lag = min(validator.flush_seconds, validator.flush_every * TRACK_INTERVAL)
+    assert lag <= TOAST_COOLDOWN_MINUTES * 60 / 10    # a small fraction of the cooldown
+
+
+def test_end_session_flushes_partial_batch(db):
+    monitor = ActivityMonitor()
+    monitor.validator.flush_every = 100
+    monitor.validator.flush_seconds = 3600
+    monitor.start_session()
+    monitor.process_intent({'intent_label': 'studying', 'confidence': 0.9,
+                            'features': [1, 0, 50, 0, 0.5, 0.9]}, context="IDE")
+    assert _rows(db) == []
+
+    monitor.end_session()
+    rows = _rows(db)
+    assert len(rows) == 1
+    assert rows[0].window_title == "IDE"
+
+
+def test_failed_flush_keeps_batch_for_retry(db, monkeypatch):
+    validator = IntentValidator(flush_every=100, flush_seconds=3600)
+    validator.log_prediction('studying', 0.9, context="a")
+    validator.log_prediction('studying', 0.9, context="b")
+
+    def _boom(db, preds):
+        raise RuntimeError("database is locked")
+    monkeypatch.setattr(activity_monitor.TrackingRepository, "log_intent_predictions", _boom)
+    assert validator.flush() == 0
+    assert validator.pending_count == 2
+
+    monkeypatch.undo()
+    monkeypatch.setattr(models, "_SessionLocal", db)
+    validator.log_prediction('studying', 0.9, context="c")
+    assert validator.flush() == 3
+    assert [r.window_title for r in _rows(db)] == ["a", "b", "c"]
+
+
+def test_pending_buffer_is_bounded(db, monkeypatch):
+    monkeypatch.setattr(activity_monitor, "MAX_PENDING_PREDICTIONS", 3)
+    validator = IntentValidator(flush_every=100, flush_seconds=3600)
+    for i in range(5):
+        validator.log_prediction('idle', 0.5, context=str(i))
+    assert validator.pending_count == 3
+    validator.flush()
+    assert [r.window_title for r in _rows(db)] == ["2", "3", "4"]
@@ -0,0 +1,131 @@
+"""Keyset pagination for /items and /items/search, streaming /items/export.
+
+Walking next_cursor must visit every matching item exactly once in
+newest-first order, even when several items share a created_at; the page
+SELECT must be served by ix_learning_items_status_created (migration 018)
+without a sort, and export must stream instead of building one string.
+"""
+
+import json
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from tracker_app.db import models
+from tracker_app.db.models import Base, LearningItem
+from tracker_app.db.repository import decode_item_cursor
+from tracker_app.web.app import app
+
+T0 = datetime(2026, 10, 1, 12, 0, 0)
+
+
+@pytest.fixture
+def client(monkeypatch, tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'items.db'}")
+    Base.metadata.create_all(bind=engine)
+    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    monkeypatch.setattr(models, "_engine", engine)
+    monkeypatch.setattr(models, "_SessionLocal", TestingSessionLocal)
+
+    with TestingSessionLocal() as s:
+        for i in range(10):
+            # Pairs share a timestamp so the id tie-break is exercised.
+            s.add(LearningItem(id=f"item-{i:02d}", question=f"question {i}",
+                               answer="python" if i % 2 else "rust",
+                               tags=json.dumps([f"t{i}"]),
+                               status="archived" if i == 9 else "active",
+                               created_at=T0 + timedelta(minutes=i // 2)))
+        s.commit()
+
+    captured = []
+    event.listen(engine, "before_cursor_execute",
+                 lambda conn, cur, stmt, params, *a: captured.append((stmt, params)))
+    app.config['TESTING'] = True
+    c = app.test_client()
+    c.engine, c.captured = engine, captured
+    yield c
+    engine.dispose()
+
+
+def _walk(client, url):
+    ids, cursor, pages = [], None, 0
+    while True:
+        resp = client.get(url + (f"&cursor={cursor}" if cursor else ""))
+        assert resp.status_code == 200, resp.get_json()
+        body = resp.get_json()
+        ids += [item['id'] for item in body['data']]
+        pages += 1
+        cursor = body['next_cursor']
+        if cursor is None:
+            return ids, pages
+
+
+def test_items_pages_cover_everything_once_newest_first(client):
+    ids, pages = _walk(client, "/api/v1/items?limit=3")
+    assert ids == [f"item-{i:02d}" for i in range(8, -1, -1)]
+    assert pages == 3
+
+    all_ids, _ = _walk(client, "/api/v1/items?status=all&limit=4")
+    assert all_ids == [f"item-{i:02d}" for i in range(9, -1, -1)]
+
+
+def test_last_full_page_has_no_cursor(client):
+    body = client.get("/api/v1/items?limit=9").get_json()
+    assert body['count'] == 9 and body['next_cursor'] is None
+
+
+def test_page_query_walks_keyset_index(client):
+    first = client.get("/api/v1/items?limit=3").get_json()
+    client.captured.clear()
+    client.get(f"/api/v1/items?limit=3&cursor={first['next_cursor']}")
+    stmt, params = next((s, p) for s, p in client.captured
+                        if s.lstrip().upper().startswith("SELECT") and "learning_items" in s)
+    with client.engine.connect() as conn:
+        plan = [r[3] for r in conn.exec_driver_sql("EXPLAIN QUERY PLAN " + stmt, params)]
+    assert len(plan) == 1
+    assert "INDEX ix_learning_items_status_created" in plan[0]
+
+
+def test_search_is_paged_and_validated(client):
+    ids, pages = _walk(client, "/api/v1/items/search?q=python&limit=2")
+    assert ids == ["item-07", "item-05", "item-03", "item-01"]   # 09 is archived
+    assert pages == 2
+
+    assert client.get("/api/v1/items/search").status_code == 400
+    assert client.get("/api/v1/items/search?q=x&limit=0").status_code == 400
+
+
+def test_bad_cursor_is_400(client):
+    for url in ("/api/v1/items?cursor=not-a-cursor",
+                "/api/v1/items/search?q=python&cursor=bm9wZQ"):
+        resp = client.get(url)
+        assert resp.status_code == 400
+        assert resp.get_json()['error'] == 'invalid cursor'
+    with pytest.raises(ValueError):
+        decode_item_cursor("%%%")
+
+
+def test_export_streams_json_and_anki(client):
+    resp = client.get("/api/v1/items/export")
+    assert resp.status_code == 200 and resp.is_streamed
+    assert resp.mimetype == "application/json"
+    exported = json.loads(resp.get_data(as_text=True))
+    assert sorted(item['id'] for item in exported) == [f"item-{i:02d}" for i in range(10)]
+    assert exported[0]['tags'] == ["t0"]
+
+    resp = client.get("/api/v1/items/export?format=anki")
+    lines = resp.get_data(as_text=True).split("\n")
+    assert len(lines) == 10
+    assert lines[0] == "question 0\trust\tt0"
+
+    assert client.get("/api/v1/items/export?format=csv").status_code == 400
+
+
+def test_export_of_empty_deck_is_valid_json(client):
+    with sessionmaker(bind=client.engine)() as s:
+        s.query(LearningItem).delete()
+        s.commit()
+    resp = client.get("/api/v1/items/export")
+    assert json.loads(resp.get_data(as_text=True)) == []
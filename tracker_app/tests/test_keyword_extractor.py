@@ -10,6 +10,8 @@ Run: python -m pytest tracker_app/tests/test_keyword_extractor.py -v
 
 import inspect
 
+import pytest
+
 from tracker_app.tracking import keyword_extractor as kw
 
 
@@ -26,3 +28,163 @@ def test_get_yake_singleton_has_fixed_config():
     assert extractor.config["lan"] == "en"
     assert extractor.config["n"] == 2
     assert extractor.config["top"] == 20
+
+
+# -- Shared extraction pipeline: one spaCy parse per text, cached by hash --
+
+class _Tok:
+    def __init__(self, text, pos, is_stop=False):
+        self.text, self.lemma_, self.pos_, self.is_stop = text, text.lower(), pos, is_stop
+
+
+class _Chunk:
+    def __init__(self, text, root):
+        self.text, self.root = text, root
+
+
+class _Doc(list):
+    ents = ()
+
+    @property
+    def noun_chunks(self):
+        return [_Chunk("the calvin cycle", self[1]), _Chunk("thylakoid membrane", self[3])]
+
+
+def _counting_nlp(calls):
+    def nlp(text):
+        calls["n"] += 1
+        return _Doc([_Tok("calvin", "PROPN"), _Tok("cycle", "NOUN"), _Tok("runs", "VERB"),
+                     _Tok("membrane", "NOUN")])
+    return nlp
+
+
+def test_pipeline_parses_each_text_once_across_both_entry_points(monkeypatch):
+    calls = {"n": 0}
+    monkeypatch.setattr(kw, "_get_nlp", lambda: _counting_nlp(calls))
+    monkeypatch.setattr(kw, "_get_scorer", lambda: None)
+    monkeypatch.setattr(kw, "_pipeline_instance", kw.ExtractionPipeline(cache_size=8))
+
+    text = "The Calvin cycle runs in the stroma next to the thylakoid membrane."
+    concepts = kw.extract_concepts(text)
+    keywords = kw.get_keyword_extractor().extract_keywords(text)
+    kw.extract_concepts(text)
+
+    assert calls["n"] == 1
+    assert concepts["calvin cycle"] == 0.7
+    assert dict(keywords)["cycle"] == 0.35
+    assert kw.get_extraction_pipeline().hits == 2
+
+
+def test_pipeline_cache_is_bounded_lru(monkeypatch):
+    calls = {"n": 0}
+    monkeypatch.setattr(kw, "_get_nlp", lambda: _counting_nlp(calls))
+    monkeypatch.setattr(kw, "_get_scorer", lambda: None)
+    pipeline = kw.ExtractionPipeline(cache_size=2)
+
+    for text in ("first text here", "second text here", "third text here", "first text here"):
+        pipeline.concepts(text)
+
+    assert len(pipeline._cache) == 2
+    assert calls["n"] == 4  # 'first' was evicted before it was seen again
+
+
+def test_pipeline_cache_disabled_with_zero_size(monkeypatch):
+    calls = {"n": 0}
+    monkeypatch.setattr(kw, "_get_nlp", lambda: _counting_nlp(calls))
+    monkeypatch.setattr(kw, "_get_scorer", lambda: None)
+    pipeline = kw.ExtractionPipeline(cache_size=0)
+
+    pipeline.concepts("repeat text here")
+    pipeline.concepts("repeat text here")
+
+    assert calls["n"] == 2
+    assert not pipeline._cache
+
+
+# -- Built-in NumPy scorer: parity with the yake package --
+
+_PARITY_TEXTS = [
+    "Photosynthesis is the process by which plants convert sunlight into glucose "
+    "using chlorophyll in the chloroplasts. The light-dependent reactions occur in "
+    "the thylakoid membrane, while the Calvin cycle runs in the stroma. NASA has "
+    "studied photosynthesis in microgravity environments.",
+    "Backpropagation computes the gradient of the loss function with respect to the "
+    "weights of a neural network. Gradient descent then updates the weights. "
+    "Stochastic gradient descent uses mini-batches. The learning rate controls the "
+    "step size of gradient descent in neural network training.",
+    "In relational databases, an index is a data structure that improves the speed "
+    "of data retrieval operations on a table. A B-tree index keeps keys sorted. "
+    "SQLite uses B-tree indexes; a covering index contains every column a query "
+    "needs, so the table lookup is skipped.",
+]
+
+
+def test_numpy_scorer_matches_yake_top_15():
+    yake = kw._get_yake()
+    if yake is None:
+        pytest.skip("yake not installed")
+    scorer = kw.NumpyKeywordScorer()
+
+    for text in _PARITY_TEXTS:
+        expected = [(k.lower(), s) for k, s in yake.extract_keywords(text)][:15]
+        got = scorer.extract_keywords(text)[:15]
+        assert [k for k, _ in got] == [k for k, _ in expected]
+        for (_, s_got), (_, s_exp) in zip(got, expected):
+            assert abs(s_got - s_exp) < 1e-9
+
+
+def test_numpy_scorer_handles_degenerate_input():
+    scorer = kw.NumpyKeywordScorer()
+    assert scorer.extract_keywords("") == []
+    assert scorer.extract_keywords("... !!! ???") == []
+    assert scorer.extract_keywords("the and of to") == []
+
+
+def test_scorer_selected_by_config(monkeypatch):
+    import tracker_app.config as config
+
+    monkeypatch.setattr(config, "KEYWORD_SCORER", "numpy")
+    assert isinstance(kw._get_scorer(), kw.NumpyKeywordScorer)
+
+    monkeypatch.setattr(config, "KEYWORD_SCORER", "yake")
+    assert kw._get_scorer() is kw._get_yake()
+
+
+# -- Extraction profiles --
+
+def test_load_nlp_excludes_profile_components(monkeypatch):
+    import spacy
+
+    seen = {}
+    monkeypatch.setattr(spacy, "load", lambda name, exclude=(): seen.setdefault(name, list(exclude)))
+
+    kw._load_nlp("fast")
+    assert seen["en_core_web_sm"] == ["parser", "ner"]
+    assert kw.EXTRACTION_PROFILES["full"]["exclude"] == ()
+
+
+def test_rule_noun_chunks_from_pos_tags():
+    doc = [_Tok("The", "DET", True), _Tok("neural", "ADJ"), _Tok("network", "NOUN"),
+           _Tok("architecture", "NOUN"), _Tok("uses", "VERB"), _Tok("attention", "NOUN"),
+           _Tok("mechanism", "NOUN"), _Tok("quickly", "ADV"), _Tok("red", "ADJ")]
+
+    chunks = list(kw._rule_noun_chunks(doc))
+
+    assert [c.text for c in chunks] == ["The neural network architecture", "attention mechanism"]
+    assert [c.root.text for c in chunks] == ["architecture", "mechanism"]
+
+
+def test_balanced_profile_uses_rule_chunker_without_parser(monkeypatch):
+    class _NoParseDoc(_Doc):
+        @property
+        def noun_chunks(self):
+            raise ValueError("[E029] noun_chunks requires the dependency parse")
+
+    nlp = lambda text: _NoParseDoc([_Tok("calvin", "PROPN"), _Tok("cycle", "NOUN"),
+                                    _Tok("runs", "VERB")])
+    monkeypatch.setattr(kw, "_get_scorer", lambda: None)
+    pipeline = kw.ExtractionPipeline(cache_size=0, nlp=nlp, profile="balanced")
+
+    concepts = pipeline.concepts("The Calvin cycle runs in the stroma.")
+
+    assert concepts["calvin cycle"] == 0.7
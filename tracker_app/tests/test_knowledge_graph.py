@@ -24,6 +24,7 @@ def clean_graph():
         kg.knowledge_graph.add_edges_from(original.edges(data=True))
         kg._loaded = False
         kg._last_db_sync = 0.0
+        kg._mark_graph_changed()
 
 
 def test_save_and_reload_graph(isolated_graph_path, clean_graph):
@@ -324,3 +325,91 @@ def test_sync_db_to_graph_skips_save_when_score_unchanged(clean_graph, monkeypat
     kg._graph_dirty = False
     kg.sync_db_to_graph(force=True)
     assert saves == [], "_save_graph() called when score was unchanged"
+
+
+def test_snapshot_is_reused_until_graph_changes(clean_graph):
+    with kg._graph_lock:
+        kg.knowledge_graph.clear()
+        kg.knowledge_graph.add_node("alpha", memory_score=0.4)
+        kg.knowledge_graph.add_node("beta", memory_score=0.9)
+        kg.knowledge_graph.add_edge("alpha", "beta", weight=0.8)
+        kg._mark_graph_changed()
+
+    snap = kg.get_snapshot()
+    assert kg.get_snapshot() is snap
+    assert "alpha" in snap.nodes and snap.memory_score("beta") == 0.9
+    assert snap.neighbours["alpha"] == (("beta", 0.8),)
+
+    kg.remove_concept_from_graph("beta")   # module mutator bumps the version
+    fresh = kg.get_snapshot()
+    assert fresh is not snap
+    assert "beta" not in fresh.nodes
+    # The old snapshot is immutable: readers holding it are unaffected.
+    assert "beta" in snap.nodes
+
+
+def test_snapshot_rebuild_defers_and_shares_the_edge_view(clean_graph, monkeypatch):
+    with kg._graph_lock:
+        kg.knowledge_graph.clear()
+        for name, score in (("alpha", 0.4), ("beta", 0.9), ("gamma", 0.6)):
+            kg.knowledge_graph.add_node(name, memory_score=score)
+        kg.knowledge_graph.add_edge("alpha", "beta", weight=0.8)
+        kg._mark_graph_changed()
+    builds = []
+    real = kg._edge_view_of
+    monkeypatch.setattr(kg, "_edge_view_of", lambda *a: builds.append(a[1:]) or real(*a))
+
+    first = kg.get_snapshot()
+    assert builds == []                         # names and scores only
+    assert first.neighbours["alpha"] == (("beta", 0.8),)
+    assert builds == [()]
+
+    with kg._graph_lock:                        # score-only change: edges shared
+        kg._on_score_changed("gamma", 0.6, 0.2)
+        kg.knowledge_graph.nodes["gamma"]["memory_score"] = 0.2
+        kg._mark_graph_changed(stats_kept=True)
+    second = kg.get_snapshot()
+    assert second is not first and second.memory_score("gamma") == 0.2
+    assert second.edges == (("alpha", "beta", 0.8),) and len(builds) == 1
+
+    with kg._graph_lock:                        # edge change: rebuilt on demand
+        kg._on_edge_changed("beta", "gamma", True)
+        kg.knowledge_graph.add_edge("beta", "gamma", weight=0.9)
+        kg._mark_graph_changed(stats_kept=True)
+    third = kg.get_snapshot()
+    assert len(builds) == 1
+    assert third.neighbours["beta"] == (("gamma", 0.9), ("alpha", 0.8))
+    assert second.neighbours["beta"] == (("alpha", 0.8),)
+
+
+def test_snapshot_scores_are_read_only(clean_graph):
+    with kg._graph_lock:
+        kg.knowledge_graph.clear()
+        kg.knowledge_graph.add_node("alpha", memory_score=0.4)
+        kg._mark_graph_changed()
+
+    snap = kg.get_snapshot()
+    with pytest.raises(ValueError):
+        snap.memory_scores[0] = 1.0
+
+
+def test_snapshot_notices_direct_graph_mutation(clean_graph):
+    with kg._graph_lock:
+        kg.knowledge_graph.clear()
+        kg._mark_graph_changed()
+    empty = kg.get_snapshot()
+
+    kg.knowledge_graph.add_node("alpha", memory_score=0.4)  # bypasses the version
+
+    assert kg.get_snapshot() is not empty
+    assert "alpha" in kg.get_snapshot()
+
+
+def test_snapshot_read_takes_no_lock_when_current(clean_graph, monkeypatch):
+    kg.get_snapshot()
+    counting = _CountingLock()
+    monkeypatch.setattr(kg, "_graph_lock", counting)
+
+    kg.get_snapshot()
+
+    assert counting.acquires == 0
@@ -0,0 +1,148 @@
+"""Bulk lambda recalibration (learning/lambda_calibration.py).
+
+The fit must move each concept's decay rate toward the one its observed
+recall implies, in the right direction, within the lambda bounds and the
+per-run cap, leave concepts without enough (or without new) reviews alone,
+and write nothing on a dry run.
+"""
+
+import math
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from tracker_app.db import models
+from tracker_app.db.models import Base, TrackedConcept
+from tracker_app.learning import lambda_calibration
+from tracker_app.learning.lambda_calibration import (
+    MAX_RUN_CHANGE, MIN_REVIEWS, fit_lambda_p, recalibrate_all_lambdas,
+)
+from tracker_app.learning.memory_model import LAMBDA_CEIL, LAMBDA_FLOOR
+
+NOW = datetime(2026, 10, 18, 12, 0, 0)
+
+
+@pytest.fixture
+def db(monkeypatch, tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'calibration.db'}")
+    Base.metadata.create_all(bind=engine)
+    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    monkeypatch.setattr(models, "_engine", engine)
+    monkeypatch.setattr(models, "_SessionLocal", TestingSessionLocal)
+    yield TestingSessionLocal
+    engine.dispose()
+
+
+def _concept(name, reviews, correct, lam=0.1, days=10, status="discovered"):
+    return TrackedConcept(concept=name, review_count=reviews, correct_count=correct,
+                          lambda_personalised=lam, attention_at_encoding=50.0,
+                          first_seen=NOW - timedelta(days=days), last_seen=NOW,
+                          status=status)
+
+
+def _lambdas(db):
+    with db() as s:
+        return {c.concept: c.lambda_personalised for c in s.query(TrackedConcept)}
+
+
+def test_fit_matches_closed_form_without_prior():
+    gap = np.array([5.0, 24.0, 48.0])
+    recall = np.array([0.8, 0.6, 0.5])
+    fit = fit_lambda_p(np.full(3, 0.1), gap, recall, np.full(3, 20.0), prior_weight=0.0,
+                       max_change=np.inf)
+    assert fit["converged"].all() and fit["iterations"] < 20
+    assert fit["lambda_p"] == pytest.approx(-np.log(recall) / gap, rel=1e-5)
+
+
+def test_prior_and_bounds_hold_the_fit_back():
+    gap, recall = np.array([24.0, 2.0]), np.array([0.99, 0.001])
+    weak = fit_lambda_p(np.full(2, 0.1), gap, recall, np.full(2, 5.0))
+    strong = fit_lambda_p(np.full(2, 0.1), gap, recall, np.full(2, 5.0), prior_weight=50.0)
+    assert weak["lambda_p"][0] < strong["lambda_p"][0] < 0.1
+    assert weak["lambda_p"][1] > strong["lambda_p"][1] > 0.1
+    no_prior = fit_lambda_p(np.full(2, 0.1), gap, recall, np.full(2, 5.0), prior_weight=0.0,
+                            max_change=np.inf)
+    assert no_prior["lambda_p"] == pytest.approx([LAMBDA_FLOOR, LAMBDA_CEIL])
+
+
+def test_a_few_perfect_reviews_stay_off_the_bound():
+    # 5/5 correct at a 48 h gap implies lambda_p ~0.002, below the floor.
+    fit = fit_lambda_p(np.array([0.05]), np.array([48.0]), np.array([5.5 / 6]),
+                       np.array([float(MIN_REVIEWS)]))
+    lam = fit["lambda_p"][0]
+    assert LAMBDA_FLOOR * 2 < lam < 0.05
+    assert math.log(0.05 / lam) <= MAX_RUN_CHANGE + 1e-9
+
+
+def test_recalibration_follows_observed_recall(db):
+    with db() as s:
+        s.add_all([
+            _concept("remembered", 20, 20),        # better than predicted: slower decay
+            _concept("forgotten", 20, 2, lam=0.01),  # worse: faster decay
+            _concept("few_reviews", 4, 0),
+            _concept("archived", 20, 20, status="archived"),
+        ])
+        s.commit()
+
+    report = recalibrate_all_lambdas(now=NOW)
+    after = _lambdas(db)
+    assert report["concepts"] == 2 and report["updated"] == 2
+    assert report["converged"] == 2
+    assert report["rmse_after"] < report["rmse_before"]
+    assert after["remembered"] < 0.1
+    assert after["forgotten"] > 0.01
+    assert after["few_reviews"] == 0.1 and after["archived"] == 0.1
+
+    again = recalibrate_all_lambdas(now=NOW)     # no new reviews: nothing refitted
+    assert again["concepts"] == 0 and _lambdas(db) == after
+
+    with db() as s:
+        s.get(TrackedConcept, "remembered").review_count = 21
+        s.get(TrackedConcept, "remembered").correct_count = 21
+        s.commit()
+    third = recalibrate_all_lambdas(now=NOW)
+    assert third["concepts"] == 1
+    assert after["remembered"] / 1.5 <= _lambdas(db)["remembered"] < after["remembered"]
+    assert _lambdas(db)["forgotten"] == after["forgotten"]
+
+
+def test_rows_reviewed_mid_run_are_left_for_the_next_run(db, monkeypatch):
+    with db() as s:
+        s.add_all([_concept("steady", 20, 20), _concept("reviewed", 20, 20)])
+        s.commit()
+
+    fit = lambda_calibration.fit_lambda_p
+    def review_during_fit(*args, **kwargs):
+        with db() as s:
+            row = s.get(TrackedConcept, "reviewed")
+            row.review_count, row.lambda_personalised = 21, 0.2
+            s.commit()
+        return fit(*args, **kwargs)
+    monkeypatch.setattr(lambda_calibration, "fit_lambda_p", review_during_fit)
+    recalibrate_all_lambdas(now=NOW)
+    monkeypatch.setattr(lambda_calibration, "fit_lambda_p", fit)
+
+    after = _lambdas(db)
+    assert after["steady"] < 0.1
+    assert after["reviewed"] == 0.2
+    with db() as s:
+        assert s.get(TrackedConcept, "reviewed").calibrated_review_count is None
+    assert recalibrate_all_lambdas(now=NOW)["concepts"] == 1
+
+
+def test_dry_run_writes_nothing(db):
+    with db() as s:
+        s.add(_concept("c", 10, 10))
+        s.commit()
+    report = recalibrate_all_lambdas(now=NOW, dry_run=True)
+    assert report["updated"] == 1
+    assert _lambdas(db) == {"c": 0.1}
+    assert recalibrate_all_lambdas(now=NOW, dry_run=True)["updated"] == 1
+
+
+def test_empty_table(db):
+    report = recalibrate_all_lambdas(now=NOW)
+    assert report["concepts"] == 0 and report["rmse_before"] is None
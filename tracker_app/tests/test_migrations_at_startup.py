@@ -48,9 +48,12 @@ CREATE TABLE intent_predictions (
 
 # Total migration count tracks the MIGRATIONS registry in
 # tracker_app/db/migrations.py — bump when a migration is appended
-# (currently 13: 001..013 including 011_datetime_storage_format,
-# 012_drop_duplicate_feedback_index, and 013_feedback_used_in_training).
-TOTAL_MIGRATIONS = 13
+# (currently 21: 001..021 including 011_datetime_storage_format,
+# 012_drop_duplicate_feedback_index, 013_feedback_used_in_training,
+# 014_daily_summary_rollup, 015_streak_state, 016_hot_query_indexes,
+# 017_retention_rollups, 018_learning_items_keyset_index,
+# 019_fts_search, 020_applied_reviews and 021_lambda_calibrated_reviews).
+TOTAL_MIGRATIONS = 21
 
 
 def _create_stale_db(db_file):
@@ -68,7 +68,7 @@ def test_privacy_gate_is_mandatory_module_level_import():
 
 def test_extract_keywords_redacts_sensitive_content(monkeypatch):
     # Keep the pipeline hermetic: no real DB / knowledge-graph access.
-    monkeypatch.setattr(ocr_module, "get_graph", lambda: nx.Graph())
+    monkeypatch.setattr(ocr_module, "get_snapshot", lambda: nx.Graph())
 
     text = (
         "My credit card is 4111-1111-1111-1111 and I use it for online purchases. "
@@ -89,8 +89,7 @@ def test_extract_keywords_retains_camelcase_compound(monkeypatch):
             return [("backPropagation", 0.8), ("calvin cycle", 0.9)]
 
     monkeypatch.setattr(ocr_module, "kw_extractor", FakeExtractor())
-    monkeypatch.setattr(ocr_module, "nlp", None)
-    monkeypatch.setattr(ocr_module, "get_graph", lambda: nx.Graph())
+    monkeypatch.setattr(ocr_module, "get_snapshot", lambda: nx.Graph())
 
     keywords = ocr_module.extract_keywords(
         "BackPropagation is a key algorithm used to train neural networks today.",
@@ -100,20 +99,20 @@ def test_extract_keywords_retains_camelcase_compound(monkeypatch):
     assert "backpropagation" in keywords, "camelCase compound must survive the split"
 
 
-def test_extract_keywords_uses_passed_graph_without_get_graph(monkeypatch):
+def test_extract_keywords_uses_passed_graph_without_get_snapshot(monkeypatch):
     # M-4 regression: the OCR pipeline hands extract_keywords a preloaded graph
     # so the node-boost never re-triggers _ensure_graph_loaded()/DB sync.
     calls = {"n": 0}
 
     def boom():
         calls["n"] += 1
-        raise AssertionError("get_graph() must not be called when graph is passed")
+        raise AssertionError("get_snapshot() must not be called when graph is passed")
 
     def fake_extract_concepts(text, top_n=15):
         return {"machinelearning": 0.8}
 
     monkeypatch.setattr(ocr_module, "extract_concepts", fake_extract_concepts)
-    monkeypatch.setattr(ocr_module, "get_graph", boom)
+    monkeypatch.setattr(ocr_module, "get_snapshot", boom)
 
     G = nx.Graph()
     G.add_node("machinelearning")
@@ -0,0 +1,117 @@
+"""Query plans of the hot concept / encounter / intent reads (migration 016).
+
+Each test runs the real code path against a migrated database, captures the
+SELECT it issues and asserts EXPLAIN QUERY PLAN for that exact statement and
+its parameters: the intended index is used and no temp B-tree sort or full
+table scan sneaks back in. The same plans must hold for a create_all-only
+database, so the ORM Index declarations stay in step with the migration.
+"""
+
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from tracker_app.db import models
+from tracker_app.db.migrations import run_migrations
+from tracker_app.db.models import Base, ConceptEncounter, IntentPrediction, TrackedConcept
+from tracker_app.utils import utcnow
+
+
+@pytest.fixture(params=["migrated", "create_all"])
+def db(request, monkeypatch, tmp_path):
+    path = tmp_path / "plan.db"
+    if request.param == "migrated":
+        result = run_migrations(db_path=str(path))
+        assert result["failed"] == 0, result["errors"]
+        engine = create_engine(f"sqlite:///{path}")
+    else:
+        engine = create_engine(f"sqlite:///{path}")
+        Base.metadata.create_all(bind=engine)
+    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    monkeypatch.setattr(models, "_engine", engine)
+    monkeypatch.setattr(models, "_SessionLocal", TestingSessionLocal)
+
+    now = utcnow()
+    with TestingSessionLocal() as s:
+        for i in range(40):
+            s.add(TrackedConcept(
+                concept=f"c{i}", relevance_score=i / 40.0,
+                next_review=now + timedelta(days=i - 20),
+                status='archived' if i % 10 == 0 else 'discovered',
+            ))
+        s.flush()
+        for i in range(200):
+            s.add(ConceptEncounter(concept=f"c{i % 40}",
+                                   timestamp=now - timedelta(minutes=i)))
+        s.add(IntentPrediction(timestamp=now - timedelta(hours=2), predicted_intent='idle',
+                               confidence=0.5, prompted_at=now - timedelta(hours=2)))
+        s.add(IntentPrediction(timestamp=now, predicted_intent='studying', confidence=0.9))
+        s.commit()
+
+    captured = []
+    event.listen(engine, "before_cursor_execute",
+                 lambda conn, cur, stmt, params, *a: captured.append((stmt, params)))
+    TestingSessionLocal.captured = captured
+    yield TestingSessionLocal
+    engine.dispose()
+
+
+def _plan(db, needle):
+    """EXPLAIN QUERY PLAN details for the first captured SELECT containing `needle`."""
+    stmt, params = next((s, p) for s, p in db.captured
+                        if s.lstrip().upper().startswith("SELECT") and needle in s)
+    with db() as s:
+        conn = s.connection().connection.driver_connection
+        return [row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + stmt, params)]
+
+
+def test_due_concepts_walk_partial_index_without_sort(db, monkeypatch):
+    from tracker_app.learning import concept_scheduler
+    # The SQL fallback behind the in-memory due queue.
+    monkeypatch.setattr(concept_scheduler, "DUE_QUEUE_ENABLED", False)
+    due = concept_scheduler.ConceptScheduler().get_due_concepts(limit=5)
+    assert [c["concept"] for c in due] == ["c19", "c18", "c17", "c16", "c15"]
+
+    plan = _plan(db, "FROM tracked_concepts")
+    assert plan == ["SCAN tracked_concepts USING INDEX ix_tracked_concepts_due"]
+
+
+def test_session_concepts_use_covering_index(db):
+    from tracker_app.tracking.knowledge_graph import get_session_concepts
+    assert len(get_session_concepts(limit=10)) == 10
+
+    plan = _plan(db, "FROM concept_encounters")
+    assert len(plan) == 1
+    assert "COVERING INDEX ix_concept_encounters_timestamp_concept" in plan[0]
+
+
+def test_concept_history_uses_composite_index_in_order(db):
+    from tracker_app.learning.concept_scheduler import ConceptScheduler
+    history = ConceptScheduler().get_concept_history("c3", days=1)
+    assert len(history) == 5
+
+    plan = _plan(db, "FROM concept_encounters")
+    assert len(plan) == 1
+    assert "INDEX ix_concept_encounters_concept_timestamp (concept=? AND timestamp>?)" in plan[0]
+
+
+def test_intent_recent_cooldown_uses_prompted_at_index(db):
+    from tracker_app.web.app import app
+    app.config['TESTING'] = True
+    resp = app.test_client().get('/api/v1/intent/recent')
+    assert resp.status_code == 200
+
+    plan = _plan(db, "prompted_at IS NOT NULL")
+    assert len(plan) == 1
+    assert "COVERING INDEX ix_intent_predictions_prompted_at" in plan[0]
+
+
+def test_single_column_encounter_indexes_are_gone(db):
+    with db() as s:
+        conn = s.connection().connection.driver_connection
+        names = {r[0] for r in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type='index' AND tbl_name='concept_encounters'")}
+    assert names == {"ix_concept_encounters_concept_timestamp",
+                     "ix_concept_encounters_timestamp_concept"}
@@ -42,7 +42,7 @@ def test_record_quiz_broadcast_stamps_cooldown():
 def test_failed_broadcast_does_not_consume_cooldown(monkeypatch):
     monkeypatch.setattr(loop, "session_is_active", lambda: True)
     monkeypatch.setattr(quiz_engine, "should_show_quiz", lambda *a, **k: True)
-    monkeypatch.setattr(quiz_engine, "generate_micro_quiz", lambda graph: {"concept": "x"})
+    monkeypatch.setattr(quiz_engine, "generate_micro_quiz", lambda graph=None: {"concept": "x"})
     monkeypatch.setattr(
         "tracker_app.web.realtime.broadcast_micro_quiz",
         lambda quiz: (_ for _ in ()).throw(RuntimeError("dashboard down")),
@@ -53,15 +53,45 @@ def test_failed_broadcast_does_not_consume_cooldown(monkeypatch):
     assert quiz_engine._last_quiz_time is None
 
 
+def test_undelivered_broadcast_does_not_consume_cooldown(monkeypatch):
+    # Tracker process with no dashboard on the event bus.
+    from tracker_app.tracking import event_bus
+    from tracker_app.web import realtime
+    monkeypatch.setattr(realtime, "socketio", None)
+    monkeypatch.setattr(event_bus, "_endpoint", None)
+    monkeypatch.setattr(loop, "session_is_active", lambda: True)
+    monkeypatch.setattr(quiz_engine, "should_show_quiz", lambda *a, **k: True)
+    monkeypatch.setattr(quiz_engine, "generate_micro_quiz", lambda graph=None: {"concept": "x"})
+
+    loop._maybe_trigger_quiz("idle", False, 50.0)
+
+    assert quiz_engine._last_quiz_time is None
+
+
 def test_successful_broadcast_stamps_cooldown(monkeypatch):
     monkeypatch.setattr(loop, "session_is_active", lambda: True)
     monkeypatch.setattr(quiz_engine, "should_show_quiz", lambda *a, **k: True)
-    monkeypatch.setattr(quiz_engine, "generate_micro_quiz", lambda graph: {"concept": "x"})
+    monkeypatch.setattr(quiz_engine, "generate_micro_quiz", lambda graph=None: {"concept": "x"})
     monkeypatch.setattr(
         "tracker_app.web.realtime.broadcast_micro_quiz",
-        lambda quiz: None,
+        lambda quiz: True,
     )
 
     loop._maybe_trigger_quiz("idle", False, 50.0)
 
     assert quiz_engine._last_quiz_time is not None
+
+
+def test_generate_micro_quiz_accepts_snapshot():
+    from tracker_app.tracking.knowledge_graph import GraphSnapshot
+
+    G = _graph()
+    G.add_edge("alpha", "beta", weight=0.9)
+    G.add_edge("alpha", "gamma", weight=0.8)
+    G.add_edge("alpha", "delta", weight=0.75)
+
+    from_graph = quiz_engine.generate_micro_quiz(G)
+    from_snapshot = quiz_engine.generate_micro_quiz(GraphSnapshot.from_graph(G))
+
+    assert from_graph["concept"] == from_snapshot["concept"] == "alpha"
+    assert from_graph["distractors"] == from_snapshot["distractors"] == ["beta", "gamma", "delta"]
@@ -0,0 +1,145 @@
+"""Maintained micro-quiz index (knowledge_graph._QuizIndex).
+
+generate_micro_quiz() on the live graph must pick the same concept and
+neighbour distractors as a scan of the graph would, stay current through
+the mutation hooks, and stop re-running the plausibility filter per call.
+"""
+
+import random
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from tracker_app.db import models
+from tracker_app.db.models import Base, TrackedConcept
+from tracker_app.tracking import knowledge_graph as kg
+from tracker_app.tracking import quiz_engine
+
+
+class _GroupEncoder:
+    """Words sharing a first letter point the same way: one edge each."""
+
+    def encode(self, concepts):
+        out = []
+        for c in concepts:
+            v = np.zeros(32)
+            v[ord(c[0]) % 16] = 1.0
+            v[16 + sum(map(ord, c)) % 16] = 0.3
+            out.append(v)
+        return np.array(out)
+
+
+WORDS = ["photosynthesis", "phloem", "pigment", "plasma", "protein", "polymer",
+         "mitosis", "meiosis", "membrane", "molecule", "enzyme", "entropy",
+         "electron", "ecology", "ribosome", "receptor", "ion", "ity", "tion"]
+
+
+@pytest.fixture
+def graph(monkeypatch, tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'quiz.db'}")
+    Base.metadata.create_all(bind=engine)
+    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    monkeypatch.setattr(models, "_engine", engine)
+    monkeypatch.setattr(models, "_SessionLocal", TestingSessionLocal)
+    monkeypatch.setattr(kg, "KNOWLEDGE_GRAPH_PATH", str(tmp_path / "graph.json"))
+    monkeypatch.setattr(kg, "_get_embed_model", lambda: _GroupEncoder())
+    original = kg.knowledge_graph.copy()
+    with kg._graph_lock:
+        kg.knowledge_graph.clear()
+        kg._mark_graph_changed()
+        kg._loaded = True
+        kg._last_db_sync = float("inf")
+    yield TestingSessionLocal
+    with kg._graph_lock:
+        kg.knowledge_graph.clear()
+        kg.knowledge_graph.add_nodes_from(original.nodes(data=True))
+        kg.knowledge_graph.add_edges_from(original.edges(data=True))
+        kg._loaded = False
+        kg._last_db_sync = 0.0
+        kg._mark_graph_changed()
+    engine.dispose()
+
+
+def _seed(db, names, rng):
+    now = datetime.utcnow()
+    with db() as s:
+        for name in names:
+            s.merge(TrackedConcept(concept=name, attention_at_encoding=50,
+                                   lambda_personalised=rng.uniform(0.01, 0.5),
+                                   last_seen=now - timedelta(hours=rng.uniform(0, 24))))
+        s.commit()
+
+
+def _scan():
+    with kg._graph_lock:
+        return quiz_engine._pick_from_graph(kg.knowledge_graph.copy())
+
+
+def test_index_pick_matches_graph_scan_through_mutations(graph):
+    rng = random.Random(11)
+    _seed(graph, WORDS, rng)
+    kg.add_concepts(WORDS[:6])
+    for _ in range(25):
+        op = rng.random()
+        if op < 0.35:
+            kg.add_concepts(rng.sample(WORDS, 4))
+        elif op < 0.7:
+            _seed(graph, rng.sample(WORDS, 6), rng)
+            kg._refresh_all_memory_scores(WORDS)
+        elif op < 0.85:
+            kg.sync_concept_to_graph(rng.choice(WORDS))
+        else:
+            kg.remove_concept_from_graph(rng.choice(list(kg.knowledge_graph)))
+
+        picked, scanned = kg.pick_quiz_concept(quiz_engine.MIN_GRAPH_SIZE), _scan()
+        assert (picked is None) == (scanned is None)
+        if picked is None:
+            continue
+        assert picked[:2] == scanned[:2]
+        neighbours = kg._quiz_index.top_neighbours(picked[0])
+        assert picked[2][:len(neighbours)] == scanned[2][:len(neighbours)] == neighbours
+        assert len(set(picked[2])) == 3 and picked[0] not in picked[2]
+        assert all(kg._quiz_index.plausible(n) for n in picked[2])
+    assert kg.knowledge_graph.number_of_edges() > 0
+
+
+def test_repeated_quizzes_skip_the_plausibility_scan(graph, monkeypatch):
+    with kg._graph_lock:
+        for i, word in enumerate(WORDS):
+            kg.knowledge_graph.add_node(word, memory_score=0.3 + i / 100)
+        kg._mark_graph_changed()
+    first = quiz_engine.generate_micro_quiz()
+    assert first["concept"] == "photosynthesis"
+
+    calls = []
+    monkeypatch.setattr(kg, "is_plausible_concept",
+                        lambda n: calls.append(n) or True)
+    for _ in range(20):
+        quiz = quiz_engine.generate_micro_quiz()
+        assert quiz["concept"] == "photosynthesis"
+        assert "ity" not in quiz["all_options"] and "tion" not in quiz["all_options"]
+    assert calls == []
+
+
+def test_score_and_edge_changes_update_the_pick(graph):
+    with kg._graph_lock:
+        for i, word in enumerate(WORDS[:8]):
+            kg._on_node_added(word, 0.2 + i / 10)
+            kg.knowledge_graph.add_node(word, memory_score=0.2 + i / 10)
+        kg._mark_graph_changed(stats_kept=True)
+    assert kg.pick_quiz_concept(4)[0] == "photosynthesis"
+
+    with kg._graph_lock:
+        kg._on_score_changed("photosynthesis", 0.2, 0.95)
+        kg.knowledge_graph.nodes["photosynthesis"]["memory_score"] = 0.95
+        for other, w in [("pigment", 0.9), ("plasma", 0.8), ("protein", 0.85)]:
+            kg._on_edge_changed("phloem", other, True)
+            kg.knowledge_graph.add_edge("phloem", other, weight=w)
+        kg._mark_graph_changed(stats_kept=True)
+    concept, score, distractors = kg.pick_quiz_concept(4)
+    assert (concept, score) == ("phloem", pytest.approx(0.3))
+    assert distractors == ["pigment", "protein", "plasma"]
+    assert kg._quiz_index.is_current()       # served without a rebuild
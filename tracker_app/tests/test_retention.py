@@ -0,0 +1,186 @@
+"""Retention / compaction of the raw log tables (db/retention.py).
+
+Rows past a table's horizon are folded into its per-day rollup and deleted
+one whole day at a time; stats rebuilt afterwards must match the ones built
+from the full raw history, and the freed pages must be returned by VACUUM.
+"""
+
+from datetime import datetime, timedelta
+from unittest import mock
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from tracker_app.db import models, retention
+from tracker_app.db.models import (
+    Base, ConceptEncounter, TrackedConcept, IntentPrediction, LearningItem, ReviewHistory,
+    FeedbackTrainingSample, MultiModalLog, DailySummary, AppliedReview,
+    ConceptDailyRollup, IntentDailyRollup, ActivityDailyRollup, ReviewDailyRollup,
+)
+from tracker_app.db.repository import DailySummaryRepository, StreakRepository
+
+NOW = datetime(2026, 10, 18, 15, 0, 0)
+
+
+@pytest.fixture
+def db(monkeypatch, tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'retention.db'}")
+    Base.metadata.create_all(bind=engine)
+    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    monkeypatch.setattr(models, "_engine", engine)
+    monkeypatch.setattr(models, "_SessionLocal", TestingSessionLocal)
+    yield TestingSessionLocal
+    engine.dispose()
+
+
+def _policies(**days):
+    policies = retention.default_policies()
+    for p in policies:
+        p.horizon_days = days.get(p.table, 0)
+    return policies
+
+
+def _run(**days):
+    return retention.run_retention(now=NOW, vacuum=False, policies=_policies(**days))
+
+
+def _seed_encounters(db, days_back=range(0, 20), per_day=3):
+    with db() as s:
+        for c in ("alpha", "beta"):
+            s.add(TrackedConcept(concept=c))
+        s.flush()
+        for back in days_back:
+            for i in range(per_day):
+                s.add(ConceptEncounter(concept="alpha" if i % 2 == 0 else "beta",
+                                       timestamp=NOW - timedelta(days=back, hours=i),
+                                       confidence=0.5))
+        s.commit()
+
+
+def test_encounters_past_horizon_are_folded_and_deleted(db):
+    _seed_encounters(db)
+    cutoff = datetime(2026, 10, 8)           # midnight, 10 days before NOW
+    with db() as s:
+        old = s.query(ConceptEncounter).filter(ConceptEncounter.timestamp < cutoff).count()
+        kept = s.query(ConceptEncounter).count() - old
+
+    report = _run(concept_encounters=10)
+    result = report['tables']['concept_encounters']
+    assert result['rows_deleted'] == old
+    assert result['cutoff'] == cutoff.isoformat()
+
+    with db() as s:
+        assert s.query(ConceptEncounter).count() == kept
+        assert s.query(ConceptEncounter).filter(ConceptEncounter.timestamp < cutoff).count() == 0
+        rollup = s.query(ConceptDailyRollup).all()
+        assert sum(r.encounters for r in rollup) == old
+        assert {r.concept for r in rollup} == {"alpha", "beta"}
+        assert all(r.day < "2026-10-08" for r in rollup)
+        alpha = next(r for r in rollup if r.concept == "alpha" and r.day == "2026-09-30")
+        assert alpha.encounters == 2 and alpha.confidence_sum == pytest.approx(1.0)
+
+    # Idempotent: nothing left to compact.
+    assert _run(concept_encounters=10)['tables']['concept_encounters']['rows_deleted'] == 0
+
+
+def test_dry_run_only_counts(db):
+    _seed_encounters(db)
+    report = retention.run_retention(now=NOW, dry_run=True, policies=_policies(concept_encounters=10))
+    assert report['tables']['concept_encounters']['rows_eligible'] > 0
+    assert report['space'] is None
+    with db() as s:
+        assert s.query(ConceptDailyRollup).count() == 0
+
+
+def test_intents_and_activity_keep_feedback_and_attention_totals(db):
+    with db() as s:
+        old = NOW - timedelta(days=40)
+        s.add_all([
+            IntentPrediction(timestamp=old, predicted_intent='studying', confidence=0.9, user_feedback=1),
+            IntentPrediction(timestamp=old, predicted_intent='studying', confidence=0.7, user_feedback=0),
+            IntentPrediction(timestamp=old, predicted_intent=None, confidence=0.2),
+            IntentPrediction(timestamp=NOW, predicted_intent='idle', confidence=0.5),
+            MultiModalLog(timestamp=old, intent_label='studying', attention_score=80, interaction_rate=4),
+            MultiModalLog(timestamp=old, intent_label='studying', attention_score=60, interaction_rate=2),
+        ])
+        s.commit()
+
+    _run(intent_predictions=30, multi_modal_logs=30)
+
+    with db() as s:
+        assert s.query(IntentPrediction).count() == 1
+        assert s.query(MultiModalLog).count() == 0
+        studying = s.get(IntentDailyRollup, ("2026-09-08", "studying"))
+        assert (studying.predictions, studying.feedback_correct, studying.feedback_wrong) == (2, 1, 1)
+        assert studying.confidence_sum == pytest.approx(1.6)
+        assert s.get(IntentDailyRollup, ("2026-09-08", "unknown")).predictions == 1
+        activity = s.get(ActivityDailyRollup, ("2026-09-08", "studying"))
+        assert (activity.samples, activity.attention_sum, activity.interaction_sum) == (2, 140, 6)
+
+
+def test_review_compaction_preserves_rebuilt_stats_and_streak(db):
+    with db() as s:
+        s.add(LearningItem(id="i1", question="q", answer="a", created_at=NOW - timedelta(days=60)))
+        s.flush()
+        for back in list(range(0, 5)) + [30, 31, 45]:
+            for quality in (4, 2):
+                s.add(ReviewHistory(item_id="i1", timestamp=NOW - timedelta(days=back),
+                                    quality_rating=quality))
+        s.commit()
+        DailySummaryRepository.rebuild(s)
+        s.commit()
+        before = {r.date: (r.reviews, r.correct_reviews) for r in s.query(DailySummary)}
+
+    report = _run(review_history=3)
+    assert report['tables']['review_history']['rows_deleted'] == 8    # days 4, 30, 31, 45
+
+    with mock.patch("tracker_app.db.repository._utcnow", return_value=NOW):
+        with db() as s:
+            assert s.query(ReviewDailyRollup).count() == 4
+            DailySummaryRepository.rebuild(s)
+            StreakRepository.rebuild(s)
+            s.commit()
+            after = {r.date: (r.reviews, r.correct_reviews) for r in s.query(DailySummary)}
+            assert after == before
+            assert StreakRepository.get_current_streak(s, today=NOW.date()) == 5
+
+
+def test_only_consumed_feedback_samples_are_deleted(db):
+    with db() as s:
+        old = NOW - timedelta(days=200)
+        for used in (0, 1):
+            s.add(FeedbackTrainingSample(timestamp=old, feature_vector="[]", predicted_label="a",
+                                         actual_label="b", used_in_training=used))
+        s.commit()
+
+    _run(feedback_training_samples=90)
+    with db() as s:
+        assert [r.used_in_training for r in s.query(FeedbackTrainingSample)] == [0]
+
+
+def test_applied_review_ids_expire_after_the_retry_window(db):
+    with db() as s:
+        for back in (0, 3, 8, 30):
+            s.add(AppliedReview(review_id=f"r{back}", kind="concept", target="alpha",
+                                applied_at=NOW - timedelta(days=back), result="{}"))
+        s.commit()
+
+    report = _run(applied_reviews=7)
+    assert report['tables']['applied_reviews']['rows_deleted'] == 2
+    with db() as s:
+        assert sorted(r.review_id for r in s.query(AppliedReview)) == ["r0", "r3"]
+    assert retention.default_policies()[-1].horizon_days == 7
+
+
+def test_reclaim_space_converts_and_shrinks_file(db):
+    _seed_encounters(db, days_back=range(0, 200), per_day=20)
+    retention.reclaim_space(max_pages=0)                  # one-time conversion
+    assert retention.reclaim_space()['method'] is None    # nothing free yet
+
+    _run(concept_encounters=5)
+    space = retention.reclaim_space(max_pages=0)
+    assert space['method'] == 'incremental'
+    assert space['reclaimed_bytes'] > 0
+    assert space['size_after_bytes'] < space['size_before_bytes']
+    assert space['free_bytes'] == 0
@@ -0,0 +1,134 @@
+"""Vectorised AWFC retention (learning/retention_engine.py).
+
+Array scores must match the scalar compute_memory_score_awfc path row for
+row (including NULL / 0 fallbacks); threshold crossing times must land on
+the threshold; the at-risk query must pick the soonest N crossings.
+"""
+
+import math
+import random
+from datetime import datetime, timedelta
+from unittest import mock
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from tracker_app.config import MEMORY_THRESHOLD
+from tracker_app.db import models
+from tracker_app.db.models import Base, TrackedConcept
+from tracker_app.learning import memory_model
+from tracker_app.learning.retention_engine import RetentionSnapshot
+from tracker_app.tracking.knowledge_graph import _memory_score_from_row
+
+NOW = datetime(2026, 10, 18, 12, 0, 0)
+
+
+@pytest.fixture
+def db(monkeypatch, tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'awfc.db'}")
+    Base.metadata.create_all(bind=engine)
+    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    monkeypatch.setattr(models, "_engine", engine)
+    monkeypatch.setattr(models, "_SessionLocal", TestingSessionLocal)
+    yield TestingSessionLocal
+    engine.dispose()
+
+
+def _seed(db, n=200, seed=3):
+    rng = random.Random(seed)
+    with db() as s:
+        for i in range(n):
+            s.add(TrackedConcept(
+                concept=f"c{i}",
+                first_seen=NOW - timedelta(days=30),
+                last_seen=NOW - timedelta(hours=rng.uniform(0, 200)),
+                attention_at_encoding=0.0 if i % 11 == 0 else rng.uniform(0, 100),
+                lambda_personalised=None if i % 13 == 0 else rng.uniform(0.005, 0.6),
+            ))
+        s.commit()
+
+
+def test_scores_match_scalar_awfc_for_every_row(db):
+    _seed(db)
+    with db() as s:
+        rows = s.query(TrackedConcept).all()
+        with mock.patch.object(memory_model, "_utcnow", return_value=NOW):
+            expected = {r.concept: _memory_score_from_row(r) for r in rows}
+        loaded = RetentionSnapshot.load(s, now=NOW).as_dict()
+        from_rows = RetentionSnapshot.from_rows(rows, now=NOW).as_dict()
+    assert loaded.keys() == expected.keys()
+    for name, score in expected.items():
+        # SQLite's julianday() keeps milliseconds.
+        assert loaded[name] == pytest.approx(score, abs=1e-6)
+        assert from_rows[name] == pytest.approx(score, abs=1e-9)
+
+
+def test_hours_until_below_lands_on_threshold(db):
+    _seed(db)
+    with db() as s:
+        snap = RetentionSnapshot.load(s, now=NOW)
+    hours = snap.hours_until_below()
+    scores = snap.scores()
+    assert ((hours == 0) == (scores < MEMORY_THRESHOLD)).all()
+    for i in range(len(snap)):
+        if hours[i] > 0:
+            later = snap.scores(at=NOW + timedelta(hours=float(hours[i])))
+            assert later[i] == pytest.approx(MEMORY_THRESHOLD, rel=1e-6)
+    assert (snap.hours_until_below(threshold=0.05) == math.inf).all()
+
+
+def test_falling_below_picks_soonest_crossings(db):
+    _seed(db)
+    with db() as s:
+        snap = RetentionSnapshot.load(s, now=NOW)
+    hours = snap.hours_until_below()
+    scores = snap.scores()
+    window = [(h, snap.names[i]) for i, h in enumerate(hours)
+              if scores[i] >= MEMORY_THRESHOLD and h <= 12]
+    assert window, "seed should put some concepts inside the window"
+
+    top = snap.falling_below(12, limit=5)
+    assert [r['concept'] for r in top] == [name for _, name in sorted(window)[:5]]
+    assert all(r['hours_until_threshold'] <= 12 for r in top)
+    assert len(snap.falling_below(12)) == len(window)
+    assert snap.falling_below(12, limit=0) == []
+
+    with_below = snap.falling_below(12, include_below=True)
+    assert with_below[0]['hours_until_threshold'] == 0
+    assert with_below[0]['memory_score'] < MEMORY_THRESHOLD
+
+
+def test_empty_table(db):
+    with db() as s:
+        snap = RetentionSnapshot.load(s)
+    assert len(snap) == 0 and snap.falling_below(24) == []
+
+
+def test_at_risk_endpoint(db):
+    with db() as s:
+        now = datetime.utcnow()
+        s.add_all([
+            # lambda_p = 0.1 * (1 - 0.5 * 0.3) = 0.085; crosses 0.6 at ~6.0 h.
+            TrackedConcept(concept="soon", last_seen=now - timedelta(hours=5),
+                           attention_at_encoding=50, lambda_personalised=0.1),
+            TrackedConcept(concept="later", last_seen=now - timedelta(hours=1),
+                           attention_at_encoding=50, lambda_personalised=0.1),
+            TrackedConcept(concept="gone", last_seen=now - timedelta(days=5),
+                           attention_at_encoding=50, lambda_personalised=0.1),
+        ])
+        s.commit()
+    from tracker_app.web.app import app
+    app.config['TESTING'] = True
+    client = app.test_client()
+
+    body = client.get("/api/v1/concepts/at-risk?hours=2").get_json()
+    assert [r['concept'] for r in body['data']] == ["soon"]
+    assert 0.9 < body['data'][0]['hours_until_threshold'] < 1.1
+
+    body = client.get("/api/v1/concepts/at-risk?hours=6&include_below=true").get_json()
+    assert [r['concept'] for r in body['data']] == ["gone", "soon", "later"]
+
+    assert client.get("/api/v1/concepts/at-risk?hours=0").status_code == 400
+    assert client.get("/api/v1/concepts/at-risk?limit=x").status_code == 400
+    assert client.get("/api/v1/concepts/at-risk?include_below=maybe").status_code == 400
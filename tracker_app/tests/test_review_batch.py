@@ -0,0 +1,173 @@
+"""Batch review submission (learning/review_batch.py, POST /reviews/batch).
+
+Ratings apply in order inside one transaction with the same SM-2 result as
+the single-review paths; replayed review ids are reported as duplicates and
+never applied twice; unknown targets fail per entry without failing the
+batch; concept reviews reach the knowledge graph.
+"""
+
+import threading
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from tracker_app.db import models
+from tracker_app.db.models import AppliedReview, Base, ReviewHistory, TrackedConcept
+from tracker_app.db.repository import DailySummaryRepository
+from tracker_app.learning.concept_scheduler import ConceptScheduler
+from tracker_app.learning.learning_tracker import LearningTracker
+from tracker_app.learning.review_batch import (
+    MAX_REVIEW_BATCH, apply_review_batch, normalize_reviews)
+from tracker_app.tracking import knowledge_graph as kg
+
+
+@pytest.fixture
+def db(monkeypatch, tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'batch.db'}")
+    Base.metadata.create_all(bind=engine)
+    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    monkeypatch.setattr(models, "_engine", engine)
+    monkeypatch.setattr(models, "_SessionLocal", TestingSessionLocal)
+    commits = []
+    event.listen(engine, "commit", lambda conn: commits.append(1))
+    TestingSessionLocal.commits = commits
+    yield TestingSessionLocal
+    engine.dispose()
+
+
+@pytest.fixture
+def clean_graph(tmp_path, monkeypatch):
+    monkeypatch.setattr(kg, "KNOWLEDGE_GRAPH_PATH", str(tmp_path / "graph.pkl"))
+    original = kg.knowledge_graph.copy()
+    yield
+    with kg._graph_lock:
+        kg.knowledge_graph.clear()
+        kg.knowledge_graph.add_nodes_from(original.nodes(data=True))
+        kg.knowledge_graph.add_edges_from(original.edges(data=True))
+        kg._loaded = False
+        kg._last_db_sync = 0.0
+
+
+@pytest.fixture
+def client():
+    from tracker_app.web.app import app
+    app.config['TESTING'] = True
+    return app.test_client()
+
+
+def _post(client, reviews):
+    return client.post("/api/v1/reviews/batch", json={"reviews": reviews})
+
+
+def test_ratings_apply_in_order_like_single_reviews(db, client):
+    tracker = LearningTracker()
+    batched = tracker.add_learning_item("Q1?", "A1")
+    single = tracker.add_learning_item("Q2?", "A2")
+    for quality in (5, 4):
+        tracker.record_review(single, quality_rating=quality)
+
+    db.commits.clear()
+    body = _post(client, [{"review_id": "r1", "item_id": batched, "quality": 5},
+                          {"review_id": "r2", "item_id": batched, "quality": 4}]).get_json()
+    assert body['success'] and body['applied'] == 2
+    assert len(db.commits) == 1
+    assert [r['status'] for r in body['data']] == ["applied", "applied"]
+
+    a, b = tracker.get_item(batched), tracker.get_item(single)
+    for field in ("interval", "ease_factor", "repetitions", "total_reviews", "correct_count"):
+        assert a[field] == b[field]
+    assert body['data'][1]['interval'] == a['interval']
+    assert tracker.get_learning_today()['reviews_today'] == 4
+
+
+def test_replayed_batch_is_not_applied_twice(db, client):
+    item = LearningTracker().add_learning_item("Q?", "A")
+    reviews = [{"review_id": "once", "item_id": item, "quality": 5}]
+    first = _post(client, reviews).get_json()
+    again = _post(client, reviews + [{"review_id": "once", "item_id": item,
+                                      "quality": 0}]).get_json()
+    assert again['applied'] == 0 and again['duplicates'] == 2
+    assert [dict(r, status="applied") for r in again['data']] == first['data'] * 2
+    with db() as s:
+        assert s.query(ReviewHistory).count() == 1
+        assert s.query(AppliedReview).count() == 1
+
+
+def test_concurrent_duplicates_report_the_stored_result(db, monkeypatch):
+    item = LearningTracker().add_learning_item("Q?", "A")
+    reviews = normalize_reviews([{"review_id": "race", "item_id": item, "quality": 5}])
+    # Both submissions look the id up before either commits.
+    barrier, bump = threading.Barrier(2), DailySummaryRepository.bump
+    def bump_after_both_looked(*args, **kwargs):
+        barrier.wait(timeout=10)
+        bump(*args, **kwargs)
+    monkeypatch.setattr(DailySummaryRepository, "bump", staticmethod(bump_after_both_looked))
+
+    bodies, failures = [], []
+    def submit():
+        try:
+            bodies.append(apply_review_batch(reviews))
+        except Exception as e:
+            failures.append(e)
+    threads = [threading.Thread(target=submit) for _ in range(2)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(timeout=30)
+
+    assert failures == []
+    assert sorted(b['results'][0]['status'] for b in bodies) == ["applied", "duplicate"]
+    assert bodies[0]['results'][0]['interval'] == bodies[1]['results'][0]['interval']
+    with db() as s:
+        assert s.query(ReviewHistory).count() == 1
+        assert s.query(AppliedReview).count() == 1
+
+
+def test_concept_reviews_update_rows_and_graph(db, client, clean_graph):
+    scheduler = ConceptScheduler()
+    scheduler.add_concept("osmosis", 0.9)
+    scheduler.add_concept("diffusion", 0.8)
+    body = _post(client, [
+        {"review_id": "c1", "concept": "osmosis", "quality": 5},
+        {"review_id": "c2", "concept": "diffusion", "was_correct": False},
+        {"review_id": "c3", "concept": "osmosis", "was_correct": True},
+    ]).get_json()
+    assert body['applied'] == 3
+    with db() as s:
+        osmosis = s.get(TrackedConcept, "osmosis")
+        diffusion = s.get(TrackedConcept, "diffusion")
+    assert osmosis.review_count == 2 and osmosis.correct_count == 2
+    assert diffusion.review_count == 1 and diffusion.correct_count == 0
+    assert osmosis.next_review > diffusion.next_review
+    assert kg.knowledge_graph.nodes["osmosis"]["interval"] == osmosis.interval
+    assert scheduler.get_due_concepts() == []        # the queue saw the new dates
+
+
+def test_unknown_targets_fail_per_entry_and_can_be_retried(db, client):
+    item = LearningTracker().add_learning_item("Q?", "A")
+    body = _post(client, [{"review_id": "a", "item_id": "missing", "quality": 3},
+                          {"review_id": "b", "concept": "nowhere", "quality": 3},
+                          {"review_id": "c", "item_id": item, "quality": 3}]).get_json()
+    assert [r['status'] for r in body['data']] == ["error", "error", "applied"]
+    assert body['errors'] == 2 and body['applied'] == 1
+    with db() as s:
+        assert {r.review_id for r in s.query(AppliedReview)} == {"c"}
+
+
+@pytest.mark.parametrize("reviews", [
+    None, [], [1],
+    [{"item_id": "x", "quality": 3}],
+    [{"review_id": "r", "quality": 3}],
+    [{"review_id": "r", "item_id": "x", "concept": "y", "quality": 3}],
+    [{"review_id": "r", "item_id": "x", "quality": 6}],
+    [{"review_id": "r", "item_id": "x", "quality": "5"}],
+    [{"review_id": "r", "item_id": "x", "was_correct": True}],
+    [{"review_id": "x" * 129, "item_id": "x", "quality": 3}],
+    [{"review_id": str(i), "item_id": "x", "quality": 3} for i in range(MAX_REVIEW_BATCH + 1)],
+])
+def test_invalid_batches_are_rejected_whole(db, client, reviews):
+    resp = _post(client, reviews)
+    assert resp.status_code == 400 and not resp.get_json()['success']
+    with db() as s:
+        assert s.query(AppliedReview).count() == 0
@@ -0,0 +1,143 @@
+"""get_review_trend runs as windowed SQL aggregates.
+
+It used to load every review_history row and every learning item into
+Python and then run one ordered query per mastered item (N+1). These tests
+pin the per-day figures against a straightforward reference implementation
+and check that the statement count no longer grows with the data.
+"""
+
+import random
+from datetime import datetime, timedelta
+from unittest import mock
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from tracker_app.db.models import Base, LearningItem, ReviewHistory
+from tracker_app.db.repository import LearningRepository
+
+NOW = datetime(2026, 10, 18, 15, 30, 0)
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    session.statements = []
+    event.listen(engine, "before_cursor_execute",
+                 lambda conn, cur, stmt, *a: session.statements.append(stmt))
+    yield session
+    session.close()
+
+
+def _trend(db, days):
+    with mock.patch("tracker_app.db.repository._utcnow", return_value=NOW):
+        return LearningRepository.get_review_trend(db, days=days)
+
+
+def _reference_trend(items, reviews, days):
+    """The previous in-Python algorithm, over plain tuples."""
+    today = NOW.date()
+    dates = [today - timedelta(days=i) for i in range(days - 1, -1, -1)]
+    by_day = {d: {"date": d.isoformat(), "reviews": 0, "correct": 0,
+                  "added": 0, "mastered": 0, "due": 0} for d in dates}
+    for _item_id, ts, quality in reviews:
+        if ts.date() in by_day:
+            by_day[ts.date()]["reviews"] += 1
+            if quality is not None and quality >= 3:
+                by_day[ts.date()]["correct"] += 1
+    for item_id, created, status, next_review in items:
+        if created.date() in by_day:
+            by_day[created.date()]["added"] += 1
+        if status == "active" and next_review is not None and next_review.date() in by_day:
+            by_day[next_review.date()]["due"] += 1
+        if status != "mastered":
+            continue
+        item_reviews = sorted((r for r in reviews if r[0] == item_id), key=lambda r: r[1])
+        day = None
+        if not item_reviews:
+            day = created.date()
+        else:
+            total = correct = 0
+            for _id, ts, quality in item_reviews:
+                total += 1
+                if quality is not None and quality >= 3:
+                    correct += 1
+                if total > 5 and correct / total > 0.95:
+                    day = ts.date()
+                    break
+            if day is None:
+                day = item_reviews[-1][1].date()
+        if day in by_day:
+            by_day[day]["mastered"] += 1
+    out = list(by_day.values())
+    for entry in out:
+        entry["accuracy"] = round(
+            entry["correct"] / entry["reviews"] * 100) if entry["reviews"] else 0
+    return out
+
+
+def _seed(db, n_items, seed=3):
+    rng = random.Random(seed)
+    items, reviews = [], []
+    for i in range(n_items):
+        created = NOW - timedelta(days=rng.randint(0, 60), minutes=rng.randint(0, 1400))
+        status = rng.choice(["active", "active", "mastered", "archived"])
+        next_review = NOW + timedelta(days=rng.randint(-20, 10), hours=rng.randint(-5, 5))
+        item_id = f"item-{i}"
+        items.append((item_id, created, status, next_review))
+        db.add(LearningItem(id=item_id, question="q", answer="a", status=status,
+                            created_at=created, next_review_date=next_review))
+        ts = created
+        for _ in range(rng.randint(0, 12)):
+            ts = ts + timedelta(hours=rng.randint(1, 90))
+            if ts > NOW:
+                break
+            quality = rng.choice([5, 5, 5, 4, 3, 2, None])
+            reviews.append((item_id, ts, quality))
+            db.add(ReviewHistory(item_id=item_id, timestamp=ts, quality_rating=quality))
+    db.commit()
+    return items, reviews
+
+
+@pytest.mark.parametrize("days", [1, 7, 30, 90])
+def test_matches_reference_algorithm(db, days):
+    items, reviews = _seed(db, 150)
+    assert _trend(db, days) == _reference_trend(items, reviews, days)
+
+
+def test_mastery_day_is_first_review_meeting_the_rule(db):
+    db.add(LearningItem(id="m", question="q", answer="a", status="mastered",
+                        created_at=NOW - timedelta(days=20)))
+    # Six perfect reviews on days -10..-5: mastery is reached on the sixth.
+    for k in range(6):
+        db.add(ReviewHistory(item_id="m", quality_rating=5,
+                             timestamp=NOW - timedelta(days=10 - k)))
+    # Later reviews inside the 3-day window must not move the mastery day.
+    db.add(ReviewHistory(item_id="m", quality_rating=5, timestamp=NOW - timedelta(days=1)))
+    db.commit()
+
+    assert sum(d["mastered"] for d in _trend(db, 3)) == 0
+    trend = _trend(db, 7)
+    assert [d["mastered"] for d in trend] == [0, 1, 0, 0, 0, 0, 0]
+    assert trend[1]["date"] == (NOW - timedelta(days=5)).date().isoformat()
+
+
+def test_statement_count_does_not_grow_with_history(db):
+    _seed(db, 20, seed=1)
+    db.statements.clear()
+    _trend(db, 30)
+    small = len(db.statements)
+
+    for i in range(200):
+        db.add(LearningItem(id=f"extra-{i}", question="q", answer="a", status="mastered",
+                            created_at=NOW - timedelta(days=2)))
+        db.add(ReviewHistory(item_id=f"extra-{i}", quality_rating=5,
+                             timestamp=NOW - timedelta(days=1)))
+    db.commit()
+    db.statements.clear()
+    _trend(db, 30)
+
+    assert len(db.statements) == small == 2
@@ -174,3 +174,72 @@ def test_concurrent_start_stop_consistent(isolated_state, monkeypatch, tmp_path)
     assert status["active"] in (True, False)
     assert isinstance(status["started_at"], str) or status["started_at"] is None
     assert isinstance(status["stopped_at"], str) or status["stopped_at"] is None
+
+
+def test_reads_are_served_from_memory(isolated_state, monkeypatch):
+    ss.start()
+    loads, acquires = [], []
+    real_load = ss._load
+    monkeypatch.setattr(ss, "_load", lambda: loads.append(1) or real_load())
+    monkeypatch.setattr(ss._file_lock, "acquire", lambda *a, **kw: acquires.append(1))
+    for _ in range(100):
+        assert ss.is_active() is True
+        assert ss.get_status()["active"] is True
+        ss.get_calibration()
+    assert loads == [] and acquires == []
+
+
+def test_writes_bump_the_version(isolated_state):
+    assert ss.version() == 0
+    ss.start()
+    ss.set_calibration({"fallback": True})
+    ss.stop()
+    assert ss.version() == 3
+    assert ss.get_status()["version"] == 3
+    assert ss._load()["version"] == 3
+
+
+def test_watcher_picks_up_another_process_write(isolated_state, monkeypatch):
+    import json, time
+    monkeypatch.setattr(ss, "_WATCH_INTERVAL", 0.05)
+    ss.stop()
+    assert ss.is_active() is False
+    # Another process: write a new file and swap it in atomically.
+    tmp = isolated_state.with_suffix(".other")
+    tmp.write_text(json.dumps({"active": True, "started_at": "2026-01-01T00:00:00",
+                               "version": 9}), encoding="utf-8")
+    tmp.replace(isolated_state)
+    deadline = time.monotonic() + 5
+    while not ss.is_active() and time.monotonic() < deadline:
+        time.sleep(0.02)
+    assert ss.is_active() is True
+    assert ss.version() == 9
+
+
+def test_watcher_starts_when_the_first_call_is_a_write(isolated_state, monkeypatch):
+    import json, threading, time
+    monkeypatch.setattr(ss, "_WATCH_INTERVAL", 0.05)
+    monkeypatch.setattr(ss, "_snapshot", None)
+    monkeypatch.setattr(ss, "_watcher", None)
+    monkeypatch.setattr(ss, "_watch_stop", threading.Event())
+    try:
+        ss.stop()                       # e.g. the dashboard's POST /session/stop
+        assert ss._watcher is not None
+        tmp = isolated_state.with_suffix(".other")
+        tmp.write_text(json.dumps({"active": True, "version": 7}), encoding="utf-8")
+        tmp.replace(isolated_state)
+        deadline = time.monotonic() + 5
+        while ss._snapshot[2].get("version") != 7 and time.monotonic() < deadline:
+            time.sleep(0.02)
+        assert ss.is_active() is True
+    finally:
+        ss._watch_stop.set()
+        ss._watcher.join(1)
+
+
+def test_status_does_not_share_the_cached_calibration(isolated_state):
+    ss.set_calibration({"threshold": 0.2})
+    status = ss.get_status()
+    status["ear_calibration"]["threshold"] = 0.9
+    assert ss.get_calibration() == {"threshold": 0.2}
+    assert ss.get_status()["ear_calibration"] == {"threshold": 0.2}
@@ -0,0 +1,102 @@
+"""Tests for the per-stage latency histograms (stage_metrics)."""
+
+import random
+
+import pytest
+
+from tracker_app.tracking import stage_metrics as sm
+
+
+@pytest.fixture(autouse=True)
+def clean_metrics():
+    was_enabled = sm.is_enabled()
+    sm.set_enabled(True)
+    sm.reset_stage_metrics()
+    yield
+    sm.reset_stage_metrics()
+    sm.set_enabled(was_enabled)
+
+
+def test_bucket_upper_round_trips_every_index():
+    for value in list(range(0, 4096)) + [10 ** k for k in range(4, 10)]:
+        idx = sm._bucket_index(value)
+        assert sm._bucket_upper(idx) >= value
+        # Within the documented relative error.
+        assert sm._bucket_upper(idx) - value <= max(1, value // 64)
+
+
+def test_percentiles_match_exact_within_relative_error():
+    rng = random.Random(7)
+    samples = [int(rng.lognormvariate(9, 1.2)) for _ in range(5000)]
+    hist = sm.LatencyHistogram()
+    for v in samples:
+        hist.record_us(v)
+
+    ordered = sorted(samples)
+    pct = hist.percentiles((50.0, 95.0, 99.0))
+    for p, got in pct.items():
+        exact = ordered[-(-int(p * 1000) * len(ordered) // 100_000) - 1]
+        assert exact <= got <= exact * (1 + 1 / 64) + 1
+
+
+def test_small_sample_percentiles_are_exact():
+    hist = sm.LatencyHistogram()
+    for v in range(1, 21):            # 1..20 us, all in the exact range
+        hist.record_us(v)
+    pct = hist.percentiles((50.0, 95.0, 99.0))
+    assert pct == {50.0: 10, 95.0: 19, 99.0: 20}
+
+
+def test_stage_timer_records_summary_in_ms():
+    sm.record_stage('ocr.extract_text', 0.250)
+    sm.record_stage('ocr.extract_text', 0.010)
+    with sm.stage_timer('ocr.preprocess_image'):
+        pass
+
+    stages = sm.get_stage_metrics()['stages']
+    assert list(stages) == ['ocr.extract_text', 'ocr.preprocess_image']
+    text = stages['ocr.extract_text']
+    assert text['count'] == 2
+    assert text['min_ms'] == pytest.approx(10.0, rel=0.02)
+    assert text['max_ms'] == pytest.approx(250.0, rel=0.02)
+    assert text['p99_ms'] == pytest.approx(250.0, rel=0.02)
+    assert stages['ocr.preprocess_image']['count'] == 1
+
+
+def test_stage_timer_records_failed_stage():
+    with pytest.raises(RuntimeError):
+        with sm.stage_timer('ocr.capture_screenshot'):
+            raise RuntimeError('boom')
+    assert sm.get_stage_metrics()['stages']['ocr.capture_screenshot']['count'] == 1
+
+
+def test_disabled_metrics_are_noops():
+    sm.set_enabled(False)
+    assert sm.stage_timer('ocr.extract_text') is sm._NULL_TIMER
+    with sm.stage_timer('ocr.extract_text'):
+        pass
+    sm.record_stage('ocr.extract_text', 1.0)
+    assert sm.get_stage_metrics() == {'enabled': False, 'stages': {}}
+
+
+def test_ocr_pipeline_records_each_stage(monkeypatch):
+    # ocr_module needs cv2/mss/pytesseract (full dev env only).
+    for mod in ('cv2', 'mss', 'pytesseract'):
+        pytest.importorskip(mod)
+    import numpy as np
+    import tracker_app.tracking.ocr_module as ocr
+
+    monkeypatch.setattr(ocr, 'capture_screenshot', lambda: np.zeros((4, 4, 3), np.uint8))
+    monkeypatch.setattr(ocr, 'preprocess_image', lambda img: img)
+    monkeypatch.setattr(ocr, 'extract_text',
+                        lambda img: 'gradient descent optimises neural network weights')
+    monkeypatch.setattr(ocr, 'extract_concepts', lambda text, top_n=15: {'gradient descent': 0.8})
+    monkeypatch.setattr(ocr, 'get_snapshot', lambda: type('G', (), {'nodes': frozenset()})())
+
+    ocr.ocr_pipeline()
+
+    stages = sm.get_stage_metrics()['stages']
+    for name in ('ocr.pipeline', 'ocr.capture_screenshot', 'ocr.preprocess_image',
+                 'ocr.extract_text', 'ocr.sanitize_text', 'ocr.validate_text',
+                 'ocr.extract_concepts', 'ocr.graph_boost'):
+        assert stages[name]['count'] == 1, name
@@ -0,0 +1,115 @@
+"""O(1) review streak (StreakRepository / streak_state).
+
+get_learning_stats used to run SELECT DISTINCT date(timestamp) over all of
+review_history on every call. The streak now lives in one state row advanced
+by record_review; rebuild() re-derives it for repair.
+"""
+
+import random
+from datetime import date, datetime, timedelta
+from unittest import mock
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from tracker_app.db import models
+from tracker_app.db.models import Base, LearningItem, ReviewHistory, StreakState
+from tracker_app.db.repository import StreakRepository
+from tracker_app.learning.learning_tracker import LearningTracker
+
+TODAY = date(2026, 10, 18)
+
+
+@pytest.fixture
+def db(monkeypatch):
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    monkeypatch.setattr(models, "_engine", engine)
+    monkeypatch.setattr(models, "_SessionLocal", TestingSessionLocal)
+    TestingSessionLocal.statements = []
+    event.listen(engine, "before_cursor_execute",
+                 lambda conn, cur, stmt, *a: TestingSessionLocal.statements.append(stmt))
+    return TestingSessionLocal
+
+
+def _at(day, hour=12):
+    return datetime.combine(day, datetime.min.time()) + timedelta(hours=hour)
+
+
+def _review_on(tracker, item_id, day):
+    with mock.patch("tracker_app.learning.learning_tracker._utcnow", return_value=_at(day)):
+        tracker.record_review(item_id, 4)
+
+
+def _streak(db, today=TODAY):
+    with db() as s:
+        return StreakRepository.get_current_streak(s, today=today)
+
+
+def test_consecutive_days_extend_and_gaps_reset(db):
+    tracker = LearningTracker()
+    item = tracker.add_learning_item("q", "a")
+
+    for offset in (5, 4, 3):
+        _review_on(tracker, item, TODAY - timedelta(days=offset))
+    assert _streak(db, TODAY - timedelta(days=3)) == 3
+
+    _review_on(tracker, item, TODAY - timedelta(days=1))   # gap on day -2
+    _review_on(tracker, item, TODAY - timedelta(days=1))   # same day: no change
+    assert _streak(db) == 1                                # alive until today ends
+    _review_on(tracker, item, TODAY)
+    assert _streak(db) == 2
+    assert _streak(db, TODAY + timedelta(days=2)) == 0     # broken
+
+
+def test_get_learning_stats_does_not_scan_review_history(db):
+    tracker = LearningTracker()
+    item = tracker.add_learning_item("q", "a")
+    with mock.patch("tracker_app.learning.learning_tracker._utcnow",
+                    return_value=datetime.utcnow()):
+        tracker.record_review(item, 5)
+
+    db.statements.clear()
+    stats = tracker.get_learning_stats()
+
+    assert stats["current_streak"] == 1
+    assert not any("review_history" in stmt for stmt in db.statements)
+
+
+def _reference_streak(review_days, today):
+    day = today if today in review_days else today - timedelta(days=1)
+    streak = 0
+    while day in review_days:
+        streak += 1
+        day -= timedelta(days=1)
+    return streak
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_rebuild_matches_distinct_date_walk(db, seed):
+    rng = random.Random(seed)
+    review_days = {TODAY - timedelta(days=d) for d in range(40) if rng.random() < 0.8}
+    with db() as s:
+        s.add(LearningItem(id="i", question="q", answer="a"))
+        for day in review_days:
+            s.add(ReviewHistory(item_id="i", timestamp=_at(day, rng.randint(0, 23)),
+                                quality_rating=4))
+        s.commit()
+        StreakRepository.rebuild(s)
+        s.commit()
+
+    assert _streak(db) == _reference_streak(review_days, TODAY)
+
+
+def test_backfill_seeds_missing_row_once(db):
+    with db() as s:
+        s.add(LearningItem(id="i", question="q", answer="a"))
+        for d in (0, 1, 2):
+            s.add(ReviewHistory(item_id="i", timestamp=_at(TODAY - timedelta(days=d)),
+                                quality_rating=5))
+        s.commit()
+        assert StreakRepository.backfill_if_missing(s) is True
+        assert StreakRepository.backfill_if_missing(s) is False
+        assert s.get(StreakState, StreakRepository.ROW_ID).current_streak == 3
@@ -109,6 +109,11 @@ def loop_env(monkeypatch):
     quiz_calls = []
 
     monkeypatch.setattr(loop, "init_all_databases", lambda: None)
+    monkeypatch.setattr(loop, "start_retention_worker", lambda: None)
+    monkeypatch.setattr(loop, "start_lambda_calibration_worker", lambda: None)
+    monkeypatch.setattr(loop, "start_event_bus_client", lambda: None)
+    monkeypatch.setattr(loop, "maybe_publish_snapshot", lambda: None)
+    monkeypatch.setattr(loop, "publish_snapshot", lambda: None)
     monkeypatch.setattr(loop, "ActivityMonitor", lambda: monitor)
     monkeypatch.setattr(loop, "get_cle", lambda: _FakeCle())
     monkeypatch.setattr(loop, "start_listeners",
@@ -185,12 +190,10 @@ def test_maybe_trigger_quiz_fires_broadcast_and_stamps_cooldown(monkeypatch):
     monkeypatch.setattr(loop, "session_is_active", lambda: True)
     monkeypatch.setattr(quiz_engine, "should_show_quiz", lambda *a, **k: True)
     monkeypatch.setattr(quiz_engine, "generate_micro_quiz",
-                        lambda graph: {"concept": "hash table"})
-    monkeypatch.setattr("tracker_app.tracking.knowledge_graph.get_graph",
-                        lambda: object())
+                        lambda graph=None: {"concept": "hash table"})
     broadcast = []
     monkeypatch.setattr(realtime, "broadcast_micro_quiz",
-                        lambda q: broadcast.append(q))
+                        lambda q: broadcast.append(q) or True)
     recorded = []
     monkeypatch.setattr(quiz_engine, "record_quiz_broadcast",
                         lambda: recorded.append(1))
@@ -207,9 +210,7 @@ def test_maybe_trigger_quiz_suppressed_inside_cooldown(monkeypatch):
     quiz_engine._last_quiz_time = datetime.utcnow() - timedelta(minutes=19)
     monkeypatch.setattr(loop, "session_is_active", lambda: True)
     monkeypatch.setattr(quiz_engine, "generate_micro_quiz",
-                        lambda graph: {"concept": "hash table"})
-    monkeypatch.setattr("tracker_app.tracking.knowledge_graph.get_graph",
-                        lambda: object())
+                        lambda graph=None: {"concept": "hash table"})
     broadcast = []
     monkeypatch.setattr(realtime, "broadcast_micro_quiz",
                         lambda q: broadcast.append(q))
@@ -227,9 +228,7 @@ def test_maybe_trigger_quiz_fires_once_cooldown_expired(monkeypatch):
     quiz_engine._last_quiz_time = datetime.utcnow() - timedelta(minutes=21)
     monkeypatch.setattr(loop, "session_is_active", lambda: True)
     monkeypatch.setattr(quiz_engine, "generate_micro_quiz",
-                        lambda graph: {"concept": "hash table"})
-    monkeypatch.setattr("tracker_app.tracking.knowledge_graph.get_graph",
-                        lambda: object())
+                        lambda graph=None: {"concept": "hash table"})
     broadcast = []
     monkeypatch.setattr(realtime, "broadcast_micro_quiz",
                         lambda q: broadcast.append(q))
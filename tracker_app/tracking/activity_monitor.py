@@ -1,6 +1,8 @@
 ﻿import time
 import os
 import json
+import atexit
+import weakref
 from collections import deque
 from datetime import datetime, timedelta
 from threading import Lock
@@ -9,10 +11,11 @@ import logging
 
 from tracker_app.utils import utcnow as _utcnow
 
-from tracker_app.config import DATA_DIR
+from tracker_app.config import DATA_DIR, INTENT_FLUSH_CYCLES, INTENT_FLUSH_SECONDS
 from tracker_app.learning.concept_scheduler import ConceptScheduler
-from tracker_app.db.repository import TrackingRepository
+from tracker_app.db.repository import TrackingRepository, DailySummaryRepository
 from tracker_app.db.models import SessionLocal, IntentPrediction, TrackingSession
+from tracker_app.tracking.stage_metrics import stage_timer, get_stage_metrics, publish_snapshot
 
 
 logger = logging.getLogger("ActivityMonitor")
@@ -35,45 +38,105 @@ class ThreadSafeCounter:
             return value
 
 
+# Upper bound on unflushed predictions kept while the database is unwritable
+# (locked, disk full); the oldest are dropped beyond this.
+MAX_PENDING_PREDICTIONS = 1000
+
+_live_validators = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_live_validators():
+    for validator in list(_live_validators):
+        validator.flush()
+
+
 class IntentValidator:
     """Validates and improves intent predictions over time.
     
-    Writes directly to the shared ORM database (sessions.db) so that
-    the web API reads the same data the tracker writes.
+    Writes to the shared ORM database (sessions.db) so that the web API reads
+    the same data the tracker writes. Predictions are buffered and inserted
+    in one transaction every `flush_every` predictions or `flush_seconds`,
+    and on flush() (session end, process exit) -- one commit per batch
+    instead of one commit + refresh per 5 s tracking cycle.
     """
     
-    def __init__(self, db_path: str = None):
+    def __init__(self, db_path: str = None, flush_every: int = INTENT_FLUSH_CYCLES,
+                 flush_seconds: float = INTENT_FLUSH_SECONDS):
         # db_path parameter kept for backward-compat but ignored; all writes
         # now go through the shared SQLAlchemy engine in models.py.
         self.prediction_buffer = deque(maxlen=100)
+        self.flush_every = max(1, int(flush_every))
+        self.flush_seconds = flush_seconds
+        self._pending = []          # [IntentPrediction]
+        self._pending_lock = Lock()
+        self._flush_lock = Lock()
+        self._last_flush = time.monotonic()
+        _live_validators.add(self)
     
     def log_prediction(self, predicted_intent: str, confidence: float, context: str = "",
-                       features=None):
-        """Log an intent prediction to the shared ORM database.
+                       features=None) -> None:
+        """Buffer an intent prediction for the shared ORM database.
 
         context is the active window title (kept for display context).
         features is the exact 6-element feature vector the classifier saw â€”
         JSON-encoded into context_keywords so feedback-driven retraining
         (ADR-003) gets real inputs, not a window-title string.
         """
-        try:
-            with SessionLocal() as db:
-                pred = IntentPrediction(
-                    timestamp=_utcnow(),
-                    predicted_intent=predicted_intent,
-                    confidence=confidence,
-                    context_keywords=json.dumps(features) if features else "[]",
-                    window_title=context or "",
-                )
-                TrackingRepository.log_intent_prediction(db, pred)
-        except Exception as e:
-            logger.error(f"Failed to log intent prediction: {e}")
+        now = _utcnow()
+        pred = IntentPrediction(
+            timestamp=now,
+            predicted_intent=predicted_intent,
+            confidence=confidence,
+            context_keywords=json.dumps(features) if features else "[]",
+            window_title=context or "",
+        )
+        with self._pending_lock:
+            self._pending.append(pred)
+            self._trim_pending()
+            due = (len(self._pending) >= self.flush_every
+                   or time.monotonic() - self._last_flush >= self.flush_seconds)
+        if due:
+            self.flush()
         
         self.prediction_buffer.append({
             'intent': predicted_intent,
             'confidence': confidence,
-            'timestamp': _utcnow()
+            'timestamp': now
         })
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    def _trim_pending(self):
+        excess = len(self._pending) - MAX_PENDING_PREDICTIONS
+        if excess > 0:
+            del self._pending[:excess]
+            logger.warning(f"Dropped {excess} unflushed intent prediction(s)")
+
+    def flush(self) -> int:
+        """Write every buffered prediction in one transaction.
+
+        Returns the number of rows written. On failure the batch is put back
+        (ahead of anything buffered meanwhile) and retried on the next flush.
+        """
+        with self._flush_lock:
+            with self._pending_lock:
+                batch, self._pending = self._pending, []
+                self._last_flush = time.monotonic()
+            if not batch:
+                return 0
+            try:
+                with SessionLocal() as db:
+                    TrackingRepository.log_intent_predictions(db, batch)
+            except Exception as e:
+                logger.error(f"Failed to flush {len(batch)} intent prediction(s): {e}")
+                with self._pending_lock:
+                    self._pending[:0] = batch
+                    self._trim_pending()
+                return 0
+            return len(batch)
     
     def get_accuracy_stats(self) -> Dict[str, Any]:
         """Get overall intent prediction accuracy"""
@@ -110,6 +173,13 @@ class TrackingAnalytics:
                     avg_attention=avg_attention,
                     primary_activity=primary_activity
                 )
+                DailySummaryRepository.bump(
+                    db, start_time,
+                    sessions=1,
+                    total_tracking_minutes=duration,
+                    concepts_encountered=concepts_count or 0,
+                    attention_sum=avg_attention or 0.0,
+                )
                 TrackingRepository.log_session(db, session)
         except Exception as e:
             logger.error(f"Failed to log tracking session: {e}")
@@ -118,7 +188,7 @@ class TrackingAnalytics:
         """Get daily tracking summary"""
         try:
             with SessionLocal() as db:
-                return TrackingRepository.get_daily_summary(db, date)
+                return DailySummaryRepository.get_daily_summary(db, date)
         except Exception as e:
             logger.error(f"Failed to get daily summary: {e}")
             date_str = date.strftime("%Y-%m-%d") if date else _utcnow().strftime("%Y-%m-%d")
@@ -128,7 +198,7 @@ class TrackingAnalytics:
         """Analyze tracking trends"""
         try:
             with SessionLocal() as db:
-                return TrackingRepository.get_trend_analysis(db, days)
+                return DailySummaryRepository.get_trend_analysis(db, days)
         except Exception as e:
             logger.error(f"Failed to get trend analysis: {e}")
             return {'tracking_days': 0, 'avg_session_minutes': 0, 'total_concepts_encountered': 0, 'avg_attention_score': 0}
@@ -166,6 +236,9 @@ class ActivityMonitor:
     
     def end_session(self):
         """End tracking session and save analytics"""
+        # Always runs, even for an idle monitor: the loop's shutdown path
+        # relies on it to persist the last partial batch of predictions.
+        self.validator.flush()
         with self._lock:
             if not self.is_running:
                 return
@@ -204,7 +277,9 @@ class ActivityMonitor:
     ):
         """Process and schedule encountered concepts.
         Passes attention_score to concept_scheduler for AWFC Î» personalisation.
+        Saved concepts are announced on the event bus (CONCEPT_CAPTURED).
         """
+        captured = []
         for concept, info in ocr_keywords.items():
             if not concept or len(concept) < 2:
                 continue
@@ -213,16 +288,22 @@ class ActivityMonitor:
                     info.get('score', confidence)
                     if isinstance(info, dict) else confidence
                 )
-                saved = self.scheduler.add_concept(
-                    concept,
-                    concept_conf,
-                    context="ocr",
-                    attention_at_encoding=attention_score,  # AWFC
-                )
+                with stage_timer('concept.add_concept'):
+                    saved = self.scheduler.add_concept(
+                        concept,
+                        concept_conf,
+                        context="ocr",
+                        attention_at_encoding=attention_score,  # AWFC
+                    )
                 if saved:
                     self.session_concepts.append(concept)
+                    captured.append(concept)
             except Exception as e:
                 logger.error(f"Error processing concept {concept}: {e}")
+        if captured:
+            from tracker_app.tracking import event_bus
+            event_bus.publish(event_bus.CONCEPT_CAPTURED,
+                              {'concepts': captured, 'source': 'ocr'})
     
     def process_intent(self, intent_result: Dict[str, Any], context: str = ""):
         """Process intent prediction with validation.
@@ -275,7 +356,8 @@ class ActivityMonitor:
             'due_concepts': due_concepts,
             'intent_accuracy': intent_stats,
             'daily_summary': daily_stats,
-            'trend_analysis': trend_stats
+            'trend_analysis': trend_stats,
+            'stage_latency': get_stage_metrics(),
         }
 
         parent = os.path.dirname(output_file)
@@ -284,6 +366,7 @@ class ActivityMonitor:
         with open(output_file, 'w') as f:
             json.dump(export_data, f, indent=2)
 
+        publish_snapshot()
         logger.info(f"Tracking data exported to {output_file}")
         return export_data
 
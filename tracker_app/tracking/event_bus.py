@@ -0,0 +1,391 @@
+"""Local pub/sub channel between the tracker and dashboard processes.
+
+tracker_app.main and tracker_app.web.app run as separate processes that
+otherwise meet only in SQLite, session_state.json and knowledge_graph.json,
+each side polling for the other's writes. This module carries four kinds of
+event over a Unix domain socket at EVENT_BUS_SOCKET:
+
+- CONCEPT_CAPTURED  {'concepts': [...], 'source': ...}   new tracked concepts
+- GRAPH_UPDATED     {'nodes': n, 'edges': m}             knowledge graph saved
+- QUIZ              the generate_micro_quiz() dict       micro-quiz to show
+- SESSION           session_state.get_status()           session toggled
+
+The dashboard runs EventBusServer (start_event_bus_server); the tracker runs
+EventBusClient (start_event_bus_client), which reconnects with backoff
+whenever the dashboard restarts. Every message is one line of JSON. The
+server dispatches what it receives to its own subscribers and forwards it to
+the other connected peers; the client dispatches what the server forwards.
+
+publish() never blocks the caller: each connection has a sender thread
+draining a bounded queue (oldest message dropped when full). It also
+delivers to this process's subscribers, except those registered with
+remote_only=True -- cache invalidation that this process already did
+directly when it wrote the change.
+"""
+
+import json
+import logging
+import os
+import socket
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Optional
+
+from tracker_app.config import EVENT_BUS_ENABLED, EVENT_BUS_SOCKET
+
+logger = logging.getLogger("EventBus")
+
+CONCEPT_CAPTURED = "concept_captured"
+GRAPH_UPDATED = "graph_updated"
+QUIZ = "quiz"
+SESSION = "session"
+TOPICS = (CONCEPT_CAPTURED, GRAPH_UPDATED, QUIZ, SESSION)
+
+MAX_MESSAGE_BYTES = 64 * 1024
+MAX_PENDING = 256          # per connection; older messages are dropped first
+RECONNECT_MAX_SECONDS = 30.0
+
+Handler = Callable[[Any], None]
+
+_subscribers: dict = {}     # topic -> [(callback, remote_only)]
+_sub_lock = threading.Lock()
+_endpoint = None            # the running EventBusServer or EventBusClient
+
+
+def available() -> bool:
+    """True where the platform has Unix domain sockets."""
+    return hasattr(socket, "AF_UNIX")
+
+
+def subscribe(topic: str, callback: Handler, remote_only: bool = False) -> None:
+    """Call `callback(data)` for every `topic` event.
+
+    remote_only=True skips events published by this process."""
+    _check_topic(topic)
+    with _sub_lock:
+        _subscribers.setdefault(topic, []).append((callback, remote_only))
+
+
+def unsubscribe(topic: str, callback: Handler) -> None:
+    with _sub_lock:
+        _subscribers[topic] = [s for s in _subscribers.get(topic, []) if s[0] is not callback]
+
+
+def publish(topic: str, data: Any = None) -> bool:
+    """Send an event to local subscribers and, when connected, the other process.
+
+    Returns True when the event was queued for at least one connected
+    peer, False when only this process saw it."""
+    _check_topic(topic)
+    _dispatch(topic, data, remote=False)
+    endpoint = _endpoint
+    if endpoint is None:
+        return False
+    line = _encode({"topic": topic, "data": data, "pid": os.getpid(), "ts": time.time()})
+    return line is not None and endpoint.send_line(line)
+
+
+def is_connected() -> bool:
+    """True while an event published here reaches another process."""
+    endpoint = _endpoint
+    return endpoint is not None and endpoint.peer_count() > 0
+
+
+def _check_topic(topic: str) -> None:
+    if topic not in TOPICS:
+        raise ValueError(f"unknown event topic {topic!r}")
+
+
+def _dispatch(topic: str, data: Any, remote: bool) -> None:
+    for callback, remote_only in list(_subscribers.get(topic, ())):
+        if remote_only and not remote:
+            continue
+        try:
+            callback(data)
+        except Exception as e:
+            logger.warning("Event handler for %s failed: %s", topic, e)
+
+
+def _encode(message: dict) -> Optional[bytes]:
+    line = json.dumps(message, default=str).encode("utf-8") + b"\n"
+    if len(line) > MAX_MESSAGE_BYTES:
+        logger.warning("Dropping %s event: %d bytes exceeds %d",
+                       message.get("topic"), len(line), MAX_MESSAGE_BYTES)
+        return None
+    return line
+
+
+def _decode(line: bytes) -> Optional[dict]:
+    try:
+        message = json.loads(line)
+    except ValueError:
+        logger.debug("Ignoring malformed event line")
+        return None
+    if not isinstance(message, dict) or message.get("topic") not in TOPICS:
+        return None
+    return message
+
+
+class _Peer:
+    """One connected socket: a sender thread draining a bounded queue and a
+    reader thread handing each received line to `on_line`.
+
+    The owner registers the peer before calling start(), so an immediate
+    disconnect always reaches `on_close` for a peer the owner knows about."""
+
+    def __init__(self, sock: socket.socket, on_line, on_close, name: str):
+        self.sock = sock
+        self.name = name
+        self._on_line = on_line
+        self._on_close = on_close
+        self._queue: deque = deque(maxlen=MAX_PENDING)
+        self._ready = threading.Condition()
+        self.closed = False
+
+    def start(self) -> "_Peer":
+        threading.Thread(target=self._send_loop, name=f"{self.name}-send", daemon=True).start()
+        threading.Thread(target=self._read_loop, name=f"{self.name}-read", daemon=True).start()
+        return self
+
+    def send_line(self, line: bytes) -> bool:
+        with self._ready:
+            if self.closed:
+                return False
+            self._queue.append(line)
+            self._ready.notify()
+        return True
+
+    def _send_loop(self):
+        while True:
+            with self._ready:
+                while not self._queue and not self.closed:
+                    self._ready.wait()
+                if self.closed:
+                    return
+                line = self._queue.popleft()
+            try:
+                self.sock.sendall(line)
+            except OSError:
+                self.close()
+                return
+
+    def _read_loop(self):
+        buffer = b""
+        try:
+            while True:
+                chunk = self.sock.recv(65536)
+                if not chunk:
+                    break
+                buffer += chunk
+                while b"\n" in buffer:
+                    line, buffer = buffer.split(b"\n", 1)
+                    self._on_line(self, line)
+                if len(buffer) > MAX_MESSAGE_BYTES:
+                    logger.warning("Closing event connection: oversized message")
+                    break
+        except OSError:
+            pass
+        self.close()
+
+    def close(self):
+        with self._ready:
+            if self.closed:
+                return
+            self.closed = True
+            self._ready.notify_all()
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.sock.close()
+        self._on_close(self)
+
+
+class EventBusServer:
+    """Dashboard side: accepts connections on `path`, dispatches their
+    events here and forwards each to every other connected peer."""
+
+    def __init__(self, path: str = EVENT_BUS_SOCKET):
+        self.path = str(path)
+        self._sock = None
+        self._peers: set = set()
+        self._lock = threading.Lock()
+
+    def start(self) -> Optional["EventBusServer"]:
+        global _endpoint
+        if _socket_in_use(self.path):
+            logger.warning("Event bus socket %s is served by another process", self.path)
+            return None
+        try:
+            os.unlink(self.path)          # stale file from a crashed dashboard
+        except FileNotFoundError:
+            pass
+        try:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.bind(self.path)
+            os.chmod(self.path, 0o600)    # this user's processes only
+            sock.listen(8)
+        except OSError as e:
+            logger.warning("Event bus unavailable (%s): %s", self.path, e)
+            return None
+        self._sock = sock
+        threading.Thread(target=self._accept_loop, name="fkt-event-bus-accept",
+                         daemon=True).start()
+        _endpoint = self
+        logger.info("Event bus listening on %s", self.path)
+        return self
+
+    def _accept_loop(self):
+        sock = self._sock
+        while True:
+            try:
+                conn, _ = sock.accept()
+            except OSError:
+                return
+            peer = _Peer(conn, self._received, self._dropped, "fkt-event-bus-peer")
+            with self._lock:
+                if self._sock is None:      # accepted while stop() ran
+                    conn.close()
+                    return
+                self._peers.add(peer)
+            peer.start()
+
+    def _received(self, peer: _Peer, line: bytes) -> None:
+        message = _decode(line)
+        if message is None:
+            return
+        _dispatch(message["topic"], message.get("data"), remote=True)
+        self._fanout(line + b"\n", skip=peer)
+
+    def _dropped(self, peer: _Peer) -> None:
+        with self._lock:
+            self._peers.discard(peer)
+
+    def _fanout(self, line: bytes, skip: Optional[_Peer] = None) -> int:
+        with self._lock:
+            peers = [p for p in self._peers if p is not skip]
+        return sum(p.send_line(line) for p in peers)
+
+    def send_line(self, line: bytes) -> bool:
+        return self._fanout(line) > 0
+
+    def peer_count(self) -> int:
+        with self._lock:
+            return len(self._peers)
+
+    def stop(self) -> None:
+        global _endpoint
+        if _endpoint is self:
+            _endpoint = None
+        with self._lock:
+            sock, self._sock = self._sock, None
+            peers, self._peers = list(self._peers), set()
+        if sock is not None:
+            sock.close()
+            try:
+                os.unlink(self.path)
+            except OSError:
+                pass
+        for peer in peers:
+            peer.close()
+
+
+class EventBusClient:
+    """Tracker side: one connection to the dashboard's server, re-established
+    with exponential backoff; events forwarded by the server are dispatched
+    here."""
+
+    def __init__(self, path: str = EVENT_BUS_SOCKET):
+        self.path = str(path)
+        self._peer: Optional[_Peer] = None
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread = None
+
+    def start(self) -> "EventBusClient":
+        global _endpoint
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="fkt-event-bus",
+                                            daemon=True)
+            self._thread.start()
+        _endpoint = self
+        return self
+
+    def _run(self):
+        delay = 1.0
+        while not self._stop.is_set():
+            if self._peer is None or self._peer.closed:
+                self._peer = None
+                sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                try:
+                    sock.connect(self.path)
+                except OSError:
+                    sock.close()
+                    delay = min(delay * 2, RECONNECT_MAX_SECONDS)
+                else:
+                    self._peer = _Peer(sock, self._received, self._dropped, "fkt-event-bus")
+                    self._peer.start()
+                    delay = 1.0
+                    logger.info("Connected to dashboard event bus at %s", self.path)
+            self._wake.wait(delay)
+            self._wake.clear()
+
+    def _received(self, peer: _Peer, line: bytes) -> None:
+        message = _decode(line)
+        if message is not None:
+            _dispatch(message["topic"], message.get("data"), remote=True)
+
+    def _dropped(self, peer: _Peer) -> None:
+        if self._peer is peer:
+            self._peer = None
+            logger.info("Dashboard event bus disconnected")
+            self._wake.set()
+
+    def send_line(self, line: bytes) -> bool:
+        peer = self._peer
+        return peer is not None and peer.send_line(line)
+
+    def peer_count(self) -> int:
+        peer = self._peer
+        return int(peer is not None and not peer.closed)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        global _endpoint
+        if _endpoint is self:
+            _endpoint = None
+        self._stop.set()
+        self._wake.set()
+        peer = self._peer
+        if peer is not None:
+            peer.close()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+
+def _socket_in_use(path: str) -> bool:
+    if not os.path.exists(path):
+        return False
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+        return True
+    except OSError:
+        return False
+    finally:
+        probe.close()
+
+
+def start_event_bus_server(path: Optional[str] = None) -> Optional[EventBusServer]:
+    """Listen for the tracker (dashboard process), unless disabled or unsupported."""
+    if not EVENT_BUS_ENABLED or not available():
+        return None
+    return EventBusServer(path or EVENT_BUS_SOCKET).start()
+
+
+def start_event_bus_client(path: Optional[str] = None) -> Optional[EventBusClient]:
+    """Connect to the dashboard (tracker process), unless disabled or unsupported."""
+    if not EVENT_BUS_ENABLED or not available():
+        return None
+    return EventBusClient(path or EVENT_BUS_SOCKET).start()
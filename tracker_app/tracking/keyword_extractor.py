@@ -10,19 +10,29 @@ Why YAKE! beats TF-IDF here:
   sentence dispersion within the single text -- real ranking without
   needing a background corpus.
 
-Pipeline:
+Pipeline (ExtractionPipeline -- one spaCy parse per text, LRU-cached by hash):
   1. YAKE!          -> ranked keyword candidates (statistical)
   2. spaCy NER      -> named entities (PRODUCT, EVENT)
   3. spaCy nouns    -> noun chunks as supplementary candidates
   4. Merge + dedup  -> final scored keyword dict
 
+Step 1 is scored by the built-in NumpyKeywordScorer (same features and
+ranking as the yake package, vectorised) unless KEYWORD_SCORER=yake.
+
 Fallback: if YAKE! is not installed, falls back to spaCy noun extraction.
 """
 
+import hashlib
 import logging
 import re
+import string
+import threading
+from collections import OrderedDict
+from pathlib import Path
 from typing import List, Tuple, Optional
 
+import numpy as np
+
 logger = logging.getLogger("KeywordExtractor")
 
 # -- Lazy-loaded heavy objects ----------------------------------------
@@ -56,19 +66,51 @@ def _get_yake():
             _yake_extractor = None
     return _yake_extractor
 
+# Extraction profiles: which en_core_web_sm components to load and whether
+# noun chunks come from the dependency parser or a POS-pattern chunker.
+# Keyword extraction only reads entities, noun chunks, POS tags and lemmas;
+# the parser is the most expensive component and NER the next.
+#   full     -- every component, parser noun chunks (original behaviour)
+#   balanced -- no parser; NER kept so PERSON entities are still blocked
+#   fast     -- tagger/lemmatizer only; PERSON blocking falls back to the
+#               _BLOCKED_NAMES list and the downstream privacy filter
+EXTRACTION_PROFILES = {
+    "full":     {"exclude": (),                 "rule_chunks": False},
+    "balanced": {"exclude": ("parser",),        "rule_chunks": True},
+    "fast":     {"exclude": ("parser", "ner"),  "rule_chunks": True},
+}
+
+
+def _profile_settings(profile: Optional[str] = None) -> dict:
+    """Return the settings for profile (default: EXTRACTION_PROFILE config)."""
+    if profile is None:
+        from tracker_app.config import EXTRACTION_PROFILE
+        profile = EXTRACTION_PROFILE
+    if profile not in EXTRACTION_PROFILES:
+        logger.warning(f"Unknown extraction profile '{profile}', using 'full'.")
+        profile = "full"
+    return EXTRACTION_PROFILES[profile]
+
+
+def _load_nlp(profile: Optional[str] = None):
+    """Load en_core_web_sm with the components the profile needs (raises on failure)."""
+    import spacy
+    return spacy.load("en_core_web_sm", exclude=list(_profile_settings(profile)["exclude"]))
+
+
 # None = never tried; _SPACY_NLP_FAILED = load failed (stop retrying + log spam)
 _SPACY_NLP_FAILED = object()
 
 def _get_nlp():
-    """Return spaCy nlp model (lazy init)."""
+    """Return spaCy nlp model for the configured extraction profile (lazy init)."""
     global _spacy_nlp
     if _spacy_nlp is _SPACY_NLP_FAILED:
         return None
     if _spacy_nlp is None:
         try:
-            import spacy
-            _spacy_nlp = spacy.load("en_core_web_sm")
-            logger.info("spaCy en_core_web_sm loaded for keyword extraction.")
+            _spacy_nlp = _load_nlp()
+            logger.info(f"spaCy en_core_web_sm loaded for keyword extraction "
+                        f"(components: {', '.join(_spacy_nlp.pipe_names)}).")
         except Exception as e:
             logger.warning(f"spaCy load failed: {e}. Will not retry.")
             _spacy_nlp = _SPACY_NLP_FAILED
@@ -76,6 +118,281 @@ def _get_nlp():
     return _spacy_nlp
 
 
+class _RuleChunk:
+    """Minimal noun-chunk stand-in (text + head token) for the rule chunker."""
+
+    __slots__ = ("text", "root")
+
+    def __init__(self, text: str, root):
+        self.text = text
+        self.root = root
+
+
+def _rule_noun_chunks(doc):
+    """Noun phrases from POS tags alone: optional DET, then ADJ/NOUN/PROPN runs
+    ending in a NOUN/PROPN head. Stands in for doc.noun_chunks when the
+    dependency parser is not loaded.
+    """
+    tokens = list(doc)
+    i, n = 0, len(tokens)
+    while i < n:
+        start = i
+        if tokens[i].pos_ == "DET":
+            i += 1
+        j = i
+        head = None
+        while j < n and tokens[j].pos_ in ("ADJ", "NOUN", "PROPN"):
+            if tokens[j].pos_ in ("NOUN", "PROPN"):
+                head = j
+            j += 1
+        if head is not None:
+            yield _RuleChunk(' '.join(t.text for t in tokens[start:head + 1]), tokens[head])
+            i = head + 1
+        else:
+            i = max(j, start + 1)
+
+
+
+# -- Built-in NumPy scorer (YAKE-compatible) ----------------------------
+_STOPWORDS_PATH = Path(__file__).resolve().parent.parent / "data" / "keyword_stopwords_en.txt"
+_SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?])\s+")
+_TOKEN_RE = re.compile(r"\w+(?:[-'\u2019]\w+)*|[^\w\s]")
+_PUNCT = frozenset(string.punctuation)
+
+# Orthographic tags, ordered so that `tag < _TAG_D` means "usable word".
+_TAG_P, _TAG_N, _TAG_A, _TAG_D, _TAG_U = range(5)
+
+
+def _word_tag(word: str, first_in_sentence: bool) -> int:
+    """YAKE's orthographic tag: digit, unusual, acronym, proper noun, plain."""
+    bare = word.replace(",", "")
+    if bare.isdigit() or bare.replace(".", "", 1).isdigit():
+        return _TAG_D
+    n_digit = sum(c.isdigit() for c in word)
+    n_alpha = sum(c.isalpha() for c in word)
+    n_punct = sum(c in _PUNCT for c in word)
+    if (n_digit and n_alpha) or (not n_digit and not n_alpha) or n_punct > 1:
+        return _TAG_U
+    if word.isupper():
+        return _TAG_A
+    if (len(word) > 1 and word[0].isupper() and not first_in_sentence
+            and sum(c.isupper() for c in word) == 1):
+        return _TAG_N
+    return _TAG_P
+
+
+def _dedup_similarity(a: str, b: str) -> float:
+    """YAKE's 'seqm' near-duplicate similarity (pre-filter + char/word/trigram overlap)."""
+    if a == b:
+        return 1.0
+    la, lb = len(a), len(b)
+    max_len = max(la, lb)
+    if abs(la - lb) > max_len * 0.6:
+        return 0.0
+    if max_len > 3:
+        if a[0] != b[0] or a[-1] != b[-1]:
+            return 0.0
+        if min(la, lb) >= 3 and a[:2] != b[:2]:
+            return 0.0
+    if abs(a.count(' ') - b.count(' ')) > 1:
+        return 0.0
+    len_ratio = min(la, lb) / max_len
+    if len_ratio < 0.3:
+        return 0.0
+    ca, cb = set(a), set(b)
+    char_overlap = len(ca & cb) / len(ca | cb)
+    if char_overlap < 0.2:
+        return 0.0
+    if max_len <= 4:
+        return char_overlap * len_ratio
+    wa, wb = a.split(), b.split()
+    if len(wa) > 1 or len(wb) > 1:
+        word_overlap = len(set(wa) & set(wb)) / len(set(wa) | set(wb))
+        if word_overlap > 0.4:
+            return word_overlap
+    ta = {a[i:i + 3] for i in range(la - 2)}
+    tb = {b[i:i + 3] for i in range(lb - 2)}
+    union = ta | tb
+    tri_overlap = len(ta & tb) / len(union) if union else 0.0
+    return min(0.3 * len_ratio + 0.2 * char_overlap + 0.5 * tri_overlap, 1.0)
+
+
+class NumpyKeywordScorer:
+    """YAKE-compatible keyword scorer computed over NumPy token-ID arrays.
+
+    Reproduces YAKE's per-term features (casing, sentence position, frequency,
+    left/right co-occurrence dispersion, sentence spread) and its uni/bigram
+    candidate score, but after one tokenising pass every feature is a
+    bincount / unique over integer arrays instead of per-object Python and a
+    networkx co-occurrence graph. Returns the same [(keyword, score)] shape
+    as yake.KeywordExtractor.extract_keywords (lower score = more relevant).
+
+    Defaults mirror the configuration the yake singleton actually runs with:
+    yake 0.7 silently ignores the camelCase dedupLim/windowsSize keywords, so
+    the effective settings are a 1-token window and a 0.9 dedup limit.
+    """
+
+    def __init__(self, top: int = 20, dedup_lim: float = 0.9, stopwords=None):
+        self.top = top
+        self.dedup_lim = dedup_lim
+        self.stopwords = frozenset(stopwords) if stopwords is not None else self._load_stopwords()
+
+    @staticmethod
+    def _load_stopwords() -> frozenset:
+        try:
+            return frozenset(_STOPWORDS_PATH.read_text(encoding="utf-8").lower().split())
+        except OSError as e:
+            logger.warning(f"Keyword stopword list unavailable ({e}); scoring without it.")
+            return frozenset()
+
+    def extract_keywords(self, text: str) -> List[Tuple[str, float]]:
+        if not text:
+            return []
+        text = text.replace("\n", " ")
+
+        # -- 1. Single Python pass: tokens -> integer ids ---------------
+        vocab: dict = {}            # lowercase surface form -> word id
+        tag_cache: dict = {}
+        wid, sent, block, tags = [], [], [], []
+        n_sentences = 0
+        b = -1
+        for sentence in _SENTENCE_SPLIT_RE.split(text):
+            if not sentence.strip():
+                continue
+            new_block = True
+            for pos, tok in enumerate(_TOKEN_RE.findall(sentence)):
+                if all(c in _PUNCT for c in tok):
+                    new_block = True
+                    continue
+                if new_block:
+                    b += 1
+                    new_block = False
+                key = (tok, pos == 0)
+                tag = tag_cache.get(key)
+                if tag is None:
+                    tag = tag_cache[key] = _word_tag(tok, pos == 0)
+                wid.append(vocab.setdefault(tok.lower(), len(vocab)))
+                sent.append(n_sentences)
+                block.append(b)
+                tags.append(tag)
+            n_sentences += 1
+        if not wid:
+            return []
+
+        # Word -> term (YAKE folds a trailing plural 's'), stopword per term.
+        terms: dict = {}
+        term_of_word = np.empty(len(vocab), dtype=np.int64)
+        term_stop: list = []
+        for w, i in vocab.items():
+            term = w[:-1] if w.endswith("s") and len(w) > 3 else w
+            t = terms.get(term)
+            if t is None:
+                t = terms[term] = len(terms)
+                bare = ''.join(c for c in term if c not in _PUNCT)
+                term_stop.append(w in self.stopwords or term in self.stopwords or len(bare) < 3)
+            term_of_word[i] = t
+
+        wid = np.asarray(wid, dtype=np.int64)
+        sent = np.asarray(sent, dtype=np.int64)
+        block = np.asarray(block, dtype=np.int64)
+        tags = np.asarray(tags, dtype=np.int8)
+        stop = np.asarray(term_stop, dtype=bool)
+        tid = term_of_word[wid]
+        n_terms = len(terms)
+        usable = tags < _TAG_D
+
+        # -- 2. Per-term features ---------------------------------------
+        valid = ~stop
+        if not valid.any():
+            return []
+        tf = np.bincount(tid, minlength=n_terms).astype(np.float64)
+        tf_a = np.bincount(tid, weights=(tags == _TAG_A), minlength=n_terms)
+        tf_n = np.bincount(tid, weights=(tags == _TAG_N), minlength=n_terms)
+        max_tf = tf.max()
+        avg_tf, std_tf = tf[valid].mean(), tf[valid].std()
+
+        # Co-occurrence with the previous token in the same block.
+        adjacent = block[1:] == block[:-1]
+        co = adjacent & usable[1:] & usable[:-1]
+        left, right = tid[:-1][co], tid[1:][co]
+        pairs = np.unique(left * n_terms + right)
+        wir = np.bincount(left, minlength=n_terms)
+        wil = np.bincount(right, minlength=n_terms)
+        wdr = np.bincount(pairs // n_terms, minlength=n_terms)
+        wdl = np.bincount(pairs % n_terms, minlength=n_terms)
+        pwr = np.divide(wdr, wir, out=np.zeros(n_terms), where=wir > 0)
+        pwl = np.divide(wdl, wil, out=np.zeros(n_terms), where=wil > 0)
+        wrel = (0.5 + pwl * tf / max_tf) + (0.5 + pwr * tf / max_tf)
+
+        # Distinct sentences per term -> spread and median sentence position.
+        ts = np.unique(tid * n_sentences + sent)
+        ts_sent = ts % n_sentences
+        per_term = np.bincount(ts // n_sentences, minlength=n_terms)
+        starts = np.concatenate(([0], np.cumsum(per_term)[:-1]))
+        median = (ts_sent[starts + (per_term - 1) // 2] + ts_sent[starts + per_term // 2]) / 2.0
+
+        wfreq = tf / (avg_tf + std_tf)
+        wspread = per_term / n_sentences
+        wcase = np.maximum(tf_a, tf_n) / (1.0 + np.log(tf))
+        wpos = np.log(np.log(3.0 + median))
+        h = (wpos * wrel) / (wcase + wfreq / wrel + wspread / wrel)
+
+        # -- 3. Uni/bigram candidates ------------------------------------
+        n_words = len(vocab)
+        n_tok = len(wid)
+        bi_right = np.nonzero(adjacent)[0] + 1
+        keys = np.concatenate((wid, n_words + wid[bi_right - 1] * n_words + wid[bi_right]))
+        order_pos = np.concatenate((2 * np.arange(n_tok), 2 * bi_right + 1))
+        occ_ok = np.concatenate((usable, usable[bi_right - 1] & usable[bi_right]))
+
+        cand, inv, cand_tf = np.unique(keys, return_inverse=True, return_counts=True)
+        first_pos = np.full(len(cand), order_pos.max() + 1)
+        np.minimum.at(first_pos, inv, order_pos)
+        cand_ok = np.bincount(inv, weights=occ_ok, minlength=len(cand)) > 0
+
+        is_bi = cand >= n_words
+        w1 = np.where(is_bi, (cand - n_words) // n_words, cand)
+        w2 = np.where(is_bi, (cand - n_words) % n_words, cand)
+        t1, t2 = term_of_word[w1], term_of_word[w2]
+        h1, h2 = h[t1], h[t2]
+        cand_h = np.where(
+            is_bi,
+            (h1 * h2) / ((h1 + h2 + 1.0) * cand_tf),
+            h1 / ((h1 + 1.0) * cand_tf),
+        )
+        keep = np.nonzero(cand_ok & ~stop[t1] & ~stop[t2])[0]
+        ranked = keep[np.lexsort((first_pos[keep], cand_h[keep]))]
+
+        # -- 4. Near-duplicate suppression (bounded by top) --------------
+        words = list(vocab)
+        results: List[Tuple[str, float]] = []
+        for c in ranked:
+            kw = words[w1[c]] + ' ' + words[w2[c]] if is_bi[c] else words[w1[c]]
+            if any(_dedup_similarity(kw, prev) > self.dedup_lim for prev, _ in results):
+                continue
+            results.append((kw, float(cand_h[c])))
+            if len(results) == self.top:
+                break
+        return results
+
+
+_numpy_scorer: Optional[NumpyKeywordScorer] = None
+
+def _get_scorer():
+    """Return the statistical keyword scorer selected by KEYWORD_SCORER.
+
+    'numpy' -> built-in NumpyKeywordScorer; anything else -> the yake
+    package singleton (None when yake is not installed).
+    """
+    global _numpy_scorer
+    from tracker_app.config import KEYWORD_SCORER
+    if KEYWORD_SCORER == "numpy":
+        if _numpy_scorer is None:
+            _numpy_scorer = NumpyKeywordScorer()
+        return _numpy_scorer
+    return _get_yake()
+
+
 _BLOCKED_NAMES = frozenset({
     'james', 'john', 'robert', 'michael', 'david', 'william', 'richard',
     'joseph', 'thomas', 'charles', 'christopher', 'daniel', 'matthew',
@@ -181,95 +498,14 @@ class YAKEKeywordExtractor:
         """
         Extract and rank keywords from a single text.
 
+        Thin wrapper over the shared ExtractionPipeline: YAKE relevance is
+        primary, spaCy entities / noun chunks / nouns supplement it.
+
         Returns:
             List of (keyword, relevance_score) sorted high->low.
             relevance_score is in [0.0, 1.0].
         """
-        if not text or len(text.strip()) < 10:
-            return []
-
-        scores: dict[str, float] = {}
-
-        # -- 0. Parse spaCy doc first (used by YAKE filtering and NER) --
-        nlp = _get_nlp()
-        doc = None
-        blocked_entity_texts = set()
-        if nlp is not None:
-            try:
-                doc = nlp(text[:50_000])  # cap for performance
-            except Exception as e:
-                logger.warning(f"spaCy parsing failed: {e}")
-
-        # -- 1. YAKE! extraction ------------------------------------
-        yake = _get_yake()
-        if yake is not None:
-            try:
-                raw = yake.extract_keywords(text)
-                # raw = [(keyword, yake_score), ...]  lower score = more relevant
-                if raw:
-                    min_s = min(s for _, s in raw)
-                    max_s = max(s for _, s in raw)
-                    rng   = max(max_s - min_s, 1e-9)
-                    for kw, s in raw:
-                        kw = kw.lower().strip()
-                        if len(kw) < self.MIN_KW_LEN:
-                            continue
-                        if s > self.YAKE_SCORE_CAP:
-                            continue
-                        # POS filter: reject bigrams containing verbs
-                        if self._is_verb_containing_bigram(kw, doc):
-                            continue
-                        # invert: low yake score -> high relevance
-                        rel = 1.0 - (s - min_s) / rng
-                        scores[kw] = max(scores.get(kw, 0.0), round(rel, 4))
-            except Exception as e:
-                logger.warning(f"YAKE! extraction failed: {e}")
-
-        # -- 2. spaCy NER + noun chunks -----------------------------
-        if doc is not None:
-            try:
-
-                # Named entities -- skip blocked types, boost allowed types
-                for ent in doc.ents:
-                    if ent.label_ in self.BLOCKED_ENTITY_TYPES:
-                        blocked_entity_texts.add(ent.text.lower().strip())
-                        continue
-                    if ent.label_ in self.ENTITY_TYPES:
-                        kw = ent.text.lower().strip()
-                        if len(kw) >= self.MIN_KW_LEN:
-                            # entities get a floor score of 0.7
-                            scores[kw] = max(scores.get(kw, 0.0), 0.7)
-
-                # Noun chunks -- supplementary
-                for chunk in doc.noun_chunks:
-                    kw = chunk.root.lemma_.lower().strip()
-                    if len(kw) >= self.MIN_KW_LEN and not chunk.root.is_stop:
-                        scores[kw] = max(scores.get(kw, 0.0), 0.35)
-
-                # Nouns and proper nouns not already captured
-                for tok in doc:
-                    if tok.pos_ in ("NOUN", "PROPN") and not tok.is_stop:
-                        kw = tok.lemma_.lower().strip()
-                        if len(kw) >= self.MIN_KW_LEN and kw.isalpha():
-                            scores[kw] = max(scores.get(kw, 0.0), 0.25)
-            except Exception as e:
-                logger.warning(f"spaCy NER extraction failed: {e}")
-
-        # -- 3. Fallback: word frequency if both pipelines failed ----
-        if not scores:
-            scores = self._frequency_fallback(text, top_n)
-
-        # -- 4. Sort, cap, return ------------------------------------
-        sorted_kws = sorted(scores.items(), key=lambda x: -x[1])
-        # Drop weak verb/function-word phrase fragments (keep single words).
-        sorted_kws = [kv for kv in sorted_kws if not self._is_weak_phrase(kv[0])]
-        # Filter out keywords that are entirely personal names (PII)
-        sorted_kws = [kv for kv in sorted_kws
-                      if not all(w in _BLOCKED_NAMES for w in kv[0].split())]
-        # Filter out keywords that are blocked entity text (ORG/GPE/etc.)
-        if blocked_entity_texts:
-            sorted_kws = [kv for kv in sorted_kws if kv[0] not in blocked_entity_texts]
-        return sorted_kws[:top_n]
+        return get_extraction_pipeline().keywords(text, top_n)
 
     @staticmethod
     def _frequency_fallback(text: str, top_n: int) -> dict:
@@ -298,97 +534,262 @@ def get_keyword_extractor() -> YAKEKeywordExtractor:
         _extractor_instance = YAKEKeywordExtractor()
     return _extractor_instance
 
-def extract_concepts(text: str, top_n: int = 15) -> dict:
-    """Unified concept extraction: spaCy-first, YAKE-supplementary.
 
-    spaCy noun chunks (0.7) and entities (0.8) are primary.
-    YAKE phrases (0.5) supplement when spaCy produces < 5 keywords.
-    POS filtering rejects YAKE bigrams containing verbs.
+class _TextAnalysis:
+    """Everything the scorers need from one text, derived from ONE spaCy parse.
 
-    Returns: {keyword: score} dict sorted by score descending.
+    Holds plain strings rather than the Doc itself so cached entries stay
+    small. YAKE output is computed lazily: extract_concepts only consults it
+    when spaCy yields fewer than 5 candidates.
     """
-    if not text or len(text.strip()) < 10:
-        return {}
 
-    scores: dict[str, float] = {}
+    __slots__ = ("text", "parsed", "entities", "blocked_entities",
+                 "chunk_phrases", "chunk_roots", "nouns", "verb_words", "_yake_raw")
+
+    _NOT_RUN = object()
+
+    def __init__(self, text: str):
+        self.text = text
+        self.parsed = False
+        self.entities: Tuple[str, ...] = ()
+        self.blocked_entities: frozenset = frozenset()
+        self.chunk_phrases: Tuple[str, ...] = ()
+        self.chunk_roots: Tuple[str, ...] = ()
+        self.nouns: Tuple[str, ...] = ()
+        self.verb_words: frozenset = frozenset()
+        self._yake_raw = self._NOT_RUN
+
+    def yake_raw(self) -> list:
+        """Raw YAKE (keyword, score) pairs, computed at most once per text."""
+        if self._yake_raw is self._NOT_RUN:
+            raw = []
+            scorer = _get_scorer()
+            if scorer is not None:
+                try:
+                    raw = scorer.extract_keywords(self.text) or []
+                except Exception as e:
+                    logger.warning(f"YAKE! extraction failed: {e}")
+            self._yake_raw = raw
+        return self._yake_raw
+
+    def is_verb_bigram(self, keyword: str) -> bool:
+        """Set-lookup equivalent of YAKEKeywordExtractor._is_verb_containing_bigram."""
+        if ' ' not in keyword or not self.parsed:
+            return False
+        return any(w in self.verb_words for w in keyword.lower().split())
 
-    # -- 1. spaCy: noun chunks + entities (PRIMARY) --
-    nlp = _get_nlp()
-    doc = None
-    blocked_entity_texts = set()
-    if nlp is not None:
+
+class ExtractionPipeline:
+    """Single spaCy + YAKE extraction path shared by every caller.
+
+    extract_concepts() and YAKEKeywordExtractor.extract_keywords() used to
+    each run spaCy and YAKE on the same OCR text. The pipeline parses a text
+    once, keeps the derived candidates in a small LRU keyed by a hash of the
+    text, and applies the two scoring policies on top of that analysis --
+    so a repeat frame of an unchanged page never reaches spaCy again.
+    """
+
+    NLP_CHAR_CAP = 50_000   # spaCy input cap for performance
+    _STOP_ARTICLES = frozenset({'the', 'a', 'an'})
+
+    def __init__(self, cache_size: Optional[int] = None, nlp=None,
+                 profile: Optional[str] = None):
+        if cache_size is None:
+            from tracker_app.config import KEYWORD_CACHE_SIZE
+            cache_size = KEYWORD_CACHE_SIZE
+        self.cache_size = max(0, int(cache_size))
+        # nlp/profile are only overridden by the benchmark harness; the
+        # default pipeline uses the shared _get_nlp() model.
+        self._nlp = nlp
+        self.rule_chunks = _profile_settings(profile)["rule_chunks"]
+        self._cache: "OrderedDict[str, _TextAnalysis]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _text_key(text: str) -> str:
+        return hashlib.blake2b(
+            text.encode("utf-8", "surrogatepass"), digest_size=16
+        ).hexdigest()
+
+    def clear_cache(self) -> None:
+        with self._lock:
+            self._cache.clear()
+            self.hits = self.misses = 0
+
+    def analyse(self, text: str) -> _TextAnalysis:
+        """Return the (possibly cached) analysis for text."""
+        key = self._text_key(text)
+        if self.cache_size:
+            with self._lock:
+                cached = self._cache.get(key)
+                if cached is not None:
+                    self._cache.move_to_end(key)
+                    self.hits += 1
+                    return cached
+                self.misses += 1
+
+        # Parse outside the lock: a duplicate parse under a race is cheaper
+        # than serialising the OCR thread behind the API thread.
+        analysis = self._parse(text)
+
+        if self.cache_size:
+            with self._lock:
+                self._cache[key] = analysis
+                self._cache.move_to_end(key)
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return analysis
+
+    def _parse(self, text: str) -> _TextAnalysis:
+        analysis = _TextAnalysis(text)
+        nlp = self._nlp if self._nlp is not None else _get_nlp()
+        if nlp is None:
+            return analysis
         try:
-            doc = nlp(text[:50_000])
+            doc = nlp(text[:self.NLP_CHAR_CAP])
+        except Exception as e:
+            logger.warning(f"spaCy parsing failed: {e}")
+            return analysis
 
-            # Named entities: block PERSON, allow ORG/GPE/NORP/LOC
+        min_len = YAKEKeywordExtractor.MIN_KW_LEN
+        entities, blocked, phrases, roots, nouns, verbs = [], set(), [], [], [], set()
+        try:
             for ent in doc.ents:
+                kw = ent.text.lower().strip()
                 if ent.label_ in YAKEKeywordExtractor.BLOCKED_ENTITY_TYPES:
-                    blocked_entity_texts.add(ent.text.lower().strip())
-                    continue
-                if ent.label_ in YAKEKeywordExtractor.ENTITY_TYPES:
-                    kw = ent.text.lower().strip()
-                    if len(kw) >= YAKEKeywordExtractor.MIN_KW_LEN:
-                        scores[kw] = max(scores.get(kw, 0.0), 0.8)
-
-            # Noun chunks: primary concept source (both phrase and root)
-            _STOP_ARTICLES = {'the', 'a', 'an'}
-            for chunk in doc.noun_chunks:
-                # Full noun chunk phrase (e.g., "neural network")
+                    blocked.add(kw)
+                elif ent.label_ in YAKEKeywordExtractor.ENTITY_TYPES and len(kw) >= min_len:
+                    entities.append(kw)
+
+            chunks = _rule_noun_chunks(doc) if self.rule_chunks else doc.noun_chunks
+            for chunk in chunks:
                 # Strip leading articles: "The neural network" -> "neural network"
                 words = chunk.text.lower().strip().split()
-                while words and words[0] in _STOP_ARTICLES:
+                while words and words[0] in self._STOP_ARTICLES:
                     words.pop(0)
                 phrase = ' '.join(words)
-                if len(phrase) >= YAKEKeywordExtractor.MIN_KW_LEN:
-                    scores[phrase] = max(scores.get(phrase, 0.0), 0.7)
-                # Root lemma as fallback
+                if len(phrase) >= min_len:
+                    phrases.append(phrase)
                 kw = chunk.root.lemma_.lower().strip()
-                if len(kw) >= YAKEKeywordExtractor.MIN_KW_LEN and not chunk.root.is_stop:
-                    scores[kw] = max(scores.get(kw, 0.0), 0.7)
+                if len(kw) >= min_len and not chunk.root.is_stop:
+                    roots.append(kw)
 
-            # Individual nouns/proper nouns
             for tok in doc:
-                if tok.pos_ in ("NOUN", "PROPN") and not tok.is_stop:
+                if tok.pos_ in ("VERB", "AUX"):
+                    verbs.add(tok.text.lower())
+                elif tok.pos_ in ("NOUN", "PROPN") and not tok.is_stop:
                     kw = tok.lemma_.lower().strip()
-                    if len(kw) >= YAKEKeywordExtractor.MIN_KW_LEN and kw.isalpha():
-                        scores[kw] = max(scores.get(kw, 0.0), 0.35)
+                    if len(kw) >= min_len and kw.isalpha():
+                        nouns.append(kw)
         except Exception as e:
             logger.warning(f"spaCy extraction failed: {e}")
 
-    # -- 2. YAKE: supplementary (only if spaCy produced < 5 keywords) --
-    if len(scores) < 5:
-        yake = _get_yake()
-        if yake is not None:
-            try:
-                raw = yake.extract_keywords(text)
-                if raw:
-                    min_s = min(s for _, s in raw)
-                    max_s = max(s for _, s in raw)
-                    rng = max(max_s - min_s, 1e-9)
-                    for kw, s in raw:
-                        kw = kw.lower().strip()
-                        if len(kw) < YAKEKeywordExtractor.MIN_KW_LEN:
-                            continue
-                        if s > YAKEKeywordExtractor.YAKE_SCORE_CAP:
-                            continue
-                        # POS filter: reject bigrams containing verbs
-                        if YAKEKeywordExtractor._is_verb_containing_bigram(kw, doc):
-                            continue
-                        # YAKE gets confidence 0.5 (supplementary)
-                        rel = 0.5
-                        scores[kw] = max(scores.get(kw, 0.0), rel)
-            except Exception as e:
-                logger.warning(f"YAKE extraction failed: {e}")
-
-    # -- 3. Filter: weak phrases, blocked names, blocked entities --
-    sorted_kws = sorted(scores.items(), key=lambda x: -x[1])
-    sorted_kws = [kv for kv in sorted_kws if not YAKEKeywordExtractor._is_weak_phrase(kv[0])]
-    sorted_kws = [kv for kv in sorted_kws
-                  if not all(w in _BLOCKED_NAMES for w in kv[0].split())]
-    if blocked_entity_texts:
-        sorted_kws = [kv for kv in sorted_kws if kv[0] not in blocked_entity_texts]
-
-    return dict(sorted_kws[:top_n])
+        analysis.parsed = True
+        analysis.entities = tuple(entities)
+        analysis.blocked_entities = frozenset(blocked)
+        analysis.chunk_phrases = tuple(phrases)
+        analysis.chunk_roots = tuple(roots)
+        analysis.nouns = tuple(nouns)
+        analysis.verb_words = frozenset(verbs)
+        return analysis
+
+    @staticmethod
+    def _yake_candidates(analysis: _TextAnalysis):
+        """Yield (keyword, raw_score, normalised_relevance) passing the YAKE gates."""
+        raw = analysis.yake_raw()
+        if not raw:
+            return
+        min_s = min(s for _, s in raw)
+        max_s = max(s for _, s in raw)
+        rng = max(max_s - min_s, 1e-9)
+        for kw, s in raw:
+            kw = kw.lower().strip()
+            if len(kw) < YAKEKeywordExtractor.MIN_KW_LEN:
+                continue
+            if s > YAKEKeywordExtractor.YAKE_SCORE_CAP:
+                continue
+            # POS filter: reject bigrams containing verbs
+            if analysis.is_verb_bigram(kw):
+                continue
+            # invert: low yake score -> high relevance
+            yield kw, 1.0 - (s - min_s) / rng
+
+    @staticmethod
+    def _bump(scores: dict, keys, value: float) -> None:
+        for kw in keys:
+            if scores.get(kw, 0.0) < value:
+                scores[kw] = value
+
+    @staticmethod
+    def _finalise(scores: dict, analysis: _TextAnalysis, top_n: int) -> List[Tuple[str, float]]:
+        """Sort, then drop weak phrases, personal names and blocked entity text."""
+        sorted_kws = sorted(scores.items(), key=lambda x: -x[1])
+        blocked = analysis.blocked_entities
+        return [
+            kv for kv in sorted_kws
+            if not YAKEKeywordExtractor._is_weak_phrase(kv[0])
+            and not all(w in _BLOCKED_NAMES for w in kv[0].split())
+            and kv[0] not in blocked
+        ][:top_n]
+
+    def keywords(self, text: str, top_n: int = 15) -> List[Tuple[str, float]]:
+        """YAKE-primary ranking (YAKEKeywordExtractor.extract_keywords policy)."""
+        if not text or len(text.strip()) < 10:
+            return []
+        analysis = self.analyse(text)
+        scores: dict[str, float] = {}
+        for kw, rel in self._yake_candidates(analysis):
+            rel = round(rel, 4)
+            if scores.get(kw, 0.0) < rel:
+                scores[kw] = rel
+        # entities get a floor score of 0.7, noun chunks 0.35, nouns 0.25
+        self._bump(scores, analysis.entities, 0.7)
+        self._bump(scores, analysis.chunk_roots, 0.35)
+        self._bump(scores, analysis.nouns, 0.25)
+        # Fallback: word frequency if both pipelines failed
+        if not scores:
+            scores = YAKEKeywordExtractor._frequency_fallback(text, top_n)
+        return self._finalise(scores, analysis, top_n)
+
+    def concepts(self, text: str, top_n: int = 15) -> dict:
+        """spaCy-primary ranking (extract_concepts policy)."""
+        if not text or len(text.strip()) < 10:
+            return {}
+        analysis = self.analyse(text)
+        scores: dict[str, float] = {}
+        self._bump(scores, analysis.entities, 0.8)
+        self._bump(scores, analysis.chunk_phrases, 0.7)
+        self._bump(scores, analysis.chunk_roots, 0.7)
+        self._bump(scores, analysis.nouns, 0.35)
+        # YAKE gets confidence 0.5 (supplementary), only when spaCy is thin
+        if len(scores) < 5:
+            self._bump(scores, (kw for kw, _ in self._yake_candidates(analysis)), 0.5)
+        return dict(self._finalise(scores, analysis, top_n))
+
+
+_pipeline_instance: Optional[ExtractionPipeline] = None
+
+def get_extraction_pipeline() -> ExtractionPipeline:
+    """Return the global ExtractionPipeline (lazy init)."""
+    global _pipeline_instance
+    if _pipeline_instance is None:
+        _pipeline_instance = ExtractionPipeline()
+    return _pipeline_instance
+
+
+def extract_concepts(text: str, top_n: int = 15) -> dict:
+    """Unified concept extraction: spaCy-first, YAKE-supplementary.
+
+    spaCy noun chunks (0.7) and entities (0.8) are primary.
+    YAKE phrases (0.5) supplement when spaCy produces < 5 keywords.
+    POS filtering rejects YAKE bigrams containing verbs.
+    Shares the cached analysis with YAKEKeywordExtractor.extract_keywords.
+
+    Returns: {keyword: score} dict sorted by score descending.
+    """
+    return get_extraction_pipeline().concepts(text, top_n)
 
 if __name__ == "__main__":
     text = (
@@ -1,13 +1,17 @@
 ﻿"""Knowledge graph of tracked concepts with JSON persistence and drift/gap analytics."""
 import networkx as nx
 import numpy as np
+import heapq
 import json
+import random
 import threading
 import time
 import logging
 from datetime import datetime, timedelta
 from pathlib import Path
 from tracker_app.config import DATA_DIR, KNOWLEDGE_GRAPH_PATH, DEFAULT_LAMBDA
+from tracker_app.learning.text_quality_validator import is_plausible_concept
+from tracker_app.tracking import event_bus
 
 
 from tracker_app.utils import utcnow as _utcnow
@@ -26,12 +30,18 @@ DB_SYNC_INTERVAL_SECONDS = 60.0
 _loaded = False
 _last_db_sync = 0.0
 _graph_dirty = False
+# Concepts the other process announced on the event bus; synced on the next
+# graph read instead of waiting for the periodic reconcile.
+_external_concepts = set()
 
 # Cap on in-memory graph size (H-6): _save_graph() evicts the lowest-
 # memory_score zero-edge nodes once the count exceeds this, keeping the
 # JSON file small and _load_graph() fast after months of use.
 MAX_GRAPH_NODES = 5000
 
+# Cosine similarity above which add_concepts links two concepts by an edge.
+EDGE_SIMILARITY = 0.7
+
 # ----------------------------
 # Lazy embedding model
 # ----------------------------
@@ -82,6 +92,742 @@ def _get_spacy_vectors(concepts):
 knowledge_graph = nx.Graph()
 
 
+# ----------------------------
+# Immutable read snapshot
+# ----------------------------
+class GraphSnapshot:
+    """Immutable, versioned view of the graph for lock-free readers.
+
+    Writers mutate `knowledge_graph` under `_graph_lock` and bump
+    `_graph_version`; readers (OCR boosting, quiz selection, stats) call
+    get_snapshot(), which hands back the current snapshot without locking
+    and rebuilds it at most once per change. `nodes` is a frozenset so
+    `name in snapshot.nodes` works exactly like the networkx check did.
+
+    The live snapshot copies only names and scores (O(N)) on a rebuild.
+    `neighbours` and `edges` cost O(E log E), and the per-cycle readers
+    never touch them, so get_snapshot() leaves them to `edge_loader`: they
+    are built on first access, and shared by every snapshot taken while
+    the graph's edges are unchanged (_edge_version).
+    """
+
+    __slots__ = ("version", "names", "nodes", "memory_scores", "index",
+                 "n_edges", "edge_version", "_edge_loader", "_edge_view")
+
+    def __init__(self, version, names, memory_scores, neighbours=None, edges=None,
+                 n_edges=None, edge_version=-1, edge_loader=None):
+        self.version = version
+        self.names = tuple(names)
+        self.nodes = frozenset(self.names)
+        scores = np.asarray(memory_scores, dtype=float)
+        scores.setflags(write=False)
+        self.memory_scores = scores
+        self.index = {n: i for i, n in enumerate(self.names)}
+        self.edge_version = edge_version
+        self._edge_loader = edge_loader
+        # (neighbours, edges): {node: ((neighbour, weight), ...)} strongest
+        # edge first, and ((u, v, weight), ...).
+        self._edge_view = None if edges is None else (neighbours, edges)
+        self.n_edges = len(edges) if n_edges is None else n_edges
+
+    def _edges_built(self):
+        view = self._edge_view
+        if view is None:
+            view = self._edge_loader(self)
+            self._edge_view = view
+        return view
+
+    @property
+    def neighbours(self) -> dict:
+        return self._edges_built()[0]
+
+    @property
+    def edges(self) -> tuple:
+        return self._edges_built()[1]
+
+    @classmethod
+    def from_graph(cls, graph, version: int = -1) -> "GraphSnapshot":
+        """Build a complete snapshot from any networkx graph (caller holds its lock)."""
+        names, scores = [], []
+        for n, d in graph.nodes(data=True):
+            names.append(n)
+            scores.append(d.get('memory_score', 0.5))
+        return cls(version, names, scores, *_edge_view_of(graph))
+
+    def __contains__(self, name) -> bool:
+        return name in self.index
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def memory_score(self, name, default: float = 0.5) -> float:
+        i = self.index.get(name)
+        return default if i is None else float(self.memory_scores[i])
+
+    def density(self) -> float:
+        """Same value as nx.density() for an undirected graph."""
+        n = len(self.names)
+        if n <= 1:
+            return 0.0
+        return 2.0 * self.n_edges / (n * (n - 1))
+
+
+def _edge_view_of(graph, nodes=None):
+    """(neighbours, edges) of `graph`, optionally restricted to `nodes`."""
+    edges = tuple(
+        (u, v, float(d.get('weight', 1.0)))
+        for u, v, d in graph.edges(data=True)
+        if nodes is None or (u in nodes and v in nodes)
+    )
+    neighbours = {}
+    for n in (graph if nodes is None else nodes):
+        adj = graph[n] if n in graph else {}
+        ranked = sorted((m for m in adj if nodes is None or m in nodes),
+                        key=lambda m: adj[m].get('weight', 0), reverse=True)
+        if ranked:
+            neighbours[n] = tuple((m, adj[m].get('weight', 0)) for m in ranked)
+    return neighbours, edges
+
+
+# Bumped by every in-module mutation; the published snapshot carries the
+# version it was built from.
+_graph_version = 0
+# Bumped when edges may have changed (edge hooks, removals of linked
+# nodes, unhooked mutations); keys the shared lazy edge view.
+_edge_version = 0
+_edge_cache = None          # (edge_version, n_edges, (neighbours, edges))
+_snapshot = GraphSnapshot(-1, (), (), {}, ())
+
+
+def _mark_graph_changed(stats_kept: bool = False):
+    """Invalidate the published snapshot (call after mutating the graph).
+
+    stats_kept=True means the caller already applied the mutation to the
+    maintained indexes (`_stats`, `_quiz_index`) through the _on_* hooks;
+    otherwise each index is rebuilt on its next read."""
+    global _graph_version, _edge_version
+    current = [ix for ix in _INDEXES if ix.is_current()]
+    _graph_version += 1
+    if not stats_kept:
+        _edge_version += 1
+    if stats_kept:
+        for ix in current:
+            ix.version = _graph_version
+
+
+class _MaintainedIndex:
+    """Base for views of the graph kept current by the mutation hooks.
+
+    An index is current while its `version` matches `_graph_version` and
+    its node count matches the graph's; anything else means a mutation
+    bypassed the hooks and the index must rebuild before it is read.
+    """
+
+    def __init__(self):
+        self.version = -1
+        self.n_nodes = 0
+
+    def is_current(self) -> bool:
+        return (self.version == _graph_version
+                and self.n_nodes == knowledge_graph.number_of_nodes())
+
+
+# ----------------------------
+# Running graph statistics
+# ----------------------------
+STATS_TOP_K = 10
+
+
+class _GraphStats(_MaintainedIndex):
+    """Aggregates behind get_graph_stats(), kept current by the mutators.
+
+    Holds the concept-node count, the sum of their memory scores, the edge
+    count, and a bounded min-heap of the STATS_TOP_K strongest concepts as
+    (memory_score, -insertion order, name), so the weakest of the top set
+    sits at the root. add_concepts, the memory-score refreshes and the
+    removals update these in O(log k) under `_graph_lock`.
+
+    A top-k member whose score drops (or that is removed) may be overtaken
+    by a node outside the heap, which the heap cannot see; that marks the
+    heap stale and the next read refills it with one O(n log k) pass.
+    Mutations that bypass the hooks (loading from disk, tests editing
+    `knowledge_graph` directly) leave `version` behind `_graph_version`, or
+    the node count off, and trigger a full rebuild instead.
+    """
+
+    def __init__(self, k: int = STATS_TOP_K):
+        super().__init__()
+        self.k = k
+        # n_nodes counts every node, for density.
+        self.n_concepts = 0       # string nodes: the concepts
+        self.score_sum = 0.0
+        self.n_edges = 0
+        self.top = []             # min-heap of (score, -seq, name)
+        self.top_names = {}       # name -> its heap entry
+        self.top_stale = False
+        self.seq = {}             # name -> insertion order, as in the graph
+        self._next_seq = 0
+
+    # -- full rebuilds (caller holds _graph_lock) --
+
+    def rebuild(self):
+        self.n_nodes = knowledge_graph.number_of_nodes()
+        self.n_edges = knowledge_graph.number_of_edges()
+        self.seq = {n: i for i, n in enumerate(knowledge_graph)}
+        self._next_seq = len(self.seq)
+        self.n_concepts, self.score_sum = 0, 0.0
+        for n, d in knowledge_graph.nodes(data=True):
+            if isinstance(n, str):
+                self.n_concepts += 1
+                self.score_sum += float(d.get('memory_score', 0.5))
+        self.rebuild_top()
+        self.version = _graph_version
+
+    def rebuild_top(self):
+        entries = (
+            (float(d.get('memory_score', 0.5)), -self.seq[n], n)
+            for n, d in knowledge_graph.nodes(data=True) if isinstance(n, str)
+        )
+        self.top = heapq.nlargest(self.k, entries)
+        heapq.heapify(self.top)
+        self.top_names = {e[2]: e for e in self.top}
+        self.top_stale = False
+
+    # -- hooks (caller holds _graph_lock; no-ops while a rebuild is pending) --
+
+    def node_added(self, name, score: float):
+        """Call just before the node is added to the graph."""
+        if not self.is_current():
+            return
+        self.n_nodes += 1
+        self.seq[name] = self._next_seq
+        self._next_seq += 1
+        if isinstance(name, str):
+            self.n_concepts += 1
+            self.score_sum += float(score)
+            self._offer(name, float(score))
+
+    def node_removed(self, name, score: float, degree: int):
+        """Call just before the node is removed from the graph."""
+        if not self.is_current():
+            return
+        self.n_nodes -= 1
+        self.n_edges -= degree
+        self.seq.pop(name, None)
+        if isinstance(name, str):
+            self.n_concepts -= 1
+            self.score_sum -= float(score)
+            entry = self.top_names.pop(name, None)
+            if entry is not None:
+                self.top.remove(entry)
+                heapq.heapify(self.top)
+                if self.n_concepts >= self.k:
+                    self.top_stale = True
+
+    def edge_changed(self, u, v, added: bool):
+        if added and self.is_current():
+            self.n_edges += 1
+
+    def score_changed(self, name, old: float, new: float):
+        if not self.is_current() or not isinstance(name, str):
+            return
+        old, new = float(old), float(new)
+        self.score_sum += new - old
+        entry = self.top_names.get(name)
+        if entry is None:
+            self._offer(name, new)
+            return
+        if new < old and self.n_concepts > self.k:
+            self.top_stale = True   # an outsider may now rank higher
+        updated = (new, entry[1], name)
+        self.top[self.top.index(entry)] = updated
+        self.top_names[name] = updated
+        heapq.heapify(self.top)
+
+    def _offer(self, name, score: float):
+        if self.top_stale:
+            return
+        entry = (score, -self.seq[name], name)
+        if len(self.top) < self.k:
+            heapq.heappush(self.top, entry)
+        elif entry > self.top[0]:
+            del self.top_names[heapq.heapreplace(self.top, entry)[2]]
+        else:
+            return
+        self.top_names[name] = entry
+
+    # -- read --
+
+    def ranked_top(self):
+        """Top-k names, strongest first; ties keep graph insertion order."""
+        if self.top_stale:
+            self.rebuild_top()
+        return [(name, score) for score, _, name in sorted(self.top, reverse=True)]
+
+
+class _QuizIndex(_MaintainedIndex):
+    """Micro-quiz candidates, kept current by the mutation hooks.
+
+    generate_micro_quiz used to run is_plausible_concept over every node,
+    take the weakest, then filter and sort that node's neighbours on every
+    call. This index keeps:
+
+    - a min-heap of (memory_score, insertion order, name) over the
+      plausible concept nodes, so the weakest is the root. A score change
+      pushes a fresh entry; entries that no longer match `live` are
+      dropped when they reach the root (lazy deletion);
+    - the plausible names in a list, for O(1) random fill-in distractors;
+    - each node's top-3 plausible neighbours by edge weight, computed on
+      first use and dropped when one of the node's edges changes or a
+      neighbour is removed.
+
+    Plausibility of a name never changes, so it is memoised per name.
+    """
+
+    N_DISTRACTORS = 3
+
+    def __init__(self):
+        super().__init__()
+        self.heap = []
+        self.live = {}            # name -> (score, order) of its heap entry
+        self.names = []
+        self.pos = {}             # name -> index in `names`
+        self.distractors = {}     # name -> top plausible neighbours
+        self._plausible = {}
+        self._next_order = 0
+
+    def plausible(self, name) -> bool:
+        ok = self._plausible.get(name)
+        if ok is None:
+            ok = isinstance(name, str) and len(name) > 2 and is_plausible_concept(name)
+            self._plausible[name] = ok
+        return ok
+
+    # -- full rebuild (caller holds _graph_lock) --
+
+    def rebuild(self):
+        self.n_nodes = knowledge_graph.number_of_nodes()
+        self.heap, self.live, self.names, self.pos = [], {}, [], {}
+        self.distractors = {}
+        for order, (n, d) in enumerate(knowledge_graph.nodes(data=True)):
+            if self.plausible(n):
+                self._insert(n, float(d.get('memory_score', 0.5)), order)
+        heapq.heapify(self.heap)
+        self._next_order = self.n_nodes
+        self.version = _graph_version
+
+    def _insert(self, name, score: float, order: int):
+        self.live[name] = (score, order)
+        self.heap.append((score, order, name))
+        self.pos[name] = len(self.names)
+        self.names.append(name)
+
+    # -- hooks (caller holds _graph_lock; no-ops while a rebuild is pending) --
+
+    def node_added(self, name, score: float):
+        """Call just before the node is added to the graph."""
+        if not self.is_current():
+            return
+        self.n_nodes += 1
+        order, self._next_order = self._next_order, self._next_order + 1
+        if self.plausible(name):
+            self._insert(name, float(score), order)
+            heapq.heappush(self.heap, self.heap.pop())
+
+    def node_removed(self, name, score: float, degree: int):
+        """Call just before the node is removed from the graph."""
+        if not self.is_current():
+            return
+        self.n_nodes -= 1
+        for neighbour in knowledge_graph[name]:
+            self.distractors.pop(neighbour, None)
+        self.distractors.pop(name, None)
+        self._plausible.pop(name, None)
+        if self.live.pop(name, None) is not None:
+            i = self.pos.pop(name)
+            last = self.names.pop()
+            if last != name:
+                self.names[i] = last
+                self.pos[last] = i
+
+    def edge_changed(self, u, v, added: bool):
+        if self.is_current():
+            self.distractors.pop(u, None)
+            self.distractors.pop(v, None)
+
+    def score_changed(self, name, old: float, new: float):
+        if not self.is_current() or name not in self.live:
+            return
+        order = self.live[name][1]
+        self.live[name] = (float(new), order)
+        heapq.heappush(self.heap, (float(new), order, name))
+        if len(self.heap) > 2 * len(self.live) + 64:
+            self.heap = [(sc, o, n) for n, (sc, o) in self.live.items()]
+            heapq.heapify(self.heap)
+
+    # -- read --
+
+    def weakest(self):
+        """(name, memory_score) of the weakest plausible concept, or None."""
+        heap = self.heap
+        while heap:
+            score, order, name = heap[0]
+            if self.live.get(name) == (score, order):
+                return name, score
+            heapq.heappop(heap)
+        return None
+
+    def top_neighbours(self, name) -> list:
+        cached = self.distractors.get(name)
+        if cached is None:
+            adj = knowledge_graph[name]
+            ranked = sorted(adj, key=lambda m: adj[m].get('weight', 0), reverse=True)
+            cached = []
+            for m in ranked:
+                if m != name and self.plausible(m):
+                    cached.append(m)
+                    if len(cached) == self.N_DISTRACTORS:
+                        break
+            self.distractors[name] = cached
+        return list(cached)
+
+    def near_others(self, name, exclude, k: int) -> list:
+        """Up to k of `name`'s nearest-neighbour distractors not in `exclude`."""
+        adj = knowledge_graph[name]
+        picked = []
+        for m, _ in knowledge_graph.nodes[name].get('near', ()):
+            if len(picked) == k:
+                break
+            if (m in self.live and m not in adj and m not in exclude
+                    and m not in picked):
+                picked.append(m)
+        return picked
+
+    def random_others(self, exclude, k: int) -> list:
+        """k distinct random plausible names not in `exclude` (fewer if short)."""
+        available = len(self.names) - sum(1 for n in set(exclude) if n in self.pos)
+        picked = []
+        while len(picked) < min(k, available):
+            name = self.names[random.randrange(len(self.names))]
+            if name not in exclude and name not in picked:
+                picked.append(name)
+        return picked
+
+
+# ----------------------------
+# Nearest-neighbour distractor table
+# ----------------------------
+DISTRACTOR_TABLE_K = 5
+
+
+class _NearTable(_MaintainedIndex):
+    """Embedding nearest neighbours of each concept, for quiz distractors.
+
+    A concept with fewer than three graph neighbours used to be padded
+    with random concepts, which are easy to rule out. Each plausible node
+    instead carries `near`: up to DISTRACTOR_TABLE_K [name, similarity]
+    pairs, the most embedding-similar plausible concepts that are not
+    already its neighbours and not similar enough (> EDGE_SIMILARITY) to
+    be the same idea. The lists live on the nodes, so they are saved and
+    loaded with the graph; build_distractor_table() computes them all.
+
+    This index holds what keeps them current incrementally: the unit
+    embeddings of the plausible nodes as matrix rows, each list's weakest
+    kept similarity (`floor`, -inf while the list has room) and which
+    lists mention each name. New nodes are scored against every row in one
+    matrix product (link). When a removal or a new edge takes a name out of
+    a list, that list is recomputed from its row (one product against the
+    matrix), so it refills to k from the remaining candidates rather than
+    draining.
+    """
+
+    def __init__(self, k: int = DISTRACTOR_TABLE_K):
+        super().__init__()
+        self.k = k
+        self.dim = None
+        self.mat = np.zeros((0, 0), dtype=np.float32)
+        self.names = []
+        self.pos = {}
+        self.floor = np.zeros(0)
+        self.referrers = {}       # name -> set of nodes whose list has it
+
+    def _vector(self, name):
+        """Unit embedding of a plausible node, or None."""
+        if not _quiz_index.plausible(name):
+            return None
+        emb = knowledge_graph.nodes[name].get('embedding')
+        if not emb:
+            return None
+        vec = np.asarray(emb, dtype=np.float32)
+        if self.dim is None:
+            self.dim = len(vec)
+        norm = float(np.linalg.norm(vec))
+        if len(vec) != self.dim or norm == 0:
+            return None
+        return vec / norm
+
+    def _append_rows(self, names, vecs):
+        n = len(self.names)
+        if n + len(names) > len(self.mat):
+            cap = max(64, 2 * (n + len(names)))
+            mat = np.zeros((cap, self.dim), dtype=np.float32)
+            if n:
+                mat[:n] = self.mat[:n]
+            floor = np.full(cap, -np.inf)
+            floor[:n] = self.floor[:n]
+            self.mat, self.floor = mat, floor
+        for i, (name, vec) in enumerate(zip(names, vecs)):
+            self.mat[n + i] = vec
+            self.floor[n + i] = -np.inf
+            self.pos[name] = n + i
+            self.names.append(name)
+
+    def _set_list(self, name, pairs):
+        node = knowledge_graph.nodes[name]
+        for old, _ in node.get('near', ()):
+            self.referrers.get(old, set()).discard(name)
+        pairs = sorted(pairs, key=lambda p: -p[1])[:self.k]
+        node['near'] = [[m, round(float(sim), 4)] for m, sim in pairs]
+        for m, _ in pairs:
+            self.referrers.setdefault(m, set()).add(name)
+        i = self.pos.get(name)
+        if i is not None:
+            self.floor[i] = pairs[-1][1] if len(pairs) == self.k else -np.inf
+
+    def _eligible(self, sims, row_name):
+        """Mask of rows that may enter `row_name`'s list, given its sims."""
+        ok = sims <= EDGE_SIMILARITY
+        ok[self.pos[row_name]] = False
+        for m in knowledge_graph[row_name]:
+            j = self.pos.get(m)
+            if j is not None:
+                ok[j] = False
+        return ok
+
+    def _top_k(self, name, sims, exclude=()):
+        ok = self._eligible(sims, name)
+        for m in exclude:
+            j = self.pos.get(m)
+            if j is not None:
+                ok[j] = False
+        idx = np.flatnonzero(ok)
+        if len(idx) > self.k:
+            idx = idx[np.argpartition(-sims[idx], self.k - 1)[:self.k]]
+        return [(self.names[j], float(sims[j])) for j in idx]
+
+    # -- full rebuild (caller holds _graph_lock) --
+
+    def rebuild(self):
+        """Reload the rows and list bookkeeping; the lists are kept as stored."""
+        self.n_nodes = knowledge_graph.number_of_nodes()
+        self.dim, self.names, self.pos, self.referrers = None, [], {}, {}
+        self.mat, self.floor = np.zeros((0, 0), dtype=np.float32), np.zeros(0)
+        names, vecs = [], []
+        for n in knowledge_graph.nodes():
+            vec = self._vector(n)
+            if vec is not None:
+                names.append(n)
+                vecs.append(vec)
+        if names:
+            self._append_rows(names, vecs)
+        for n in names:
+            pairs = knowledge_graph.nodes[n].get('near', ())
+            for m, _ in pairs:
+                self.referrers.setdefault(m, set()).add(n)
+            self.floor[self.pos[n]] = pairs[-1][1] if len(pairs) == self.k else -np.inf
+        self.version = _graph_version
+
+    def build_all(self, block: int = 512) -> int:
+        """Recompute every list from the rows, `block` rows per product."""
+        self.rebuild()
+        n = len(self.names)
+        mat = self.mat[:n]
+        for start in range(0, n, block):
+            sims = mat[start:start + block] @ mat.T
+            for i, row in enumerate(sims, start):
+                self._set_list(self.names[i], self._top_k(self.names[i], row))
+        return n
+
+    # -- hooks (caller holds _graph_lock; no-ops while a rebuild is pending) --
+
+    def node_added(self, name, score: float):
+        """Call just before the node is added; link() adds its row."""
+        if self.is_current():
+            self.n_nodes += 1
+
+    def link(self, names):
+        """Give freshly added nodes their lists and offer them to the others.
+
+        Call after the nodes and their edges are in the graph."""
+        if not self.is_current():
+            self.rebuild()            # rows for `names` included
+        fresh, vecs = [], []
+        for name in names:
+            vec = self._vector(name) if name not in self.pos else None
+            if vec is not None:
+                fresh.append(name)
+                vecs.append(vec)
+        if fresh:
+            self._append_rows(fresh, vecs)
+        new = [name for name in names if name in self.pos]
+        if not new:
+            return
+        n = len(self.names)
+        rows = self.mat[[self.pos[name] for name in new]]
+        sims = rows @ self.mat[:n].T                      # (new, all)
+        skip = set(new)
+        for name, row in zip(new, sims):
+            self._set_list(name, self._top_k(name, row))
+            # Existing lists this node now beats (new rows were handled above).
+            beats = np.flatnonzero((row > self.floor[:n]) & (row <= EDGE_SIMILARITY))
+            for j in beats:
+                other = self.names[j]
+                if other in skip or knowledge_graph.has_edge(name, other):
+                    continue
+                pairs = [p for p in knowledge_graph.nodes[other].get('near', ())
+                         if p[0] != name]
+                self._set_list(other, pairs + [(name, float(row[j]))])
+
+    def _refill(self, holders, exclude):
+        """Recompute the lists of `holders` without any name in `exclude`."""
+        holders = [h for h in holders if h in self.pos and h in knowledge_graph]
+        if not holders:
+            return
+        n = len(self.names)
+        sims = self.mat[[self.pos[h] for h in holders]] @ self.mat[:n].T
+        for holder, row in zip(holders, sims):
+            self._set_list(holder, self._top_k(holder, row, exclude))
+
+    def node_removed(self, name, score: float, degree: int):
+        """Call just before the node is removed from the graph."""
+        if not self.is_current():
+            return
+        self.n_nodes -= 1
+        holders = self.referrers.pop(name, set())
+        for old, _ in knowledge_graph.nodes[name].get('near', ()):
+            self.referrers.get(old, set()).discard(name)
+        self._remove_row(name)
+        self._refill(holders, (name,))
+
+    def _remove_row(self, name):
+        i = self.pos.pop(name, None)
+        if i is not None:
+            last = self.names.pop()
+            if last != name:
+                j = len(self.names)
+                self.names[i] = last
+                self.pos[last] = i
+                self.mat[i] = self.mat[j]
+                self.floor[i] = self.floor[j]
+
+    def edge_changed(self, u, v, added: bool):
+        # A graph neighbour is already a distractor candidate; keep it
+        # out of the nearest-neighbour list.
+        if added and self.is_current():
+            if v in self.referrers.get(u, ()):
+                self._refill([v], (u,))
+            if u in self.referrers.get(v, ()):
+                self._refill([u], (v,))
+
+    def score_changed(self, name, old: float, new: float):
+        pass
+
+
+_stats = _GraphStats()
+_quiz_index = _QuizIndex()
+_near_table = _NearTable()
+_INDEXES = (_stats, _quiz_index, _near_table)
+
+
+def _on_node_added(name, score):
+    for ix in _INDEXES:
+        ix.node_added(name, score)
+
+
+def _on_node_removed(name, score, degree):
+    global _edge_version
+    if degree:
+        _edge_version += 1
+    for ix in _INDEXES:
+        ix.node_removed(name, score, degree)
+
+
+def _on_edge_changed(u, v, added):
+    global _edge_version
+    _edge_version += 1
+    for ix in _INDEXES:
+        ix.edge_changed(u, v, added)
+
+
+def _on_score_changed(name, old, new):
+    for ix in _INDEXES:
+        ix.score_changed(name, old, new)
+
+
+def _snapshot_is_current(snap) -> bool:
+    # Node/edge counts catch direct mutations of knowledge_graph that bypass
+    # _mark_graph_changed() (tests, ad-hoc scripts).
+    return (snap.version == _graph_version
+            and len(snap.names) == knowledge_graph.number_of_nodes()
+            and snap.n_edges == knowledge_graph.number_of_edges())
+
+
+def get_snapshot(ensure_loaded: bool = False) -> GraphSnapshot:
+    """Return the current immutable graph snapshot.
+
+    Lock-free when nothing changed since the last call; otherwise rebuilds
+    once under `_graph_lock` and swaps the module reference atomically.
+    Never triggers a DB sync unless ensure_loaded=True (the quiz path,
+    which wants the periodic reconcile that get_graph() performs).
+    """
+    global _snapshot
+    if ensure_loaded:
+        _ensure_graph_loaded()
+    snap = _snapshot
+    if _snapshot_is_current(snap):
+        return snap
+    with _graph_lock:
+        snap = _snapshot
+        if not _snapshot_is_current(snap):
+            snap = _build_snapshot_locked()
+            _snapshot = snap
+    return snap
+
+
+def _build_snapshot_locked() -> GraphSnapshot:
+    """Names and scores now; the edge view shared or deferred (holds _graph_lock)."""
+    names, scores = [], []
+    for n, d in knowledge_graph.nodes(data=True):
+        names.append(n)
+        scores.append(d.get('memory_score', 0.5))
+    n_edges = knowledge_graph.number_of_edges()
+    cached = _edge_cache
+    view = cached[2] if cached and cached[:2] == (_edge_version, n_edges) else (None, None)
+    return GraphSnapshot(_graph_version, names, scores, *view, n_edges=n_edges,
+                         edge_version=_edge_version, edge_loader=_load_edge_view)
+
+
+def _load_edge_view(snap: GraphSnapshot):
+    """First access to a live snapshot's neighbours/edges.
+
+    While the graph's edges are as they were when `snap` was taken, the
+    view is built from the live graph once and cached for later snapshots.
+    If they have changed since, `snap` gets the current edges among its
+    own nodes.
+    """
+    global _edge_cache
+    with _graph_lock:
+        cached = _edge_cache
+        if cached and cached[:2] == (snap.edge_version, snap.n_edges):
+            return cached[2]
+        n_edges = knowledge_graph.number_of_edges()
+        if (snap.edge_version, snap.n_edges) == (_edge_version, n_edges):
+            view = _edge_view_of(knowledge_graph)
+            _edge_cache = (_edge_version, n_edges, view)
+            return view
+        return _edge_view_of(knowledge_graph, snap.nodes)
+
+
 def _ensure_graph_loaded():
     """Populate the in-memory graph on first use, then re-reconcile periodically.
 
@@ -96,8 +842,12 @@ def _ensure_graph_loaded():
     """
     global _loaded, _last_db_sync
     now = time.monotonic()
+    if (_loaded and not _external_concepts
+            and now - _last_db_sync < DB_SYNC_INTERVAL_SECONDS):
+        return  # lock-free fast path between reconciles
     with _graph_lock:
         if not _loaded:
+            _mark_graph_changed()
             if knowledge_graph.number_of_nodes() != 0:
                 # Graph already populated (e.g. by another module) â€” no file/DB
                 # bootstrap needed, but subsequent calls still re-reconcile.
@@ -107,12 +857,28 @@ def _ensure_graph_loaded():
                     logger.info("No persisted knowledge graph; building from DB.")
                 else:
                     logger.info("Knowledge graph loaded from %s", KNOWLEDGE_GRAPH_PATH)
+                    if _distractor_table_missing():
+                        _build_distractor_table_locked()   # saved by the sync below
                 sync_db_to_graph()  # reconcile (or first-build) then persist
                 _loaded = True
             _last_db_sync = now
         elif now - _last_db_sync >= DB_SYNC_INTERVAL_SECONDS:
+            _external_concepts.clear()
             sync_db_to_graph()
             _last_db_sync = now
+        if _external_concepts:
+            pending = list(_external_concepts)
+            _external_concepts.difference_update(pending)
+            sync_concepts_to_graph(pending)
+
+
+def _note_external_concepts(data):
+    """CONCEPT_CAPTURED from the other process: sync those on the next read."""
+    concepts = (data or {}).get('concepts') or ()
+    _external_concepts.update(c for c in concepts if isinstance(c, str) and c.strip())
+
+
+event_bus.subscribe(event_bus.CONCEPT_CAPTURED, _note_external_concepts, remote_only=True)
 
 def _jsonable(obj):
     """Convert numpy scalars/arrays (and containers of them) to plain JSON types."""
@@ -154,6 +920,7 @@ def _load_graph_locked() -> bool:
         knowledge_graph.add_edges_from(
             (u, v, dict(attrs)) for u, v, attrs in data['edges']
         )
+        _mark_graph_changed()
         return knowledge_graph.number_of_nodes() > 0
 
     # 1. Current JSON format.
@@ -185,6 +952,7 @@ def _load_graph_locked() -> bool:
             knowledge_graph.clear()
             knowledge_graph.add_nodes_from(data.nodes(data=True))
             knowledge_graph.add_edges_from(data.edges(data=True))
+            _mark_graph_changed()
             logger.info("Migrating legacy pickle knowledge graph %s -> %s", cand, path)
             _save_graph()
             _graph_dirty = False
@@ -218,9 +986,12 @@ def _evict_oversized_nodes():
         for node in candidates:
             if evicted >= excess:
                 break
+            _on_node_removed(
+                node, knowledge_graph.nodes[node].get('memory_score', 0.5), 0)
             knowledge_graph.remove_node(node)
             evicted += 1
         if evicted:
+            _mark_graph_changed(stats_kept=True)
             logger.info(
                 "Evicted %d low-relevance zero-edge nodes (graph cap %d)",
                 evicted, MAX_GRAPH_NODES,
@@ -250,6 +1021,10 @@ def _save_graph():
         tmp.replace(path)
         _graph_dirty = False
         logger.debug("Knowledge graph saved to %s", path)
+        event_bus.publish(event_bus.GRAPH_UPDATED, {
+            'nodes': knowledge_graph.number_of_nodes(),
+            'edges': knowledge_graph.number_of_edges(),
+        })
     except Exception as e:
         logger.warning("Failed to save knowledge graph: %s", e)
 
@@ -289,11 +1064,10 @@ def _fetch_live_memory_scores(concepts):
     if not concepts:
         return {}
     try:
-        from tracker_app.db.models import SessionLocal, TrackedConcept
+        from tracker_app.db.models import SessionLocal
+        from tracker_app.learning.retention_engine import RetentionSnapshot
         with SessionLocal() as db:
-            rows = db.query(TrackedConcept).filter(
-                TrackedConcept.concept.in_(concepts)).all()
-        return {r.concept: _memory_score_from_row(r) for r in rows}
+            return RetentionSnapshot.load(db, concepts).as_dict()
     except Exception as e:
         logger.debug(f"_fetch_live_memory_scores failed: {e}")
         return {}
@@ -328,9 +1102,11 @@ def add_concepts(concepts):
     with _graph_lock:
         # Pull live memory state so new nodes don't start frozen at 0.3 (Phase 11.2).
         live_scores = _fetch_live_memory_scores(valid_concepts)
+        added = []
         for idx, concept in enumerate(valid_concepts):
             if concept not in knowledge_graph:
                 emb = embeddings[idx] if embeddings is not None else []
+                _on_node_added(concept, live_scores.get(concept, 0.3))
                 knowledge_graph.add_node(
                     concept,
                     embedding=emb.tolist() if hasattr(emb, "tolist") else list(emb),
@@ -340,6 +1116,7 @@ def add_concepts(concepts):
                     last_review=_utcnow().strftime(DATETIME_FORMAT),
                     intent_conf=1.0
                 )
+                added.append(concept)
                 _graph_dirty = True
             else:
                 knowledge_graph.nodes[concept]['count'] += 1
@@ -356,20 +1133,24 @@ def add_concepts(concepts):
                         if norm_i == 0 or norm_j == 0:
                             continue
                         cosine_sim = np.dot(vec_i, vec_j) / (norm_i * norm_j)
-                        if cosine_sim > 0.7:
+                        if cosine_sim > EDGE_SIMILARITY:
                             if knowledge_graph.has_edge(valid_concepts[i], valid_concepts[j]):
                                 # EMA instead of unbounded accumulation
                                 old = knowledge_graph[valid_concepts[i]][valid_concepts[j]]['weight']
                                 knowledge_graph[valid_concepts[i]][valid_concepts[j]]['weight'] = (
                                     min(1.0, 0.85 * old + 0.15 * cosine_sim)
                                 )
+                                _on_edge_changed(valid_concepts[i], valid_concepts[j], False)
                             else:
                                 knowledge_graph.add_edge(
                                     valid_concepts[i], valid_concepts[j],
                                     weight=cosine_sim
                                 )
+                                _on_edge_changed(valid_concepts[i], valid_concepts[j], True)
                     except Exception as e:
                         logger.warning(f"Error adding edge between concepts: {e}")
+        _near_table.link(added)
+        _mark_graph_changed(stats_kept=True)
 
 def sync_concept_to_graph(concept):
     """Refresh one graph node's memory fields from the live DB row.
@@ -407,15 +1188,35 @@ def sync_concept_to_graph(concept):
             last_seen  = row.last_seen or row.first_seen
         with _graph_lock:
             node = knowledge_graph.nodes[concept]
+            _on_score_changed(concept, node.get('memory_score', 0.5), round(score, 4))
             node['memory_score']    = round(score, 4)
             node['interval']        = interval
             node['memory_strength'] = strength
             if isinstance(last_seen, datetime):
                 node['last_review'] = last_seen.strftime(DATETIME_FORMAT)
+            _mark_graph_changed(stats_kept=True)
     except Exception as e:
         logger.debug(f"sync_concept_to_graph failed for {concept}: {e}")
 
 
+def sync_concepts_to_graph(concepts):
+    """Batch form of sync_concept_to_graph for concepts the DB already has.
+
+    Missing nodes are added one by one, exactly as the single-concept path
+    would add them. Every node's memory fields are then refreshed from one
+    query and one array pass, instead of two queries per concept."""
+    concepts = list(dict.fromkeys(concepts))
+    for concept in concepts:
+        if concept not in knowledge_graph:
+            add_concepts([concept])
+    present = [c for c in concepts if c in knowledge_graph]
+    _refresh_all_memory_scores(present)
+    if present:
+        # Intervals move even when the rounded score does not.
+        with _graph_lock:
+            _mark_graph_changed(stats_kept=True)
+
+
 def remove_concept_from_graph(concept):
     """Remove a concept node (and its edges) from the in-memory graph.
 
@@ -428,8 +1229,12 @@ def remove_concept_from_graph(concept):
         return False
     with _graph_lock:
         if concept in knowledge_graph:
+            _on_node_removed(concept,
+                                knowledge_graph.nodes[concept].get('memory_score', 0.5),
+                                knowledge_graph.degree(concept))
             knowledge_graph.remove_node(concept)
             _graph_dirty = True
+            _mark_graph_changed(stats_kept=True)
     if _graph_dirty:
         _save_graph()
     return True
@@ -453,11 +1258,13 @@ def _refresh_all_memory_scores(concepts):
     except Exception as e:
         logger.debug(f"_refresh_all_memory_scores failed: {e}")
         return
+    from tracker_app.learning.retention_engine import RetentionSnapshot
+    scores = RetentionSnapshot.from_rows(rows).scores()   # one array pass
     updates = {}
-    for r in rows:
+    for r, score in zip(rows, scores.tolist()):
         if r.concept in knowledge_graph:
             updates[r.concept] = (
-                _memory_score_from_row(r),
+                score,
                 getattr(r, "interval", 1) or 1,
                 getattr(r, "memory_strength", 2.5) or 2.5,
                 r.last_seen or r.first_seen,
@@ -467,7 +1274,9 @@ def _refresh_all_memory_scores(concepts):
             node = knowledge_graph.nodes[concept]
             new_score = round(score, 4)
             if node.get('memory_score') != new_score:
+                _on_score_changed(concept, node.get('memory_score', 0.5), new_score)
                 _graph_dirty = True
+                _mark_graph_changed(stats_kept=True)
             node['memory_score']    = new_score
             node['interval']        = interval
             node['memory_strength'] = strength
@@ -703,65 +1512,123 @@ def find_knowledge_gaps(top_k: int = 5) -> list:
 
 # â”€â”€â”€ Graph statistics (for dashboard API) â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€
 
+def pick_quiz_concept(min_candidates: int = 1, n_distractors: int = 3):
+    """Weakest plausible concept with its distractors, from `_quiz_index`.
+
+    Returns (concept, memory_score, distractors) or None when fewer than
+    `min_candidates` plausible concepts exist. Distractors are the
+    concept's strongest plausible neighbours, then its nearest embedding
+    neighbours from the distractor table, then random other candidates
+    when both run short. O(log n) amortised.
+    """
+    _ensure_graph_loaded()
+    with _graph_lock:
+        if not _quiz_index.is_current():
+            _quiz_index.rebuild()
+        if len(_quiz_index.names) < min_candidates:
+            logger.debug("Too few quiz candidates (%d < %d)",
+                         len(_quiz_index.names), min_candidates)
+            return None
+        picked = _quiz_index.weakest()
+        if picked is None:
+            return None
+        concept, score = picked
+        distractors = _quiz_index.top_neighbours(concept)[:n_distractors]
+        if len(distractors) < n_distractors:
+            distractors += _quiz_index.near_others(
+                concept, [concept, *distractors], n_distractors - len(distractors))
+        if len(distractors) < n_distractors:
+            distractors += _quiz_index.random_others(
+                [concept, *distractors], n_distractors - len(distractors))
+    return concept, score, distractors
+
+
+def build_distractor_table() -> dict:
+    """Recompute every node's nearest-neighbour distractor list and save.
+
+    O(n^2 * dim) in blocked matrix products; add_concepts keeps the table
+    current afterwards, so this runs once for a graph saved without it
+    (see _ensure_graph_loaded) or on demand from
+    tracker_app.scripts.build_distractor_table.
+    """
+    started = time.perf_counter()
+    _ensure_graph_loaded()
+    with _graph_lock:
+        rows = _build_distractor_table_locked()
+    if _graph_dirty:
+        _save_graph()
+    report = {'concepts': rows, 'k': _near_table.k,
+              'duration_ms': round((time.perf_counter() - started) * 1000, 1)}
+    logger.info("Distractor table built for %d concepts in %.1f ms",
+                rows, report['duration_ms'])
+    return report
+
+
+def _build_distractor_table_locked() -> int:
+    global _graph_dirty
+    if not _quiz_index.is_current():
+        _quiz_index.rebuild()
+    rows = _near_table.build_all()
+    if rows:
+        _graph_dirty = True
+        _mark_graph_changed(stats_kept=True)
+    return rows
+
+
+def _distractor_table_missing() -> bool:
+    """True for a graph with embeddings saved before the table existed."""
+    nodes = knowledge_graph.nodes(data=True)
+    return (any(d.get('embedding') for _, d in nodes)
+            and not any('near' in d for _, d in nodes))
+
+
 def get_graph_stats() -> dict:
-    """Return summary statistics about the knowledge graph."""
+    """Return summary statistics about the knowledge graph.
+
+    Served from the running aggregates in `_stats`: O(k) in the top-k size
+    (plus the top nodes' degrees for their edges), not O(nodes + edges).
+    """
     _ensure_graph_loaded()
     with _graph_lock:
-        n_nodes = knowledge_graph.number_of_nodes()
-        n_edges = knowledge_graph.number_of_edges()
-        string_nodes = [n for n in knowledge_graph.nodes() if isinstance(n, str)]
-
-        avg_memory = 0.0
-        if string_nodes:
-            scores = [
-                knowledge_graph.nodes[n].get('memory_score', 0.5)
-                for n in string_nodes
-            ]
-            avg_memory = float(sum(scores)) / len(scores)
-
-        top_concepts = sorted(
-            (n for n in string_nodes),
-            key=lambda n: knowledge_graph.nodes[n].get('memory_score', 0.5),
-            reverse=True,
-        )[:10]
+        if not _stats.is_current():
+            _stats.rebuild()
+        top = _stats.ranked_top()
+        n_nodes, n_edges = _stats.n_nodes, _stats.n_edges
+        n_concepts = _stats.n_concepts
+        avg_memory = _stats.score_sum / n_concepts if n_concepts else 0.0
 
         # Real edges among the visible top concepts (M-7). The frontend used to
         # fabricate spoke lines from a fake "HUB"; return the actual weighted
-        # semantic edges so the map draws the true graph structure.
-        top_set = set(top_concepts)
-        edges = sorted(
-            (
-                [u, v, round(float(data.get('weight', 1.0)), 4)]
-                for u, v, data in knowledge_graph.edges(data=True)
-                if u in top_set and v in top_set
-            ),
-            key=lambda e: e[2],
-            reverse=True,
-        )
-
-        # Per-node live memory scores for the visible top set â€” the frontend
-        # force-layout sizes/colours nodes from these (weak = small/dim).
-        nodes = [
-            {
-                'concept': n,
-                'memory_score': float(knowledge_graph.nodes[n].get('memory_score', 0.5)),
-            }
-            for n in top_concepts
-        ]
-
-        return {
-            'total_nodes':    n_nodes,
-            'total_edges':    n_edges,
-            'concept_nodes':  len(string_nodes),
-            'avg_memory_score': round(avg_memory, 4),
-            'density':         round(nx.density(knowledge_graph), 6),
-            # dashboard (frontend) keys
-            'total_concepts':  len(string_nodes),
-            'avg_memory_strength': round(avg_memory, 4),
-            'top_concepts':    top_concepts,
-            'nodes':           nodes,
-            'edges':           edges,  # [source, target, weight]
-        }
+        # semantic edges so the map draws the true graph structure. Each edge
+        # is listed once, from the earlier-inserted end (as graph.edges does).
+        seq = _stats.seq
+        top_set = {name for name, _ in top}
+        edges = []
+        for u in sorted(top_set, key=seq.__getitem__):
+            for v, d in knowledge_graph[u].items():
+                if v in top_set and seq[v] > seq[u]:
+                    edges.append([u, v, round(float(d.get('weight', 1.0)), 4)])
+    edges.sort(key=lambda e: e[2], reverse=True)
+
+    top_concepts = [name for name, _ in top]
+    # Per-node live memory scores for the visible top set -- the frontend
+    # force-layout sizes/colours nodes from these (weak = small/dim).
+    nodes = [{'concept': name, 'memory_score': score} for name, score in top]
+    density = 2.0 * n_edges / (n_nodes * (n_nodes - 1)) if n_nodes > 1 else 0.0
+
+    return {
+        'total_nodes':    n_nodes,
+        'total_edges':    n_edges,
+        'concept_nodes':  n_concepts,
+        'avg_memory_score': round(avg_memory, 4),
+        'density':         round(density, 6),
+        # dashboard (frontend) keys
+        'total_concepts':  n_concepts,
+        'avg_memory_strength': round(avg_memory, 4),
+        'top_concepts':    top_concepts,
+        'nodes':           nodes,
+        'edges':           edges,  # [source, target, weight]
+    }
 
 
 if __name__ == "__main__":
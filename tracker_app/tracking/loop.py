@@ -15,10 +15,14 @@ from tracker_app.config import (
     SESSION_ALLOWED_INTENTS,
 )
 from tracker_app.db.db_module import init_all_databases
+from tracker_app.db.retention import start_retention_worker
+from tracker_app.learning.lambda_calibration import start_lambda_calibration_worker
+from tracker_app.tracking.event_bus import start_event_bus_client
 from tracker_app.tracking.activity_monitor import ActivityMonitor
 from tracker_app.tracking.intent_module import predict_intent
 from tracker_app.tracking.cle_module import get_cle
 from tracker_app.tracking.session_state import is_active as session_is_active
+from tracker_app.tracking.stage_metrics import maybe_publish_snapshot, publish_snapshot
 from tracker_app.tracking.privacy_filter import is_sensitive_window
 
 logger = logging.getLogger("TrackerLoop")
@@ -252,23 +256,23 @@ def _maybe_trigger_quiz(
         from tracker_app.tracking.quiz_engine import (
             should_show_quiz, generate_micro_quiz, record_quiz_broadcast
         )
-        from tracker_app.tracking.knowledge_graph import get_graph
         if should_show_quiz(
             _idle_cycles, webcam_enabled, attention_score,
             session_active=session_is_active(),
         ):
-            graph = get_graph()
-            quiz  = generate_micro_quiz(graph)
+            quiz = generate_micro_quiz()   # live graph, via its quiz index
             if quiz:
                 try:
                     from tracker_app.web.realtime import broadcast_micro_quiz
-                    broadcast_micro_quiz(quiz)
+                    delivered = broadcast_micro_quiz(quiz)
                 except Exception:
-                    pass  # dashboard may not be running
-                else:
+                    delivered = False
+                if delivered:
                     # M-6: cooldown starts only after a successful broadcast.
                     record_quiz_broadcast()
-                logger.info(f"Micro-quiz triggered: '{quiz['concept']}'")
+                    logger.info(f"Micro-quiz triggered: '{quiz['concept']}'")
+                else:
+                    logger.debug("Micro-quiz not delivered: dashboard not connected")
     except Exception as e:
         logger.debug(f"Quiz engine skipped: {e}")
 
@@ -309,6 +313,13 @@ def track_loop(
 
     cle.reset()
 
+    # Background compaction of the raw log tables (db/retention.py).
+    retention_worker = start_retention_worker()
+    # Periodic refit of every concept's decay rate (learning/lambda_calibration.py).
+    calibration_worker = start_lambda_calibration_worker()
+    # Quiz/concept/graph/session events to the dashboard (tracking/event_bus.py).
+    event_bus_client = start_event_bus_client()
+
     audio_counter = ocr_counter = webcam_counter = save_counter = 0
     ocr_result    = {'keywords': {}}
     audio_result  = {'audio_label': 'silence', 'confidence': 0.9}
@@ -461,6 +472,8 @@ def track_loop(
                 except Exception as e:
                     logger.warning(f"Export error: {e}")
                 save_counter = 0
+            else:
+                maybe_publish_snapshot()
 
             # ── Sleep for remainder of cycle ──────────────────────────────────
             elapsed = time.time() - cycle_start
@@ -471,6 +484,13 @@ def track_loop(
     finally:
         executor.shutdown(wait=False)
         monitor.end_session()
+        publish_snapshot()
+        if retention_worker:
+            retention_worker.stop()
+        if calibration_worker:
+            calibration_worker.stop()
+        if event_bus_client:
+            event_bus_client.stop()
         if kb_listener:
             kb_listener.stop()
         if ms_listener:
@@ -5,12 +5,13 @@ import pytesseract
 import hashlib
 from mss import mss
 from tracker_app.config import TESSERACT_PATH, OCR_MIN_WORD_CONFIDENCE
-import spacy
 import logging
-from tracker_app.tracking.knowledge_graph import get_graph
-from tracker_app.tracking.keyword_extractor import get_keyword_extractor
-from tracker_app.tracking.keyword_extractor import extract_concepts
+from tracker_app.tracking.knowledge_graph import get_snapshot
+from tracker_app.tracking.keyword_extractor import (
+    get_keyword_extractor, extract_concepts,
+)
 from tracker_app.learning.text_quality_validator import validate_and_clean_extraction
+from tracker_app.tracking.stage_metrics import stage_timer
 from tracker_app.tracking.privacy_filter import (
     sanitize_text_for_storage, is_sensitive_window, strip_redaction_markers,
     filter_sensitive_keywords,
@@ -39,7 +40,6 @@ elif TESSERACT_PATH.lower() == "tesseract":
 
 # Initialize models with error handling
 kw_extractor = None
-nlp = None
 
 try:
     kw_extractor = get_keyword_extractor()
@@ -47,12 +47,6 @@ try:
 except Exception as e:
     logger.warning(f"Keyword extractor load failed: {e}")
 
-try:
-    nlp = spacy.load("en_core_web_sm")
-    logger.info("spaCy model loaded.")
-except Exception as e:
-    logger.warning(f"spaCy load failed: {e}")
-
 # Screenshot deduplication
 _last_screenshot_hash = None
 
@@ -228,16 +222,18 @@ def extract_text(img, min_confidence: int = None):
 def extract_keywords(text, top_n=15, boost_repeats=True, graph=None):
     """Extract keywords with quality validation and privacy filtering.
 
-    graph: optional preloaded knowledge graph. When provided the node-boost
-    lookup uses it directly instead of calling get_graph() (which may
-    trigger a DB sync) from the OCR worker thread (M-4).
+    graph: optional preloaded knowledge graph or GraphSnapshot. Without one
+    the node-boost reads the immutable snapshot (get_snapshot()), which
+    never takes _graph_lock or triggers a DB sync on the OCR worker
+    thread (M-4).
     """
     if not text or len(text.strip()) < 10:
         return {}
     
     # Privacy filter FIRST (mandatory structural gate — imported at module load,
     # so this can never silently disappear)
-    sanitized = sanitize_text_for_storage(text)
+    with stage_timer('ocr.sanitize_text'):
+        sanitized = sanitize_text_for_storage(text)
 
     if not sanitized['safe_to_store']:
         logger.warning("[PRIVACY] Text rejected due to sensitive content")
@@ -254,7 +250,8 @@ def extract_keywords(text, top_n=15, boost_repeats=True, graph=None):
     text = strip_redaction_markers(text)
     
     # Quality validation
-    validation = validate_and_clean_extraction(text)
+    with stage_timer('ocr.validate_text'):
+        validation = validate_and_clean_extraction(text)
     
     # Reject garbage immediately
     if not validation['is_useful']:
@@ -266,18 +263,20 @@ def extract_keywords(text, top_n=15, boost_repeats=True, graph=None):
     
     # Unified extraction: spaCy-first, YAKE-supplementary
     try:
-        kw_dict = extract_concepts(clean_text, top_n=top_n)
+        with stage_timer('ocr.extract_concepts'):
+            kw_dict = extract_concepts(clean_text, top_n=top_n)
     except Exception as e:
         logger.warning(f"Concept extraction failed: {e}")
         kw_dict = {}
 
     # Boost keywords existing in knowledge graph (OCR-specific)
     try:
-        if graph is None:
-            graph = get_graph()
-        for kw in list(kw_dict.keys()):
-            if kw in graph.nodes:
-                kw_dict[kw] = min(1.0, kw_dict[kw] + 0.1)
+        with stage_timer('ocr.graph_boost'):
+            if graph is None:
+                graph = get_snapshot()
+            for kw in list(kw_dict.keys()):
+                if kw in graph.nodes:
+                    kw_dict[kw] = min(1.0, kw_dict[kw] + 0.1)
     except Exception as e:
         logger.warning(f"Knowledge graph boosting failed: {e}")
 
@@ -290,25 +289,37 @@ def extract_keywords(text, top_n=15, boost_repeats=True, graph=None):
 
 
 def ocr_pipeline():
-    """Complete OCR processing pipeline with error handling"""
+    """Complete OCR processing pipeline with error handling.
+
+    Each stage is timed into stage_metrics (see /api/v1/metrics); the whole
+    run is recorded as 'ocr.pipeline'.
+    """
+    with stage_timer('ocr.pipeline'):
+        return _run_ocr_pipeline()
+
+
+def _run_ocr_pipeline():
     try:
         # Capture screenshot
-        img = capture_screenshot()
+        with stage_timer('ocr.capture_screenshot'):
+            img = capture_screenshot()
         if img is None:
             return {"keywords": {}, "raw_text": ""}
 
         # Preprocess image
-        processed_img = preprocess_image(img)
+        with stage_timer('ocr.preprocess_image'):
+            processed_img = preprocess_image(img)
         if processed_img is None:
             return {"keywords": {}, "raw_text": ""}
 
         # Extract text
-        text = extract_text(processed_img)
+        with stage_timer('ocr.extract_text'):
+            text = extract_text(processed_img)
         if not text.strip():
             return {"keywords": {}, "raw_text": ""}
 
-        # Extract keywords with scores (graph loaded once per pipeline, M-4)
-        G = get_graph()
+        # Extract keywords with scores (one lock-free snapshot per pipeline, M-4)
+        G = get_snapshot()
         keywords_with_scores = extract_keywords(text, top_n=15, graph=G)
         
         # Convert to proper format with counts
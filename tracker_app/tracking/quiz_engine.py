@@ -97,15 +97,23 @@ def should_show_quiz(
 
 # â”€â”€â”€ Quiz generation â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€
 
-def generate_micro_quiz(graph) -> Optional[dict]:
+def generate_micro_quiz(graph=None) -> Optional[dict]:
     """
     Build a 4-option multiple-choice quiz from the weakest graph concept.
 
+    graph: None (the default) reads the live knowledge graph through its
+    maintained quiz index (knowledge_graph.pick_quiz_concept), O(log n).
+    A knowledge_graph.GraphSnapshot or any networkx graph is scanned
+    instead (snapshotted first), for ad-hoc graphs.
+
     Selection:
       - Prefers concepts with memory_score < 0.65 (weak memory)
       - Falls back to any string node if none qualify
 
-    Distractors: top neighbours by edge weight (semantically close = hard distractors)
+    Distractors: top neighbours by edge weight (semantically close = hard
+    distractors). On the live graph, a concept with fewer than three
+    neighbours is topped up from its nearest embedding neighbours
+    (knowledge_graph.build_distractor_table) before any random pick.
 
     Returns:
         {
@@ -119,35 +127,14 @@ def generate_micro_quiz(graph) -> Optional[dict]:
         }
         or None if graph is too small.
     """
-    nodes = [(n, d) for n, d in graph.nodes(data=True) if isinstance(n, str) and len(n) > 2 and is_plausible_concept(n)]
-    if len(nodes) < MIN_GRAPH_SIZE:
-        logger.debug(f"Graph too small for quiz ({len(nodes)} < {MIN_GRAPH_SIZE})")
-        return None
-
-    # Pick weakest concept
-    weak = [x for x in nodes if x[1].get('memory_score', 0.5) < 0.65]
-    pool = weak if weak else nodes
-    pool.sort(key=lambda x: x[1].get('memory_score', 0.5))
-    concept_name, concept_data = pool[0]
-
-    # Build distractor list from neighbours
-    neighbours = [
-        n for n in graph.neighbors(concept_name)
-        if isinstance(n, str) and n != concept_name and is_plausible_concept(n)
-    ]
-    neighbours.sort(
-        key=lambda n: graph[concept_name][n].get('weight', 0),
-        reverse=True
-    )
-
-    if len(neighbours) >= 3:
-        distractors = neighbours[:3]
+    if graph is None:
+        from tracker_app.tracking.knowledge_graph import pick_quiz_concept
+        picked = pick_quiz_concept(MIN_GRAPH_SIZE)
     else:
-        other_names = [n for n, _ in nodes if n != concept_name]
-        distractors = (neighbours + random.sample(
-            [n for n in other_names if n not in neighbours],
-            min(3 - len(neighbours), len(other_names) - len(neighbours))
-        ))[:3]
+        picked = _pick_from_graph(graph)
+    if picked is None:
+        return None
+    concept_name, concept_score, distractors = picked
 
     if len(distractors) < 3:
         logger.debug("Not enough distractors for quiz")
@@ -164,15 +151,52 @@ def generate_micro_quiz(graph) -> Optional[dict]:
         'distractors':    distractors[:3],
         'all_options':    all_options,
         'correct_index':  correct_index,
-        'memory_score':   round(concept_data.get('memory_score', 0.5), 3),
+        'memory_score':   round(concept_score, 3),
         # dashboard (frontend) keys
         'options':        all_options,
-        'difficulty':     ('easy' if concept_data.get('memory_score', 0.5) >= 0.65
-                           else 'medium' if concept_data.get('memory_score', 0.5) >= 0.4
+        'difficulty':     ('easy' if concept_score >= 0.65
+                           else 'medium' if concept_score >= 0.4
                            else 'hard'),
     }
 
 
+def _pick_from_graph(graph):
+    """Scan form of knowledge_graph.pick_quiz_concept for an explicit graph."""
+    from tracker_app.tracking.knowledge_graph import GraphSnapshot
+    snap = graph if isinstance(graph, GraphSnapshot) else GraphSnapshot.from_graph(graph)
+
+    plausible = [
+        i for i, n in enumerate(snap.names)
+        if isinstance(n, str) and len(n) > 2 and is_plausible_concept(n)
+    ]
+    if len(plausible) < MIN_GRAPH_SIZE:
+        logger.debug(f"Graph too small for quiz ({len(plausible)} < {MIN_GRAPH_SIZE})")
+        return None
+
+    # Pick weakest concept: the minimum is weak (< 0.65) whenever any node
+    # is, so this equals "weakest of the weak pool, else weakest overall".
+    scores = snap.memory_scores[plausible]
+    pick = plausible[int(scores.argmin())]
+    concept_name = snap.names[pick]
+    concept_score = float(snap.memory_scores[pick])
+
+    # Build distractor list from neighbours (snapshot keeps them strongest first)
+    neighbours = [
+        n for n, _ in snap.neighbours.get(concept_name, ())
+        if isinstance(n, str) and n != concept_name and is_plausible_concept(n)
+    ]
+
+    if len(neighbours) >= 3:
+        distractors = neighbours[:3]
+    else:
+        other_names = [snap.names[i] for i in plausible if i != pick]
+        distractors = (neighbours + random.sample(
+            [n for n in other_names if n not in neighbours],
+            min(3 - len(neighbours), len(other_names) - len(neighbours))
+        ))[:3]
+    return concept_name, concept_score, distractors
+
+
 # â”€â”€â”€ Result recording â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€
 
 def record_quiz_result(concept: str, was_correct: bool):
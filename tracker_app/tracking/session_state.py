@@ -9,16 +9,29 @@ back to "inactive", so a stale file never blocks tracking.
 Cross-process safety is provided by a filelock.FileLock sidecar file
 (session_state.json.lock). If the lock cannot be created or acquired,
 the module falls back to unlocked access with a warning.
+
+Only writes (start, stop, set_calibration) take the locks: they
+read-modify-write the file under the file lock, bump its `version` and
+fsync before the atomic replace. Readers (is_active, get_status,
+get_calibration) are lock-free: they return the in-memory `_snapshot`,
+which this process's writes replace directly and a daemon watcher thread
+reloads whenever the file's (inode, mtime, size) changes, polling every
+_WATCH_INTERVAL seconds. A write from the other process therefore
+becomes visible here within one interval, well inside the tracker's
+per-cycle cadence; when the event bus is connected, the SESSION event
+each write publishes makes it visible at once.
 """
 
 import json
 import logging
+import os
 import threading
 from datetime import datetime
 from pathlib import Path
 
 from filelock import FileLock, Timeout as LockTimeout
 from tracker_app.config import DATA_DIR
+from tracker_app.tracking import event_bus
 from tracker_app.utils import utcnow as _utcnow
 
 _log = logging.getLogger(__name__)
@@ -30,6 +43,14 @@ _file_lock = FileLock(_LOCK_PATH, timeout=5)
 
 _DEFAULT = {"active": False, "started_at": None, "stopped_at": None, "ear_calibration": None}
 
+_WATCH_INTERVAL = 0.5
+
+# (path, file signature, state) as last loaded or written; replaced whole,
+# never mutated, so readers need no lock.
+_snapshot = None
+_watcher = None
+_watch_stop = threading.Event()
+
 
 def _load() -> dict:
     try:
@@ -43,11 +64,92 @@ def _load() -> dict:
 
 
 def _save(state: dict) -> None:
+    """Write `state` as the next version and publish it to this process."""
+    global _snapshot
+    state["version"] = int(state.get("version") or 0) + 1
     _STATE_PATH.parent.mkdir(parents=True, exist_ok=True)
     tmp = _STATE_PATH.with_suffix(".json.tmp")
     with open(tmp, "w", encoding="utf-8") as f:
         json.dump(state, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
     tmp.replace(_STATE_PATH)
+    _snapshot = (_STATE_PATH, _signature(_STATE_PATH), _copy(state))
+
+
+def _copy(state: dict) -> dict:
+    """Copy of `state` that shares no mutable value with it."""
+    state = dict(state)
+    if isinstance(state.get("ear_calibration"), dict):
+        state["ear_calibration"] = dict(state["ear_calibration"])
+    return state
+
+
+def _signature(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_ino, st.st_mtime_ns, st.st_size
+
+
+def _reload() -> tuple:
+    """Re-read the file into `_snapshot` if it changed (or the path moved)."""
+    global _snapshot
+    with _lock:
+        path = _STATE_PATH
+        sig = _signature(path)
+        snap = _snapshot
+        if snap is None or snap[0] != path or snap[1] != sig:
+            # Stat before reading: a write racing the read leaves a stale
+            # signature, so the next poll reloads again.
+            snap = (path, sig, _load())
+            _snapshot = snap
+        return snap
+
+
+def _watch() -> None:
+    while not _watch_stop.wait(_WATCH_INTERVAL):
+        try:
+            snap = _snapshot
+            if snap is None or snap[0] != _STATE_PATH or snap[1] != _signature(snap[0]):
+                _reload()
+        except Exception as exc:
+            _log.debug("session_state watcher: %s", exc)
+
+
+def _start_watcher() -> None:
+    global _watcher
+    with _lock:
+        if _watcher is None:
+            _watcher = threading.Thread(target=_watch, name="fkt-session-state-watcher",
+                                        daemon=True)
+            _watcher.start()
+
+
+def _published(state: dict) -> dict:
+    """Announce a write (call after releasing the locks); returns `state`.
+
+    A process whose first session call is a write must still watch for
+    the other process's later writes."""
+    if _watcher is None:
+        _start_watcher()
+    event_bus.publish(event_bus.SESSION, get_status())
+    return state
+
+
+# The other process wrote the file: reload now rather than on the next poll.
+event_bus.subscribe(event_bus.SESSION, lambda data: _reload(), remote_only=True)
+
+
+def _current() -> dict:
+    """The cached state; loads synchronously only on first use or a new path."""
+    snap = _snapshot
+    if snap is None or snap[0] != _STATE_PATH:
+        snap = _reload()
+    if _watcher is None:
+        _start_watcher()
+    return snap[2]
 
 
 def _acquire_file_lock():
@@ -73,12 +175,12 @@ def _release_file_lock(acquired: bool) -> None:
 
 def is_active() -> bool:
     """Return True when a study session is currently toggled on."""
-    with _lock:
-        acquired = _acquire_file_lock()
-        try:
-            return bool(_load().get("active"))
-        finally:
-            _release_file_lock(acquired)
+    return bool(_current().get("active"))
+
+
+def version() -> int:
+    """Write counter of the state file; changes whenever any process writes."""
+    return int(_current().get("version") or 0)
 
 
 def start() -> dict:
@@ -98,9 +200,9 @@ def start() -> dict:
             state["started_at"] = now
             state["stopped_at"] = None
             _save(state)
-            return state
         finally:
             _release_file_lock(acquired)
+    return _published(state)
 
 
 def stop() -> dict:
@@ -113,9 +215,9 @@ def stop() -> dict:
             state["stopped_at"] = _utcnow().isoformat()
             state["ear_calibration"] = None
             _save(state)
-            return state
         finally:
             _release_file_lock(acquired)
+    return _published(state)
 
 
 
@@ -128,25 +230,17 @@ def set_calibration(data: dict) -> None:
             _save(state)
         finally:
             _release_file_lock(acquired)
+    _published(state)
 
 
 def get_calibration() -> dict | None:
-    with _lock:
-        acquired = _acquire_file_lock()
-        try:
-            return _load().get("ear_calibration")
-        finally:
-            _release_file_lock(acquired)
+    cal = _current().get("ear_calibration")
+    return dict(cal) if isinstance(cal, dict) else cal
 
 
 def get_status() -> dict:
     """Return the current state plus a live elapsed-seconds figure."""
-    with _lock:
-        acquired = _acquire_file_lock()
-        try:
-            state = _load()
-        finally:
-            _release_file_lock(acquired)
+    state = _current()
     elapsed = None
     if state.get("active") and state.get("started_at"):
         try:
@@ -159,5 +253,6 @@ def get_status() -> dict:
         "started_at": state.get("started_at"),
         "stopped_at": state.get("stopped_at"),
         "elapsed_seconds": elapsed,
-        "ear_calibration": state.get("ear_calibration"),
+        "ear_calibration": get_calibration(),
+        "version": int(state.get("version") or 0),
     }
\ No newline at end of file
@@ -0,0 +1,341 @@
+"""Per-stage latency histograms for the OCR -> concept pipeline.
+
+Each stage (screenshot capture, preprocessing, Tesseract, privacy sanitising,
+quality validation, concept extraction, graph boosting, add_concept) records
+its wall time into an in-process HDR-style histogram: log-linear buckets with
+~1% relative error, fixed memory per stage, O(1) record. Percentiles are read
+off the bucket counts, so p50/p95/p99 stay cheap no matter how long the
+tracker has been running.
+
+With STAGE_METRICS_ENABLED off, stage_timer() returns a shared no-op context
+manager and record_stage() returns immediately, so the instrumented code pays
+one flag check per stage.
+
+Only the tracker process runs the pipeline, but /api/v1/metrics is served by
+the dashboard. The tracker therefore writes its raw bucket counts to
+STAGE_METRICS_SNAPSHOT (publish_snapshot / maybe_publish_snapshot) and the
+dashboard merges that file into its own histograms when asked with
+include_snapshot=True. A reset from the dashboard removes the snapshot and
+leaves a `.reset` marker the tracker honours on its next publish.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+
+from tracker_app.config import (
+    STAGE_METRICS_ENABLED, STAGE_METRICS_SNAPSHOT, STAGE_METRICS_PUBLISH_SECONDS,
+)
+
+logger = logging.getLogger("StageMetrics")
+
+# Values are recorded in integer microseconds. 128 linear sub-buckets per
+# power of two bound the relative error of any reported value to < 1/64.
+_SUB_BUCKET_BITS = 7
+_SUB_BUCKET_COUNT = 1 << _SUB_BUCKET_BITS
+_SUB_BUCKET_HALF = _SUB_BUCKET_COUNT >> 1
+# Highest trackable value: 2**36 us (~19 hours). Larger samples are clamped.
+_MAX_EXPONENT = 36
+_MAX_VALUE_US = (1 << _MAX_EXPONENT) - 1
+_BUCKET_SLOTS = _SUB_BUCKET_COUNT + (_MAX_EXPONENT - _SUB_BUCKET_BITS + 1) * _SUB_BUCKET_HALF
+
+PERCENTILES = (50.0, 95.0, 99.0)
+
+
+def _bucket_index(value_us: int) -> int:
+    """Slot for a value: exact below 128 us, log-linear above."""
+    if value_us < _SUB_BUCKET_COUNT:
+        return value_us
+    exponent = value_us.bit_length() - _SUB_BUCKET_BITS
+    mantissa = value_us >> exponent           # in [64, 128)
+    return _SUB_BUCKET_COUNT + (exponent - 1) * _SUB_BUCKET_HALF + (mantissa - _SUB_BUCKET_HALF)
+
+
+def _bucket_upper(index: int) -> int:
+    """Highest value (us) that maps to slot `index`."""
+    if index < _SUB_BUCKET_COUNT:
+        return index
+    offset = index - _SUB_BUCKET_COUNT
+    exponent = offset // _SUB_BUCKET_HALF + 1
+    mantissa = offset % _SUB_BUCKET_HALF + _SUB_BUCKET_HALF
+    return ((mantissa + 1) << exponent) - 1
+
+
+class LatencyHistogram:
+    """Fixed-size log-linear latency histogram (HdrHistogram-style)."""
+
+    __slots__ = ("_counts", "_lock", "count", "total_us", "min_us", "max_us")
+
+    def __init__(self):
+        self._counts = [0] * _BUCKET_SLOTS
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total_us = 0
+        self.min_us = 0
+        self.max_us = 0
+
+    def record_us(self, value_us: int) -> None:
+        value_us = min(max(int(value_us), 0), _MAX_VALUE_US)
+        idx = _bucket_index(value_us)
+        with self._lock:
+            self._counts[idx] += 1
+            if self.count == 0 or value_us < self.min_us:
+                self.min_us = value_us
+            if value_us > self.max_us:
+                self.max_us = value_us
+            self.count += 1
+            self.total_us += value_us
+
+    def percentiles(self, percentiles=PERCENTILES) -> dict:
+        """{percentile: value_us} for each requested percentile.
+
+        Like HdrHistogram, the reported value is the highest value equivalent
+        to the bucket the percentile falls in, clamped to the observed range.
+        """
+        with self._lock:
+            counts = list(self._counts)
+            total, lo, hi = self.count, self.min_us, self.max_us
+        if total == 0:
+            return {p: 0 for p in percentiles}
+        # Rank = ceil(p% of total), in integer arithmetic so 95% of 20 is
+        # exactly 19 rather than 19.000000000000004 -> 20.
+        targets = sorted(
+            (max(1, -(-int(p * 1000) * total // 100_000)), p) for p in percentiles
+        )
+        out = {}
+        seen = 0
+        t = 0
+        for idx, c in enumerate(counts):
+            if not c:
+                continue
+            seen += c
+            while t < len(targets) and seen >= targets[t][0]:
+                out[targets[t][1]] = min(max(_bucket_upper(idx), lo), hi)
+                t += 1
+            if t == len(targets):
+                break
+        return out
+
+    def to_state(self) -> dict:
+        """Raw counts as a JSON-friendly dict (non-empty buckets only)."""
+        with self._lock:
+            return {
+                'count': self.count,
+                'total_us': self.total_us,
+                'min_us': self.min_us,
+                'max_us': self.max_us,
+                'buckets': [[i, c] for i, c in enumerate(self._counts) if c],
+            }
+
+    def merge_state(self, state: dict) -> None:
+        """Add the samples described by a to_state() dict."""
+        count = int(state.get('count', 0))
+        if count <= 0:
+            return
+        with self._lock:
+            for idx, c in state.get('buckets', ()):
+                if 0 <= idx < _BUCKET_SLOTS:
+                    self._counts[idx] += int(c)
+            lo, hi = int(state.get('min_us', 0)), int(state.get('max_us', 0))
+            if self.count == 0 or lo < self.min_us:
+                self.min_us = lo
+            if hi > self.max_us:
+                self.max_us = hi
+            self.count += count
+            self.total_us += int(state.get('total_us', 0))
+
+    def summary(self) -> dict:
+        """Count, min/mean/max and p50/p95/p99 in milliseconds."""
+        pct = self.percentiles()
+        with self._lock:
+            count, total, lo, hi = self.count, self.total_us, self.min_us, self.max_us
+        return {
+            'count': count,
+            'min_ms': round(lo / 1000.0, 3),
+            'mean_ms': round(total / count / 1000.0, 3) if count else 0.0,
+            'max_ms': round(hi / 1000.0, 3),
+            'p50_ms': round(pct[50.0] / 1000.0, 3),
+            'p95_ms': round(pct[95.0] / 1000.0, 3),
+            'p99_ms': round(pct[99.0] / 1000.0, 3),
+            'total_ms': round(total / 1000.0, 3),
+        }
+
+
+class _StageTimer:
+    """Context manager recording the elapsed time of one stage run."""
+
+    __slots__ = ("_stage", "_start")
+
+    def __init__(self, stage: str):
+        self._stage = stage
+        self._start = 0
+
+    def __enter__(self):
+        self._start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        _histogram(self._stage).record_us((time.perf_counter_ns() - self._start) // 1000)
+        return False
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+_enabled = STAGE_METRICS_ENABLED
+_histograms: dict = {}
+_histograms_lock = threading.Lock()
+_snapshot_path = STAGE_METRICS_SNAPSHOT
+_last_publish = 0.0
+
+
+def _histogram(stage: str) -> LatencyHistogram:
+    hist = _histograms.get(stage)
+    if hist is None:
+        with _histograms_lock:
+            hist = _histograms.setdefault(stage, LatencyHistogram())
+    return hist
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def set_enabled(enabled: bool) -> None:
+    """Toggle recording at runtime (existing histograms are kept)."""
+    global _enabled
+    _enabled = bool(enabled)
+
+
+def stage_timer(stage: str):
+    """`with stage_timer('ocr.extract_text'): ...` records the block's wall time.
+
+    Failed stages are recorded too: a Tesseract call that times out still
+    spent that time in the cycle.
+    """
+    if not _enabled:
+        return _NULL_TIMER
+    return _StageTimer(stage)
+
+
+def record_stage(stage: str, seconds: float) -> None:
+    """Record an externally measured duration for a stage."""
+    if not _enabled:
+        return
+    _histogram(stage).record_us(seconds * 1_000_000)
+
+
+def get_stage_metrics(include_snapshot: bool = False) -> dict:
+    """{'enabled': bool, 'stages': {stage: summary}} with stages sorted by name.
+
+    include_snapshot=True also merges the histograms another process (the
+    tracker) last published to STAGE_METRICS_SNAPSHOT.
+    """
+    with _histograms_lock:
+        items = sorted(_histograms.items())
+    snapshot = _read_snapshot() if include_snapshot else None
+    if not snapshot:
+        return {
+            'enabled': _enabled,
+            'stages': {name: hist.summary() for name, hist in items},
+        }
+    merged = {}
+    for name, hist in items:
+        merged[name] = LatencyHistogram()
+        merged[name].merge_state(hist.to_state())
+    for name, state in snapshot.get('stages', {}).items():
+        merged.setdefault(name, LatencyHistogram()).merge_state(state)
+    return {
+        'enabled': _enabled or bool(snapshot.get('enabled')),
+        'stages': {name: merged[name].summary() for name in sorted(merged)},
+        'published_at': snapshot.get('published_at'),
+    }
+
+
+def reset_stage_metrics(include_snapshot: bool = False) -> None:
+    """Drop every recorded sample.
+
+    include_snapshot=True also drops the published snapshot and asks the
+    process that wrote it to clear its histograms before publishing again.
+    """
+    with _histograms_lock:
+        _histograms.clear()
+    if not include_snapshot:
+        return
+    try:
+        os.unlink(_snapshot_path)
+    except FileNotFoundError:
+        return
+    except OSError as e:
+        logger.warning("Could not remove stage metrics snapshot: %s", e)
+        return
+    try:
+        open(_snapshot_path + '.reset', 'w').close()
+    except OSError as e:
+        logger.warning("Could not request a stage metrics reset: %s", e)
+
+
+def publish_snapshot() -> bool:
+    """Write this process's raw histograms to STAGE_METRICS_SNAPSHOT.
+
+    Honours a pending reset request first, so samples read and cleared
+    through the dashboard are not published again.
+    """
+    global _last_publish
+    _last_publish = time.monotonic()
+    marker = _snapshot_path + '.reset'
+    if os.path.exists(marker):
+        with _histograms_lock:
+            _histograms.clear()
+        try:
+            os.unlink(marker)
+        except OSError:
+            pass
+    with _histograms_lock:
+        items = sorted(_histograms.items())
+    snapshot = {
+        'pid': os.getpid(),
+        'published_at': time.time(),
+        'enabled': _enabled,
+        'stages': {name: hist.to_state() for name, hist in items},
+    }
+    tmp = _snapshot_path + '.tmp'
+    try:
+        os.makedirs(os.path.dirname(_snapshot_path) or '.', exist_ok=True)
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(snapshot, f)
+        os.replace(tmp, _snapshot_path)
+    except OSError as e:
+        logger.warning("Could not publish stage metrics: %s", e)
+        return False
+    return True
+
+
+def maybe_publish_snapshot() -> bool:
+    """publish_snapshot() at most every STAGE_METRICS_PUBLISH_SECONDS."""
+    if time.monotonic() - _last_publish < STAGE_METRICS_PUBLISH_SECONDS:
+        return False
+    return publish_snapshot()
+
+
+def _read_snapshot():
+    """The published snapshot, unless missing, unreadable or our own."""
+    try:
+        with open(_snapshot_path, encoding='utf-8') as f:
+            snapshot = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(snapshot, dict) or snapshot.get('pid') == os.getpid():
+        return None
+    return snapshot
@@ -6,7 +6,7 @@ import re
 import threading
 import logging
 from datetime import datetime
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify
 
 from tracker_app.utils import utcnow as _utcnow
 
@@ -210,11 +210,15 @@ def get_items():
         return jsonify({'success': False,
                         'error': f'status must be one of: {sorted(VALID_STATUSES)}'}), 400
     try:
-        items = get_tracker().get_items(status=status, limit=limit)
-        return jsonify({'success': True, 'data': items, 'count': len(items)})
+        page = get_tracker().get_items_page(status=status, limit=limit,
+                                            cursor=request.args.get('cursor'))
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
     except Exception as e:
         logger.error(f"get_items: {e}")
         return jsonify({'success': False, 'error': 'Internal server error'}), 500
+    return jsonify({'success': True, 'data': page['items'], 'count': len(page['items']),
+                    'next_cursor': page['next_cursor']})
 
 
 @api_bp.route('/items', methods=['POST'])
@@ -295,6 +299,93 @@ def get_due_items():
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
+@api_bp.route('/items/search', methods=['GET'])
+def search_items():
+    """Newest-first page of active items whose question or answer contains `q`.
+    Follow `next_cursor` (null on the last page) for the rest."""
+    query = (request.args.get('q') or '').strip()
+    if not query:
+        return jsonify({'success': False, 'error': 'q is required'}), 400
+    try:
+        limit = int(request.args.get('limit', 50))
+        if not (1 <= limit <= MAX_LIMIT):
+            return jsonify({'success': False, 'error': f'limit must be 1\u2013{MAX_LIMIT}'}), 400
+    except (ValueError, TypeError):
+        return jsonify({'success': False, 'error': 'limit must be an integer'}), 400
+    try:
+        page = get_tracker().search_items_page(query, limit=limit,
+                                               cursor=request.args.get('cursor'))
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        logger.error(f"search_items: {e}")
+        return jsonify({'success': False, 'error': 'Internal server error'}), 500
+    return jsonify({'success': True, 'data': page['items'], 'count': len(page['items']),
+                    'next_cursor': page['next_cursor']})
+
+
+SEARCH_SCOPES = {'items', 'concepts', 'all'}
+
+
+@api_bp.route('/search', methods=['GET'])
+def search():
+    """BM25-ranked full-text search over deck items and tracked concepts.
+
+    Every word in `q` is a prefix term (search-as-you-type), all must match.
+    `scope` is items, concepts or all; `limit` applies per kind."""
+    query = (request.args.get('q') or '').strip()
+    if not query:
+        return jsonify({'success': False, 'error': 'q is required'}), 400
+    scope = request.args.get('scope', 'all')
+    if scope not in SEARCH_SCOPES:
+        return jsonify({'success': False,
+                        'error': f'scope must be one of: {sorted(SEARCH_SCOPES)}'}), 400
+    try:
+        limit = int(request.args.get('limit', 20))
+        if not (1 <= limit <= 100):
+            return jsonify({'success': False, 'error': 'limit must be 1\u2013100'}), 400
+    except (ValueError, TypeError):
+        return jsonify({'success': False, 'error': 'limit must be an integer'}), 400
+
+    try:
+        from tracker_app.db.models import SessionLocal
+        from tracker_app.db.repository import SearchRepository
+        data = {}
+        with SessionLocal() as db:
+            if scope in ('items', 'all'):
+                data['items'] = [
+                    {**LearningTracker._row_to_dict(item), 'score': round(score, 4)}
+                    for item, score in SearchRepository.search_items(db, query, limit)
+                ]
+            if scope in ('concepts', 'all'):
+                data['concepts'] = [
+                    {'concept': c.concept, 'status': c.status,
+                     'relevance_score': c.relevance_score, 'next_review': c.next_review,
+                     'score': round(score, 4)}
+                    for c, score in SearchRepository.search_concepts(db, query, limit)
+                ]
+        return jsonify({'success': True, 'data': data})
+    except Exception as e:
+        logger.error(f"search: {e}")
+        return jsonify({'success': False, 'error': 'Internal server error'}), 500
+
+
+EXPORT_MIMETYPES = {'json': 'application/json', 'anki': 'text/tab-separated-values'}
+
+
+@api_bp.route('/items/export', methods=['GET'])
+def export_items():
+    """Stream the whole deck as a download; rows are read in batches while
+    the response is written, so large decks never sit in memory at once."""
+    fmt = request.args.get('format', 'json')
+    if fmt not in EXPORT_MIMETYPES:
+        return jsonify({'success': False,
+                        'error': f'format must be one of: {sorted(EXPORT_MIMETYPES)}'}), 400
+    ext = 'json' if fmt == 'json' else 'txt'
+    return Response(get_tracker().iter_export(fmt), mimetype=EXPORT_MIMETYPES[fmt],
+                    headers={'Content-Disposition': f'attachment; filename=deck.{ext}'})
+
+
 @api_bp.route('/items/<item_id>', methods=['GET'])
 def get_item(item_id):
     try:
@@ -319,6 +410,39 @@ def delete_item(item_id):
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
+@api_bp.route('/concepts/at-risk', methods=['GET'])
+def get_concepts_at_risk():
+    """Concepts whose live AWFC retention drops below MEMORY_THRESHOLD within
+    the next `hours`, soonest first (one vectorised pass over the table).
+    `include_below=true` also lists concepts that are already below it."""
+    try:
+        hours = float(request.args.get('hours', 24))
+        limit = int(request.args.get('limit', 20))
+    except (ValueError, TypeError):
+        return jsonify({'success': False, 'error': 'hours must be a number and limit an integer'}), 400
+    if not (0 < hours <= 24 * 30):
+        return jsonify({'success': False, 'error': 'hours must be in (0, 720]'}), 400
+    if not (1 <= limit <= MAX_LIMIT):
+        return jsonify({'success': False, 'error': f'limit must be 1\u2013{MAX_LIMIT}'}), 400
+    include_below = _parse_bool_flag(request.args.get('include_below', 'false'))
+    if include_below is None:
+        return jsonify({'success': False, 'error': 'include_below must be true or false'}), 400
+    try:
+        from tracker_app.config import MEMORY_THRESHOLD
+        from tracker_app.db.models import SessionLocal
+        from tracker_app.learning.retention_engine import RetentionSnapshot
+        with SessionLocal() as db:
+            snapshot = RetentionSnapshot.load(db)
+        at_risk = snapshot.falling_below(hours, limit=limit, include_below=include_below)
+        for row in at_risk:
+            row['drops_below_at'] = row['drops_below_at'].isoformat()
+        return jsonify({'success': True, 'data': at_risk, 'count': len(at_risk),
+                        'threshold': MEMORY_THRESHOLD, 'hours': hours})
+    except Exception as e:
+        logger.error(f"get_concepts_at_risk: {e}")
+        return jsonify({'success': False, 'error': 'Internal server error'}), 500
+
+
 @api_bp.route('/concepts/<concept>', methods=['DELETE'])
 def delete_concept(concept):
     """Permanently remove a tracked concept, its encounter history, and its
@@ -326,6 +450,7 @@ def delete_concept(concept):
     passively captured (e.g. a stray sensitive term)."""
     try:
         from tracker_app.db.models import SessionLocal, TrackedConcept
+        from tracker_app.learning.due_queue import concept_queue
         from tracker_app.tracking.knowledge_graph import remove_concept_from_graph
         with SessionLocal() as db:
             row = db.query(TrackedConcept).filter(
@@ -334,6 +459,7 @@ def delete_concept(concept):
                 return jsonify({'success': False, 'error': 'Concept not found'}), 404
             db.delete(row)  # ConceptEncounter rows cascade via ORM
             db.commit()
+        concept_queue.discard(concept)
         remove_concept_from_graph(concept)
         return jsonify({'success': True, 'message': 'Concept deleted'})
     except Exception as e:
@@ -348,11 +474,12 @@ def delete_intent_predictions():
     try:
         from tracker_app.db.models import (
             SessionLocal, IntentPrediction, IntentAccuracy,
-            FeedbackTrainingSample,
+            FeedbackTrainingSample, IntentDailyRollup,
         )
         from sqlalchemy import delete
         with SessionLocal() as db:
             n_pred  = db.execute(delete(IntentPrediction)).rowcount
+            db.execute(delete(IntentDailyRollup))
             db.execute(delete(IntentAccuracy))
             n_fb    = db.execute(delete(FeedbackTrainingSample)).rowcount
             db.commit()
@@ -374,15 +501,25 @@ def delete_tracking_history():
             SessionLocal, TrackingSession, MultiModalLog, MemoryDecay,
             Metric, DailySummary, IntentPrediction, IntentAccuracy,
             FeedbackTrainingSample, ConceptEncounter,
+            ConceptDailyRollup, IntentDailyRollup, ActivityDailyRollup,
         )
+        from tracker_app.db.repository import DailySummaryRepository
         from sqlalchemy import delete
         with SessionLocal() as db:
             n_enc    = db.execute(delete(ConceptEncounter)).rowcount
+            # Compacted capture history goes too; review_daily_rollup is
+            # part of the kept deck.
+            db.execute(delete(ConceptDailyRollup))
+            db.execute(delete(IntentDailyRollup))
+            db.execute(delete(ActivityDailyRollup))
             db.execute(delete(TrackingSession))
             db.execute(delete(MultiModalLog))
             db.execute(delete(MemoryDecay))
             db.execute(delete(Metric))
             db.execute(delete(DailySummary))
+            # Re-derive the rollup so the kept deck's review/added/mastered
+            # counters survive while the capture counters drop to zero.
+            DailySummaryRepository.rebuild(db)
             n_pred   = db.execute(delete(IntentPrediction)).rowcount
             db.execute(delete(IntentAccuracy))
             db.execute(delete(FeedbackTrainingSample))
@@ -427,6 +564,34 @@ def record_review():
         return jsonify({'success': False, 'error': str(e)}), 400
 
 
+@api_bp.route('/reviews/batch', methods=['POST'])
+def record_review_batch():
+    """Apply many item/concept ratings, in order, in one transaction.
+
+    Body: {"reviews": [{"review_id", "item_id" | "concept", "quality"
+    (or "was_correct" for concepts)}, ...]}. review_id is client-chosen;
+    resubmitting an applied id returns its stored result as a duplicate.
+    """
+    data = request.get_json(silent=True)
+    if not data:
+        return jsonify({'success': False, 'error': 'Request body must be valid JSON'}), 400
+    if not isinstance(data, dict):
+        return jsonify({'success': False, 'error': 'Request body must be a JSON object'}), 400
+    from tracker_app.learning.review_batch import apply_review_batch, normalize_reviews
+    try:
+        reviews = normalize_reviews(data.get('reviews'))
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    try:
+        batch = apply_review_batch(reviews)
+    except Exception as e:
+        logger.error(f"record_review_batch: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+    return jsonify({'success': True, 'data': batch['results'],
+                    'applied': batch['applied'], 'duplicates': batch['duplicate'],
+                    'errors': batch['error']})
+
+
 @api_bp.route('/stats', methods=['GET'])
 def get_stats():
     try:
@@ -462,6 +627,33 @@ def get_stats_trend():
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
+@api_bp.route('/stats/forecast', methods=['GET'])
+def get_stats_forecast():
+    """Projected review load per day for the next `days` days (default 14).
+
+    Items count on their SM-2 date; concepts on their SM-2 date or their AWFC
+    threshold crossing, whichever is sooner. Overdue reviews are reported
+    once under `overdue`, not folded into today.
+    """
+    from tracker_app.learning.forecast import MAX_FORECAST_DAYS
+    try:
+        days = int(request.args.get('days', 14))
+    except (ValueError, TypeError):
+        return jsonify({'success': False, 'error': 'days must be an integer'}), 400
+    if not (1 <= days <= MAX_FORECAST_DAYS):
+        return jsonify({'success': False,
+                        'error': f'days must be 1\u2013{MAX_FORECAST_DAYS}'}), 400
+    try:
+        from tracker_app.db import models
+        from tracker_app.learning.forecast import review_forecast
+        with models.SessionLocal() as db:
+            forecast = review_forecast(db, days=days)
+        return jsonify({'success': True, 'data': forecast})
+    except Exception as e:
+        logger.error(f"get_stats_forecast: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
 # Ã¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢Â
 # Intent & feedback retraining
 # Ã¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢ÂÃ¢â€¢Â
@@ -645,9 +837,9 @@ def get_concept_detail(concept):
     frontend's click-to-drill-in on a graph node."""
     try:
         from tracker_app.learning.concept_scheduler import ConceptScheduler
-        from tracker_app.tracking.knowledge_graph import get_graph
+        from tracker_app.tracking.knowledge_graph import get_snapshot
         history = ConceptScheduler().get_concept_history(concept)
-        memory = get_graph().nodes.get(concept, {}).get('memory_score', 0.5)
+        memory = get_snapshot(ensure_loaded=True).memory_score(concept)
         return jsonify({'success': True, 'data': {
             'concept': concept,
             'memory_score': round(float(memory), 4),
@@ -665,8 +857,7 @@ def get_concept_detail(concept):
 def get_current_quiz():
     try:
         from tracker_app.tracking.quiz_engine import generate_micro_quiz
-        from tracker_app.tracking.knowledge_graph import get_graph
-        quiz = generate_micro_quiz(get_graph())
+        quiz = generate_micro_quiz()
         return jsonify({'success': True, 'data': quiz})
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
@@ -755,7 +946,7 @@ def browser_ingest():
             return jsonify({'success': True, 'message': 'No keywords extracted'})
 
         scheduler = ConceptScheduler()
-        saved     = 0
+        captured  = []
         for concept, score in keywords.items():
             if len(concept) >= 3:
                 result = scheduler.add_concept(
@@ -766,7 +957,12 @@ def browser_ingest():
                     source="browser_extension",
                 )
                 if result:
-                    saved += 1
+                    captured.append(concept)
+        saved = len(captured)
+        if captured:
+            from tracker_app.tracking import event_bus
+            event_bus.publish(event_bus.CONCEPT_CAPTURED,
+                              {'concepts': captured, 'source': 'browser_extension'})
 
         return jsonify({
             'success':        True,
@@ -870,3 +1066,19 @@ def health_check():
             'error': str(e),
         }), 503
 
+
+
+@api_bp.route('/metrics', methods=['GET'])
+def get_metrics():
+    """Per-stage latency histograms (count, mean, p50/p95/p99 in ms) for the
+    OCR -> concept pipeline, merged from the tracker's published snapshot.
+    Pass ?reset=true to clear them (in both processes) after reading."""
+    try:
+        from tracker_app.tracking.stage_metrics import get_stage_metrics, reset_stage_metrics
+        data = get_stage_metrics(include_snapshot=True)
+        if _parse_bool_flag(request.args.get('reset', 'false')):
+            reset_stage_metrics(include_snapshot=True)
+        return jsonify({'success': True, 'data': data})
+    except Exception as e:
+        logger.error("get_metrics: %s", e)
+        return jsonify({'success': False, 'error': str(e)}), 500
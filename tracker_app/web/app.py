@@ -103,6 +103,13 @@ def run_dashboard(debug=None, port=5000):
     app.logger.info(f"   Stats API: http://localhost:{port}/stats")
     app.logger.info(f"Real-time updates: Socket.IO enabled")
     
+    # Events from the tracker process (tracking/event_bus.py). With the debug
+    # reloader, only the child process that actually serves requests listens.
+    if not debug or os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        from tracker_app.tracking.event_bus import start_event_bus_server
+        if start_event_bus_server():
+            app.logger.info("Tracker event bus: listening")
+
     # Use socketio.run instead of app.run for WebSocket support
     host = '0.0.0.0' if os.getenv('DOCKER_CONTAINER') else '127.0.0.1'
     socketio.run(app, debug=debug, port=port, host=host, allow_unsafe_werkzeug=True)
@@ -1,4 +1,9 @@
-"""Socket.IO realtime layer: connects dashboard clients and broadcasts micro-quiz events."""
+"""Socket.IO realtime layer: connects dashboard clients and broadcasts micro-quiz events.
+
+Events the tracker process publishes on the local event bus
+(tracking/event_bus.py) are pushed to the browser from here: micro_quiz,
+concepts_captured, graph_updated and session_state.
+"""
 
 import hmac
 import os
@@ -53,13 +58,38 @@ def init_socketio(app):
         except Exception as e:
             logger.warning(f"stats request error: {e}")
 
+    _forward_bus_events()
     return socketio
 
 
+def _forward_bus_events():
+    """Push event-bus events to every connected browser."""
+    from tracker_app.tracking import event_bus
+
+    def forward(name):
+        return lambda data: socketio.emit(name, data)
+
+    # A quiz raised in this process is emitted by broadcast_micro_quiz itself.
+    event_bus.subscribe(event_bus.QUIZ, forward("micro_quiz"), remote_only=True)
+    event_bus.subscribe(event_bus.CONCEPT_CAPTURED, forward("concepts_captured"))
+    event_bus.subscribe(event_bus.GRAPH_UPDATED, forward("graph_updated"))
+    event_bus.subscribe(event_bus.SESSION, forward("session_state"))
+
+
 # ── Broadcast helpers (called from loop.py) ───────────────────────────────────
 
-def broadcast_micro_quiz(quiz_data: dict):
-    """Broadcast a micro-quiz to all connected dashboard clients."""
+def broadcast_micro_quiz(quiz_data: dict) -> bool:
+    """Broadcast a micro-quiz to all connected dashboard clients.
+
+    In the dashboard process it is emitted directly; in the tracker process
+    it goes over the event bus. Returns False when no dashboard was reached.
+    """
     if socketio:
-        socketio.emit("micro_quiz", quiz_data, broadcast=True)
-        logger.info(f"Micro-quiz broadcast: '{quiz_data.get('concept', '?')}'")
\ No newline at end of file
+        socketio.emit("micro_quiz", quiz_data)
+        delivered = True
+    else:
+        from tracker_app.tracking import event_bus
+        delivered = event_bus.publish(event_bus.QUIZ, quiz_data)
+    if delivered:
+        logger.info(f"Micro-quiz broadcast: '{quiz_data.get('concept', '?')}'")
+    return delivered
\ No newline at end of file